@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.io.exchange_log import ExchangeLogWriter
+from tvb_multiscale.benchmarks.dt_calibration import relative_rms_error, DtCalibration
+
+
+class DummyConfig(object):
+
+    def __init__(self, output_base=None):
+        self.output_base = output_base
+        self.TVB_TO_SPIKING_DT_RATIO = 2
+        self.MIN_DELAY_RATIO = 1
+
+
+class DummyInterface(object):
+    """An interface exchanging a sinusoid, whose error grows as the TVB_TO_SPIKING_DT_RATIO decreases."""
+
+    def __init__(self, config, dt):
+        self.config = config
+        self.dt = dt
+        self.exchange_log = None
+
+    def exchange_log_header(self):
+        return {"dt": self.dt, "synchronization_n_steps": 1, "min_delay": self.dt / self.config.MIN_DELAY_RATIO,
+                "tvb_to_spikeNet_sizes": [1], "spikeNet_to_tvb_layout": [(0, [0])],
+                "spikeNet_to_tvb_params": {"S_e": [0]}, "tvb_nodes_ids": [1], "spiking_nodes_ids": [0]}
+
+    def enable_exchange_log(self, filepath):
+        self.exchange_log = ExchangeLogWriter(filepath, self.exchange_log_header())
+
+    def disable_exchange_log(self):
+        self.exchange_log.close()
+        self.exchange_log = None
+
+    def exchange(self, time):
+        value = np.sin(time)
+        self.exchange_log.write_tvb_to_spikeNet(np.array([value]))
+        error = 0.1 / self.config.TVB_TO_SPIKING_DT_RATIO
+        self.exchange_log.write_spikeNet_to_tvb(np.array([value * (1.0 + error)]))
+
+
+class DummySimulator(object):
+
+    def __init__(self, interface):
+        self.interface = interface
+
+    def run(self, simulation_length):
+        for time in np.arange(int(np.round(simulation_length / self.interface.dt))) * self.interface.dt:
+            self.interface.exchange(time)
+
+
+def build_dummy_cosimulation(config, dt=0.1):
+    interface = DummyInterface(config, dt)
+    return DummySimulator(interface), interface
+
+
+def test_relative_rms_error():
+    reference = np.array([[1.0, -1.0], [1.0, -1.0], [1.0, -1.0], [1.0, -1.0]])
+    assert relative_rms_error(reference, reference) == 0.0
+    assert np.isclose(relative_rms_error(1.1 * reference, reference), 0.1)
+    # Only the common steps are compared:
+    assert np.isclose(relative_rms_error(1.1 * reference, reference[:2]), 0.1)
+    assert relative_rms_error(reference[:0], reference) == 0.0
+    # The absolute error for zero reference values:
+    assert np.isclose(relative_rms_error(reference, 0.0 * reference), 1.0)
+    # Alternating fluctuations are averaged out by smoothing:
+    fluctuations = reference + np.array([[0.5], [-0.5], [0.5], [-0.5]])
+    assert relative_rms_error(fluctuations, reference) > 0.4
+    assert np.isclose(relative_rms_error(fluctuations, reference, smoothing_n_steps=2), 0.0)
+
+
+def test_recommend():
+    calibration = DtCalibration(build_dummy_cosimulation, tvb_to_spiking_dt_ratios=[1, 2], min_delay_ratios=[1],
+                                isolate=False, config_class=DummyConfig)
+    calibration.reference_results = OrderedDict([("tvb_to_spiking_dt_ratio", 2), ("min_delay_ratio", 1),
+                                                  ("per_step_time", 3.0)])
+    calibration.results = [OrderedDict([("tvb_to_spiking_dt_ratio", 1), ("within_tolerance", True),
+                                        ("per_step_time", 2.0)]),
+                           OrderedDict([("tvb_to_spiking_dt_ratio", 2), ("within_tolerance", True),
+                                        ("per_step_time", 1.0)]),
+                           OrderedDict([("tvb_to_spiking_dt_ratio", 4), ("within_tolerance", False),
+                                        ("per_step_time", 0.5)]),
+                           OrderedDict([("tvb_to_spiking_dt_ratio", 8), ("error", "failed")])]
+    # The fastest trial within the tolerance:
+    assert calibration.recommend() is calibration.results[1]
+    # The reference, if there is no trial within the tolerance:
+    for results in calibration.results[:2]:
+        results["within_tolerance"] = False
+    assert calibration.recommend() is calibration.reference_results
+    with pytest.raises(ValueError):
+        calibration.apply(DummyConfig())
+    calibration.recommended = calibration.recommend()
+    assert calibration.apply(DummyConfig()).TVB_TO_SPIKING_DT_RATIO == 2
+
+
+def test_dt_calibration_run(tmpdir):
+    output_folder = str(tmpdir)
+    calibration = DtCalibration(build_dummy_cosimulation, parameters={"dt": 0.1}, simulation_length=10.0,
+                                tvb_to_spiking_dt_ratios=[1, 4, 8], min_delay_ratios=[1, 2], tolerance=0.03,
+                                isolate=False, output_folder=output_folder, config_class=DummyConfig)
+    assert calibration.reference == (8, 1)
+    results = calibration.run()
+    assert len(results) == 6
+    assert all(trial["number_of_steps"] == 100 for trial in results)
+    assert all(os.path.isdir(os.path.dirname(trial["exchange_log"])) for trial in results)
+    errors = dict(((trial["tvb_to_spiking_dt_ratio"], trial["min_delay_ratio"]),
+                   trial["spikeNet_to_tvb_error"]) for trial in results)
+    assert errors[(8, 1)] == 0.0
+    assert errors[(8, 2)] == 0.0
+    # (1 + 0.1/4) / (1 + 0.1/8) - 1 is within the tolerance, (1 + 0.1/1) / (1 + 0.1/8) - 1 is not:
+    assert np.isclose(errors[(4, 1)], 1.025 / 1.0125 - 1.0)
+    assert np.isclose(errors[(1, 2)], 1.1 / 1.0125 - 1.0)
+    assert all(trial["tvb_to_spikeNet_error"] == 0.0 for trial in results)
+    assert [trial["within_tolerance"] for trial in results] == [False, False, True, True, True, True]
+    assert calibration.recommended["within_tolerance"]
+    assert calibration.recommended["tvb_to_spiking_dt_ratio"] in [4, 8]
+    config = calibration.apply(DummyConfig())
+    assert config.TVB_TO_SPIKING_DT_RATIO == calibration.recommended["tvb_to_spiking_dt_ratio"]
+    assert config.MIN_DELAY_RATIO == calibration.recommended["min_delay_ratio"]
+    filepath = calibration.to_json(os.path.join(output_folder, "dt_calibration.json"))
+    with open(filepath) as file:
+        assert sorted(json.load(file).keys()) == ["recommended", "reference", "tolerance", "trials"]
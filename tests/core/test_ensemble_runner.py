@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy
+
+from tvb_multiscale.core.ensemble.runner import EnsembleRunner, parameters_grid, configure_kernel
+
+
+class DummyConfig(object):
+
+    DEFAULT_NEST_KERNEL_CONFIG = {"grng_seed": 1, "rng_seeds": range(2, 3)}
+
+    def __init__(self, output_base=None):
+        self.output_base = output_base
+
+
+class DummySimulator(object):
+
+    def __init__(self, G, seed, kernel_config):
+        self.G = G
+        self.seed = seed
+        self.kernel_config = kernel_config
+
+    def run(self, simulation_length=10.0):
+        time = numpy.arange(0.0, simulation_length, 1.0)
+        data = self.G * numpy.random.RandomState(self.kernel_config["grng_seed"]).rand(time.size, 2, 3, 1)
+        return [(time, data), None]
+
+
+def dummy_builder(config, G=1.0, seed=0):
+    if G < 0.0:
+        raise ValueError("Negative G!")
+    return DummySimulator(G, seed, config.DEFAULT_NEST_KERNEL_CONFIG)
+
+
+def test_parameters_grid():
+    parameters = parameters_grid(G=[1.0, 2.0], seed=[0, 1, 2], label="test")
+    assert len(parameters) == 6
+    assert parameters[-1] == {"G": 2.0, "seed": 2, "label": "test"}
+
+
+def test_configure_kernel_seeds():
+    for local_num_threads in [1, 2, 4]:
+        seeds = []
+        for seed in range(5):
+            kernel_config = configure_kernel(DummyConfig(), local_num_threads, seed).DEFAULT_NEST_KERNEL_CONFIG
+            assert kernel_config["local_num_threads"] == local_num_threads
+            assert len(kernel_config["rng_seeds"]) == local_num_threads
+            seeds.append(set([kernel_config["grng_seed"]] + list(kernel_config["rng_seeds"])))
+        # Distinct seeds give disjoint sets of random streams' seeds:
+        for i_seed, seeds1 in enumerate(seeds):
+            for seeds2 in seeds[i_seed + 1:]:
+                assert len(seeds1 & seeds2) == 0
+    # The global seed of the default kernel configuration is kept, if no seed is given:
+    kernel_config = configure_kernel(DummyConfig(), 2).DEFAULT_NEST_KERNEL_CONFIG
+    assert kernel_config["grng_seed"] == 1
+    assert list(kernel_config["rng_seeds"]) == [2, 3]
+    # The default kernel configuration of the class is not modified:
+    assert DummyConfig.DEFAULT_NEST_KERNEL_CONFIG == {"grng_seed": 1, "rng_seeds": range(2, 3)}
+
+
+def test_ensemble_runner(tmpdir):
+    parameters = parameters_grid(G=[1.0, 2.0, -1.0], seed=[0, 1])
+    runner = EnsembleRunner(dummy_builder, parameters, simulation_length=5.0, local_num_threads=2, n_workers=2,
+                            output_folder=str(tmpdir), config_class=DummyConfig)
+    summaries = runner.run()
+    assert [summary["member_id"] for summary in summaries] == list(range(6))
+    assert os.path.isfile(runner.manifest_path)
+    for summary, member_parameters in zip(summaries, parameters):
+        if member_parameters["G"] < 0.0:
+            assert "Negative G!" in summary["error"]
+            continue
+        results = EnsembleRunner.read_member_results(summary["results"])
+        assert results[1] is None
+        assert results[0][1].shape == (5, 2, 3, 1)
+        # The global seed of the member's kernel, for 2 threads:
+        expected = member_parameters["G"] * \
+            numpy.random.RandomState(3 * member_parameters["seed"] + 1).rand(5, 2, 3, 1)
+        assert numpy.allclose(results[0][1], expected)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import numpy
+import pytest
+
+from tvb_multiscale.core.spiking_models.devices import EventBuffer
+
+
+def test_append_and_grow():
+    buffer = EventBuffer(["V_m"], capacity=4)
+    for i_chunk in range(10):
+        buffer.append({"times": i_chunk * numpy.ones((3, )), "senders": numpy.arange(3) + 1,
+                       "V_m": -70.0 * numpy.ones((3, ))})
+    assert buffer.size == 30
+    assert buffer.capacity == 32
+    assert buffer["senders"].dtype == numpy.dtype("i4")
+    assert numpy.all(buffer["times"] == numpy.repeat(numpy.arange(10), 3))
+    assert not buffer["times"].flags.writeable
+    with pytest.raises(ValueError):
+        buffer.append({"times": [1.0], "senders": [1]})
+    with pytest.raises(ValueError):
+        buffer.append({"times": [1.0], "senders": [1], "V_m": [-70.0], "g_ex": [0.0]})
+
+
+def test_read_cursors():
+    buffer = EventBuffer()
+    buffer.append({"times": [0.1, 0.2], "senders": [1, 2]})
+    assert numpy.all(buffer.read("a")["times"] == [0.1, 0.2])
+    buffer.append({"times": [0.3], "senders": [3]})
+    assert numpy.all(buffer.read("a")["senders"] == [3])
+    assert numpy.all(buffer.read("b", ["senders"])["senders"] == [1, 2, 3])
+    assert len(buffer.read("a")["times"]) == 0
+    buffer.clear()
+    assert buffer.size == 0 and buffer.cursor("a") == 0
+    buffer.append({"times": [0.4], "senders": ["0_1"]})
+    assert buffer["senders"].tolist() == ["0_1"]
+
+
+def test_clear_keeps_returned_views():
+    buffer = EventBuffer(["V_m"])
+    buffer.append({"times": [0.1, 0.2], "senders": [1, 2], "V_m": [-70.0, -65.0]})
+    events = buffer.read()
+    buffer.clear()
+    buffer.append({"times": [0.3], "senders": [3], "V_m": [-60.0]})
+    # The events returned before the clear are not overwritten by the ones appended after it:
+    assert numpy.all(events["times"] == [0.1, 0.2])
+    assert numpy.all(events["senders"] == [1, 2])
+    assert numpy.all(events["V_m"] == [-70.0, -65.0])
+    assert numpy.all(buffer["times"] == [0.3])
+    assert buffer["senders"].dtype == numpy.dtype("i4")
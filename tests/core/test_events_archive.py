@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy
+
+from tvb_multiscale.core.io.events_archive import EventsArchiveWriter, read_events_archive
+
+
+def test_append_and_read(tmpdir):
+    filepath = os.path.join(str(tmpdir), "events.h5")
+    archive = EventsArchiveWriter(filepath, chunk_size=4)
+    for i_chunk in range(3):
+        archive.append("E_cortex", {"times": i_chunk + numpy.arange(5) / 10.0, "senders": numpy.arange(5) + 1})
+    archive.append("I_cortex", {"times": numpy.array([0.5]), "senders": numpy.array([7]), "V_m": numpy.array([-70.0])})
+    archive.append("I_cortex", {"times": numpy.array([]), "senders": numpy.array([]), "V_m": numpy.array([])})
+    archive.close()
+    # Appending to an existing archive:
+    archive = EventsArchiveWriter(filepath)
+    archive.append("I_cortex", {"times": numpy.array([0.6]), "senders": numpy.array([8]), "V_m": numpy.array([-60.0])})
+    archive.close()
+    events = read_events_archive(filepath)
+    assert list(events.keys()) == ["E_cortex", "I_cortex"]
+    assert numpy.allclose(events["E_cortex"]["times"],
+                          numpy.concatenate([i_chunk + numpy.arange(5) / 10.0 for i_chunk in range(3)]))
+    assert numpy.all(events["E_cortex"]["senders"] == numpy.tile(numpy.arange(5) + 1, 3))
+    i_events = read_events_archive(filepath, "I_cortex", ["senders", "V_m"])
+    assert list(i_events.keys()) == ["senders", "V_m"]
+    assert numpy.all(i_events["senders"] == [7, 8])
+    assert numpy.allclose(i_events["V_m"], [-70.0, -60.0])
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+
+from tvb_multiscale.core.io.exchange_log import ExchangeLogWriter, ExchangeLogReader
+
+
+HEADER = {"dt": 0.1,
+          "synchronization_n_steps": 1,
+          "tvb_to_spikeNet_sizes": [2, 3],
+          "spikeNet_to_tvb_layout": [(1, [0, 1]), (0, [2])],
+          "spikeNet_to_tvb_params": {"R_e": [0, 1], "S_e": [2]},
+          "tvb_nodes_ids": [3],
+          "spiking_nodes_ids": [0, 1, 2],
+          "min_delay": 0.1}
+
+
+def write_exchange_log(filepath, n_steps, dtype="f8"):
+    writer = ExchangeLogWriter(filepath, HEADER, dtype)
+    tvb_to_spikeNet = []
+    spikeNet_to_tvb = []
+    for step in range(n_steps):
+        tvb_to_spikeNet.append([step + np.arange(2.0), -step - np.arange(3.0)])
+        spikeNet_to_tvb.append([10.0 * step + np.arange(2.0), [100.0 * step]])
+        for values in tvb_to_spikeNet[-1]:
+            writer.write_tvb_to_spikeNet(values)
+        for values in spikeNet_to_tvb[-1]:
+            writer.write_spikeNet_to_tvb(values)
+    writer.close()
+    return tvb_to_spikeNet, spikeNet_to_tvb
+
+
+def test_exchange_log_round_trip(tmpdir):
+    filepath = os.path.join(str(tmpdir), "exchange_log")
+    tvb_to_spikeNet, spikeNet_to_tvb = write_exchange_log(filepath, 5)
+    reader = ExchangeLogReader(filepath)
+    assert reader.header["dt"] == HEADER["dt"]
+    assert reader.header["dtype"] == np.dtype("f8").str
+    assert reader.tvb_to_spikeNet_sizes == [2, 3]
+    assert [sv_id for sv_id, nodes_ids in reader.spikeNet_to_tvb_layout] == [1, 0]
+    assert [nodes_ids.tolist() for sv_id, nodes_ids in reader.spikeNet_to_tvb_layout] == [[0, 1], [2]]
+    assert reader.number_of_steps == 5
+    assert reader.tvb_to_spikeNet.shape == (5, 5)
+    assert reader.spikeNet_to_tvb.shape == (5, 3)
+    for step in range(5):
+        for values, expected in zip(reader.tvb_to_spikeNet_values(step), tvb_to_spikeNet[step]):
+            assert np.all(values == expected)
+        for values, expected in zip(reader.spikeNet_to_tvb_values(step), spikeNet_to_tvb[step]):
+            assert np.all(values == expected)
+
+
+def test_exchange_log_dtype(tmpdir):
+    filepath = os.path.join(str(tmpdir), "exchange_log")
+    write_exchange_log(filepath, 3, dtype="f4")
+    assert os.path.getsize(filepath + ".tvb_to_spikeNet.bin") == 3 * 5 * 4
+    reader = ExchangeLogReader(filepath)
+    # Values are read back as float64:
+    assert reader.tvb_to_spikeNet.dtype == np.dtype("f8")
+    assert np.all(reader.spikeNet_to_tvb_values(2)[0] == [20.0, 21.0])
+
+
+def test_exchange_log_interrupted(tmpdir):
+    filepath = os.path.join(str(tmpdir), "exchange_log")
+    write_exchange_log(filepath, 4)
+    # An incomplete last step, as written by an interrupted co-simulation:
+    with open(filepath + ".tvb_to_spikeNet.bin", "ab") as file:
+        file.write(np.arange(3.0).tobytes())
+    reader = ExchangeLogReader(filepath)
+    assert reader.tvb_to_spikeNet.shape == (4, 5)
+    assert reader.spikeNet_to_tvb.shape == (4, 3)
+    assert reader.number_of_steps == 4
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import numpy
+
+from tvb_multiscale.core.utils.data_structures_utils import filter_events, group_events, grouped_events_to_dict
+
+
+def _events(sort=True):
+    rng = numpy.random.RandomState(0)
+    times = numpy.round(rng.uniform(0.0, 100.0, 1000), 1)
+    if sort:
+        times = numpy.sort(times)
+    return {"times": times, "senders": rng.randint(1, 100, 1000)}
+
+
+def _expected(events, inds):
+    return dict([(var, numpy.asarray(values)[inds]) for var, values in events.items()])
+
+
+def _assert_filtered(output, expected):
+    for var in expected.keys():
+        assert numpy.all(output[var] == expected[var])
+
+
+def test_filter_events_intervals():
+    for sort in [True, False]:
+        events = _events(sort)
+        times = events["times"]
+        _assert_filtered(filter_events(events, times=[10.0, 20.0]),
+                         _expected(events, (times >= 10.0) & (times <= 20.0)))
+        _assert_filtered(filter_events(events, times=[None, 20.0]), _expected(events, times <= 20.0))
+        _assert_filtered(filter_events(events, times=[90.0, None]), _expected(events, times >= 90.0))
+        _assert_filtered(filter_events(events, times=[10.0, 20.0], exclude_times=[15.0, None]),
+                         _expected(events, (times >= 10.0) & (times < 15.0)))
+
+
+def test_filter_events_sets():
+    events = _events(False)
+    times = events["times"]
+    selected = [1.0, 2.5, 50.1]
+    _assert_filtered(filter_events(events, variables=["senders"], times=selected),
+                     {"senders": events["senders"][numpy.isin(times, selected)]})
+    _assert_filtered(filter_events(events, exclude_times=selected), _expected(events, ~numpy.isin(times, selected)))
+    output = filter_events({"times": [], "senders": []}, times=[1.0, 2.0])
+    assert len(output["times"]) == 0 and len(output["senders"]) == 0
+
+
+def test_group_events():
+    events = _events(False)
+    groups, offsets, times = group_events(events, x="senders", y="times")
+    assert numpy.all(groups == numpy.unique(events["senders"]))
+    assert offsets[-1] == events["times"].size
+    times_by_sender = grouped_events_to_dict(groups, offsets, times)
+    for sender, sender_times in times_by_sender.items():
+        assert numpy.all(sender_times == numpy.sort(events["times"][events["senders"] == sender]))
+        assert sender_times.base is times
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.interfaces.base import TVBSpikeNetInterface
+
+from tests.core.test_interfaces_tolerance import SetRecorder
+
+
+def tvb_to_spikeNet_interface(model, nodes_ids, scale, **kwargs):
+    return SimpleNamespace(model=model, name=model, nodes_ids=nodes_ids, scale=scale, set=SetRecorder(), **kwargs)
+
+
+def spikeNet_to_tvb_interface(model, name, tvb_sv_id, nodes_ids, scale, values):
+    return SimpleNamespace(model=model, name=name, tvb_sv_id=tvb_sv_id, nodes_ids=nodes_ids, scale=scale,
+                           current_population_mean_values=np.array(values))
+
+
+def configured_interface():
+    interface = TVBSpikeNetInterface()
+    interface._available_input_devices = ["dc_generator"]
+    interface._current_input_devices = ["dc_generator"]
+    interface.tvb_to_spikeNet_interfaces = \
+        [tvb_to_spikeNet_interface("dc_generator", [3, 1], 2.0, tvb_sv_id=1),
+         tvb_to_spikeNet_interface("current", [0, 2], 0.5, tvb_coupling_id=0)]
+    interface.spikeNet_to_tvb_interfaces = \
+        [spikeNet_to_tvb_interface("multimeter", "S_e", 0, [1, 2], 3.0, [1.0, 2.0]),
+         spikeNet_to_tvb_interface("voltmeter", "V_m", 1, [0], 1.0, [-70.0])]
+    # Transformations set as weights are fused with the interfaces' scales, the ones set as functions are not:
+    interface.transforms_weights = {"tvb_to_current": np.arange(1.0, 5.0), "potential_to_tvb": 10.0 * np.ones((4, ))}
+    interface.transforms = {"spikes_var_to_tvb": lambda values, nodes_ids: values + np.array(nodes_ids)}
+    interface.transforms_kernels = {}
+    interface.configure(None)
+    return interface
+
+
+def test_compile_exchange_plan():
+    interface = configured_interface()
+    from_state, var_id, nodes_ids, scale, kernel, set_values, set_schedule = interface._tvb_to_spikeNet_plan[0]
+    assert from_state and var_id == 1
+    assert np.all(nodes_ids == [3, 1])
+    assert np.allclose(scale, [8.0, 4.0])
+    assert set_values is interface.tvb_to_spikeNet_interfaces[0].set
+    from_state, var_id, nodes_ids, scale = interface._tvb_to_spikeNet_plan[1][:4]
+    assert not from_state and var_id == 0
+    assert np.allclose(scale, [0.5, 1.5])
+    # The multimeter's transformation is a function, the voltmeter's one is fused with its scale:
+    multimeter_plan, voltmeter_plan = interface._spikeNet_to_tvb_plan
+    assert multimeter_plan[2] == 0 and np.allclose(multimeter_plan[4], 3.0) and multimeter_plan[5] is not None
+    assert voltmeter_plan[2] == 1 and np.allclose(voltmeter_plan[4], [10.0]) and voltmeter_plan[5] is None
+    assert interface.spikeNet_to_tvb_params == {"S_e": [1, 2], "V_m": [0]}
+
+
+def test_exchange():
+    interface = configured_interface()
+    state = np.arange(8.0).reshape((2, 4, 1))
+    coupling = -np.arange(8.0).reshape((2, 4, 1))
+    interface.tvb_state_to_spikeNet(state, coupling, None)
+    dc_setter, current_setter = [tvb_to_spikeNet.set for tvb_to_spikeNet in interface.tvb_to_spikeNet_interfaces]
+    assert np.allclose(dc_setter.calls[0][0], [8.0 * 7.0, 4.0 * 5.0])
+    assert np.allclose(current_setter.calls[0][0], [0.5 * 0.0, 1.5 * -2.0])
+    state = interface.spikeNet_state_to_tvb_state(state)
+    assert np.allclose(state[0, :, 0], [0.0, 3.0 * (1.0 + 1.0), 3.0 * (2.0 + 2.0), 3.0])
+    assert np.allclose(state[1, :, 0], [-700.0, 5.0, 6.0, 7.0])
+
+
+def test_unsupported_interface_model():
+    interface = configured_interface()
+    interface.spikeNet_to_tvb_interfaces.append(spikeNet_to_tvb_interface("unknown", "R", 0, [0], 1.0, [0.0]))
+    with pytest.raises(ValueError, match="not supported"):
+        interface.configure(None)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.interfaces.base import TVBSpikeNetInterface
+
+
+class SetRecorder(object):
+    """A TVB -> Spiking Network interface setter, recording the values (and masks) it is called with."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, values, mask=None):
+        self.calls.append((np.array(values), None if mask is None else np.array(mask)))
+
+
+def configured_interface(tolerance, n_nodes=4):
+    setter = SetRecorder()
+    interface = TVBSpikeNetInterface()
+    interface._tvb_to_spikeNet_plan = [(True, 0, np.arange(n_nodes), np.ones((n_nodes, )), None, setter, None)]
+    interface._spikeNet_to_tvb_plan = []
+    interface._tvb_to_spikeNet_tolerances = [tolerance]
+    interface.configure_synchronization()
+    return interface, setter
+
+
+def set_values(interface, setter, values):
+    interface._set_spikeNet_values(0, np.array(values, dtype="f8"), setter, None)
+
+
+def test_first_values_are_all_set():
+    interface, setter = configured_interface(0.5)
+    set_values(interface, setter, [1.0, 2.0, 3.0, 4.0])
+    assert len(setter.calls) == 1
+    values, mask = setter.calls[0]
+    assert np.all(values == [1.0, 2.0, 3.0, 4.0])
+    assert mask is None
+
+
+def test_unchanged_values_are_skipped():
+    interface, setter = configured_interface(0.5)
+    set_values(interface, setter, [1.0, 2.0, 3.0, 4.0])
+    # Changes within the tolerance are not set:
+    set_values(interface, setter, [1.0, 2.5, 2.6, 4.0])
+    assert len(setter.calls) == 1
+    # ...and they don't accumulate, because the last values set are kept for comparison:
+    set_values(interface, setter, [1.0, 2.4, 3.4, 4.0])
+    assert len(setter.calls) == 1
+    assert np.all(interface._tvb_to_spikeNet_last_values[0] == [1.0, 2.0, 3.0, 4.0])
+
+
+def test_partial_mask():
+    interface, setter = configured_interface(0.5)
+    set_values(interface, setter, [1.0, 2.0, 3.0, 4.0])
+    set_values(interface, setter, [1.6, 2.0, 3.4, 3.0])
+    assert len(setter.calls) == 2
+    values, mask = setter.calls[1]
+    assert np.all(mask == [True, False, False, True])
+    assert np.all(values == [1.6, 2.0, 3.4, 3.0])
+    assert np.all(interface._tvb_to_spikeNet_last_values[0] == [1.6, 2.0, 3.0, 3.0])
+    # The change of the third node is compared to the last value set, not to the last value received:
+    set_values(interface, setter, [1.6, 2.0, 3.6, 3.0])
+    values, mask = setter.calls[2]
+    assert np.all(mask == [False, False, True, False])
+    # All changed values are set without a mask:
+    set_values(interface, setter, [0.0, 0.0, 0.0, 0.0])
+    values, mask = setter.calls[3]
+    assert mask is None
+
+
+def test_zero_tolerance():
+    interface, setter = configured_interface(0.0)
+    set_values(interface, setter, [1.0, 2.0, 3.0, 4.0])
+    # Only exactly equal values are skipped:
+    set_values(interface, setter, [1.0, 2.0, 3.0, 4.0])
+    assert len(setter.calls) == 1
+    set_values(interface, setter, [1.0, 2.0 + 1e-12, 3.0, 4.0])
+    values, mask = setter.calls[1]
+    assert np.all(mask == [False, True, False, False])
+
+
+def test_no_tolerance():
+    interface, setter = configured_interface(None)
+    set_values(interface, setter, [1.0, 2.0, 3.0, 4.0])
+    set_values(interface, setter, [1.0, 2.0, 3.0, 4.0])
+    assert len(setter.calls) == 2
+    assert all(mask is None for values, mask in setter.calls)
+
+
+def test_assert_tolerance():
+    interface = TVBSpikeNetInterface()
+    assert interface._assert_tolerance(SimpleNamespace(tolerance=None)) is None
+    assert interface._assert_tolerance(SimpleNamespace(tolerance=0.1, _persistent_values=True)) == 0.1
+    # Values that do not hold until they are set again, e.g., of dc generators, cannot be skipped:
+    with pytest.raises(ValueError):
+        interface._assert_tolerance(SimpleNamespace(tolerance=0.1, _persistent_values=False,
+                                                    name="S_e", model="dc_generator"))
+    with pytest.raises(ValueError):
+        interface._assert_tolerance(SimpleNamespace(tolerance=-0.1, _persistent_values=True,
+                                                    name="S_e", model="inhomogeneous_poisson_generator"))
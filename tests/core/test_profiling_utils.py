@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+
+import numpy as np
+
+from tvb_multiscale.core.utils.profiling_utils import CosimulationProfiler
+
+
+def profile_steps(profiler, durations):
+    for step_durations in durations:
+        profiler.start_step()
+        for phase, duration in zip(profiler.phases, step_durations):
+            profiler.add(phase, duration)
+
+
+def test_report_totals():
+    profiler = CosimulationProfiler(phases=["transform", "run", "write"])
+    profile_steps(profiler, [[1.0, 2.0, 0.5], [3.0, 4.0, 0.5], [2.0, 0.0, 0.5]])
+    # The last step is stored by report():
+    report = profiler.report(bins=2)
+    assert report["number_of_steps"] == profiler.number_of_steps == 3
+    assert [report[phase]["total"] for phase in profiler.phases] == [6.0, 6.0, 1.5]
+    assert report["total"] == 13.5
+    assert report["transform"]["mean"] == 2.0 and report["run"]["max"] == 4.0 and report["write"]["std"] == 0.0
+    assert report["run"]["histogram"] == {"counts": [1, 2], "edges": [0.0, 2.0, 4.0]}
+    # Further steps are added to the totals:
+    profile_steps(profiler, [[1.0, 1.0, 1.0]])
+    assert profiler.report()["total"] == 16.5
+    profiler.reset()
+    report = profiler.report()
+    assert report["number_of_steps"] == 0 and report["total"] == 0.0
+    assert list(report["run"].keys()) == ["total"]
+
+
+def test_add_since_mark():
+    profiler = CosimulationProfiler()
+    profiler.start_step()
+    # Without a mark, nothing is added:
+    profiler.add_since_mark("tvb_integration")
+    profiler.mark()
+    profiler.add_since_mark("tvb_integration")
+    # ...and the mark is consumed:
+    profiler.add_since_mark("tvb_other")
+    timings = profiler.report()
+    assert timings["tvb_integration"]["total"] > 0.0
+    assert timings["tvb_other"]["total"] == 0.0
+    assert np.isclose(timings["total"], timings["tvb_integration"]["total"])
+
+
+def test_to_json(tmpdir):
+    profiler = CosimulationProfiler(phases=["transform", "run"])
+    profile_steps(profiler, [[1.0, 2.0], [3.0, 4.0]])
+    filepath = profiler.to_json(os.path.join(str(tmpdir), "profile.json"), bins=4)
+    with open(filepath) as file:
+        report = json.load(file)
+    assert list(report.keys()) == ["transform", "run", "number_of_steps", "total"]
+    assert report["number_of_steps"] == 2 and report["total"] == 10.0
+    assert report["run"]["total"] == 6.0 and len(report["run"]["histogram"]["counts"]) == 4
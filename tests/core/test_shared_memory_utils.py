@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.utils.shared_memory_utils import SharedMemoryRingBuffer
+
+
+def test_ring_buffer_wraparound():
+    ring_buffer = SharedMemoryRingBuffer(3, n_slots=2)
+    try:
+        for i_slot in range(7):
+            ring_buffer.write(np.arange(3) + 10.0 * i_slot)
+            assert ring_buffer.number_of_pending_slots == 1
+            assert np.all(ring_buffer.read() == np.arange(3) + 10.0 * i_slot)
+            assert ring_buffer.number_of_pending_slots == 0
+        assert ring_buffer.number_of_writes == ring_buffer.number_of_reads == 7
+        # Interleaved writes and reads keep the order of the slots across the end of the buffer:
+        ring_buffer.write(np.full((3, ), 1.0))
+        ring_buffer.write(np.full((3, ), 2.0))
+        assert np.all(ring_buffer.read() == 1.0)
+        ring_buffer.write(np.full((3, ), 3.0))
+        assert np.all(ring_buffer.read() == 2.0)
+        assert np.all(ring_buffer.read() == 3.0)
+    finally:
+        ring_buffer.close()
+
+
+def test_ring_buffer_full_and_empty():
+    ring_buffer = SharedMemoryRingBuffer(2, n_slots=2)
+    try:
+        with pytest.raises(ValueError):
+            ring_buffer.read()
+        ring_buffer.write([1.0, 2.0])
+        ring_buffer.write([3.0, 4.0])
+        with pytest.raises(ValueError):
+            ring_buffer.write([5.0, 6.0])
+        # A failed write leaves the unread slots intact:
+        assert ring_buffer.number_of_pending_slots == 2
+        assert np.all(ring_buffer.read() == [1.0, 2.0])
+        assert np.all(ring_buffer.read() == [3.0, 4.0])
+        with pytest.raises(ValueError):
+            ring_buffer.read()
+    finally:
+        ring_buffer.close()
+
+
+def test_ring_buffer_attach():
+    ring_buffer = SharedMemoryRingBuffer(4, n_slots=3)
+    attached = SharedMemoryRingBuffer(4, n_slots=3, name=ring_buffer.name)
+    try:
+        ring_buffer.write(np.arange(4.0))
+        assert attached.number_of_pending_slots == 1
+        values = attached.read()
+        assert np.all(values == np.arange(4.0))
+        assert ring_buffer.number_of_pending_slots == 0
+        # Values read are copies, not views of the shared memory:
+        ring_buffer.write(np.zeros((4, )))
+        assert np.all(values == np.arange(4.0))
+    finally:
+        attached.close()
+        ring_buffer.close()
+
+
+def test_ring_buffer_empty_slots():
+    # A ring buffer of zero size slots only counts writes and reads:
+    ring_buffer = SharedMemoryRingBuffer(0, n_slots=2)
+    try:
+        ring_buffer.write([])
+        assert ring_buffer.read().size == 0
+    finally:
+        ring_buffer.close()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.utils.transforms_utils import \
+    NUMBA_AVAILABLE, gather_scale, gather_scale_clip, transform_kernel
+
+
+VALUES = np.array([1.0, -2.0, np.nan, 0.5, -0.0, 3.0])
+NODES_IDS = np.array([5, 0, 2, 1, 3], dtype="i")
+SCALE = np.array([1.0, 2.0, 3.0, 4.0, -1.0])
+
+
+def test_numpy_kernels():
+    assert np.allclose(gather_scale(VALUES, NODES_IDS, SCALE), [3.0, 2.0, np.nan, -8.0, -0.5], equal_nan=True)
+    assert np.allclose(gather_scale_clip(VALUES, NODES_IDS, SCALE), [3.0, 2.0, np.nan, 0.0, 0.0], equal_nan=True)
+    # One scale per node for all TVB modes:
+    modes_values = np.stack([VALUES, 2 * VALUES], axis=1)
+    output = gather_scale_clip(modes_values, NODES_IDS, SCALE)
+    assert output.shape == (5, 2)
+    assert np.allclose(output[:, 1], 2 * output[:, 0], equal_nan=True)
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba is not installed")
+@pytest.mark.parametrize("clip", [False, True])
+def test_numba_kernels(clip):
+    numba_kernel = transform_kernel(clip=clip, use_numba=True)
+    numpy_kernel = transform_kernel(clip=clip, use_numba=False)
+    # A single TVB mode, computed by the jitted kernels, and multiple TVB modes:
+    for values in [VALUES, np.stack([VALUES, -VALUES, 2 * VALUES], axis=1)]:
+        output = numba_kernel(values, NODES_IDS, SCALE)
+        expected = numpy_kernel(values, NODES_IDS, SCALE)
+        assert output.shape == expected.shape
+        assert np.array_equal(output, expected, equal_nan=True)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import numpy as np
+
+from tvb_multiscale.tvb_nest.config import CONFIGURED
+from tvb_multiscale.tvb_nest.nest_models.builders.base import NESTModelBuilder
+
+
+class MockNodeCollection(list):
+
+    def tolist(self):
+        return list(self)
+
+
+class MockNEST(object):
+
+    """A mock NEST instance, recording the arguments of Connect calls and the synapses they create."""
+
+    def __init__(self):
+        self.calls = []
+        self.synapses = []
+
+    def Connect(self, pre, post, conn_spec, syn_spec):
+        self.calls.append((pre, post, dict(conn_spec), dict(syn_spec)))
+        pre = np.array(list(pre))
+        post = np.array(list(post))
+        if conn_spec["rule"] == "all_to_all":
+            src_is_trg = set(pre) == set(post)
+            pre, post = np.repeat(pre, post.size), np.tile(post, pre.size)
+        elif conn_spec["rule"] == "one_to_one":
+            src_is_trg = np.all(pre == post)
+        else:
+            # Probabilistic rules are not expanded:
+            return
+        if src_is_trg and not conn_spec.get("allow_autapses", True):
+            pre, post = pre[pre != post], post[pre != post]
+        for i_syn, (source, target) in enumerate(zip(pre, post)):
+            values = dict([(key, value[i_syn] if np.ndim(value) else value)
+                           for key, value in syn_spec.items() if key != "synapse_model"])
+            self.synapses.append((int(source), int(target), syn_spec["synapse_model"],
+                                  values["weight"], values["delay"], values["receptor_type"]))
+
+
+def mock_population(global_ids):
+    neurons = MockNodeCollection(global_ids)
+    return SimpleNamespace(_population=neurons, population=neurons, number_of_neurons=len(global_ids))
+
+
+def mock_builder():
+    builder = NESTModelBuilder.__new__(NESTModelBuilder)
+    builder.config = CONFIGURED
+    builder.logger = SimpleNamespace(info=lambda msg: None)
+    builder.spiking_dt = 0.1
+    builder.nest_instance = MockNEST()
+    return builder
+
+
+def connections():
+    E = mock_population(list(range(1, 9)))
+    I = mock_population(list(range(9, 13)))
+    E2 = mock_population(list(range(13, 21)))
+    syn_spec = {"synapse_model": "static_synapse", "weight": 1.0, "delay": 1.0, "receptor_type": 0}
+    return [(E, None, E, None, {"rule": "all_to_all", "allow_autapses": False},
+             dict(syn_spec, weight=1.5, receptor_type=[0, 1])),
+            (E, None, I, None, {"rule": "all_to_all"}, dict(syn_spec, weight=2.0, delay=2.0)),
+            (E, None, E2, None, {"rule": "one_to_one"}, dict(syn_spec, weight=3.0)),
+            (E, None, E, None, {"rule": "one_to_one", "allow_autapses": False}, dict(syn_spec, weight=4.0)),
+            (I, None, I, None, {"rule": "one_to_one", "allow_autapses": True}, dict(syn_spec, weight=5.0))]
+
+
+def test_bulk_connections():
+    builder = mock_builder()
+    for connection in connections():
+        builder.connect_two_populations(*connection)
+    bulk_builder = mock_builder()
+    bulk_builder.connect_populations(connections())
+    # All connections are merged into a single call, with a one_to_one rule and array valued synapse parameters:
+    assert len(bulk_builder.nest_instance.calls) == 1
+    pre, post, conn_spec, syn_spec = bulk_builder.nest_instance.calls[0]
+    assert conn_spec == {"rule": "one_to_one"}
+    assert syn_spec["synapse_model"] == "static_synapse"
+    for key in ["weight", "delay", "receptor_type"]:
+        assert syn_spec[key].shape == pre.shape == post.shape
+    # There are no autapses, other than the ones allowed:
+    assert np.all(syn_spec["weight"][pre == post] == 5.0)
+    # ...and the synapses are the same as the ones of one Connect call per connection:
+    assert sorted(bulk_builder.nest_instance.synapses) == sorted(builder.nest_instance.synapses)
+
+
+def test_bulk_connections_fallback():
+    builder = mock_builder()
+    E = mock_population(list(range(1, 9)))
+    I = mock_population(list(range(9, 13)))
+    distribution = {"distribution": "uniform", "low": 0.0, "high": 1.0}
+    builder.connect_populations(
+        [(E, None, I, None, {"rule": "all_to_all"},
+          {"synapse_model": "static_synapse", "weight": distribution, "delay": 1.0, "receptor_type": 0}),
+         (E, None, I, None, {"rule": "fixed_indegree", "indegree": 2},
+          {"synapse_model": "static_synapse", "weight": 1.0, "delay": 1.0, "receptor_type": 0})])
+    # Distributions of weights and probabilistic rules are left to NEST, one Connect call each:
+    calls = builder.nest_instance.calls
+    assert len(calls) == 2
+    assert calls[0][2]["rule"] == "all_to_all" and calls[0][3]["weight"] == distribution
+    assert calls[1][2]["rule"] == "fixed_indegree" and calls[1][2]["indegree"] == 2
+
+
+class MockParameter(object):
+    """A scalar, non numerical synapse parameter, as a nest.Parameter."""
+    pass
+
+
+def test_bulk_connections_non_numerical_parameters():
+    builder = mock_builder()
+    E = mock_population(list(range(1, 9)))
+    I = mock_population(list(range(9, 13)))
+    parameter = MockParameter()
+    builder.connect_populations(
+        [(E, None, I, None, {"rule": "all_to_all"},
+          {"synapse_model": "static_synapse", "weight": parameter, "delay": 1.0, "receptor_type": 0}),
+         (E, None, I, None, {"rule": "all_to_all"},
+          {"synapse_model": "static_synapse", "weight": np.float64(2.0), "delay": 1, "receptor_type": 0})])
+    # The nest.Parameter weights are left to NEST, whereas numpy and integer numbers are merged:
+    calls = builder.nest_instance.calls
+    assert len(calls) == 2
+    assert calls[0][2]["rule"] == "all_to_all" and calls[0][3]["weight"] is parameter
+    assert calls[1][2] == {"rule": "one_to_one"}
+    assert np.all(calls[1][3]["weight"] == 2.0) and len(calls[1][0]) == 8 * 4
+
+
+def test_bulk_connections_all_to_all_limit():
+    builder = mock_builder()
+    builder.max_bulk_all_to_all_synapses = 32
+    E = mock_population(list(range(1, 9)))
+    I = mock_population(list(range(9, 13)))
+    I2 = mock_population(list(range(13, 18)))
+    syn_spec = {"synapse_model": "static_synapse", "weight": 1.0, "delay": 1.0, "receptor_type": 0}
+    builder.connect_populations([(E, None, I, None, {"rule": "all_to_all"}, dict(syn_spec)),
+                                 (E, None, I2, None, {"rule": "all_to_all"}, dict(syn_spec))])
+    # The 8 x 4 synapses are expanded, whereas the 8 x 5 ones are created by a native all_to_all Connect call:
+    calls = builder.nest_instance.calls
+    assert len(calls) == 2
+    assert calls[0][2]["rule"] == "all_to_all" and list(calls[0][1]) == list(range(13, 18))
+    assert calls[1][2] == {"rule": "one_to_one"} and len(calls[1][0]) == 8 * 4
+    assert len(builder.nest_instance.synapses) == 8 * 4 + 8 * 5
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.tvb_nest.nest_models.devices import NESTASCIIFileReader
+
+
+HEADER = "# NEST version: 3.0\n# RecordingBackendASCII\nsender\ttime_ms\n"
+
+
+def write(filepath, text, mode="a"):
+    with open(filepath, mode) as file:
+        file.write(text)
+
+
+def assert_events(events, senders, times):
+    assert sorted(events.keys()) == ["senders", "times"]
+    assert np.all(events["senders"] == senders)
+    assert np.all(events["times"] == times)
+
+
+def test_read_appended_lines(tmpdir):
+    filepath = os.path.join(str(tmpdir), "spike_recorder-1-0.dat")
+    write(filepath, HEADER + "1\t0.1\n2\t0.2\n", "w")
+    reader = NESTASCIIFileReader(filepath)
+    assert_events(reader.read(), [1, 2], [0.1, 0.2])
+    assert reader.columns == ["senders", "times"]
+    # Only the lines appended since the previous read are parsed:
+    write(filepath, "3\t0.3\n")
+    assert_events(reader.read(), [3], [0.3])
+    assert_events(reader.read(), [], [])
+    assert reader.offset == os.path.getsize(filepath)
+
+
+def test_incomplete_header(tmpdir):
+    filepath = os.path.join(str(tmpdir), "spike_recorder-1-0.dat")
+    write(filepath, HEADER[:30], "w")
+    reader = NESTASCIIFileReader(filepath)
+    assert reader.read() == {}
+    assert reader._data_offset is None
+    # The header is read again, once it is complete:
+    write(filepath, HEADER[30:] + "1\t0.1\n")
+    assert_events(reader.read(), [1], [0.1])
+
+
+def test_partial_trailing_line(tmpdir):
+    filepath = os.path.join(str(tmpdir), "spike_recorder-1-0.dat")
+    write(filepath, HEADER + "1\t0.1\n2\t0.", "w")
+    reader = NESTASCIIFileReader(filepath)
+    assert_events(reader.read(), [1], [0.1])
+    # The incomplete last line is left to be read when completed:
+    assert_events(reader.read(), [], [])
+    write(filepath, "25\n3\t0.3\n")
+    assert_events(reader.read(), [2, 3], [0.25, 0.3])
+
+
+def test_truncation(tmpdir):
+    filepath = os.path.join(str(tmpdir), "spike_recorder-1-0.dat")
+    write(filepath, HEADER + "1\t0.1\n2\t0.2\n", "w")
+    reader = NESTASCIIFileReader(filepath)
+    reader.read()
+    # The file is truncated after its header, as when the device is reset, and new lines are written:
+    write(filepath, HEADER + "3\t0.3\n", "w")
+    assert_events(reader.read(), [3], [0.3])
+    write(filepath, "4\t0.4\n")
+    assert_events(reader.read(), [4], [0.4])
+
+
+def test_malformed_lines(tmpdir):
+    filepath = os.path.join(str(tmpdir), "spike_recorder-1-0.dat")
+    write(filepath, HEADER + "1\t0.1\n2\tnan?\n3\t0.3\n", "w")
+    reader = NESTASCIIFileReader(filepath)
+    with pytest.raises(ValueError, match="Failed to parse 6 values"):
+        reader.read()
+    # The malformed lines are not skipped:
+    assert reader.offset == reader._data_offset
+    write(filepath, HEADER + "1\t0.1\n2\t0.2\n3\t\n", "w")
+    with pytest.raises(ValueError, match="Failed to parse 6 values"):
+        reader.read()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import numpy as np
+
+from tvb_multiscale.core.io.checkpoint import CosimulationCheckpointer
+from tvb_multiscale.tvb_nest.nest_models import devices
+from tvb_multiscale.tvb_nest.nest_models.devices import NESTSpikeRecorder
+
+from tests.tvb_nest.test_nest_ascii_file_reader import HEADER, write
+
+
+class MockRecorderNode(object):
+    """A NEST spike recorder node recording to an ascii file, counting its events as NEST does."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.n_events = 0
+        write(filepath, HEADER, "w")
+
+    def record(self, senders, times):
+        write(self.filepath, "".join("%d\t%g\n" % (sender, time) for sender, time in zip(senders, times)))
+        self.n_events += len(times)
+
+    def get(self, attr):
+        return getattr(self, attr)
+
+    def set(self, values):
+        for attr, value in values.items():
+            setattr(self, attr, value)
+
+
+def truncate_ascii_file_after_header(filepath, header_chars="#"):
+    # Keep the comment lines and the line of the columns' names:
+    with open(filepath, "r+") as file:
+        line = file.readline()
+        while line.startswith(header_chars):
+            line = file.readline()
+        file.truncate(file.tell())
+
+
+def test_ascii_reset_and_checkpoint_flush(tmpdir, monkeypatch):
+    monkeypatch.setattr(devices, "truncate_ascii_file_after_header", truncate_ascii_file_after_header)
+    data_path = str(tmpdir)
+    node = MockRecorderNode(os.path.join(data_path, "E_spikes_region_0-1-0.dat"))
+    nest = SimpleNamespace(GetKernelStatus=lambda key: data_path)
+    recorder = NESTSpikeRecorder(node, nest, label="E_spikes_region_0", record_to="ascii")
+    spiking_network = SimpleNamespace(output_devices=OrderedDict([("E", OrderedDict([("region_0", recorder)]))]))
+    checkpointer = CosimulationCheckpointer(None, SimpleNamespace(spiking_network=spiking_network),
+                                            folder=os.path.join(data_path, "checkpoints"))
+    node.record([1, 2, 3], [0.1, 0.2, 0.3])
+    events = checkpointer._flush_events()[("E", "region_0")]
+    assert np.all(events["senders"] == [1, 2, 3])
+    node.record([4, 5], [0.4, 0.5])
+    recorder.reset()
+    # The count of events restarts from 0, as the events of the files:
+    assert recorder.number_of_events == 0
+    assert recorder.number_of_resets == 1
+    assert len(recorder.events["times"]) == 0
+    node.record([6, 7], [0.6, 0.7])
+    assert recorder.number_of_events == 2
+    assert np.all(recorder.events["senders"] == [6, 7])
+    # The events recorded after the reset are flushed:
+    events = checkpointer._flush_events()[("E", "region_0")]
+    assert np.all(events["senders"] == [6, 7])
+    assert np.allclose(events["times"], [0.6, 0.7])
+    assert checkpointer._flush_events() == OrderedDict()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import sys
+from types import ModuleType
+
+import pytest
+
+from tvb_multiscale.tvb_nest.nest_models.builders import nest_factory
+from tvb_multiscale.tvb_nest.nest_models.builders.nest_factory import NESTBootstrap
+
+
+def fake_nest(modules_survive_reset=False):
+    """A fake nest module, recording the calls to it."""
+    nest = ModuleType("nest")
+    nest.calls = []
+    nest.loaded_modules = set()
+
+    def ResetKernel():
+        nest.calls.append(("ResetKernel", ))
+        if not modules_survive_reset:
+            nest.loaded_modules.clear()
+
+    def Install(module):
+        if module in nest.loaded_modules:
+            raise Exception("DynamicModuleManagementError in Install: Module '%s' is loaded already." % module)
+        if module == "missingmodule":
+            raise Exception("DynamicModuleManagementError in Install: Module '%s' could not be opened." % module)
+        nest.calls.append(("Install", module))
+        nest.loaded_modules.add(module)
+
+    nest.ResetKernel = ResetKernel
+    nest.Install = Install
+    nest.set_verbosity = lambda verbosity: nest.calls.append(("set_verbosity", verbosity))
+    nest.SetKernelStatus = lambda config: nest.calls.append(("SetKernelStatus", dict(config)))
+    return nest
+
+
+@pytest.fixture
+def bootstrap(monkeypatch):
+    monkeypatch.setitem(sys.modules, "nest", fake_nest())
+    monkeypatch.setattr(nest_factory, "_set_nest_environment", lambda config, logger: None)
+    return NESTBootstrap()
+
+
+def test_import_once(bootstrap):
+    assert not bootstrap.loaded
+    nest = bootstrap.load()
+    assert nest is sys.modules["nest"]
+    assert bootstrap.manages(nest)
+    assert bootstrap.load() is nest
+    assert len(bootstrap.timings["environment"]) == len(bootstrap.timings["import"]) == 1
+    assert not bootstrap.manages(fake_nest())
+
+
+def test_reset_reinstalls_and_restores(bootstrap):
+    nest = bootstrap.load()
+    bootstrap.install("mymodule")
+    bootstrap.install("mymodule")
+    assert nest.calls == [("Install", "mymodule")]
+    bootstrap.configure_kernel({"resolution": 0.05, "local_num_threads": 4}, verbosity=40)
+    nest.calls = []
+    # An explicit reset re-applies the cached modules and kernel configuration:
+    bootstrap.reset()
+    assert nest.calls == [("ResetKernel", ), ("Install", "mymodule"), ("set_verbosity", 40),
+                          ("SetKernelStatus", {"resolution": 0.05, "local_num_threads": 4})]
+    assert len(bootstrap.timings["reset"]) == 1
+    assert len(bootstrap.timings["install"]) == 2
+    assert len(bootstrap.timings["kernel"]) == 2
+
+
+def test_clean_reset(bootstrap):
+    nest = bootstrap.load()
+    bootstrap.install("mymodule")
+    bootstrap.configure_kernel({"resolution": 0.05, "local_num_threads": 4}, verbosity=40)
+    nest.calls = []
+    # A builder's reset keeps the modules, but none of the previous kernel configuration...
+    bootstrap.reset(restore_kernel_config=False)
+    assert nest.calls == [("ResetKernel", ), ("Install", "mymodule")]
+    # ...which is set anew right after:
+    bootstrap.configure_kernel({"resolution": 0.1}, verbosity=40)
+    nest.calls = []
+    bootstrap.reset()
+    assert nest.calls[-1] == ("SetKernelStatus", {"resolution": 0.1})
+
+
+def test_reinstall_errors(monkeypatch, bootstrap):
+    monkeypatch.setitem(sys.modules, "nest", fake_nest(modules_survive_reset=True))
+    nest = bootstrap.load()
+    bootstrap.install("mymodule")
+    # Modules still loaded after the reset are not an error...
+    bootstrap.reset()
+    assert nest.loaded_modules == {"mymodule"}
+    # ...but any other installation failure is:
+    bootstrap.installed_modules.append("missingmodule")
+    with pytest.raises(Exception, match="could not be opened"):
+        bootstrap.reset()
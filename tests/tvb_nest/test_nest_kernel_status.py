@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from tvb_multiscale.tvb_nest.nest_models.network import NESTKernelStatus
+
+
+class MockNEST(object):
+    """A NEST kernel, counting the calls of GetKernelStatus, and simulating in steps of resolution."""
+
+    def __init__(self, resolution=0.1, min_delay=1.0, time=0.0):
+        self.status = {"resolution": resolution, "min_delay": min_delay, "time": time}
+        self.calls = 0
+
+    def GetKernelStatus(self, keys):
+        self.calls += 1
+        if isinstance(keys, str):
+            return self.status[keys]
+        return tuple(self.status[key] for key in keys)
+
+    def Run(self, simulation_length):
+        steps = int(np.round(simulation_length / self.status["resolution"]))
+        self.status["time"] += steps * self.status["resolution"]
+
+
+def test_values_are_read_from_nest_before_update():
+    nest = MockNEST()
+    kernel_status = NESTKernelStatus(nest)
+    assert kernel_status.resolution == 0.1
+    assert kernel_status.min_delay == 1.0
+    # min_delay can still change by new connections:
+    nest.status["min_delay"] = 2.0
+    assert kernel_status.min_delay == 2.0
+    nest.Run(1.0)
+    kernel_status.advance(1.0)
+    assert kernel_status.time == nest.status["time"]
+    assert nest.calls == 4
+
+
+def test_update_and_advance():
+    nest = MockNEST(time=5.0)
+    kernel_status = NESTKernelStatus(nest)
+    kernel_status.update()
+    assert nest.calls == 1
+    assert kernel_status.resolution == 0.1
+    assert kernel_status.min_delay == 1.0
+    assert kernel_status.time == 5.0
+    # The time is advanced in integer steps, without accumulating floating point errors:
+    for _ in range(1000):
+        nest.Run(0.1)
+        kernel_status.advance(0.1)
+    assert nest.calls == 1
+    assert kernel_status._steps == 1050
+    assert np.isclose(kernel_status.time, 105.0)
+    assert kernel_status.time == 1050 * 0.1
+    # Changes of the kernel are not seen until the next update:
+    nest.status["min_delay"] = 2.0
+    assert kernel_status.min_delay == 1.0
+    kernel_status.update()
+    assert kernel_status.min_delay == 2.0
+    assert kernel_status._steps == 1050
+
+
+def test_clear():
+    nest = MockNEST()
+    kernel_status = NESTKernelStatus(nest)
+    kernel_status.update()
+    kernel_status.advance(10.0)
+    kernel_status.clear()
+    assert kernel_status._resolution is None
+    assert kernel_status._min_delay is None
+    assert kernel_status._steps == 0
+    # After clear, values are read from NEST again, and the time is not advanced locally:
+    nest.status["resolution"] = 0.05
+    nest.Run(1.0)
+    kernel_status.advance(1.0)
+    calls = nest.calls
+    assert kernel_status.resolution == 0.05
+    assert kernel_status.time == nest.status["time"]
+    assert nest.calls == calls + 2
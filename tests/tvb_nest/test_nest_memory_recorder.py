@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import numpy as np
+from pandas import Series
+
+from tvb_multiscale.tvb_nest.nest_models.devices import NESTSpikeRecorder
+from tvb_multiscale.tvb_nest.interfaces.nest_to_tvb_interface import NESTtoTVBinterface
+
+from tests.tvb_nest.test_nest_to_tvb_interface import MockNEST
+
+
+class MockMemoryRecorderNode(object):
+    """A NEST spike recorder node recording to memory, counting the events fetched from it."""
+
+    def __init__(self, global_id=1):
+        self.global_id = global_id
+        self.senders = []
+        self.times = []
+        self.fetched = 0
+
+    def record(self, senders, times):
+        self.senders += list(senders)
+        self.times += list(times)
+
+    @property
+    def n_events(self):
+        return len(self.times)
+
+    @property
+    def events(self):
+        self.fetched += self.n_events
+        return {"senders": np.array(self.senders), "times": np.array(self.times)}
+
+    def get(self, attr):
+        return getattr(self, attr)
+
+    def set(self, values):
+        # Setting n_events to 0 deletes the events in memory:
+        if values.get("n_events", None) == 0:
+            self.senders = []
+            self.times = []
+
+
+def test_memory_recorder_new_events():
+    node = MockMemoryRecorderNode()
+    recorder = NESTSpikeRecorder(node, None, record_to="memory")
+    for step in range(100):
+        node.record([step, step + 1], [step + 0.1, step + 0.2])
+        new_events = recorder.get_new_events()
+        assert np.all(new_events["senders"] == [step, step + 1])
+        assert np.allclose(new_events["times"], [step + 0.1, step + 0.2])
+        # The events are drained from the memory of the recorder:
+        assert node.n_events == 0
+    # Every event has been fetched from the recorder only once:
+    assert node.fetched == 200
+    assert recorder.number_of_events == 200
+    assert np.all(recorder.events["senders"][:4] == [0, 1, 1, 2])
+    node.record([100], [100.1])
+    assert recorder.number_of_events == 201
+    assert len(recorder.events["times"]) == 201
+    assert node.fetched == 201
+    recorder.reset()
+    assert recorder.number_of_events == 0
+    assert recorder.number_of_resets == 1
+    assert len(recorder.events["times"]) == 0
+    node.record([7], [200.1])
+    assert np.all(recorder.get_new_events()["senders"] == [7])
+
+
+def test_spikes_number_with_drained_events():
+    node = MockMemoryRecorderNode()
+    recorder = NESTSpikeRecorder(node, None, record_to="memory")
+    recorder._number_of_neurons = 2
+    interface = NESTtoTVBinterface(SimpleNamespace(nest_instance=MockNEST([node])), 0, "E", "spike_recorder",
+                                   [0], device_set=Series({"r0": recorder}))
+    interface.configure()
+    node.record([1, 2], [0.1, 0.2])
+    assert np.allclose(interface.population_mean_spikes_number, [1.0])
+    # Draining the events of the recorder does not change its number of events:
+    recorder.events
+    node.record([1, 2, 1, 2], [0.3, 0.4, 0.5, 0.6])
+    assert np.allclose(interface.population_mean_spikes_number, [2.0])
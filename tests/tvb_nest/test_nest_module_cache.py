@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from tvb_multiscale.tvb_nest.nest_models.builders import nest_factory
+from tvb_multiscale.tvb_nest.nest_models.builders.nest_factory import \
+    nest_module_hash, compile_modules, _cache_nest_module, _nest_module_installed_files
+
+
+def write_sources(source_path, contents="// model\n"):
+    os.makedirs(source_path, exist_ok=True)
+    with open(os.path.join(source_path, "mymodule.cpp"), "w") as file:
+        file.write(contents)
+
+
+@pytest.fixture
+def nest_setup(tmpdir, monkeypatch):
+    """A NEST installation path, a modules' configuration, and a fake module build, counting the builds."""
+    root = str(tmpdir)
+    nest_path = os.path.join(root, "nest")
+    config = SimpleNamespace(MYMODULES_DIR=os.path.join(root, "sources"),
+                             MYMODULES_BLD_DIR=os.path.join(root, "build"),
+                             MYMODULES_CACHE_DIR=os.path.join(root, "cache"),
+                             MYMODULES_COMPILER_FLAGS=("CXXFLAGS", ),
+                             MYMODULES_COMPILE_WORKERS=1,
+                             NEST_PATH=nest_path)
+    write_sources(os.path.join(config.MYMODULES_DIR, "mymodule"))
+    monkeypatch.setenv("NEST_INSTALL_DIR", nest_path)
+    monkeypatch.setenv("CXXFLAGS", "-O2")
+    monkeypatch.setattr(nest_factory, "nest_version", lambda nest_path: "3.0")
+    builds = []
+
+    def build_nest_module(module, source_path, module_bld_dir, nest_path):
+        builds.append(module)
+        for filepath in _nest_module_installed_files(module, nest_path).values():
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "w") as file:
+                file.write("build %d" % len(builds))
+        return module
+
+    monkeypatch.setattr(nest_factory, "_build_nest_module", build_nest_module)
+    return config, nest_path, builds
+
+
+def test_nest_module_hash(tmpdir, monkeypatch):
+    source_path = os.path.join(str(tmpdir), "mymodule")
+    write_sources(source_path)
+    monkeypatch.setattr(nest_factory, "nest_version", lambda nest_path: "3.0")
+    monkeypatch.setenv("CXXFLAGS", "-O2")
+    module_hash = nest_module_hash(source_path, "nest", ("CXXFLAGS", ))
+    assert module_hash == nest_module_hash(source_path, "nest", ("CXXFLAGS", ))
+    # Any change of the compiler flags, of the NEST version, or of the sources, changes the hash:
+    monkeypatch.setenv("CXXFLAGS", "-O3")
+    assert nest_module_hash(source_path, "nest", ("CXXFLAGS", )) != module_hash
+    monkeypatch.setenv("CXXFLAGS", "-O2")
+    monkeypatch.setattr(nest_factory, "nest_version", lambda nest_path: "3.1")
+    assert nest_module_hash(source_path, "nest", ("CXXFLAGS", )) != module_hash
+    monkeypatch.setattr(nest_factory, "nest_version", lambda nest_path: "3.0")
+    write_sources(source_path, "// model changed\n")
+    assert nest_module_hash(source_path, "nest", ("CXXFLAGS", )) != module_hash
+    write_sources(source_path)
+    assert nest_module_hash(source_path, "nest", ("CXXFLAGS", )) == module_hash
+    os.rename(os.path.join(source_path, "mymodule.cpp"), os.path.join(source_path, "mymodule.h"))
+    assert nest_module_hash(source_path, "nest", ("CXXFLAGS", )) != module_hash
+
+
+def test_compile_modules_cache(nest_setup, monkeypatch):
+    config, nest_path, builds = nest_setup
+    installed_files = _nest_module_installed_files("mymodule", nest_path)
+    # Cache miss:
+    compile_modules(["mymodule"], config=config)
+    assert builds == ["mymodule"]
+    assert len(os.listdir(config.MYMODULES_CACHE_DIR)) == 1
+    # Cache hit, which installs the cached files:
+    for filepath in installed_files.values():
+        os.remove(filepath)
+    compile_modules(["mymodule"], config=config)
+    assert builds == ["mymodule"]
+    assert all(os.path.isfile(filepath) for filepath in installed_files.values())
+    with open(installed_files["so"]) as file:
+        assert file.read() == "build 1"
+    # A change of the compiler flags is a cache miss, making a new entry:
+    monkeypatch.setenv("CXXFLAGS", "-O3")
+    compile_modules(["mymodule"], config=config)
+    assert builds == ["mymodule"] * 2
+    assert len(os.listdir(config.MYMODULES_CACHE_DIR)) == 2
+    # Recompilation is forced, keeping the existing entry:
+    compile_modules(["mymodule"], recompile=True, config=config)
+    assert builds == ["mymodule"] * 3
+    assert len(os.listdir(config.MYMODULES_CACHE_DIR)) == 2
+
+
+def test_cache_nest_module_existing_entry(nest_setup):
+    config, nest_path, builds = nest_setup
+    installed_files = _nest_module_installed_files("mymodule", nest_path)
+    compile_modules(["mymodule"], config=config)
+    module_cache_dir = os.path.join(config.MYMODULES_CACHE_DIR, os.listdir(config.MYMODULES_CACHE_DIR)[0])
+    # The entry of a concurrent job with the same key is kept, and no temporary folder is left behind:
+    with open(installed_files["so"], "w") as file:
+        file.write("concurrent build")
+    assert _cache_nest_module(installed_files, module_cache_dir)
+    assert os.listdir(config.MYMODULES_CACHE_DIR) == [os.path.basename(module_cache_dir)]
+    with open(os.path.join(module_cache_dir, os.path.basename(installed_files["so"]))) as file:
+        assert file.read() == "build 1"
+    # Nothing is cached if the module is not installed:
+    os.remove(installed_files["so"])
+    assert not _cache_nest_module(installed_files, module_cache_dir + "_other")
+    assert not os.path.exists(module_cache_dir + "_other")
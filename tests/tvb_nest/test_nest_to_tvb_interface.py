@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import numpy as np
+from pandas import Series
+
+from tvb_multiscale.tvb_nest.nest_models.devices import NESTSpikeRecorder
+from tvb_multiscale.tvb_nest.interfaces.nest_to_tvb_interface import NESTtoTVBinterface
+
+
+class MockNode(object):
+    """A NEST spike recorder node, holding its number of events."""
+
+    def __init__(self, global_id, n_events=0):
+        self.global_id = global_id
+        self.n_events = n_events
+
+    def get(self, attr):
+        return getattr(self, attr)
+
+    def set(self, values):
+        for attr, value in values.items():
+            setattr(self, attr, value)
+
+
+class MockNodeCollection(object):
+
+    def __init__(self, nest, global_ids):
+        # NEST requires the nodes of a NodeCollection to be sorted by global id:
+        assert global_ids == sorted(global_ids)
+        self.nest = nest
+        self.global_ids = global_ids
+
+    def get(self, attr):
+        self.nest.get_calls.append(attr)
+        return tuple(self.nest.nodes[global_id].get(attr) for global_id in self.global_ids)
+
+    def set(self, values):
+        # As NEST, set a list of dictionaries, one per node, or a dictionary of list-valued parameters,
+        # one value per node, in the order of the global ids:
+        self.nest.set_calls.append(values)
+        for i_node, global_id in enumerate(self.global_ids):
+            if isinstance(values, (list, tuple)):
+                node_values = values[i_node]
+            else:
+                node_values = dict((attr, value[i_node] if isinstance(value, (list, tuple)) else value)
+                                   for attr, value in values.items())
+            self.nest.nodes[global_id].set(node_values)
+
+
+class MockNEST(object):
+
+    def __init__(self, nodes):
+        self.nodes = dict((node.global_id, node) for node in nodes)
+        self.get_calls = []
+        self.set_calls = []
+
+    def NodeCollection(self, global_ids):
+        return MockNodeCollection(self, global_ids)
+
+
+def build_interface(global_ids=(30, 10, 20), numbers_of_neurons=(10, 20, 40)):
+    nodes = [MockNode(global_id) for global_id in global_ids]
+    nest = MockNEST(nodes)
+    recorders = Series()
+    for i_node, (node, number_of_neurons) in enumerate(zip(nodes, numbers_of_neurons)):
+        recorder = NESTSpikeRecorder(node, nest, label="E_r%d" % i_node)
+        recorder._number_of_neurons = number_of_neurons
+        recorders["r%d" % i_node] = recorder
+    interface = NESTtoTVBinterface(SimpleNamespace(nest_instance=nest), 0, "E", "spike_recorder",
+                                   list(range(len(nodes))), device_set=recorders)
+    interface.configure()
+    return interface, nodes, nest
+
+
+def test_spikes_number_single_get():
+    # The recorders' global ids are not in the order of the interface's nodes:
+    interface, nodes, nest = build_interface()
+    for node, n_events in zip(nodes, [10, 40, 160]):
+        node.n_events = n_events
+    values = interface.population_mean_spikes_number
+    # A single get() call for all the recorders:
+    assert nest.get_calls == ["n_events"]
+    # The values are in the order of the interface's nodes, i.e., 10/10, 40/20, 160/40:
+    assert np.allclose(values, [1.0, 2.0, 4.0])
+    assert np.all(interface.number_of_events == [10, 40, 160])
+
+
+def test_spikes_number_incremental():
+    interface, nodes, nest = build_interface()
+    for node, n_events in zip(nodes, [10, 40, 160]):
+        node.n_events = n_events
+    interface.population_mean_spikes_number
+    # Only the events recorded since the previous readout are counted:
+    for node, n_events in zip(nodes, [15, 40, 200]):
+        node.n_events = n_events
+    assert np.allclose(interface.population_mean_spikes_number, [0.5, 0.0, 1.0])
+    # The events of a recorder reset since the previous readout count from 0:
+    interface["r1"].number_of_resets += 1
+    nodes[1].n_events = 20
+    nodes[2].n_events = 240
+    assert np.allclose(interface.population_mean_spikes_number, [0.0, 1.0, 1.0])
+    assert len(nest.get_calls) == 3
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import numpy as np
+from pandas import Series
+
+from tvb_multiscale.tvb_nest.nest_models.devices import NESTDCGenerator, NESTInhomogeneousPoissonGenerator
+from tvb_multiscale.tvb_nest.interfaces.tvb_to_nest_devices_interface import \
+    TVBtoNESTDCGeneratorInterface, TVBtoNESTInhomogeneousPoissonGeneratorInterface
+
+from tests.tvb_nest.test_nest_to_tvb_interface import MockNode, MockNEST
+
+
+def test_schedule_times_on_resolution_grid():
+    # The NEST time accumulated by simulating 30 TVB time steps of 0.1 ms, i.e., 3.0000000000000013 ms:
+    time = np.sum(np.full((30, ), 0.1))
+    kernel_status = SimpleNamespace(time=time, resolution=0.05)
+    interface = TVBtoNESTInhomogeneousPoissonGeneratorInterface(SimpleNamespace(kernel_status=kernel_status),
+                                                                dt=0.1)
+    assert interface._schedule_times(4) == [k * 0.05 for k in [61, 63, 65, 67]]
+    assert interface._schedule_times(1) == [61 * 0.05]
+
+
+def build_devices_interface(interface_class, device_class, global_ids=(30, 10, 20)):
+    nodes = [MockNode(global_id) for global_id in global_ids]
+    nest = MockNEST(nodes)
+    devices = Series()
+    for i_node, node in enumerate(nodes):
+        devices["r%d" % i_node] = device_class(node, nest, label="generator_r%d" % i_node)
+    kernel_status = SimpleNamespace(time=1.0, resolution=0.1, min_delay=0.1)
+    interface = interface_class(SimpleNamespace(nest_instance=nest, kernel_status=kernel_status), "E",
+                                devices.iloc[0].model, dt=0.1, nodes_ids=list(range(len(nodes))), device_set=devices)
+    interface.configure()
+    return interface, nodes, nest
+
+
+def test_batched_set_by_global_id():
+    # The devices' global ids are not in the order of the interface's nodes:
+    interface, nodes, nest = build_devices_interface(TVBtoNESTDCGeneratorInterface, NESTDCGenerator)
+    interface.set([1.0, 2.0, 3.0])
+    # A single set() call of list-valued parameters, ordered by global id, with the common values:
+    assert len(nest.set_calls) == 1
+    assert nest.set_calls[0]["amplitude"] == [2.0, 3.0, 1.0]
+    # ...so that each value reaches the device of its node:
+    assert [node.amplitude for node in nodes] == [1.0, 2.0, 3.0]
+    assert all(node.origin == 1.0 and node.stop == 0.1 for node in nodes)
+
+
+def test_batched_set_arrays_by_global_id():
+    interface, nodes, nest = build_devices_interface(TVBtoNESTInhomogeneousPoissonGeneratorInterface,
+                                                    NESTInhomogeneousPoissonGenerator)
+    interface.set_schedule(np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]))
+    # A list of dictionaries, one per device, ordered by global id:
+    assert [values["rate_values"] for values in nest.set_calls[0]] == [[2.0, 5.0], [3.0, 6.0], [1.0, 4.0]]
+    assert [node.rate_values for node in nodes] == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+    assert all(np.allclose(node.rate_times, [1.1, 1.2]) for node in nodes)
+    # Only the masked devices are set, still ordered by global id:
+    interface.set([7.0, 8.0, 9.0], mask=[True, False, True])
+    assert [values["rate_values"] for values in nest.set_calls[1]] == [[9.0], [7.0]]
+    assert [node.rate_values for node in nodes] == [[7.0], [2.0, 5.0], [9.0]]
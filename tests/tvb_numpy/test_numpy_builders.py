@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from pandas import Series
+
+from tvb_multiscale.core.spiking_models.devices import DeviceSet
+from tvb_multiscale.tvb_numpy.config import Config
+from tvb_multiscale.tvb_numpy.numpy_models.builders.base import NumpyModelBuilder
+from tvb_multiscale.tvb_numpy.interfaces.builders.base import TVBNumpyInterfaceBuilder
+from tvb_multiscale.tvb_numpy.interfaces.base import TVBNumpyInterface
+
+from tvb.datatypes.connectivity import Connectivity
+from tvb.simulator.simulator import Simulator
+from tvb.simulator.models.wong_wang_exc_inh import ReducedWongWangExcInh
+from tvb.simulator.integrators import HeunDeterministic
+from tvb.simulator.monitors import Raw
+
+
+SPIKING_NODES_IDS = [0, 1]
+
+
+def build_tvb_simulator(number_of_regions=3, dt=0.1):
+    weights = np.ones((number_of_regions, number_of_regions))
+    np.fill_diagonal(weights, 0.0)
+    tract_lengths = 10.0 * weights
+    connectivity = Connectivity(weights=weights, tract_lengths=tract_lengths,
+                                region_labels=np.array(["region_%d" % i for i in range(number_of_regions)]),
+                                centres=np.zeros((number_of_regions, 3)), speed=np.array([4.0]))
+    connectivity.configure()
+    simulator = Simulator(connectivity=connectivity, model=ReducedWongWangExcInh(),
+                          integrator=HeunDeterministic(dt=dt), monitors=(Raw(), ))
+    simulator.configure()
+    return simulator
+
+
+def build_spiking_network(simulator, spiking_nodes_ids, config):
+    builder = NumpyModelBuilder(simulator, spiking_nodes_ids, config=config)
+    builder.population_order = 40
+    builder.populations = [{"label": "E", "model": "lif", "params": {}, "scale": 1.0, "nodes": None},
+                           {"label": "I", "model": "lif", "params": {}, "scale": 0.5, "nodes": None}]
+    builder.populations_connections = [
+        {"source": "E", "target": "I", "synapse_model": "static_synapse",
+         "conn_spec": {"rule": "fixed_indegree", "indegree": 5}, "weight": 10.0, "delay": 0.1,
+         "receptor_type": 0, "nodes": None}]
+    builder.nodes_connections = []
+    builder.output_devices = [{"model": "spike_recorder", "params": {},
+                               "connections": OrderedDict([("E_spikes", "E"), ("I_spikes", "I")]), "nodes": None}]
+    builder.input_devices = []
+    return builder.build_spiking_network()
+
+
+def build_interface(simulator, spiking_network, spiking_nodes_ids, config):
+    builder = TVBNumpyInterfaceBuilder(simulator, spiking_network, spiking_nodes_ids, True)
+    # The TVB node 2 drives only the first spiking node:
+    builder.tvb_to_spikeNet_interfaces = [{"model": "inhomogeneous_poisson_generator", "params": {},
+                                           "interface_weights": 1.0,
+                                           "weights": lambda source_node, target_node: 100.0 * (target_node == 0),
+                                           "delays": 0.1, "connections": {"S_e": ["E"]},
+                                           "source_nodes": None, "target_nodes": None}]
+    builder.spikeNet_to_tvb_interfaces = [{"model": "spike_recorder", "params": {},
+                                           "interface_weights": 1.0, "delays": 0.0,
+                                           "connections": {"S_i": ["E"]}, "nodes": None}]
+    interface = builder.build_interface(TVBNumpyInterface(config))
+    interface.configure(simulator.model)
+    spiking_network.configure()
+    return interface
+
+
+def build_numpy_interface():
+    # A module level function, so that it can be pickled and called by a spiking network's child process:
+    config = Config()
+    simulator = build_tvb_simulator()
+    spiking_network = build_spiking_network(simulator, SPIKING_NODES_IDS, config)
+    return build_interface(simulator, spiking_network, SPIKING_NODES_IDS, config)
+
+
+def run_exchange(interface, dt, n_steps=50):
+    """Run n_steps TVB <-> Spiking Network exchange steps for a constant TVB rate of 8 spikes/ms,
+       i.e., 8000 spikes/sec, of the TVB node 2, and return the readouts of the state variable S_i."""
+    state = np.zeros((2, 3, 1))
+    state[0, 2, 0] = 8.0
+    # ReducedWongWangExcInh is coupled only via S_e:
+    coupling = np.zeros((1, 3, 1))
+    readouts = []
+    for _ in range(n_steps):
+        interface.tvb_state_to_spikeNet(state, coupling, None)
+        interface.spiking_network.Run(dt)
+        state = interface.spikeNet_state_to_tvb_state(state)
+        readouts.append(state[1, :, 0].copy())
+    return np.array(readouts)
+
+
+def test_build_spiking_network():
+    config = Config()
+    simulator = build_tvb_simulator()
+    spiking_network = build_spiking_network(simulator, [0, 1], config)
+    assert spiking_network.nodes_labels == ["region_0", "region_1"]
+    for node in spiking_network.brain_regions:
+        assert node["E"].number_of_neurons == 40
+        assert node["I"].number_of_neurons == 20
+    assert len(spiking_network.numpy_instance.GetConnections(
+        source=spiking_network.brain_regions["region_0"]["E"].population,
+        target=spiking_network.brain_regions["region_0"]["I"].population)) == 5 * 20
+    assert list(spiking_network.output_devices.index) == ["E_spikes", "I_spikes"]
+    assert spiking_network.output_devices["E_spikes"]["region_1"].number_of_neurons == 40
+
+
+def test_interface_exchange():
+    simulator = build_tvb_simulator()
+    interface = build_numpy_interface()
+    spiking_network = interface.spiking_network
+    recorders = spiking_network.output_devices["E_spikes"]
+    n_neurons = recorders["region_0"].number_of_neurons
+    readouts = run_exchange(interface, simulator.integrator.dt, 100)
+    # The readout is the number of spikes per neuron of each TVB time step,
+    # adding up to the events of the recorders:
+    assert recorders["region_0"].number_of_events > 0
+    assert recorders["region_1"].number_of_events == 0
+    assert np.allclose(np.sum(readouts[:, :2], axis=0) * n_neurons,
+                       [recorders["region_0"].number_of_events, recorders["region_1"].number_of_events])
+    # The TVB node that is not modelled by the spiking network is not written to:
+    assert np.all(readouts[:, 2] == 0.0)
+    assert np.isclose(spiking_network.numpy_instance.GetKernelStatus("time"), 100 * simulator.integrator.dt)
+
+
+def test_spikes_times_by_neurons_in_time_window():
+    simulator = build_tvb_simulator()
+    interface = build_numpy_interface()
+    run_exchange(interface, simulator.integrator.dt, 100)
+    recorder = interface.spiking_network.output_devices["E_spikes"]["region_0"]
+    all_spikes = recorder.get_spikes_times_by_neurons()
+    assert len(all_spikes) > 1
+    # The time window of the first spike, within which some senders have no spikes:
+    first_time = np.min([spikes[0] for spikes in all_spikes.values()])
+    for times, exclude_times in [([first_time, first_time], []), (None, [None, first_time])]:
+        spikes = recorder.get_spikes_times_by_neurons(times=times, exclude_times=exclude_times)
+        # All senders are included, with empty arrays for those without spikes within the selected times:
+        assert list(spikes.keys()) == list(all_spikes.keys())
+        for sender, sender_times in spikes.items():
+            selected = all_spikes[sender] == first_time
+            if times is None:
+                selected = ~selected
+            assert np.all(sender_times == all_spikes[sender][selected])
+    spikes = recorder.get_spikes_times_by_neurons(times=[first_time, first_time])
+    assert any(len(sender_times) == 0 for sender_times in spikes.values())
+
+
+def test_pipelined_run():
+    config = Config()
+    simulator = build_tvb_simulator()
+    spiking_network = build_spiking_network(simulator, SPIKING_NODES_IDS, config)
+    spiking_network.configure()
+    spiking_network.pipelined = True
+    for _ in range(5):
+        spiking_network.Run(simulator.integrator.dt)
+    executor = spiking_network._executor
+    assert executor is not None
+    assert spiking_network.pipeline_report()["runs"] == 5
+    # Resetting the pipeline stops the worker thread, and the next Run starts a new one:
+    spiking_network.reset_pipeline()
+    assert spiking_network._executor is None
+    assert executor._shutdown
+    spiking_network.Run(simulator.integrator.dt)
+    assert spiking_network._executor is not None
+    spiking_network.close_pipeline()
+    assert spiking_network._executor is None
+    assert spiking_network.pipeline_report()["runs"] == 1
+    assert np.isclose(spiking_network.numpy_instance.GetKernelStatus("time"), 6 * simulator.integrator.dt)
+
+
+def test_positional_and_label_indexing():
+    config = Config()
+    simulator = build_tvb_simulator()
+    builder = NumpyModelBuilder(simulator, SPIKING_NODES_IDS, config=config)
+    builder.population_order = 10
+    builder.populations = [{"label": "E", "model": "lif", "params": {}, "scale": 1.0, "nodes": None}]
+    builder.populations_connections = []
+    builder.nodes_connections = []
+    # A device of the second spiking node only, which is the position 1 of the spiking brain:
+    builder.output_devices = [{"model": "spike_recorder", "params": {},
+                               "connections": OrderedDict([("E_spikes", "E")]), "nodes": [1]}]
+    builder.input_devices = []
+    spiking_network = builder.build_spiking_network()
+    recorders = spiking_network.output_devices["E_spikes"]
+    assert list(recorders.index) == ["region_1"]
+    assert spiking_network.brain_regions.iloc[1] is spiking_network.brain_regions["region_1"]
+    # Integer keys are always labels, never positions:
+    recorder = recorders["region_1"]
+    devices = DeviceSet("E_spikes", "spike_recorder", Series({0: recorder, 2: recorder}))
+    assert devices[2] is recorder
+    assert list(devices[[0, 2]].index) == [0, 2]
+    assert list(devices.iloc[[1]].index) == [2]
+    with pytest.raises(KeyError):
+        devices[1]
+    with pytest.raises(KeyError):
+        devices[[0, 5]]
+
+
+def test_profiled_exchange():
+    simulator = build_tvb_simulator()
+    interface = build_numpy_interface()
+    profiler = interface.enable_profiler()
+    assert interface.spiking_network.profiler is profiler
+    run_exchange(interface, simulator.integrator.dt, n_steps=10)
+    report = profiler.report()
+    assert report["number_of_steps"] == 10
+    for phase in ["tvb_to_spikeNet_transform", "tvb_to_spikeNet_set", "spikeNet_run", "spikeNet_readout",
+                  "spikeNet_to_tvb_write"]:
+        assert report[phase]["total"] > 0.0
+    # Nothing is waited for without pipelining:
+    assert report["spikeNet_wait"]["total"] == 0.0
+    assert np.isclose(report["total"], np.sum([report[phase]["total"] for phase in profiler.phases]))
+    assert interface.disable_profiler() is profiler
+    assert interface.spiking_network.profiler is None
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+
+from tvb_multiscale.benchmarks.cosimulation_benchmark import configurations_grid, CosimulationBenchmark
+
+
+RESULTS_KEYS = ["configuration", "number_of_neurons", "build_time", "simulation_time", "number_of_steps",
+                "per_step_time", "per_step_overhead", "per_step_phases", "number_of_events", "events_per_sec",
+                "peak_rss_MB"]
+
+
+def tiny_configurations(**parameters):
+    return configurations_grid(backend="numpy", number_of_regions=4, number_of_spiking_nodes=2,
+                               neurons_per_population=20, tvb_dt=0.1, simulation_length=2.0, use_numba=False,
+                               **parameters)
+
+
+def test_configurations_grid():
+    configurations = tiny_configurations(device=["poisson", "dc"], seed=[0, 1])
+    assert len(configurations) == 4
+    assert [(configuration["device"], configuration["seed"]) for configuration in configurations] == \
+           [("poisson", 0), ("poisson", 1), ("dc", 0), ("dc", 1)]
+    assert all(configuration["number_of_regions"] == 4 for configuration in configurations)
+
+
+def test_run_configuration(tmpdir):
+    output_base = str(tmpdir)
+    benchmark = CosimulationBenchmark(tiny_configurations(), isolate=False, output_base=output_base)
+    results = benchmark.run()
+    assert len(results) == 1
+    assert "error" not in results[0]
+    assert list(results[0].keys()) == RESULTS_KEYS
+    assert results[0]["number_of_neurons"] == 2 * (20 + 5)
+    assert results[0]["number_of_steps"] == 20
+    filepath = benchmark.to_json(os.path.join(output_base, "cosimulation_benchmark.json"))
+    with open(filepath) as file:
+        results = json.load(file)
+    assert list(results[0].keys()) == RESULTS_KEYS
+    assert list(results[0]["build_time"].keys()) == ["tvb_simulator", "spiking_network", "interface",
+                                                     "configure", "total"]
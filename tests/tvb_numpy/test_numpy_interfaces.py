@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pandas import Series
+
+from tvb_multiscale.tvb_numpy.numpy_models.builders.numpy_factory import load_numpy, create_device, connect_device
+from tvb_multiscale.tvb_numpy.numpy_models.population import NumpyPopulation
+from tvb_multiscale.tvb_numpy.numpy_models.region_node import NumpyRegionNode
+from tvb_multiscale.tvb_numpy.numpy_models.brain import NumpyBrain
+from tvb_multiscale.tvb_numpy.numpy_models.network import NumpyNetwork
+from tvb_multiscale.tvb_numpy.interfaces.tvb_to_numpy_devices_interface import \
+    TVBtoNumpyInhomogeneousPoissonGeneratorInterface
+from tvb_multiscale.tvb_numpy.interfaces.numpy_to_tvb_interface import NumpytoTVBinterface
+from tvb_multiscale.core.spiking_models.devices import DeviceSet
+from tvb_multiscale.core.io.checkpoint import CosimulationCheckpointer
+
+
+def build_network(regions=("r0", "r1"), n_neurons=50):
+    simulator = load_numpy()
+    brain = NumpyBrain()
+    recorders = DeviceSet("E", "spike_recorder")
+    generators = DeviceSet("E", "inhomogeneous_poisson_generator")
+    for region in regions:
+        brain[region] = NumpyRegionNode(region, numpy_instance=simulator)
+        brain[region]["E"] = NumpyPopulation(simulator.Create("lif", n_neurons), "E", "lif", simulator)
+        recorder = create_device("spike_recorder", numpy_instance=simulator, label="E_%s" % region)
+        recorders[region] = connect_device(recorder, brain[region]["E"], None, numpy_instance=simulator)
+        generator = create_device("inhomogeneous_poisson_generator", numpy_instance=simulator, label="E_%s" % region)
+        generators[region] = connect_device(generator, brain[region]["E"], None,
+                                            weight=100.0, delay=0.1, numpy_instance=simulator)
+    network = NumpyNetwork(simulator, brain, Series({"E": recorders}), Series({"E": generators}))
+    return simulator, network, recorders, generators
+
+
+def test_spikes_number_across_recorder_reset():
+    simulator, network, recorders, generators = build_network()
+    # A second recorder, never reset, counting all the spikes of the first region:
+    all_spikes = simulator.Create("spike_recorder")
+    simulator.Connect(network.brain_regions["r0"]["E"].population, all_spikes)
+    tvb_to_numpy = TVBtoNumpyInhomogeneousPoissonGeneratorInterface(
+        network, "E", "inhomogeneous_poisson_generator", dt=0.1, tvb_sv_id=0, nodes_ids=[0, 1], device_set=generators)
+    numpy_to_tvb = NumpytoTVBinterface(network, 0, "E", "spike_recorder", [0, 1], device_set=recorders)
+    network.configure()
+    n_neurons = recorders["r0"].number_of_neurons
+    spikes_number = 0.0
+    for step in range(40):
+        tvb_to_numpy.set_schedule(np.full((5, 2), 8000.0))
+        network.Run(0.5)
+        spikes_number += numpy_to_tvb.population_mean_spikes_number[0] * n_neurons
+        if step in [15, 25]:
+            # Reset the recorder right after an exchange, as a co-simulation bounding its memory would do:
+            recorders["r0"].reset()
+            assert recorders["r0"].number_of_events == 0
+    assert all_spikes.get("n_events") > 0
+    assert np.round(spikes_number) == all_spikes.get("n_events")
+
+
+def test_checkpoint_events_across_recorder_reset(tmpdir):
+    simulator, network, recorders, generators = build_network(regions=("r0", ))
+    checkpointer = CosimulationCheckpointer(None, SimpleNamespace(spiking_network=network), folder=str(tmpdir))
+    generators["r0"].device.set({"rate_times": [0.1], "rate_values": [8000.0]})
+    simulator.Run(20.0)
+    n_events = recorders["r0"].number_of_events
+    assert n_events > 0
+    assert checkpointer._flush_events()[("E", "r0")]["times"].size == n_events
+    recorders["r0"].reset()
+    simulator.Run(5.0)
+    # The events recorded after the reset are flushed, even if they are fewer than the ones flushed before it:
+    n_events = recorders["r0"].number_of_events
+    assert 0 < n_events
+    events = checkpointer._flush_events()[("E", "r0")]
+    assert events["times"].size == n_events
+    assert np.all(events["times"] > 20.0)
+
+
+def test_checkpoint_round_trip(tmpdir):
+    simulator, network, recorders, generators = build_network()
+    network.synchronization_n_steps = 4
+    tvb_simulator = SimpleNamespace(current_step=30, current_state=np.ones((2, 2, 1)),
+                                    history=SimpleNamespace(buffer=np.arange(12.0).reshape((3, 2, 2, 1))),
+                                    integrator=SimpleNamespace(dt=0.1, noise=None), monitors=[])
+    interface = SimpleNamespace(spiking_network=network, spikeNet_to_tvb_interfaces=[],
+                                _synchronization_step=2, _tvb_to_spikeNet_buffers=[np.array([1.0, 2.0])],
+                                _spikeNet_to_tvb_values=[np.array([3.0])],
+                                _pipelined_values=[], _pipelined_ready_values=[])
+    generators["r0"].device.set({"rate_times": [0.1], "rate_values": [8000.0]})
+    network.Run(0.1)
+    network.Run(0.1)
+    assert network._synchronization_step == 2
+    V_m = network.brain_regions["r0"]["E"].Get(["V_m"])["V_m"]
+    checkpointer = CosimulationCheckpointer(tvb_simulator, interface, folder=str(tmpdir))
+    path = checkpointer.checkpoint(block=True)
+    checkpointer.close()
+    # Mess up the state of the co-simulation:
+    tvb_simulator.current_step = 0
+    tvb_simulator.history.buffer[:] = 0.0
+    interface._synchronization_step = 0
+    interface._tvb_to_spikeNet_buffers[0][:] = 0.0
+    network._synchronization_step = 0
+    network.brain_regions["r0"]["E"].Set({"V_m": -50.0})
+    # ...and restore it:
+    checkpointer = CosimulationCheckpointer(tvb_simulator, interface, folder=str(tmpdir))
+    assert checkpointer.restore() == path
+    assert tvb_simulator.current_step == 30
+    assert np.all(tvb_simulator.history.buffer == np.arange(12.0).reshape((3, 2, 2, 1)))
+    assert interface._synchronization_step == 2
+    assert np.all(interface._tvb_to_spikeNet_buffers[0] == [1.0, 2.0])
+    assert network._synchronization_step == 2
+    assert np.allclose(network.brain_regions["r0"]["E"].Get(["V_m"])["V_m"], V_m)
+    assert checkpointer._events_time_offset == 30 * 0.1
+
+
+def test_schedule_times_on_resolution_grid():
+    simulator, network, recorders, generators = build_network(regions=("r0", ))
+    tvb_to_numpy = TVBtoNumpyInhomogeneousPoissonGeneratorInterface(
+        network, "E", "inhomogeneous_poisson_generator", dt=0.1, tvb_sv_id=0, nodes_ids=[0], device_set=generators)
+    resolution = simulator.GetKernelStatus("resolution")
+    for _ in range(30):
+        network.Run(0.1)
+    times = np.array(tvb_to_numpy._schedule_times(4))
+    assert np.all(times == np.round(times / resolution) * resolution)
+    assert np.allclose(times, 3.0 + resolution + 0.1 * np.arange(4))
+
+
+def test_checkpoints_kept(tmpdir):
+    tvb_simulator = SimpleNamespace(current_step=0, current_state=np.ones((2, 2, 1)),
+                                    history=SimpleNamespace(buffer=np.zeros((3, 2, 2, 1))),
+                                    integrator=SimpleNamespace(dt=0.1, noise=None), monitors=[])
+    for keep in [0, 1, 2]:
+        folder = os.path.join(str(tmpdir), "keep%d" % keep)
+        checkpointer = CosimulationCheckpointer(tvb_simulator, folder=folder, keep=keep)
+        for step in range(4):
+            tvb_simulator.current_step = step
+            checkpointer.checkpoint(block=True)
+        checkpointer.close()
+        # Only the most recent checkpoints are kept:
+        assert [os.path.basename(path) for path in checkpointer.checkpoints_paths] == \
+               ["checkpoint_%012d.pkl" % step for step in range(4 - keep, 4)]
+    with pytest.raises(ValueError):
+        CosimulationCheckpointer(tvb_simulator, folder=str(tmpdir), keep=-1)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import signal
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.interfaces.remote import RemoteTVBSpikeNetInterface
+
+from tests.tvb_numpy.test_numpy_builders import \
+    build_tvb_simulator, build_numpy_interface, run_exchange, SPIKING_NODES_IDS
+
+
+def test_remote_network_round_trip():
+    simulator = build_tvb_simulator()
+    dt = simulator.integrator.dt
+    local_interface = build_numpy_interface()
+    local_readouts = run_exchange(local_interface, dt)
+    remote_interface = RemoteTVBSpikeNetInterface(build_numpy_interface, simulator)
+    try:
+        remote_interface.configure(simulator.model)
+        remote_interface.spiking_network.configure()
+        assert np.all(remote_interface.spiking_nodes_ids == SPIKING_NODES_IDS)
+        assert remote_interface.spiking_network.min_delay == local_interface.spiking_network.min_delay
+        remote_readouts = run_exchange(remote_interface, dt)
+        # The same seeded network, simulated in the child process, returns the same values:
+        assert np.sum(local_readouts) > 0.0
+        assert np.allclose(remote_readouts, local_readouts)
+        assert remote_interface.spiking_network.call("output_devices.E_spikes.region_0.number_of_events") == \
+            local_interface.spiking_network.output_devices["E_spikes"]["region_0"].number_of_events
+        assert np.isclose(remote_interface.spiking_network.call("numpy_instance.GetKernelStatus", "time"),
+                          50 * dt)
+    finally:
+        remote_interface.close()
+    assert remote_interface.spiking_network._process is None
+
+
+def test_remote_network_process_death():
+    simulator = build_tvb_simulator()
+    remote_interface = RemoteTVBSpikeNetInterface(build_numpy_interface, simulator)
+    try:
+        spiking_network = remote_interface.spiking_network
+        # The child process dies, as if by a segmentation fault, or killed for out of memory:
+        spiking_network._process.kill()
+        with pytest.raises(ValueError, match="died with exit code"):
+            spiking_network.configure()
+        assert not spiking_network._pending
+        assert spiking_network._process is None
+        assert spiking_network.exitcode == -signal.SIGKILL
+        with pytest.raises(ValueError, match="not running"):
+            spiking_network.configure()
+    finally:
+        remote_interface.close()
+    assert spiking_network.input_buffer is None
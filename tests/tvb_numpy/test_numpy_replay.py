@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.io.exchange_log import ExchangeLogReader
+from tvb_multiscale.core.interfaces.replay import ReplayTVBSpikeNetInterface, SpikeNetReplayDriver
+
+from tests.tvb_numpy.test_numpy_builders import build_tvb_simulator, build_numpy_interface, run_exchange
+
+
+N_STEPS = 80
+
+
+def record_exchange_log(filepath):
+    simulator = build_tvb_simulator()
+    interface = build_numpy_interface()
+    interface.enable_exchange_log(filepath)
+    readouts = run_exchange(interface, simulator.integrator.dt, N_STEPS)
+    interface.disable_exchange_log()
+    return simulator, readouts
+
+
+def test_exchange_log_of_interface(tmpdir):
+    filepath = os.path.join(str(tmpdir), "exchange_log")
+    simulator, readouts = record_exchange_log(filepath)
+    reader = ExchangeLogReader(filepath)
+    assert reader.number_of_steps == N_STEPS
+    # The TVB node 2 proxy device receives the scaled TVB rate:
+    assert np.allclose(reader.tvb_to_spikeNet, 8000.0)
+    assert [(sv_id, nodes_ids.tolist()) for sv_id, nodes_ids in reader.spikeNet_to_tvb_layout] == [(1, [0, 1])]
+    assert np.all(reader.spikeNet_to_tvb == readouts[:, :2])
+
+
+def test_replay_to_tvb(tmpdir):
+    filepath = os.path.join(str(tmpdir), "exchange_log")
+    simulator, readouts = record_exchange_log(filepath)
+    interface = ReplayTVBSpikeNetInterface(filepath)
+    interface.configure(simulator.model)
+    assert list(interface.spikeNet_to_tvb_params.keys()) == ["S_i"]
+    replayed = run_exchange(interface, simulator.integrator.dt, N_STEPS)
+    assert np.all(replayed == readouts)
+    with pytest.raises(ValueError):
+        interface.spikeNet_state_to_tvb_state(np.zeros((2, 3, 1)))
+
+
+def test_replay_to_spiking_network(tmpdir):
+    filepath = os.path.join(str(tmpdir), "exchange_log")
+    simulator, readouts = record_exchange_log(filepath)
+    # The same seeded Spiking Network, driven by the recorded TVB values, outputs the recorded values:
+    driver = SpikeNetReplayDriver(build_numpy_interface(), filepath)
+    replayed = driver.run(configure=False)
+    assert replayed.shape == (N_STEPS, 2)
+    assert np.sum(replayed) > 0.0
+    assert np.all(replayed == readouts[:, :2])
+    with pytest.raises(ValueError):
+        driver.run(N_STEPS + 1)
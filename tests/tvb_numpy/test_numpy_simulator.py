@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from tvb_multiscale.tvb_numpy.numpy_models.simulator import NumpySimulator
+
+
+def build_network(rng_seed=0):
+    simulator = NumpySimulator(resolution=0.1, rng_seed=rng_seed)
+    E = simulator.Create("lif", 80)
+    I = simulator.Create("izhikevich", 20)
+    simulator.Connect(E, E + I, {"rule": "fixed_indegree", "indegree": 10}, {"weight": 20.0, "delay": 1.0})
+    simulator.Connect(I, E, {"rule": "pairwise_bernoulli", "p": 0.2}, {"weight": -5.0, "delay": 0.5})
+    generator = simulator.Create("poisson_generator", params={"rate": 5000.0})
+    simulator.Connect(generator, E + I, syn_spec={"weight": 30.0, "delay": 0.1})
+    spike_recorder = simulator.Create("spike_recorder")
+    simulator.Connect(E + I, spike_recorder)
+    multimeter = simulator.Create("multimeter", params={"record_from": ["V_m"], "interval": 1.0})
+    simulator.Connect(multimeter, E)
+    return simulator, E, I, generator, spike_recorder, multimeter
+
+
+def test_connections():
+    simulator, E, I, generator, spike_recorder, multimeter = build_network()
+    assert len(simulator.GetConnections(target=E[0], source=E + I)) == 10 + \
+        len(simulator.GetConnections(source=I, target=E[0]))
+    assert simulator.GetKernelStatus("min_delay") == 0.1
+    assert simulator.GetKernelStatus("max_delay") == 1.0
+    connections = simulator.GetConnections(source=generator)
+    assert len(connections) == 100
+    connections.set({"weight": 10.0})
+    assert np.all(np.array(connections.get("weight")) == 10.0)
+
+
+def test_run():
+    simulator, E, I, generator, spike_recorder, multimeter = build_network()
+    simulator.Run(50.0)
+    assert simulator.GetKernelStatus("time") == 50.0
+    events = spike_recorder.get("events")
+    assert spike_recorder.get("n_events") == events["times"].size > 0
+    assert np.all((events["times"] > 0.0) & (events["times"] <= 50.0))
+    assert np.all(np.isin(events["senders"], (E + I).global_ids))
+    assert multimeter.get("n_events") == 50 * len(E)
+    # Without input there are no spikes:
+    generator.set({"rate": 0.0})
+    simulator.Run(10.0)  # deliver the pending spikes
+    E.set({"V_m": -70.0, "I_syn": 0.0})
+    I.set({"V_m": -65.0, "U_m": -13.0})
+    simulator.Run(2.0)  # deliver the spikes of the reset neurons
+    spike_recorder.set({"n_events": 0})
+    simulator.Run(50.0)
+    assert spike_recorder.get("n_events") == 0
+
+
+def test_reproducibility():
+    n_events = []
+    for _ in range(2):
+        simulator, E, I, generator, spike_recorder, multimeter = build_network(rng_seed=1)
+        simulator.Run(20.0)
+        n_events.append(spike_recorder.get("n_events"))
+    assert n_events[0] == n_events[1]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from importlib import import_module
+
+
+# The specifications of the Spiking Network backends the co-simulation benchmarks can run against.
+# Classes are given as "module:class" strings, so that a backend is imported only when it is benchmarked.
+# Any installed backend, including the tvb_numpy reference backend that requires no external spiking simulator,
+# can be added with register_benchmark_backend().
+
+BENCHMARK_BACKENDS = {
+    "numpy":
+        {"config": "tvb_multiscale.tvb_numpy.config:Config",
+         "spiking_model_builder": "tvb_multiscale.tvb_numpy.numpy_models.builders.base:NumpyModelBuilder",
+         "interface_builder": "tvb_multiscale.tvb_numpy.interfaces.builders.base:TVBNumpyInterfaceBuilder",
+         "interface": "tvb_multiscale.tvb_numpy.interfaces.base:TVBNumpyInterface",
+         "instance": "numpy_instance",
+         "model": "lif",
+         "spike_recorder": "spike_recorder",
+         "poisson": "inhomogeneous_poisson_generator",
+         "dc": "dc_generator",
+         "parameter": "I_e",
+         "recording_backends": ["memory"],
+         "record_to_parameter": None},
+    "nest":
+        {"config": "tvb_multiscale.tvb_nest.config:Config",
+         "spiking_model_builder": "tvb_multiscale.tvb_nest.nest_models.builders.base:NESTModelBuilder",
+         "interface_builder": "tvb_multiscale.tvb_nest.interfaces.builders.base:TVBNESTInterfaceBuilder",
+         "interface": "tvb_multiscale.tvb_nest.interfaces.base:TVBNESTInterface",
+         "instance": "nest_instance",
+         "model": "iaf_cond_alpha",
+         "spike_recorder": "spike_recorder",
+         "poisson": "inhomogeneous_poisson_generator",
+         "dc": "dc_generator",
+         "parameter": "I_e",
+         "recording_backends": ["memory", "ascii"],
+         "record_to_parameter": "record_to"}
+}
+
+
+def register_benchmark_backend(name, **spec):
+    """This function registers (or modifies) a Spiking Network backend for the co-simulation benchmarks.
+       Arguments:
+        name: the name (string) of the backend
+        **spec: the specification of the backend, with the keys of the BENCHMARK_BACKENDS' entries:
+                config, spiking_model_builder, interface_builder, interface: "module:class" strings,
+                instance: the name of the Spiking Network's attribute of the spiking simulator instance,
+                model: the name of the neuron model,
+                spike_recorder, poisson, dc: the names of the respective device models,
+                parameter: the name of the neurons' parameter set by TVB for the parameter interface,
+                recording_backends: a list of the names of the supported recording backends,
+                record_to_parameter: the name of the output devices' parameter that sets the recording backend,
+                                     or None, if it cannot be set
+    """
+    backend = dict(BENCHMARK_BACKENDS.get(name, {}))
+    backend.update(spec)
+    BENCHMARK_BACKENDS[name] = backend
+    return backend
+
+
+def _import_class(path):
+    module, name = path.split(":")
+    return getattr(import_module(module), name)
+
+
+def load_benchmark_backend(name):
+    """This function imports the classes of a Spiking Network backend for the co-simulation benchmarks.
+       Arguments:
+        name: the name (string) of the backend
+       Returns:
+        a dictionary of the specification of the backend, with the classes imported
+    """
+    if name not in BENCHMARK_BACKENDS:
+        raise ValueError("Benchmark backend %s is not one of the registered ones: %s!"
+                         % (name, str(list(BENCHMARK_BACKENDS.keys()))))
+    backend = dict(BENCHMARK_BACKENDS[name])
+    for key in ["config", "spiking_model_builder", "interface_builder", "interface"]:
+        backend[key] = _import_class(backend[key])
+    return backend
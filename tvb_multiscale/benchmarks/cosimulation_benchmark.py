@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import resource
+import multiprocessing
+from collections import OrderedDict
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+
+from tvb_multiscale.core.config import initialize_logger
+from tvb_multiscale.core.tvb.simulator_builder import SimulatorBuilder
+from tvb_multiscale.core.spiking_models.builders.templates import tvb_weight, tvb_delay
+from tvb_multiscale.core.utils.profiling_utils import CosimulationProfiler
+from tvb_multiscale.benchmarks.backends import load_benchmark_backend
+
+from tvb.datatypes.connectivity import Connectivity
+
+
+LOG = initialize_logger(__name__)
+
+
+# The parameters of a co-simulation benchmark configuration and their defaults:
+DEFAULT_BENCHMARK_CONFIGURATION = OrderedDict([
+    ("backend", "numpy"),  # the name of a registered benchmark backend, see benchmarks.backends
+    ("number_of_regions", 68),  # the number of TVB region nodes of the synthetic connectivity
+    ("number_of_spiking_nodes", 2),  # the number of TVB region nodes modelled by the Spiking Network
+    ("neurons_per_population", 100),  # the number of neurons of the excitatory population E
+    ("inhibitory_scale", 0.25),  # the size of the inhibitory population I, relative to the excitatory one
+    ("connection_probability", 0.1),  # the probability of connections within and among spiking nodes
+    ("device", "poisson"),  # the TVB -> Spiking Network interface: "poisson", "dc" or "parameter"
+    ("record_to", None),  # the recording backend of the spike recorders. Default = None, for the backend's default
+    ("tvb_dt", 0.1),  # the TVB integration time step in ms
+    ("simulation_length", 100.0),  # the simulation time in ms
+    ("use_numba", True),
+    ("seed", 0)
+])
+
+DEVICES = ["poisson", "dc", "parameter"]
+
+# The TVB (ReducedWongWangExcIOInhI model) state variables coupled to the Spiking Network for each device type:
+DEVICES_TVB_VARIABLES = {"poisson": "R_e", "dc": "S_e", "parameter": "S_e"}
+
+
+def configurations_grid(**parameters):
+    """This function generates the benchmark configurations of all combinations of the input parameters' values.
+       Arguments:
+        **parameters: keyword arguments of benchmark configuration parameters,
+                      each one a single value or a list of values.
+                      Parameters not given take their values from DEFAULT_BENCHMARK_CONFIGURATION.
+       Returns:
+        a list of configuration dictionaries
+    """
+    for name in parameters.keys():
+        if name not in DEFAULT_BENCHMARK_CONFIGURATION:
+            raise ValueError("%s is not a benchmark configuration parameter!\n"
+                             "Available parameters: %s" % (name, str(list(DEFAULT_BENCHMARK_CONFIGURATION.keys()))))
+    names = list(parameters.keys())
+    values = [value if isinstance(value, (list, tuple)) else [value] for value in parameters.values()]
+    configurations = []
+    for combination in product(*values):
+        configuration = OrderedDict(DEFAULT_BENCHMARK_CONFIGURATION)
+        configuration.update(zip(names, combination))
+        configurations.append(configuration)
+    return configurations
+
+
+def peak_rss():
+    """This function returns the peak resident set size of the current process in MB."""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return maxrss / 1024.0 ** 2  # in bytes
+    return maxrss / 1024.0  # in KB
+
+
+class CosimulationBenchmark(object):
+
+    """CosimulationBenchmark builds and runs TVB - Spiking Network co-simulations of synthetic configurations,
+       using the SimulatorBuilder, the Spiking Network model builder and the TVB - Spiking Network interface builder
+       of a Spiking Network backend (see benchmarks.backends), and reports, for each configuration:
+        - the build times of the TVB simulator, the Spiking Network, the interface,
+          and of the configuration of the co-simulator,
+        - the simulation time and the mean per step times of the co-simulation phases (see CosimulationProfiler),
+        - the per step overhead, i.e., the mean per step time of the TVB <-> Spiking Network exchange,
+        - the number of spikes recorded, and the events recorded per second of simulation time,
+        - the peak resident set size (RSS) of the process.
+       The synthetic configuration consists of a random TVB connectivity,
+       and of excitatory E and inhibitory I populations of spiking neurons for each spiking region node,
+       connected with fixed indegree connections within and among spiking region nodes,
+       and recorded by spike recorders.
+       If isolate is True, each configuration runs in a new process,
+       so that peak RSS measurements and spiking simulators' kernels are not shared among configurations.
+    """
+
+    def __init__(self, configurations=None, isolate=True, output_base=None):
+        if configurations is None:
+            configurations = configurations_grid()
+        self.configurations = list(configurations)
+        self.isolate = isolate
+        if output_base is None:
+            output_base = os.path.join(tempfile.gettempdir(), "tvb_multiscale_benchmarks")
+        self.output_base = output_base
+        self.results = []
+
+    @staticmethod
+    def build_connectivity(number_of_regions, seed=0):
+        """Method to build a random TVB connectivity.
+           Arguments:
+            number_of_regions: the number of region nodes
+            seed: the seed of the random number generator. Default = 0
+           Returns:
+            a Connectivity instance
+        """
+        random_state = np.random.RandomState(seed)
+        weights = random_state.uniform(0.0, 1.0, (number_of_regions, number_of_regions))
+        tract_lengths = random_state.uniform(10.0, 100.0, (number_of_regions, number_of_regions))
+        tract_lengths = (tract_lengths + tract_lengths.T) / 2
+        np.fill_diagonal(weights, 0.0)
+        np.fill_diagonal(tract_lengths, 0.0)
+        connectivity = Connectivity(weights=weights, tract_lengths=tract_lengths,
+                                    region_labels=np.array(["region_%d" % i for i in range(number_of_regions)]),
+                                    centres=random_state.uniform(-50.0, 50.0, (number_of_regions, 3)))
+        connectivity.configure()
+        return connectivity
+
+    @staticmethod
+    def build_tvb_simulator(configuration, config):
+        simulator_builder = SimulatorBuilder()
+        simulator_builder.config = config
+        simulator_builder.use_numba = configuration["use_numba"]
+        simulator_builder.connectivity = \
+            CosimulationBenchmark.build_connectivity(configuration["number_of_regions"], configuration["seed"])
+        simulator_builder.dt = configuration["tvb_dt"]
+        simulator_builder.monitor_period = configuration["tvb_dt"]
+        return simulator_builder.build()
+
+    @staticmethod
+    def build_spiking_network(configuration, backend, simulator, spiking_nodes_ids, config):
+        builder = backend["spiking_model_builder"](simulator, spiking_nodes_ids, None, config)
+        builder.population_order = configuration["neurons_per_population"]
+        builder.populations = [
+            {"label": "E", "model": backend["model"], "params": {}, "scale": 1.0, "nodes": None},
+            {"label": "I", "model": backend["model"], "params": {}, "scale": configuration["inhibitory_scale"],
+             "nodes": None}
+        ]
+        conn_spec = {"rule": "fixed_indegree", "p": configuration["connection_probability"],
+                     "allow_autapses": True, "allow_multapses": True}
+        delay = np.maximum(builder.spiking_dt, builder.tvb_dt)
+        builder.populations_connections = []
+        for source, target, weight in zip(["E", "E", "I", "I"], ["E", "I", "E", "I"], [1.0, 1.0, -1.0, -1.0]):
+            builder.populations_connections.append(
+                {"source": source, "target": target, "synapse_model": "static_synapse", "conn_spec": conn_spec,
+                 "weight": weight, "delay": delay, "receptor_type": 0, "nodes": None})
+        builder.nodes_connections = []
+        if len(spiking_nodes_ids) > 1:
+            builder.nodes_connections.append(
+                {"source": "E", "target": ["E", "I"], "synapse_model": "static_synapse", "conn_spec": conn_spec,
+                 "weight": lambda source_node, target_node: tvb_weight(source_node, target_node, builder.tvb_weights),
+                 "delay": lambda source_node, target_node:
+                            np.maximum(delay, tvb_delay(source_node, target_node, builder.tvb_delays)),
+                 "receptor_type": 0, "source_nodes": None, "target_nodes": None})
+        params = {}
+        if configuration["record_to"] is not None and backend["record_to_parameter"]:
+            params[backend["record_to_parameter"]] = configuration["record_to"]
+        builder.output_devices = [{"model": backend["spike_recorder"], "params": params,
+                                   "connections": OrderedDict([("E_spikes", "E"), ("I_spikes", "I")]),
+                                   "nodes": None}]
+        builder.input_devices = []
+        return builder.build_spiking_network()
+
+    @staticmethod
+    def build_interface(configuration, backend, simulator, spiking_network, spiking_nodes_ids, config):
+        builder = backend["interface_builder"](simulator, spiking_network, spiking_nodes_ids, True)
+        builder.use_numba = configuration["use_numba"]
+        connections = {DEVICES_TVB_VARIABLES[configuration["device"]]: ["E"]}
+        if configuration["device"] == "parameter":
+            interface = {"model": "current", "parameter": backend["parameter"], "interface_weights": 1.0,
+                         "connections": connections, "nodes": None}
+        else:
+            interface = {"model": backend[configuration["device"]], "params": {}, "interface_weights": 1.0,
+                         "connections": connections, "source_nodes": None, "target_nodes": None}
+        builder.tvb_to_spikeNet_interfaces = [interface]
+        builder.spikeNet_to_tvb_interfaces = [{"model": backend["spike_recorder"], "params": {},
+                                               "interface_weights": 1.0, "delays": 0.0,
+                                               "connections": {"Rin_e": ["E"], "Rin_i": ["I"]}, "nodes": None}]
+        return builder.build_interface(backend["interface"](config))
+
+    @staticmethod
+    def _assert_configuration(configuration, backend):
+        if configuration["device"] not in DEVICES:
+            raise ValueError("Benchmark device %s is not one of %s!" % (configuration["device"], str(DEVICES)))
+        if configuration["record_to"] is not None \
+                and configuration["record_to"] not in backend["recording_backends"]:
+            raise ValueError("Recording backend %s is not one of the ones of backend %s: %s!"
+                             % (configuration["record_to"], configuration["backend"],
+                                str(backend["recording_backends"])))
+        if configuration["number_of_spiking_nodes"] > configuration["number_of_regions"]:
+            raise ValueError("The number of spiking nodes %d is larger than the number of regions %d!"
+                             % (configuration["number_of_spiking_nodes"], configuration["number_of_regions"]))
+
+    @staticmethod
+    def _number_of_events(spiking_network):
+        number_of_events = 0
+        for devices in spiking_network.output_devices:
+            for device in devices:
+                number_of_events += device.number_of_events
+        return number_of_events
+
+    @staticmethod
+    def run_configuration(configuration, output_base=None):
+        """Method to build and run the co-simulation of a benchmark configuration in the current process.
+           Arguments:
+            configuration: a benchmark configuration dictionary (see configurations_grid)
+            output_base: the output folder of the backend's Config. Default = None
+           Returns:
+            an OrderedDict of the configuration and of its benchmark results
+        """
+        configuration = OrderedDict(configuration)
+        backend = load_benchmark_backend(configuration["backend"])
+        CosimulationBenchmark._assert_configuration(configuration, backend)
+        config = backend["config"](output_base=output_base)
+        spiking_nodes_ids = list(range(configuration["number_of_spiking_nodes"]))
+
+        build_time = OrderedDict()
+        tic = perf_counter()
+        simulator = CosimulationBenchmark.build_tvb_simulator(configuration, config)
+        build_time["tvb_simulator"] = perf_counter() - tic
+
+        tic = perf_counter()
+        spiking_network = CosimulationBenchmark.build_spiking_network(configuration, backend, simulator,
+                                                                      spiking_nodes_ids, config)
+        build_time["spiking_network"] = perf_counter() - tic
+
+        tic = perf_counter()
+        interface = CosimulationBenchmark.build_interface(configuration, backend, simulator,
+                                                          spiking_network, spiking_nodes_ids, config)
+        build_time["interface"] = perf_counter() - tic
+
+        tic = perf_counter()
+        simulator.configure(interface)
+        build_time["configure"] = perf_counter() - tic
+        build_time["total"] = float(np.sum(list(build_time.values())))
+
+        profiler = interface.enable_profiler(CosimulationProfiler())
+        tic = perf_counter()
+        simulator.run(simulation_length=configuration["simulation_length"])
+        simulation_time = perf_counter() - tic
+        report = profiler.report()
+        interface.disable_profiler()
+
+        number_of_steps = report["number_of_steps"]
+        phases = OrderedDict()
+        for phase in profiler.phases:
+            phases[phase] = report[phase].get("mean", 0.0)
+        # The overhead of the co-simulation per step is the time spent on the TVB <-> Spiking Network exchange:
+        overhead = phases["tvb_to_spikeNet_transform"] + phases["tvb_to_spikeNet_set"] + \
+                   phases["spikeNet_readout"] + phases["spikeNet_to_tvb_write"]
+        spiking_network.close_pipeline()
+        number_of_events = CosimulationBenchmark._number_of_events(spiking_network)
+
+        getattr(spiking_network, backend["instance"]).Cleanup()
+
+        results = OrderedDict()
+        results["configuration"] = configuration
+        results["number_of_neurons"] = int(np.sum([population.number_of_neurons
+                                                   for node in spiking_network.brain_regions
+                                                   for population in node]))
+        results["build_time"] = build_time
+        results["simulation_time"] = simulation_time
+        results["number_of_steps"] = number_of_steps
+        results["per_step_time"] = simulation_time / np.maximum(1, number_of_steps)
+        results["per_step_overhead"] = overhead
+        results["per_step_phases"] = phases
+        results["number_of_events"] = int(number_of_events)
+        results["events_per_sec"] = number_of_events / simulation_time if simulation_time > 0.0 else 0.0
+        results["peak_rss_MB"] = peak_rss()
+        return results
+
+    def run(self):
+        """Method to run all the benchmark configurations, in order,
+           each one in a new process, if isolate is True.
+           Failures of single configurations are logged and reported as results with an "error" entry.
+           Returns:
+            the list of results' dictionaries
+        """
+        self.results = []
+        for configuration in self.configurations:
+            LOG.info("Running co-simulation benchmark configuration:\n%s" % str(dict(configuration)))
+            try:
+                if self.isolate:
+                    # A new process per configuration, with spawn to avoid inheriting any spiking simulator's state:
+                    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+                        results = pool.apply(CosimulationBenchmark.run_configuration,
+                                             (configuration, self.output_base))
+                else:
+                    results = self.run_configuration(configuration, self.output_base)
+            except Exception as e:
+                LOG.warning("Co-simulation benchmark configuration failed with error:\n%s" % str(e))
+                results = OrderedDict([("configuration", OrderedDict(configuration)), ("error", str(e))])
+            self.results.append(results)
+        return self.results
+
+    def to_json(self, filepath):
+        """Method to write the benchmark results to a json file."""
+        with open(filepath, "w") as file:
+            json.dump(self.results, file, indent=2)
+        return filepath
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="TVB - Spiking Network co-simulation scaling benchmarks.")
+    for name, default in DEFAULT_BENCHMARK_CONFIGURATION.items():
+        if isinstance(default, bool):
+            parser.add_argument("--%s" % name.replace("_", "-"), dest=name, nargs="+", type=int)
+        elif default is None:
+            parser.add_argument("--%s" % name.replace("_", "-"), dest=name, nargs="+", type=str)
+        else:
+            parser.add_argument("--%s" % name.replace("_", "-"), dest=name, nargs="+", type=type(default))
+    parser.add_argument("--output", default="cosimulation_benchmark.json",
+                        help="The json file to write the results to.")
+    parser.add_argument("--no-isolate", dest="isolate", action="store_false",
+                        help="Run all configurations in the current process.")
+    args = vars(parser.parse_args(args))
+    output = args.pop("output")
+    isolate = args.pop("isolate")
+    parameters = dict([(name, values) for name, values in args.items() if values is not None])
+    if "use_numba" in parameters:
+        parameters["use_numba"] = [bool(value) for value in parameters["use_numba"]]
+    benchmark = CosimulationBenchmark(configurations_grid(**parameters), isolate=isolate)
+    benchmark.run()
+    return benchmark.to_json(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import tempfile
+import multiprocessing
+from collections import OrderedDict
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+
+from tvb_multiscale.core.config import initialize_logger
+from tvb_multiscale.core.io.exchange_log import ExchangeLogReader
+from tvb_multiscale.benchmarks.backends import _import_class
+
+
+LOG = initialize_logger(__name__)
+
+
+DEFAULT_TVB_TO_SPIKING_DT_RATIOS = [1, 2, 4, 8]
+DEFAULT_MIN_DELAY_RATIOS = [1, 2, 4]
+
+DEFAULT_CONFIG_CLASS = "tvb_multiscale.tvb_nest.config:Config"
+
+
+def relative_rms_error(values, reference, smoothing_n_steps=1):
+    """This function computes the root mean square error of exchanged values from reference ones,
+       relative to the root mean square of the reference values.
+       Arguments:
+        values: an array of the exchanged values, of shape (number of TVB steps, number of values)
+        reference: an array of the reference exchanged values, of the same shape
+        smoothing_n_steps: the number of TVB steps of a moving average applied along time before the comparison,
+                           so that fluctuations of spiking activity faster than that are not counted as errors.
+                           Default = 1, i.e., no smoothing
+       Returns:
+        the relative RMS error (float)
+    """
+    n_steps = np.minimum(values.shape[0], reference.shape[0])
+    values = values[:n_steps]
+    reference = reference[:n_steps]
+    if values.size == 0:
+        return 0.0
+    if smoothing_n_steps > 1:
+        kernel = np.ones((smoothing_n_steps, )) / smoothing_n_steps
+        values = np.apply_along_axis(np.convolve, 0, values, kernel, mode="valid")
+        reference = np.apply_along_axis(np.convolve, 0, reference, kernel, mode="valid")
+    error = np.sqrt(np.mean((values - reference) ** 2))
+    norm = np.sqrt(np.mean(reference ** 2))
+    if norm > 0.0:
+        return float(error / norm)
+    return float(error)
+
+
+class DtCalibration(object):
+
+    """DtCalibration selects the ratio of the TVB integration time step to the spiking simulator's resolution
+       (Config.TVB_TO_SPIKING_DT_RATIO), and the ratio of the Spiking Network's minimum delay to its resolution
+       (Config.MIN_DELAY_RATIO), by running short trial co-simulations for every combination of candidate ratios.
+       For each trial, it measures
+        - the step throughput, i.e., the mean wall time per TVB step of the co-simulation, and
+        - the relative RMS error (see relative_rms_error) of the values exchanged between TVB and the Spiking Network
+          at every TVB step, recorded to an exchange log, from the ones of a fine resolution reference trial.
+       The recommended settings are the ones of the fastest trial with an error within the tolerance.
+       The co-simulations are built by the builder_fun, with signature:
+            builder_fun(config, **parameters) -> (a configured TVB co-simulator, its TVBSpikeNetInterface)
+       where config is an instance of the config_class of the Spiking Network backend,
+       with the ratios of the trial set, so that the spiking model builders compute the spiking simulator's resolution
+       and the default minimum delay from them.
+       If isolate is True, each trial runs in a new (spawned) process, so that it starts with a new spiking simulator
+       kernel, in which case the builder_fun has to be importable by the new process (i.e., defined at module level).
+    """
+
+    def __init__(self, builder_fun, parameters=None, simulation_length=100.0,
+                 tvb_to_spiking_dt_ratios=DEFAULT_TVB_TO_SPIKING_DT_RATIOS, min_delay_ratios=DEFAULT_MIN_DELAY_RATIOS,
+                 reference=None, tolerance=0.1, smoothing_n_steps=1, isolate=True, output_folder=None,
+                 config_class=DEFAULT_CONFIG_CLASS):
+        """Arguments:
+            builder_fun: the function building a configured TVB co-simulator and its interface
+            parameters: a dictionary of keyword arguments of the builder_fun. Default = None
+            simulation_length: the simulation length (ms) of the trials. Default = 100.0
+            tvb_to_spiking_dt_ratios: a list of the candidate TVB_TO_SPIKING_DT_RATIO values
+            min_delay_ratios: a list of the candidate MIN_DELAY_RATIO values
+            reference: the (TVB_TO_SPIKING_DT_RATIO, MIN_DELAY_RATIO) of the reference trial.
+                       Default = None, in which case the largest dt ratio and the smallest min delay ratio
+            tolerance: the maximum relative RMS error of the exchanged values from the reference ones. Default = 0.1
+            smoothing_n_steps: the number of TVB steps of the moving average applied before the comparison.
+                               Default = 1, i.e., no smoothing
+            isolate: if True, each trial runs in a new process. Default = True
+            output_folder: the folder to write the trials' outputs and exchange logs to.
+                           Default = None, in which case a temporary folder
+            config_class: the Config class of the Spiking Network backend, or a "module:class" string thereof.
+                          Default = the Config of tvb_nest
+        """
+        self.builder_fun = builder_fun
+        self.parameters = dict(parameters or {})
+        self.simulation_length = simulation_length
+        self.candidates = list(product(tvb_to_spiking_dt_ratios, min_delay_ratios))
+        if len(self.candidates) == 0:
+            raise ValueError("No candidate TVB_TO_SPIKING_DT_RATIO and MIN_DELAY_RATIO values given!")
+        if reference is None:
+            reference = (np.max(tvb_to_spiking_dt_ratios), np.min(min_delay_ratios))
+        self.reference = tuple(reference)
+        if tolerance < 0.0:
+            raise ValueError("The error tolerance %s cannot be negative!" % str(tolerance))
+        self.tolerance = tolerance
+        self.smoothing_n_steps = int(smoothing_n_steps)
+        self.isolate = isolate
+        if output_folder is None:
+            output_folder = os.path.join(tempfile.gettempdir(), "tvb_multiscale_dt_calibration")
+        self.output_folder = output_folder
+        self.config_class = config_class
+        self.reference_results = None
+        self.results = []
+        self.recommended = None
+
+    @staticmethod
+    def run_trial(builder_fun, parameters, tvb_to_spiking_dt_ratio, min_delay_ratio,
+                  simulation_length, output_folder, config_class=DEFAULT_CONFIG_CLASS):
+        """Method to build and run a trial co-simulation in the current process,
+           recording the exchanged values to an exchange log.
+           Returns:
+            an OrderedDict of the trial's settings, timings and exchange log filepath
+        """
+        label = "dt_ratio%s_min_delay_ratio%s" % (str(tvb_to_spiking_dt_ratio), str(min_delay_ratio))
+        folder = os.path.join(output_folder, label)
+        if isinstance(config_class, str):
+            config_class = _import_class(config_class)
+        config = config_class(output_base=folder)
+        config.TVB_TO_SPIKING_DT_RATIO = tvb_to_spiking_dt_ratio
+        config.MIN_DELAY_RATIO = min_delay_ratio
+        simulator, interface = builder_fun(config, **parameters)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        exchange_log_path = os.path.join(folder, "exchange_log")
+        interface.enable_exchange_log(exchange_log_path)
+        tic = perf_counter()
+        simulator.run(simulation_length=simulation_length)
+        simulation_time = perf_counter() - tic
+        header = interface.exchange_log_header()
+        interface.disable_exchange_log()
+        number_of_steps = int(np.round(simulation_length / header["dt"]))
+        results = OrderedDict()
+        results["tvb_to_spiking_dt_ratio"] = tvb_to_spiking_dt_ratio
+        results["min_delay_ratio"] = min_delay_ratio
+        results["tvb_dt"] = header["dt"]
+        results["min_delay"] = header["min_delay"]
+        results["simulation_time"] = simulation_time
+        results["number_of_steps"] = number_of_steps
+        results["per_step_time"] = simulation_time / np.maximum(1, number_of_steps)
+        results["exchange_log"] = exchange_log_path
+        return results
+
+    def _run_trial(self, tvb_to_spiking_dt_ratio, min_delay_ratio):
+        args = (self.builder_fun, self.parameters, tvb_to_spiking_dt_ratio, min_delay_ratio,
+                self.simulation_length, self.output_folder, self.config_class)
+        LOG.info("Running dt calibration trial with TVB_TO_SPIKING_DT_RATIO = %s and MIN_DELAY_RATIO = %s..."
+                 % (str(tvb_to_spiking_dt_ratio), str(min_delay_ratio)))
+        if self.isolate:
+            # A new process per trial, with spawn to avoid inheriting any spiking simulator's state:
+            with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+                return pool.apply(DtCalibration.run_trial, args)
+        return self.run_trial(*args)
+
+    def error(self, trial_results):
+        """Method to compute the relative RMS errors of the values exchanged in a trial from the reference ones.
+           Returns:
+            a tuple of the errors of the TVB -> Spiking Network values
+            and of the Spiking Network -> TVB values
+        """
+        trial = ExchangeLogReader(trial_results["exchange_log"])
+        reference = ExchangeLogReader(self.reference_results["exchange_log"])
+        return (relative_rms_error(trial.tvb_to_spikeNet, reference.tvb_to_spikeNet, self.smoothing_n_steps),
+                relative_rms_error(trial.spikeNet_to_tvb, reference.spikeNet_to_tvb, self.smoothing_n_steps))
+
+    def run(self):
+        """Method to run the reference trial and the trials of all candidate ratios,
+           and select the recommended ones.
+           Failures of single trials are logged and reported as results with an "error" entry.
+           Returns:
+            the list of the trials' results
+        """
+        self.reference_results = self._run_trial(*self.reference)
+        self.results = []
+        for tvb_to_spiking_dt_ratio, min_delay_ratio in self.candidates:
+            if (tvb_to_spiking_dt_ratio, min_delay_ratio) == self.reference:
+                results = OrderedDict(self.reference_results)
+            else:
+                try:
+                    results = self._run_trial(tvb_to_spiking_dt_ratio, min_delay_ratio)
+                except Exception as e:
+                    LOG.warning("Dt calibration trial failed with error:\n%s" % str(e))
+                    self.results.append(OrderedDict([("tvb_to_spiking_dt_ratio", tvb_to_spiking_dt_ratio),
+                                                     ("min_delay_ratio", min_delay_ratio),
+                                                     ("error", str(e))]))
+                    continue
+            results["tvb_to_spikeNet_error"], results["spikeNet_to_tvb_error"] = self.error(results)
+            results["within_tolerance"] = \
+                bool(np.maximum(results["tvb_to_spikeNet_error"], results["spikeNet_to_tvb_error"]) <= self.tolerance)
+            self.results.append(results)
+        self.recommended = self.recommend()
+        return self.results
+
+    def recommend(self):
+        """Method to select the results of the fastest trial with errors within the tolerance,
+           or those of the reference trial, if there is none.
+        """
+        trials = [results for results in self.results if results.get("within_tolerance", False)]
+        if len(trials) == 0:
+            LOG.warning("No trial is within the error tolerance %s! Recommending the reference settings."
+                        % str(self.tolerance))
+            return self.reference_results
+        return trials[int(np.argmin([results["per_step_time"] for results in trials]))]
+
+    def apply(self, config):
+        """Method to set the recommended TVB_TO_SPIKING_DT_RATIO and MIN_DELAY_RATIO to a Config instance,
+           to be used by the spiking model and interface builders.
+           Returns:
+            the config
+        """
+        if self.recommended is None:
+            raise ValueError("There are no recommended settings! Run the dt calibration first!")
+        config.TVB_TO_SPIKING_DT_RATIO = self.recommended["tvb_to_spiking_dt_ratio"]
+        config.MIN_DELAY_RATIO = self.recommended["min_delay_ratio"]
+        return config
+
+    def to_json(self, filepath):
+        """Method to write the dt calibration results to a json file."""
+        with open(filepath, "w") as file:
+            json.dump({"reference": self.reference_results, "tolerance": self.tolerance,
+                       "recommended": self.recommended, "trials": self.results},
+                      file, indent=2, default=float)
+        return filepath
@@ -10,13 +10,13 @@ from xarray import DataArray
 from tvb_multiscale.core.config import initialize_logger
 from tvb_multiscale.core.spiking_models.network import SpikingNetwork
 from tvb_multiscale.core.utils.data_structures_utils import cross_dimensions_and_coordinates_MultiIndex, \
-    get_ordered_dimensions, get_caller_fun_name
+    get_ordered_dimensions, get_caller_fun_name, group_events
 
 from tvb.basic.neotraits.api import HasTraits, Attr, Float
 from tvb.datatypes import connectivity
 
 from tvb.contrib.scripts.utils.data_structures_utils import \
-    ensure_list, concatenate_heterogeneous_DataArrays, sort_events_by_x_and_y
+    ensure_list, concatenate_heterogeneous_DataArrays
 from tvb.contrib.scripts.datatypes.time_series_xarray import TimeSeries, TimeSeriesRegion
 
 
@@ -557,17 +557,20 @@ class SpikingNetworkAnalyser(HasTraits):
             rate_method = self.compute_rate_time_series
         res_type = self._get_comput_res_type(rate_method) + "_by_neuron"
         if "times" in spikes.keys():
-            spikes_times_by_neuron = Series(sort_events_by_x_and_y(spikes, x="senders", y="times"))
+            # Group the spikes' times by sender neuron, as slices of a single sorted array:
+            neurons, offsets, times = group_events(spikes, x="senders", y="times")
+            neurons = neurons.tolist()
+            spikes_times_by_neuron = [times[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
         else:
-            spikes_times_by_neuron = spikes
-        neurons = list(spikes_times_by_neuron.keys())
-        spikes_times_by_neuron = list(spikes_times_by_neuron.values)
+            neurons = list(spikes.keys())
+            spikes_times_by_neuron = list(spikes.values)
+        n_spiking_neurons = len(spikes_times_by_neuron)
         rates = OrderedDict()
         if len(neurons) < number_of_neurons:
             neurons = np.arange(number_of_neurons)
         for i_neuron, neuron in enumerate(neurons):
-            if len(spikes_times_by_neuron):
-                spikes_times = spikes_times_by_neuron.pop(0)
+            if i_neuron < n_spiking_neurons:
+                spikes_times = spikes_times_by_neuron[i_neuron]
             else:
                 spikes_times = []
             rates[neuron] = \
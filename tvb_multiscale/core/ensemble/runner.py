@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import tempfile
+import multiprocessing
+from collections import OrderedDict
+from contextlib import contextmanager
+from importlib import import_module
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+
+from tvb_multiscale.core.config import initialize_logger
+
+from tvb.contrib.scripts.utils.file_utils import safe_makedirs
+
+
+LOG = initialize_logger(__name__)
+
+
+# The environment variables limiting the threads of the numerical libraries of each ensemble worker process:
+THREADS_ENVIRONMENT_VARIABLES = ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMBA_NUM_THREADS"]
+
+DEFAULT_CONFIG_CLASS = "tvb_multiscale.tvb_nest.config:Config"
+
+
+def parameters_grid(**parameters):
+    """This function generates the parameters of the ensemble members for all combinations of the input values.
+       Arguments:
+        **parameters: keyword arguments of the parameters of the ensemble members' builder function,
+                      each one a single value or a list of values
+       Returns:
+        a list of parameters' dictionaries
+    """
+    names = list(parameters.keys())
+    values = [value if isinstance(value, (list, tuple)) else [value] for value in parameters.values()]
+    return [OrderedDict(zip(names, combination)) for combination in product(*values)]
+
+
+def configure_kernel(config, local_num_threads=1, seed=None):
+    """This function sets the number of threads and the seeds of the spiking simulator's kernel
+       to the default kernel configuration of a configuration instance.
+       The default kernel configuration is copied, so that the class attribute is not modified.
+       Arguments:
+        config: a Config instance of a Spiking Network backend
+        local_num_threads: the number of threads of the spiking simulator. Default = 1
+        seed: the seed (integer) of the random number generators of the spiking simulator.
+              Default = None, in which case the seeds of the default kernel configuration are kept
+       Returns:
+        the config
+    """
+    if hasattr(config, "DEFAULT_NEST_KERNEL_CONFIG"):
+        kernel_config = dict(config.DEFAULT_NEST_KERNEL_CONFIG)
+        kernel_config["local_num_threads"] = local_num_threads
+        if seed is None:
+            first_seed = kernel_config.get("grng_seed", 1)
+        else:
+            # The seeds are spaced by the number of random streams, i.e., the global one and one per thread,
+            # so that the streams of distinct seeds never overlap:
+            first_seed = seed * (local_num_threads + 1) + 1
+        # One seed per virtual process:
+        kernel_config["grng_seed"] = first_seed
+        kernel_config["rng_seeds"] = range(first_seed + 1, first_seed + 1 + local_num_threads)
+        config.DEFAULT_NEST_KERNEL_CONFIG = kernel_config
+    if hasattr(config, "DEFAULT_NUMPY_KERNEL_CONFIG") and seed is not None:
+        kernel_config = dict(config.DEFAULT_NUMPY_KERNEL_CONFIG)
+        kernel_config["rng_seed"] = seed
+        config.DEFAULT_NUMPY_KERNEL_CONFIG = kernel_config
+    return config
+
+
+@contextmanager
+def limited_threads(local_num_threads):
+    """Context manager limiting the threads of the numerical libraries of the processes started within it,
+       by setting the THREADS_ENVIRONMENT_VARIABLES, which the spawned processes inherit.
+    """
+    previous = dict([(name, os.environ.get(name, None)) for name in THREADS_ENVIRONMENT_VARIABLES])
+    for name in THREADS_ENVIRONMENT_VARIABLES:
+        os.environ[name] = str(local_num_threads)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _import_class(path):
+    module, name = path.split(":")
+    return getattr(import_module(module), name)
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class EnsembleRunner(object):
+
+    """EnsembleRunner runs an ensemble of independent TVB - Spiking Network co-simulations,
+       which differ only in some parameters (e.g., seeds, the global coupling scaling G, or interface weights),
+       in a pool of worker processes.
+       Each member runs in a new (spawned) process, with its own spiking simulator kernel,
+       which is configured with local_num_threads threads and, if the member's parameters include a "seed",
+       with that seed (see configure_kernel).
+       The numerical libraries of the workers are also limited to local_num_threads threads,
+       so that n_workers * local_num_threads does not exceed the available cores.
+       The co-simulations are built by the builder_fun, a function which has to be importable by the workers
+       (i.e., defined at module level), with signature:
+            builder_fun(config, **parameters) -> a configured TVB co-simulator
+       where config is an instance of the config_class of the Spiking Network backend,
+       with its output folder set to the member's folder.
+       The results of each member, i.e., the time and data of each TVB monitor, are written to the file
+       member_<member_id>/results.npz of the output_folder, as soon as the member completes,
+       and the ensemble's manifest, i.e., the parameters, timings and results' file (or error) of each member,
+       to the file ensemble.json of the output_folder.
+    """
+
+    def __init__(self, builder_fun, parameters=None, simulation_length=None,
+                 local_num_threads=1, n_workers=None, output_folder=None, config_class=DEFAULT_CONFIG_CLASS):
+        """Arguments:
+            builder_fun: the (module level) function building a configured TVB co-simulator of a member
+            parameters: a list of dictionaries of the parameters of the members, e.g., generated by parameters_grid.
+                        Default = None, corresponding to a single member with the default parameters
+            simulation_length: the simulation length (ms) of the members' co-simulations.
+                               Default = None, in which case the co-simulators' simulation_length is used
+            local_num_threads: the number of threads of each worker. Default = 1
+            n_workers: the number of worker processes.
+                       Default = None, in which case as many as fit in the available cores with local_num_threads
+            output_folder: the folder to write the results to. Default = None, in which case a temporary folder
+            config_class: the Config class of the Spiking Network backend, or a "module:class" string thereof.
+                          Default = the Config of tvb_nest
+        """
+        self.builder_fun = builder_fun
+        if parameters is None:
+            parameters = [OrderedDict()]
+        self.parameters = list(parameters)
+        self.simulation_length = simulation_length
+        if local_num_threads < 1:
+            raise ValueError("The number of threads of each worker (local_num_threads = %s) has to be positive!"
+                             % str(local_num_threads))
+        self.local_num_threads = int(local_num_threads)
+        if n_workers is None:
+            n_workers = np.maximum(1, multiprocessing.cpu_count() // self.local_num_threads)
+        self.n_workers = int(np.minimum(n_workers, np.maximum(1, len(self.parameters))))
+        if output_folder is None:
+            output_folder = os.path.join(tempfile.gettempdir(), "tvb_multiscale_ensemble")
+        self.output_folder = output_folder
+        self.config_class = config_class
+        self.results = []
+
+    @property
+    def number_of_members(self):
+        return len(self.parameters)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.output_folder, "ensemble.json")
+
+    @staticmethod
+    def member_folder(output_folder, member_id):
+        return os.path.join(output_folder, "member_%05d" % member_id)
+
+    @staticmethod
+    def write_member_results(filepath, results):
+        """Method to write the results of a co-simulation, i.e., a (time, data) tuple per TVB monitor,
+           to a npz file, with the time and data of the i-th monitor as "time_i" and "data_i" arrays.
+        """
+        arrays = OrderedDict([("number_of_monitors", np.array(len(results)))])
+        for i_monitor, result in enumerate(results):
+            if result is None:
+                continue
+            arrays["time_%d" % i_monitor] = np.asarray(result[0])
+            arrays["data_%d" % i_monitor] = np.asarray(result[1])
+        np.savez(filepath, **arrays)
+        return filepath
+
+    @staticmethod
+    def read_member_results(filepath):
+        """Method to read the results of a co-simulation, written by write_member_results.
+           Returns:
+            a list of (time, data) tuples per TVB monitor, with None for monitors without results
+        """
+        with np.load(filepath) as arrays:
+            results = []
+            for i_monitor in range(int(arrays["number_of_monitors"])):
+                if "time_%d" % i_monitor in arrays.files:
+                    results.append((arrays["time_%d" % i_monitor], arrays["data_%d" % i_monitor]))
+                else:
+                    results.append(None)
+        return results
+
+    @staticmethod
+    def run_member(builder_fun, member_id, parameters, simulation_length=None, local_num_threads=1,
+                   output_folder=None, config_class=DEFAULT_CONFIG_CLASS):
+        """Method to build, run and write the results of a single member of the ensemble.
+           Failures are reported in an "error" entry of the returned summary, instead of being raised,
+           so that they do not stop the rest of the ensemble.
+           Returns:
+            a dictionary summarizing the member: its id, parameters, folder, results' file and timings
+        """
+        summary = OrderedDict([("member_id", member_id), ("parameters", OrderedDict(parameters))])
+        folder = EnsembleRunner.member_folder(output_folder, member_id)
+        summary["folder"] = folder
+        try:
+            safe_makedirs(folder)
+            if isinstance(config_class, str):
+                config_class = _import_class(config_class)
+            config = configure_kernel(config_class(output_base=folder), local_num_threads,
+                                      parameters.get("seed", None))
+            tic = perf_counter()
+            simulator = builder_fun(config, **parameters)
+            summary["build_time"] = perf_counter() - tic
+            tic = perf_counter()
+            if simulation_length is None:
+                results = simulator.run()
+            else:
+                results = simulator.run(simulation_length=simulation_length)
+            summary["simulation_time"] = perf_counter() - tic
+            summary["results"] = EnsembleRunner.write_member_results(os.path.join(folder, "results.npz"), results)
+        except Exception as e:
+            summary["error"] = "%s: %s" % (type(e).__name__, str(e))
+        return summary
+
+    @staticmethod
+    def _run_member(args):
+        return EnsembleRunner.run_member(*args)
+
+    def _write_manifest(self):
+        with open(self.manifest_path, "w") as file:
+            json.dump(self.results, file, indent=2, default=_json_default)
+
+    def run(self):
+        """Method to run all the members of the ensemble in the pool of workers.
+           The manifest is rewritten every time a member completes, so that it reflects the ensemble's progress.
+           Returns:
+            the list of the members' summaries, in the order of the members
+        """
+        safe_makedirs(self.output_folder)
+        self.results = []
+        tasks = [(self.builder_fun, member_id, parameters, self.simulation_length, self.local_num_threads,
+                  self.output_folder, self.config_class)
+                 for member_id, parameters in enumerate(self.parameters)]
+        LOG.info("Running an ensemble of %d co-simulations with %d workers of %d threads each..."
+                 % (self.number_of_members, self.n_workers, self.local_num_threads))
+        with limited_threads(self.local_num_threads):
+            # Spawned processes with one task each, so that every member starts with a new spiking simulator kernel:
+            with multiprocessing.get_context("spawn").Pool(self.n_workers, maxtasksperchild=1) as pool:
+                for summary in pool.imap_unordered(EnsembleRunner._run_member, tasks):
+                    if "error" in summary:
+                        LOG.warning("Ensemble member %d failed with error:\n%s"
+                                    % (summary["member_id"], summary["error"]))
+                    else:
+                        LOG.info("Ensemble member %d completed." % summary["member_id"])
+                    self.results.append(summary)
+                    self._write_manifest()
+        self.results = sorted(self.results, key=lambda summary: summary["member_id"])
+        self._write_manifest()
+        return self.results
@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 
 from collections import OrderedDict
+from operator import attrgetter
+from time import perf_counter
 
 import numpy as np
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger, LINE
 from tvb_multiscale.core.spiking_models.devices import \
     InputDeviceDict, OutputDeviceDict, OutputSpikeDeviceDict, OutputContinuousTimeDeviceDict
+from tvb_multiscale.core.io.exchange_log import ExchangeLogWriter
+from tvb_multiscale.core.utils.profiling_utils import CosimulationProfiler
+from tvb_multiscale.core.utils.transforms_utils import transform_kernel, transform_kernel_from_function
 
 from tvb.contrib.scripts.utils.data_structures_utils \
     import is_integer, concatenate_heterogeneous_DataArrays
@@ -43,6 +48,47 @@ class TVBSpikeNetInterface(object):
     spikeNet_to_tvb_sv_interfaces_ids = []
     spikeNet_to_tvb_params = OrderedDict()
 
+    transforms = {}
+    # The weights of the transformations set as weights (and not as functions) by the builder,
+    # which are fused with the interfaces' scales in the exchange plan:
+    transforms_weights = {}
+    # The fused (possibly numba jitted) kernels of the TVB -> Spiking Network transformations set as weights,
+    # of signature kernel(values, nodes_ids, scale), see tvb_multiscale.core.utils.transforms_utils:
+    transforms_kernels = {}
+
+    # The exchange plans, compiled once by configure(), and followed at every time step:
+    _tvb_to_spikeNet_plan = None
+    _spikeNet_to_tvb_plan = None
+
+    # The number of TVB time steps of each synchronization window of TVB and the Spiking Network.
+    # For synchronization_n_steps > 1, TVB -> Spiking Network values are buffered and sent as schedules,
+    # and the Spiking Network -> TVB values, read at the end of each window,
+    # are held for the TVB time steps of the next window:
+    synchronization_n_steps = 1
+    _synchronization_step = 0
+    _tvb_to_spikeNet_buffers = []
+    _spikeNet_to_tvb_values = []
+
+    # For TVB -> Spiking Network interfaces with a tolerance (not None), and synchronization_n_steps == 1,
+    # only the values of the nodes that changed by more than the tolerance since they were last set are set,
+    # via interface.set(values, mask), and the setting is skipped entirely if no value changed:
+    _tvb_to_spikeNet_tolerances = []
+    _tvb_to_spikeNet_last_values = []
+
+    # In pipelined mode, the Spiking Network simulation of a window,
+    # as well as the reading of its output values, run on a worker thread, overlapping with TVB integration.
+    # Then, the Spiking Network -> TVB values are lagging by one more synchronization window:
+    pipelined = False
+    _pipelined_values = []
+    _pipelined_ready_values = []
+
+    # An optional CosimulationProfiler, shared with the Spiking Network, see enable_profiler():
+    profiler = None
+
+    # An optional ExchangeLogWriter, recording the values exchanged at every TVB time step,
+    # see enable_exchange_log():
+    exchange_log = None
+
     def __init__(self, config=CONFIGURED):
         self.config = config
         LOG.info("%s created!" % self.__class__)
@@ -119,53 +165,303 @@ class TVBSpikeNetInterface(object):
                 self.spikeNet_to_tvb_params[interface.name] += interface.nodes_ids
             self.spikeNet_to_tvb_params[interface.name] = \
                 np.unique(self.spikeNet_to_tvb_params[interface.name]).tolist()
+        self.compile_exchange_plan()
+        self.configure_synchronization()
+
+    def _tvb_to_spikeNet_transform(self, interface):
+        # Returns whether the source is the TVB state (or the coupling),
+        # the index of the source variable, and the name of the transformation for this interface
+        if interface.model in self._available_input_devices:
+            # if we need the state variable
+            if interface.model in self._current_input_devices:
+                # We assume that current is a mean field quantity
+                # applied equally and in parallel
+                # to all target neurons of the spiking populations
+                # This is why no scaling has been applied
+                # for the synaptic weight from the dc_generator device, representing a TVB node,
+                # to the target spiking node
+                # For this output TVB state variable:
+                # ...transmit it to the corresponding devices of the spiking network,
+                # ...which represent each TVB node
+                return True, interface.tvb_sv_id, "tvb_to_current"
+            elif interface.model in self._spike_rate_input_devices:
+                # Rate is already a meanfield quantity.
+                # All neurons of the target spiking populations
+                # will receive the same spike rate.
+                # No further scaling is required with the population size (number of neurons)
+                # For this output TVB state variable:
+                # ...convert to spiking rate for every TVB node...
+                return True, interface.tvb_sv_id, "tvb_to_spike_rate"
+        elif interface.model in PARAMETERS:
+            if interface.model == "current":
+                # We assume that current is a mean field quantity
+                # applied equally and in parallel
+                # to all target neurons of the spiking populations
+                # Instantaneous transmission. TVB history is used to buffer delayed communication.
+                return False, interface.tvb_coupling_id, "tvb_to_current"
+            elif interface.model == "potential":
+                # We assume that potential is a mean field quantity
+                # applied equally and in parallel
+                # to all target neurons of the spiking populations
+                # Instantaneous transmission. TVB history is used to buffer delayed communication.
+                return False, interface.tvb_coupling_id, "tvb_to_potential"
+        raise ValueError("Interface model %s is not supported yet!" % interface.model)
+
+    def _spikeNet_to_tvb_transform(self, interface):
+        # Returns the name of the interface property to read the Spiking Network values from,
+        # and the name of the transformation for this interface
+        if interface.model in self._spike_rate_output_devices:
+            # The number of spikes has to be converted to a spike rate via division:
+            #  by the total number of neurons to convert it to a mean field quantity,
+            #  and by the time step dt, which is already included in the spikes_to_tvb scaling.
+            # Instantaneous transmission. TVB history is used to buffer delayed communication.
+            return "population_mean_spikes_number", "spikes_to_tvb"
+        elif interface.model in self._voltmeter_output_devices:
+            # Instantaneous transmission. TVB history is used to buffer delayed communication.
+            return "current_population_mean_values", "potential_to_tvb"
+        elif interface.model in self._multimeter_output_devices:
+            # Instantaneous transmission. TVB history is used to buffer delayed communication.
+            return "current_population_mean_values", "spikes_var_to_tvb"
+        # TODO: add any other possible Spiking Network output devices to TVB parameters interfaces here!
+        raise ValueError("Interface model %s is not supported yet!" % interface.model)
+
+    def _fuse_scale(self, interface, transform, nodes_ids):
+        # General form: interface_scale_weight * transformation_of(values)
+        # If the transformation is a weight, it is fused with the interface scale,
+        # and no transformation function is needed at every time step.
+        weights = self.transforms_weights.get(transform, None)
+        if weights is None:
+            return np.array(interface.scale), self.transforms[transform]
+        return np.array(interface.scale) * np.array(weights)[nodes_ids], None
+
+    def _assert_tolerance(self, interface):
+        # Values can be left unset only for interfaces the values of which hold until they are set again:
+        tolerance = getattr(interface, "tolerance", None)
+        if tolerance is not None:
+            if not getattr(interface, "_persistent_values", False):
+                raise ValueError("Interface %s of model %s cannot skip setting unchanged values, "
+                                 "because its values do not hold until they are set again!"
+                                 % (interface.name, interface.model))
+            if tolerance < 0.0:
+                raise ValueError("tolerance=%g of interface %s is negative!" % (tolerance, interface.name))
+        return tolerance
+
+    def compile_exchange_plan(self):
+        """This method compiles once the TVB <-> Spiking Network exchange plan,
+           i.e., for every interface, the source or target TVB variable index,
+           the nodes' indices array, the scale vector (fused with the transformation weights, if any),
+           the transformation kernel (TVB -> Spiking Network), and a direct reference to the setter (TVB -> Spiking Network),
+           or the getter (Spiking Network -> TVB), of the interface,
+           so that each time step exchange is reduced to a few vectorized operations.
+        """
+        self._tvb_to_spikeNet_plan = []
+        self._tvb_to_spikeNet_tolerances = []
+        for interface in self.tvb_to_spikeNet_interfaces:
+            from_state, var_id, transform = self._tvb_to_spikeNet_transform(interface)
+            self._tvb_to_spikeNet_tolerances.append(self._assert_tolerance(interface))
+            nodes_ids = np.array(interface.nodes_ids).astype("i")
+            scale, transform_fun = self._fuse_scale(interface, transform, nodes_ids)
+            if transform_fun is None:
+                kernel = self.transforms_kernels.get(transform, None)
+                if kernel is None:
+                    kernel = transform_kernel(use_numba=False)
+                # A contiguous float vector of scales, one per node, as expected by the jitted kernels:
+                scale = np.ascontiguousarray(np.broadcast_to(scale, nodes_ids.shape), dtype="f8")
+            else:
+                kernel = transform_kernel_from_function(transform_fun)
+            self._tvb_to_spikeNet_plan.append((from_state, var_id, nodes_ids, scale, kernel, interface.set,
+                                               getattr(interface, "set_schedule", None)))
+        self._spikeNet_to_tvb_plan = []
+        spikeNet_to_tvb_interfaces = list(self.spikeNet_to_tvb_interfaces)
+        for interface_id in self.spikeNet_to_tvb_sv_interfaces_ids:
+            interface = spikeNet_to_tvb_interfaces[interface_id]
+            values_property, transform = self._spikeNet_to_tvb_transform(interface)
+            nodes_ids = np.array(interface.nodes_ids).astype("i")
+            scale, transform_fun = self._fuse_scale(interface, transform, nodes_ids)
+            if values_property == "population_mean_spikes_number":
+                # Spikes are counted over a whole synchronization window. Scale them to a count per TVB time step:
+                scale = scale / self.synchronization_n_steps
+            self._spikeNet_to_tvb_plan.append((interface, attrgetter(values_property),
+                                               interface.tvb_sv_id, nodes_ids, scale, transform_fun))
+
+    def configure_synchronization(self):
+        """This method prepares the buffers for synchronization windows of synchronization_n_steps TVB time steps,
+           and sets the same synchronization windows to the Spiking Network.
+           Only interfaces that can set schedules of values can be used for synchronization_n_steps > 1.
+        """
+        self.synchronization_n_steps = int(self.synchronization_n_steps)
+        if self.synchronization_n_steps < 1:
+            raise ValueError("synchronization_n_steps=%d is not a positive integer!" % self.synchronization_n_steps)
+        if self.synchronization_n_steps > 1:
+            for interface in self.tvb_to_spikeNet_interfaces:
+                if not hasattr(interface, "set_schedule"):
+                    raise ValueError("Interface %s of model %s cannot set schedules of values "
+                                     "for synchronization windows of %d TVB time steps!"
+                                     % (interface.name, interface.model, self.synchronization_n_steps))
+        self._synchronization_step = 0
+        self._tvb_to_spikeNet_buffers = [np.zeros((self.synchronization_n_steps, len(plan[2])))
+                                         for plan in self._tvb_to_spikeNet_plan]
+        # NaN values, so that all values are set the first time:
+        self._tvb_to_spikeNet_last_values = [np.full((len(plan[2]), ), np.nan)
+                                             for plan in self._tvb_to_spikeNet_plan]
+        self._spikeNet_to_tvb_values = [np.zeros((len(plan[3]), ))
+                                        for plan in self._spikeNet_to_tvb_plan]
+        self._pipelined_values = list(self._spikeNet_to_tvb_values)
+        self._pipelined_ready_values = list(self._spikeNet_to_tvb_values)
+        if self.spiking_network is not None:
+            self.spiking_network.synchronization_n_steps = self.synchronization_n_steps
+            self.spiking_network.pipelined = self.pipelined
+            if self.pipelined:
+                self.spiking_network.pipeline_callback = self._read_pipelined_values
+                self.spiking_network.reset_pipeline()
+            else:
+                self.spiking_network.pipeline_callback = None
+
+    def _read_spikeNet_values(self):
+        # Read and transform the Spiking Network -> TVB values of all interfaces
+        values = []
+        for interface, get_values, sv_id, nodes_ids, scale, transform_fun in self._spikeNet_to_tvb_plan:
+            if transform_fun is None:
+                values.append(scale * get_values(interface))
+            else:
+                values.append(scale * transform_fun(get_values(interface), nodes_ids))
+        return values
+
+    def enable_profiler(self, profiler=None):
+        """Method to enable the profiling of the co-simulation phases of every step.
+           Arguments:
+            profiler: a CosimulationProfiler instance. Default = None, in which case a new one is created.
+           Returns:
+            the CosimulationProfiler instance, shared by this interface and the Spiking Network.
+        """
+        if profiler is None:
+            profiler = CosimulationProfiler()
+        self.profiler = profiler
+        self.spiking_network.profiler = profiler
+        return profiler
+
+    def disable_profiler(self):
+        """Method to disable the profiling of the co-simulation phases.
+           Returns:
+            the CosimulationProfiler instance, if any.
+        """
+        profiler = self.profiler
+        self.profiler = None
+        self.spiking_network.profiler = None
+        return profiler
+
+    def exchange_log_header(self):
+        """Method to return the header of an exchange log of this interface,
+           i.e., the layout of the exchanged values and the co-simulation settings."""
+        if self._tvb_to_spikeNet_plan is None:
+            self.compile_exchange_plan()
+            self.configure_synchronization()
+        return {"dt": float(self.dt),
+                "synchronization_n_steps": int(self.synchronization_n_steps),
+                "tvb_to_spikeNet_sizes": [int(len(plan[2])) for plan in self._tvb_to_spikeNet_plan],
+                "spikeNet_to_tvb_layout": [(int(plan[2]), np.array(plan[3]).tolist())
+                                           for plan in self._spikeNet_to_tvb_plan],
+                "spikeNet_to_tvb_params": OrderedDict([(name, np.array(nodes_ids).tolist())
+                                                       for name, nodes_ids in self.spikeNet_to_tvb_params.items()]),
+                "tvb_nodes_ids": np.array(self.tvb_nodes_ids).tolist(),
+                "spiking_nodes_ids": np.array(self.spiking_nodes_ids).tolist(),
+                "min_delay": float(self.spiking_network.min_delay)}
+
+    def enable_exchange_log(self, filepath, dtype="f8"):
+        """Method to enable the recording of the values passed to the TVB -> Spiking Network interfaces,
+           and of the values written to the TVB state from the Spiking Network, at every TVB time step,
+           to an exchange log, which can be replayed to either side via tvb_multiscale.core.interfaces.replay.
+           Arguments:
+            filepath: the base filepath of the exchange log files
+            dtype: the numpy data type of the logged values. Default = "f8"
+           Returns:
+            the ExchangeLogWriter instance
+        """
+        self.disable_exchange_log()
+        self.exchange_log = ExchangeLogWriter(filepath, self.exchange_log_header(), dtype)
+        return self.exchange_log
+
+    def disable_exchange_log(self):
+        """Method to stop the recording of the exchanged values and close the exchange log, if any.
+           Returns:
+            the ExchangeLogWriter instance, if any.
+        """
+        exchange_log = self.exchange_log
+        self.exchange_log = None
+        if exchange_log is not None:
+            exchange_log.close()
+        return exchange_log
+
+    def _read_pipelined_values(self):
+        # Called on the worker thread, right after the Spiking Network simulation of a window:
+        self._pipelined_values = self._read_spikeNet_values()
+
+    @property
+    def pipeline_overlap(self):
+        """The fraction of the Spiking Network simulation time overlapped with TVB integration in pipelined mode."""
+        return self.spiking_network.pipeline_overlap
+
+    def _wait_pipelined(self):
+        # In pipelined mode, at the last TVB time step of a synchronization window,
+        # wait for the Spiking Network simulation of the previous window to complete,
+        # before setting any new input to it, and get the values read after it:
+        if self.pipelined and self._synchronization_step == self.synchronization_n_steps - 1:
+            profiler = self.profiler
+            if profiler is not None:
+                tic = perf_counter()
+            self.spiking_network.wait()
+            if profiler is not None:
+                profiler.add("spikeNet_wait", perf_counter() - tic)
+            self._pipelined_ready_values = self._pipelined_values
+
+    def _set_spikeNet_values(self, i_plan, values, set_values, set_schedule):
+        # Set the values to the TVB -> Spiking Network interface of the i_plan-th entry of the exchange plan
+        if self.exchange_log is not None:
+            self.exchange_log.write_tvb_to_spikeNet(values)
+        if self.synchronization_n_steps == 1:
+            tolerance = self._tvb_to_spikeNet_tolerances[i_plan]
+            if tolerance is None:
+                set_values(values)
+            else:
+                # Set only the values that changed by more than the tolerance since they were last set:
+                last_values = self._tvb_to_spikeNet_last_values[i_plan]
+                mask = ~(np.abs(values - last_values) <= tolerance)
+                if mask.all():
+                    set_values(values)
+                elif mask.any():
+                    set_values(values, mask)
+                last_values[mask] = values[mask]
+        else:
+            # Buffer the values, and send them as a schedule at the last TVB time step of the window:
+            self._tvb_to_spikeNet_buffers[i_plan][self._synchronization_step] = values
+            if self._synchronization_step == self.synchronization_n_steps - 1:
+                set_schedule(self._tvb_to_spikeNet_buffers[i_plan])
 
     def tvb_state_to_spikeNet(self, state, coupling, stimulus):
         # Apply TVB -> Spiking Network input at time t before integrating time step t -> t+dt
-        for interface in self.tvb_to_spikeNet_interfaces:
-            if interface.model in self._available_input_devices:
-                values = state[interface.tvb_sv_id].squeeze()  # if we need the state variable
-                if interface.model in self._current_input_devices:
-                    transform_fun = self.transforms["tvb_to_current"]
-                    # We assume that current is a mean field quantity
-                    # applied equally and in parallel
-                    # to all target neurons of the spiking populations
-                    # This is why no scaling has been applied
-                    # for the synaptic weight from the dc_generator device, representing a TVB node,
-                    # to the target spiking node
-                    # For this output TVB state variable:
-                    # ...transmit it to the corresponding devices of the spiking network,
-                    # ...which represent each TVB node
-                elif interface.model in self._spike_rate_input_devices:
-                    # Rate is already a meanfield quantity.
-                    # All neurons of the target spiking populations
-                    # will receive the same spike rate.
-                    # No further scaling is required with the population size (number of neurons)
-                    # For this output TVB state variable:
-                    # ...convert to spiking rate for every TVB node..
-                    # For this output TVB state variable:
-                    # ...convert to spiking rate for every TVB node...
-                    transform_fun = self.transforms["tvb_to_spike_rate"]
-            elif interface.model in PARAMETERS:
-                values = coupling[interface.tvb_coupling_id].squeeze()
-                if interface.model == "current":
-                    transform_fun = self.transforms["tvb_to_current"]
-                    # We assume that current is a mean field quantity
-                    # applied equally and in parallel
-                    # to all target neurons of the spiking populations
-                    # Instantaneous transmission. TVB history is used to buffer delayed communication.
-                elif interface.model == "potential":
-                    transform_fun = self.transforms["tvb_to_potential"]
-                    # We assume that potential is a mean field quantity
-                    # applied equally and in parallel
-                    # to all target neurons of the spiking populations
-                    # Instantaneous transmission. TVB history is used to buffer delayed communication.
+        if self._tvb_to_spikeNet_plan is None:
+            self.compile_exchange_plan()
+            self.configure_synchronization()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.add_since_mark("tvb_other")
+            profiler.start_step()
+        self._wait_pipelined()
+        for i_plan, (from_state, var_id, nodes_ids, scale, kernel, set_values, set_schedule) \
+                in enumerate(self._tvb_to_spikeNet_plan):
+            if profiler is not None:
+                tic = perf_counter()
+            if from_state:
+                values = state[var_id].squeeze()
             else:
-                raise ValueError("Interface model %s is not supported yet!" % interface.model)
-            # General form: interface_scale_weight * transformation_of(TVB_state_values)
-            values = interface.scale * \
-                     transform_fun(values, interface.nodes_ids)
-            interface.set(values)
+                values = coupling[var_id].squeeze()
+            values = kernel(values, nodes_ids, scale)
+            if profiler is not None:
+                toc = perf_counter()
+                profiler.add("tvb_to_spikeNet_transform", toc - tic)
+            self._set_spikeNet_values(i_plan, values, set_values, set_schedule)
+            if profiler is not None:
+                profiler.add("tvb_to_spikeNet_set", perf_counter() - toc)
 
     # Deprecated
     # def spikeNet_state_to_tvb_parameter(self, model):
@@ -196,28 +492,31 @@ class TVBSpikeNetInterface(object):
 
     def spikeNet_state_to_tvb_state(self, state):
         # Apply Spiking Network -> TVB state input at time t+dt after integrating time step t -> t+dt
-        for interface_id in self.spikeNet_to_tvb_sv_interfaces_ids:
-            interface = self.spikeNet_to_tvb_interfaces[interface_id]
-            # Update TVB state
-            if interface.model in self._spike_rate_output_devices:
-                # The number of spikes has to be converted to a spike rate via division:
-                #  by the total number of neurons to convert it to a mean field quantity,
-                #  and by the time step dt, which is already included in the spikes_to_tvb scaling.
-                # Instantaneous transmission. TVB history is used to buffer delayed communication.
-                transform_fun = self.transforms["spikes_to_tvb"]
-                values = interface.population_mean_spikes_number
-            elif interface.model == self._multimeter_output_devices:
-                # Instantaneous transmission. TVB history is used to buffer delayed communication.
-                transform_fun = self.transforms["spikes_sv_to_tvb"]
-                values = interface.current_population_mean_values
-            elif interface.model == self._voltmeter_output_devices:
-                # Instantaneous transmission. TVB history is used to buffer delayed communication.
-                transform_fun = self.transforms["potential_to_tvb"]
-                values = interface.current_population_mean_values
-            # TODO: add any other possible Spiking Network output devices to TVB parameters interfaces here!
+        if self._spikeNet_to_tvb_plan is None:
+            self.compile_exchange_plan()
+            self.configure_synchronization()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.add_since_mark("tvb_integration")
+            tic = perf_counter()
+        # The Spiking Network has been simulated only at the last TVB time step of a synchronization window:
+        if self._synchronization_step == self.synchronization_n_steps - 1:
+            if self.pipelined:
+                # The values read after the simulation of the previous window:
+                self._spikeNet_to_tvb_values = self._pipelined_ready_values
             else:
-                raise ValueError("Interface model %s is not supported yet!" % interface.model)
-            # General form: interface_scale_weight * transformation_of(SpikeNet_state_values)
-            state[interface.tvb_sv_id, interface.nodes_ids, 0] = \
-                interface.scale * transform_fun(values,  interface.nodes_ids)
+                self._spikeNet_to_tvb_values = self._read_spikeNet_values()
+        if profiler is not None:
+            toc = perf_counter()
+            profiler.add("spikeNet_readout", toc - tic)
+        for (interface, get_values, sv_id, nodes_ids, scale, transform_fun), values \
+                in zip(self._spikeNet_to_tvb_plan, self._spikeNet_to_tvb_values):
+            # Update TVB state
+            state[sv_id, nodes_ids, 0] = values
+            if self.exchange_log is not None:
+                self.exchange_log.write_spikeNet_to_tvb(values)
+        self._synchronization_step = (self._synchronization_step + 1) % self.synchronization_n_steps
+        if profiler is not None:
+            profiler.add("spikeNet_to_tvb_write", perf_counter() - toc)
+            profiler.mark()
         return state
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from pandas import Series
+from pandas import Series, concat
 import numpy as np
 
 from tvb_multiscale.core.config import initialize_logger
@@ -11,6 +11,7 @@ from tvb_multiscale.core.interfaces.builders.tvb_to_spikeNet_parameter_interface
 from tvb_multiscale.core.interfaces.builders.spikeNet_to_tvb_interface_builder import SpikeNetToTVBInterfaceBuilder
 from tvb_multiscale.core.spiking_models.network import SpikingNetwork
 from tvb_multiscale.core.spiking_models.devices import InputDeviceDict
+from tvb_multiscale.core.utils.transforms_utils import transform_kernel
 
 from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
 from tvb.simulator.simulator import Simulator
@@ -55,6 +56,22 @@ class TVBSpikeNetInterfaceBuilder(object):
     # We return from a Spiking Network multimeter or voltmeter the membrane potential in mV
     w_potential_to_tvb = 1.0
 
+    # The time (in ms) of each synchronization window of TVB and the Spiking Network.
+    # Default = None, corresponding to synchronization at every TVB time step.
+    # It cannot be longer than the minimum delay of the TVB connections between spiking and TVB region nodes.
+    synchronization_time = None
+
+    # If True, the Spiking Network simulation of each synchronization window runs on a worker thread,
+    # overlapping with the TVB integration of the next window.
+    # The Spiking Network -> TVB values then lag by one more synchronization window,
+    # which has to fit, together with the synchronization window, within the minimum TVB delay
+    # of the connections between spiking and TVB region nodes.
+    pipelined = False
+
+    # If True, and numba is available, the TVB -> Spiking Network transformations set as weights
+    # are applied by fused, numba jitted kernels, otherwise by numpy ones:
+    use_numba = True
+
     # The Spiking Network nodes where TVB input is directed
     tvb_to_spikeNet_interfaces = []
 
@@ -159,6 +176,46 @@ class TVBSpikeNetInterfaceBuilder(object):
     def number_of_nodes(self):
         return self.tvb_connectivity.number_of_regions
 
+    @property
+    def tvb_spikeNet_min_delay(self):
+        """The minimum delay of the TVB connections between spiking and TVB region nodes, in both directions."""
+        spiking_nodes_ids = np.array(self.spiking_nodes_ids).astype("i")
+        tvb_nodes_ids = np.setdiff1d(np.arange(self.number_of_nodes), spiking_nodes_ids)
+        connections = np.zeros(self.tvb_weights.shape, dtype="bool")
+        connections[np.ix_(spiking_nodes_ids, tvb_nodes_ids)] = True
+        connections[np.ix_(tvb_nodes_ids, spiking_nodes_ids)] = True
+        connections = np.logical_and(connections, self.tvb_weights > 0.0)
+        if np.any(connections):
+            return np.min(self.tvb_delays[connections])
+        return np.inf
+
+    @property
+    def synchronization_n_steps(self):
+        """The number of TVB time steps of each synchronization window of TVB and the Spiking Network."""
+        if self.synchronization_time is None:
+            return 1
+        synchronization_n_steps = int(np.round(self.synchronization_time / self.tvb_dt))
+        if synchronization_n_steps < 1:
+            raise ValueError("synchronization_time=%g is smaller than the TVB time step dt=%g!"
+                             % (self.synchronization_time, self.tvb_dt))
+        min_delay = self.tvb_spikeNet_min_delay
+        if synchronization_n_steps * self.tvb_dt > min_delay + self.tvb_dt / 2:
+            raise ValueError("synchronization_time=%g is longer than the minimum delay=%g "
+                             "of the TVB connections between spiking and TVB region nodes!"
+                             % (synchronization_n_steps * self.tvb_dt, min_delay))
+        return synchronization_n_steps
+
+    def _assert_pipelining(self, synchronization_n_steps):
+        if self.pipelined:
+            min_delay = self.tvb_spikeNet_min_delay
+            if 2 * synchronization_n_steps * self.tvb_dt > min_delay + self.tvb_dt / 2:
+                raise ValueError("Pipelined co-simulation is not possible, "
+                                 "because two synchronization windows of total time %g "
+                                 "do not fit in the minimum delay=%g "
+                                 "of the TVB connections between spiking and TVB region nodes!"
+                                 % (2 * synchronization_n_steps * self.tvb_dt, min_delay))
+        return self.pipelined
+
     def assert_delay(self, delay):
         return np.maximum(0.0, delay)
 
@@ -215,6 +272,34 @@ class TVBSpikeNetInterfaceBuilder(object):
             transforms.update(self._prepare_spikeNet_to_tvb_transform_fun(prop, dummy))
         return transforms
 
+    def generate_transforms_weights(self):
+        # The weights' vectors of the transformations set as weights (and not as functions),
+        # to be fused with the interfaces' scales into the exchange plan of the TVB - Spiking Network interface
+        dummy = np.ones((self.number_of_nodes, ))
+        transforms_weights = {}
+        for prop in ["w_tvb_to_current",
+                     "w_tvb_to_potential",
+                     "w_tvb_to_spike_rate",
+                     "w_spikes_to_tvb",
+                     "w_spikes_var_to_tvb",
+                     "w_potential_to_tvb"]:
+            if not hasattr(getattr(self, prop), "__call__"):
+                transforms_weights[prop.split("w_")[1]] = dummy * getattr(self, prop)
+        return transforms_weights
+
+    def generate_transforms_kernels(self):
+        # The fused kernels of the TVB -> Spiking Network transformations set as weights (and not as functions),
+        # which gather, scale and, for spike rates, clip at zero the TVB values at every time step
+        transforms_kernels = {}
+        for prop in ["w_tvb_to_current",
+                     "w_tvb_to_potential",
+                     "w_tvb_to_spike_rate"]:
+            if not hasattr(getattr(self, prop), "__call__"):
+                transform = prop.split("w_")[1]
+                transforms_kernels[transform] = transform_kernel(clip=transform == "tvb_to_spike_rate",
+                                                                 use_numba=self.use_numba)
+        return transforms_kernels
+
     def build_interface(self, tvb_spikeNet_interface):
         """
         Configure the TVB Spiking Network interface of the fine scale as well other aspects of its interface with TVB
@@ -229,8 +314,12 @@ class TVBSpikeNetInterfaceBuilder(object):
         tvb_spikeNet_interface.spiking_nodes_ids = self.spiking_nodes_ids
         tvb_spikeNet_interface.exclusive_nodes = self.exclusive_nodes
         tvb_spikeNet_interface.spiking_network = self.spiking_network
+        tvb_spikeNet_interface.synchronization_n_steps = self.synchronization_n_steps
+        tvb_spikeNet_interface.pipelined = self._assert_pipelining(tvb_spikeNet_interface.synchronization_n_steps)
 
         tvb_spikeNet_interface.transforms = self.generate_transforms()
+        tvb_spikeNet_interface.transforms_weights = self.generate_transforms_weights()
+        tvb_spikeNet_interface.transforms_kernels = self.generate_transforms_kernels()
 
         tvb_spikeNet_interface.tvb_to_spikeNet_interfaces = Series({})
         ids = [-1, -1]
@@ -240,26 +329,26 @@ class TVBSpikeNetInterfaceBuilder(object):
 
                 ids[0] += 1
                 tvb_spikeNet_interface.tvb_to_spikeNet_interfaces = \
-                    tvb_spikeNet_interface.tvb_to_spikeNet_interfaces.append(
-                        self._tvb_to_spikNet_device_interface_builder([],
-                                                                      self.spiking_network,
-                                                                      self.spiking_nodes_ids, self.tvb_nodes_ids,
-                                                                      self.tvb_model, self.tvb_weights, self.tvb_delays,
-                                                                      self.tvb_connectivity.region_labels, self.tvb_dt,
-                                                                      self.exclusive_nodes,
-                                                                      self.config).build_interface(interface, ids[0])
-                                                                            )
+                    concat([tvb_spikeNet_interface.tvb_to_spikeNet_interfaces,
+                            self._tvb_to_spikNet_device_interface_builder([],
+                                                                          self.spiking_network,
+                                                                          self.spiking_nodes_ids, self.tvb_nodes_ids,
+                                                                          self.tvb_model, self.tvb_weights,
+                                                                          self.tvb_delays,
+                                                                          self.tvb_connectivity.region_labels,
+                                                                          self.tvb_dt, self.exclusive_nodes,
+                                                                          self.config).build_interface(interface,
+                                                                                                       ids[0])])
             else:
                 ids[1] += 1
                 tvb_spikeNet_interface.tvb_to_spikeNet_interfaces = \
-                    tvb_spikeNet_interface.tvb_to_spikeNet_interfaces.append(
+                    concat([tvb_spikeNet_interface.tvb_to_spikeNet_interfaces,
                             self._tvb_to_spikeNet_parameter_interface_builder([],
                                                                               self.spiking_network,
                                                                               self.spiking_nodes_ids, self.tvb_nodes_ids,
                                                                               self.tvb_model, self.exclusive_nodes,
                                                                               self.config).build_interface(interface,
-                                                                                                           ids[1])
-                                                                            )
+                                                                                                           ids[1])])
 
         tvb_spikeNet_interface.spikeNet_to_tvb_interfaces = \
             self._spikeNet_to_tvb_interface_builder(self.spikeNet_to_tvb_interfaces,
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
 from six import add_metaclass
-from pandas import Series
+from pandas import Series, concat
 import numpy as np
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
@@ -73,7 +73,7 @@ class SpikeNetToTVBInterfaceBuilder(object):
         # Convert TVB node index to interface SpikeNet node index:
         interface["nodes"] = [np.where(self.spiking_nodes_ids == spiking_node)[0][0]
                               for spiking_node in spiking_nodes]
-        device_set = self.build_and_connect_devices([interface], self.spiking_network.brain_regions)[0]
+        device_set = self.build_and_connect_devices([interface], self.spiking_network.brain_regions).iloc[0]
         try:
             # The index of the TVB state variable that is targeted
             tvb_sv_id = self.tvb_model.state_variables.index(device_set.name)
@@ -92,5 +92,5 @@ class SpikeNetToTVBInterfaceBuilder(object):
         spikeNet_to_tvb_interfaces = Series()
         for id, interface in enumerate(self.interfaces):
             spikeNet_to_tvb_interfaces = \
-                spikeNet_to_tvb_interfaces.append(self.build_interface(interface, id))
+                concat([spikeNet_to_tvb_interfaces, self.build_interface(interface, id)])
         return spikeNet_to_tvb_interfaces
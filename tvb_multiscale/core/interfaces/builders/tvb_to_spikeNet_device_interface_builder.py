@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
 from six import add_metaclass
-from pandas import Series
+from pandas import Series, concat
 import numpy as np
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
@@ -49,6 +49,10 @@ class TVBtoSpikeNetDeviceInterfaceBuilder(object):
         self.tvb_dt = tvb_dt
         self.exclusive_nodes = exclusive_nodes
         self.config = config
+        self.tvb_to_spiking_dt_ratio = self.config.TVB_TO_SPIKING_DT_RATIO
+        self.default_min_spiking_dt = self.config.MIN_SPIKING_DT
+        self.default_min_delay_ratio = self.config.MIN_DELAY_RATIO
+        self.default_min_delay = self.config.MIN_SPIKING_DT
         self._update_default_min_delay()
         self.default_connection = dict(self.config.DEFAULT_CONNECTION)
         self.default_connection["delay"] = self.default_min_delay
@@ -91,6 +95,8 @@ class TVBtoSpikeNetDeviceInterfaceBuilder(object):
             assert np.all(node not in self.tvb_nodes_ids for node in target_nodes)
             assert np.all(node not in self.spiking_nodes_ids for node in source_tvb_nodes)
         # Properties set as functions
+        # An optional tolerance of the change of the values, below which they are not set again:
+        tolerance = interface.pop("tolerance", None)
         interface_weight_fun = property_to_fun(interface.pop("interface_weights", 1.0))
         interface_weights = np.ones((len(source_tvb_nodes),)).astype("f")
         weight_fun = property_to_fun(interface.pop("weights", self.default_connection["weight"]))
@@ -128,7 +134,7 @@ class TVBtoSpikeNetDeviceInterfaceBuilder(object):
         interface["neurons_inds"] = neurons_inds
         interface["nodes"] = [np.where(self.spiking_nodes_ids == trg_node)[0][0] for trg_node in target_nodes]
         # Generate the devices => "proxy TVB nodes":
-        device_set = self.build_and_connect_devices([interface], self.spiking_network.brain_regions)[0]
+        device_set = self.build_and_connect_devices([interface], self.spiking_network.brain_regions).iloc[0]
         tvb_to_spikeNet_interface = Series()
         try:
             # The TVB state variable index linked to the interface to build
@@ -146,10 +152,11 @@ class TVBtoSpikeNetDeviceInterfaceBuilder(object):
                               target_nodes=target_nodes,
                               scale=interface_weights,
                               dt=self.tvb_dt).from_device_set(device_set, tvb_sv_id, device_set.name)
+        tvb_to_spikeNet_interface[interface_index].tolerance = tolerance
         return tvb_to_spikeNet_interface
 
     def build(self):
         tvb_to_spikeNet_interfaces = Series()
         for id, interface in enumerate(self.interfaces):
-            tvb_to_spikeNet_interfaces = tvb_to_spikeNet_interfaces.append(self.build_interface(interface, id))
+            tvb_to_spikeNet_interfaces = concat([tvb_to_spikeNet_interfaces, self.build_interface(interface, id)])
         return tvb_to_spikeNet_interfaces
\ No newline at end of file
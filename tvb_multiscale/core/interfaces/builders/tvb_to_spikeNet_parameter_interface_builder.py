@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from six import string_types
-from pandas import Series
+from pandas import Series, concat
 import numpy as np
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
@@ -72,13 +72,15 @@ class TVBtoSpikeNetParameterInterfaceBuilder(object):
                 self._build_target_class(self.spiking_network, name, interface["model"],
                                          interface.get("parameter", default_parameter),
                                          tvb_coupling_id, spiking_nodes_ids, interface_weights)
+            # An optional tolerance of the change of the values, below which they are not set again:
+            tvb_to_spikeNet_interfaces[interface_index].tolerance = interface.get("tolerance", None)
             for i_node in spiking_nodes_ids:
-                node = self.spiking_network.brain_regions[self.spiking_nodes_ids.index(i_node)]
+                node = self.spiking_network.brain_regions.iloc[self.spiking_nodes_ids.index(i_node)]
                 tvb_to_spikeNet_interfaces[interface_index][node.label] = node[ensure_list(populations)]
             return tvb_to_spikeNet_interfaces
 
     def build(self):
         tvb_to_spikeNet_interfaces = Series()
         for id, interface in enumerate(self.interfaces):
-            tvb_to_spikeNet_interfaces = tvb_to_spikeNet_interfaces.append(self.build_interface(interface, id))
+            tvb_to_spikeNet_interfaces = concat([tvb_to_spikeNet_interfaces, self.build_interface(interface, id)])
         return tvb_to_spikeNet_interfaces
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import numpy as np
+
+from tvb_multiscale.core.config import CONFIGURED, initialize_logger
+from tvb_multiscale.core.interfaces.base import TVBSpikeNetInterface
+from tvb_multiscale.core.spiking_models.remote_network import RemoteSpikingNetwork
+
+
+LOG = initialize_logger(__name__)
+
+
+class RemoteTVBSpikeNetInterface(TVBSpikeNetInterface):
+
+    """RemoteTVBSpikeNetInterface is the interface between TVB and a spiking network (e.g., NEST or ANNarchy),
+       which is built and simulated in a child process, via a RemoteSpikingNetwork.
+       The actual TVB - Spiking Network interface is built in the child process by the build_interface callable,
+       exactly as for co-simulation within the same process.
+       This interface only transfers the TVB state and coupling to the child process,
+       and writes back to the TVB state the Spiking Network values it receives from it.
+       It can be used by the TVB co-simulator like any other TVBSpikeNetInterface.
+       Call close() after the end of the simulation to stop the child process.
+    """
+
+    def __init__(self, build_interface, tvb_simulator, n_slots=2, config=CONFIGURED):
+        """Arguments:
+            build_interface: a picklable (e.g., module level) callable, which builds the TVB simulator,
+                             the spiking network and the TVB - Spiking Network interface,
+                             and returns the latter
+            tvb_simulator: the TVB (co)simulator of this process,
+                           which has to be identical to the one used in build_interface
+            n_slots: the number of slots of the transfer ring buffers. Default = 2
+        """
+        super(RemoteTVBSpikeNetInterface, self).__init__(config)
+        self.tvb_model = tvb_simulator.model
+        self.dt = tvb_simulator.integrator.dt
+        number_of_regions = tvb_simulator.connectivity.number_of_regions
+        self.spiking_network = \
+            RemoteSpikingNetwork(build_interface,
+                                 (self.tvb_model.nvar, number_of_regions),
+                                 (len(self.tvb_model.cvar), number_of_regions),
+                                 n_slots, config)
+        self.tvb_nodes_ids = self.spiking_network.tvb_nodes_ids
+        self.spiking_nodes_ids = self.spiking_network.spiking_nodes_ids
+
+    def __repr__(self):
+        return self.__class__.__name__ + " TVB-Remote Spiking Network Interface"
+
+    def print_str(self, detailed_output=False, connectivity=False):
+        return "%s\n\nSpiking Network process: %s" % (self.__repr__(), str(self.spiking_network._process))
+
+    def configure(self, tvb_model):
+        self.tvb_model = tvb_model
+        self.spikeNet_to_tvb_params = OrderedDict(self.spiking_network.spikeNet_to_tvb_params)
+
+    def tvb_state_to_spikeNet(self, state, coupling, stimulus):
+        # The actual transfer happens in the child process, right before simulating the spiking network
+        self.spiking_network.write_tvb_values(np.array(state), np.array(coupling))
+
+    def spikeNet_state_to_tvb_state(self, state):
+        for sv_id, nodes_ids, values in self.spiking_network.read_spikeNet_values():
+            state[sv_id, nodes_ids, 0] = values
+        return state
+
+    def close(self):
+        self.spiking_network.close()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from tvb_multiscale.core.config import CONFIGURED, initialize_logger
+from tvb_multiscale.core.interfaces.base import TVBSpikeNetInterface
+from tvb_multiscale.core.io.exchange_log import ExchangeLogReader
+from tvb_multiscale.core.spiking_models.brain import SpikingBrain
+from tvb_multiscale.core.spiking_models.network import SpikingNetwork
+
+
+LOG = initialize_logger(__name__)
+
+
+def _json_like(obj):
+    # Convert tuples to lists, as they are read back from a json header:
+    if isinstance(obj, (list, tuple)):
+        return [_json_like(o) for o in obj]
+    return obj
+
+
+class ReplaySpikingNetwork(SpikingNetwork):
+    """
+        ReplaySpikingNetwork is an empty SpikingNetwork, which does nothing when it is run.
+        It is used by the ReplayTVBSpikeNetInterface, which replays the Spiking Network output from an exchange log.
+    """
+
+    _min_delay = 0.0
+
+    def __init__(self, min_delay=0.0, config=CONFIGURED):
+        super(ReplaySpikingNetwork, self).__init__(SpikingBrain(), pd.Series(dtype="O"), pd.Series(dtype="O"),
+                                                   config)
+        self._min_delay = min_delay
+
+    @property
+    def min_delay(self):
+        return self._min_delay
+
+    def configure(self, *args, **kwargs):
+        pass
+
+    def _Run(self, simulation_length, *args, **kwargs):
+        pass
+
+
+class ReplayTVBSpikeNetInterface(TVBSpikeNetInterface):
+
+    """ReplayTVBSpikeNetInterface replays to the TVB simulator the Spiking Network values recorded
+       in an exchange log (see TVBSpikeNetInterface.enable_exchange_log()),
+       so that the TVB side of a co-simulation can be run and benchmarked without simulating the Spiking Network.
+       It can be used by the TVB co-simulator like any other TVBSpikeNetInterface,
+       for up to the number of TVB time steps recorded.
+    """
+
+    def __init__(self, filepath, config=CONFIGURED):
+        """Arguments:
+            filepath: the base filepath of the exchange log files
+        """
+        super(ReplayTVBSpikeNetInterface, self).__init__(config)
+        self.exchange_log_reader = ExchangeLogReader(filepath)
+        header = self.exchange_log_reader.header
+        self.dt = header["dt"]
+        self.tvb_nodes_ids = np.array(header["tvb_nodes_ids"])
+        self.spiking_nodes_ids = np.array(header["spiking_nodes_ids"])
+        self.spiking_network = ReplaySpikingNetwork(header["min_delay"], config)
+        self.replay_step = 0
+
+    def __repr__(self):
+        return self.__class__.__name__ + " TVB-Spiking Network exchange log replay interface"
+
+    def print_str(self, detailed_output=False, connectivity=False):
+        return "%s\n\nExchange log: %s" % (self.__repr__(), self.exchange_log_reader.filepath)
+
+    def configure(self, tvb_model):
+        self.tvb_model = tvb_model
+        self.spikeNet_to_tvb_params = OrderedDict(self.exchange_log_reader.header["spikeNet_to_tvb_params"])
+        self.replay_step = 0
+
+    def tvb_state_to_spikeNet(self, state, coupling, stimulus):
+        pass
+
+    def spikeNet_state_to_tvb_state(self, state):
+        if self.replay_step >= self.exchange_log_reader.spikeNet_to_tvb.shape[0]:
+            raise ValueError("The exchange log %s holds only %d TVB time steps!"
+                             % (self.exchange_log_reader.filepath, self.exchange_log_reader.spikeNet_to_tvb.shape[0]))
+        for (sv_id, nodes_ids), values in zip(self.exchange_log_reader.spikeNet_to_tvb_layout,
+                                              self.exchange_log_reader.spikeNet_to_tvb_values(self.replay_step)):
+            state[sv_id, nodes_ids, 0] = values
+        self.replay_step += 1
+        return state
+
+
+class SpikeNetReplayDriver(object):
+
+    """SpikeNetReplayDriver replays to a Spiking Network the TVB values recorded in an exchange log
+       (see TVBSpikeNetInterface.enable_exchange_log()), via a configured TVBSpikeNetInterface,
+       so that the Spiking Network side of a co-simulation can be run and benchmarked without simulating TVB.
+       The Spiking Network is run exactly as in co-simulation, i.e., for the same synchronization windows,
+       and the values it outputs for TVB are returned, to be compared with the recorded ones, if needed.
+    """
+
+    def __init__(self, tvb_spikeNet_interface, filepath):
+        """Arguments:
+            tvb_spikeNet_interface: a configured TVBSpikeNetInterface, built as for the recorded co-simulation
+            filepath: the base filepath of the exchange log files
+        """
+        self.tvb_spikeNet_interface = tvb_spikeNet_interface
+        self.exchange_log_reader = ExchangeLogReader(filepath)
+        header = self.tvb_spikeNet_interface.exchange_log_header()
+        for key in ["tvb_to_spikeNet_sizes", "spikeNet_to_tvb_layout", "synchronization_n_steps"]:
+            if _json_like(header[key]) != _json_like(self.exchange_log_reader.header[key]):
+                raise ValueError("The %s of the interface %s do not match the ones of the exchange log %s!"
+                                 % (key, str(header[key]), str(self.exchange_log_reader.header[key])))
+
+    def run(self, n_steps=None, configure=True):
+        """Method to replay the recorded TVB values to the Spiking Network.
+           Arguments:
+            n_steps: the number of TVB time steps to replay. Default = None, corresponding to all recorded steps
+            configure: boolean flag to configure the Spiking Network for simulation first. Default = True
+           Returns:
+            an array of the Spiking Network values for TVB of shape (n_steps, number of values),
+            with the values of all Spiking Network -> TVB interfaces concatenated, as in the exchange log.
+        """
+        interface = self.tvb_spikeNet_interface
+        reader = self.exchange_log_reader
+        if n_steps is None:
+            n_steps = reader.tvb_to_spikeNet.shape[0]
+        elif n_steps > reader.tvb_to_spikeNet.shape[0]:
+            raise ValueError("The exchange log %s holds only %d TVB time steps!"
+                             % (reader.filepath, reader.tvb_to_spikeNet.shape[0]))
+        if configure:
+            interface.spiking_network.configure()
+        layout = reader.spikeNet_to_tvb_layout
+        state_shape = (np.max([sv_id for sv_id, nodes_ids in layout] + [-1]) + 1,
+                       np.max([np.max(nodes_ids, initial=-1) for sv_id, nodes_ids in layout] + [-1]) + 1,
+                       1)
+        output = []
+        for step in range(n_steps):
+            interface._wait_pipelined()
+            for i_plan, (plan, values) in enumerate(zip(interface._tvb_to_spikeNet_plan,
+                                                        reader.tvb_to_spikeNet_values(step))):
+                interface._set_spikeNet_values(i_plan, values, plan[5], plan[6])
+            interface.spiking_network.Run(interface.dt)
+            state = interface.spikeNet_state_to_tvb_state(np.zeros(state_shape))
+            output.append(np.concatenate([state[sv_id, nodes_ids, 0] for sv_id, nodes_ids in layout] + [[]]))
+        interface.spiking_network.close_pipeline()
+        return np.array(output)
+
@@ -18,6 +18,14 @@ class TVBtoSpikeNetDeviceInterface(DeviceSet):
     # This class implements an interface that sends TVB state to the Spiking Network
     # via input/stimulating devices that play the role of TVB region node proxies
 
+    # Whether the values set to the devices hold until they are set again.
+    # Only then, unchanged values can be left unset (see tolerance):
+    _persistent_values = True
+
+    # An optional tolerance: if not None, only the values of the nodes that changed by more than the tolerance
+    # since they were last set are set, via set(values, mask). Default = None, i.e., all values are set at every step:
+    tolerance = None
+
     def __init__(self, spiking_network, name="", model="", dt=0.1, tvb_sv_id=None,
                  nodes_ids=[], target_nodes=[], scale=np.array([1.0]), device_set=None):
         super(TVBtoSpikeNetDeviceInterface, self).__init__(name, model, device_set)
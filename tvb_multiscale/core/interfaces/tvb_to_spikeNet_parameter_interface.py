@@ -21,6 +21,13 @@ class TVBtoSpikeNetParameterInterface(Series):
 
     _available_input_parameters = {}
 
+    # Parameters' values hold until they are set again, therefore unchanged values can be left unset (see tolerance):
+    _persistent_values = True
+
+    # An optional tolerance: if not None, only the values of the nodes that changed by more than the tolerance
+    # since they were last set are set, via set(values, mask). Default = None, i.e., all values are set at every step:
+    tolerance = None
+
     def __init__(self, spiking_network, name, model, parameter="", tvb_coupling_id=0, nodes_ids=[],
                  scale=np.array([1.0]), neurons=Series()):
         super(TVBtoSpikeNetParameterInterface, self).__init__(neurons)
@@ -78,6 +85,12 @@ class TVBtoSpikeNetParameterInterface(Series):
             values *= self.number_of_nodes
         return values
 
-    def set(self, values):
-        for node, value in zip(self.nodes, self._assert_input_size(values)):
-            self[node].Set({self.parameter: value})
+    def set(self, values, mask=None):
+        """Method to set the values of the parameter to the neurons of each node.
+           Arguments:
+            values: sequence of values, one for each node, or a single value for all nodes
+            mask: an optional boolean array of the nodes to set values to. Default = None, for all nodes
+        """
+        for i_node, (node, value) in enumerate(zip(self.nodes, self._assert_input_size(values))):
+            if mask is None or mask[i_node]:
+                self[node].Set({self.parameter: value})
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+import os
+import glob
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+
+from tvb_multiscale.core.config import CONFIGURED, initialize_logger
+from tvb.contrib.scripts.utils.file_utils import safe_makedirs
+
+
+LOG = initialize_logger(__name__)
+
+
+class CosimulationCheckpointer(object):
+
+    """CosimulationCheckpointer saves and restores checkpoints of a TVB - Spiking Network co-simulation,
+       comprising:
+        - the TVB simulator's current state and step, history buffer, noise random state and monitors' stocks,
+        - the TVB - Spiking Network interface state, i.e., the synchronization and pipelining buffers,
+        - the spiking network's step within the current synchronization window,
+        - the spiking neurons' and their incoming connections' attributes, read via
+          SpikingBrain.Get and SpikingBrain.GetFromConnections,
+        - the events recorded by the output devices since the previous checkpoint, flushed to separate files.
+       Checkpoints are taken between runs of the TVB simulator, where its state and history are consistent.
+       The state is snapshot synchronously, since spiking simulators cannot be accessed from other threads,
+       whereas its serialization and writing to disk run on a worker thread,
+       overlapping with the simulation of the next period.
+       A co-simulation is resumed by rebuilding and configuring the simulator, the spiking network and the interface,
+       exactly as for the original run (including any random seeds of the network building),
+       and then calling restore().
+    """
+
+    # The attributes of the spiking neurons and of their incoming connections to be checkpointed.
+    # Connections' attributes are only needed for plastic synapses:
+    neurons_attributes = ["V_m"]
+    connections_attributes = []
+
+    # The number of most recent checkpoints to keep on disk. Flushed events' files are always kept:
+    keep = 2
+
+    _executor = None
+    _future = None
+    _flushed_events = {}
+    _events_time_offset = 0.0
+
+    def __init__(self, simulator, tvb_spikeNet_interface=None, folder=None,
+                 neurons_attributes=None, connections_attributes=None, keep=None):
+        """Arguments:
+            simulator: the configured TVB (co)simulator
+            tvb_spikeNet_interface: the configured TVBSpikeNetInterface. Default = None, i.e., TVB only checkpoints
+            folder: the folder to write checkpoints to. Default = None, i.e., "checkpoints" in the results' folder
+            neurons_attributes: a list of the neurons' attributes to be checkpointed. Default = ["V_m"]
+            connections_attributes: a list of the connections' attributes to be checkpointed. Default = []
+            keep: the number of most recent checkpoints to keep on disk. Default = 2
+        """
+        self.simulator = simulator
+        self.tvb_spikeNet_interface = tvb_spikeNet_interface
+        if folder is None:
+            folder = os.path.join(CONFIGURED.out.FOLDER_RES, "checkpoints")
+        self.folder = folder
+        safe_makedirs(self.folder)
+        if neurons_attributes is not None:
+            self.neurons_attributes = list(neurons_attributes)
+        if connections_attributes is not None:
+            self.connections_attributes = list(connections_attributes)
+        if keep is not None:
+            self.keep = int(keep)
+        if self.keep < 0:
+            raise ValueError("The number of checkpoints to keep %d cannot be negative!" % self.keep)
+        self._flushed_events = {}
+        self._events_time_offset = 0.0
+        self.timings = []
+
+    @property
+    def spiking_network(self):
+        if self.tvb_spikeNet_interface is None:
+            return None
+        return self.tvb_spikeNet_interface.spiking_network
+
+    def _checkpoint_path(self, step):
+        return os.path.join(self.folder, "checkpoint_%012d.pkl" % step)
+
+    def _events_path(self, step):
+        return os.path.join(self.folder, "events_%012d.pkl" % step)
+
+    @property
+    def checkpoints_paths(self):
+        return sorted(glob.glob(os.path.join(self.folder, "checkpoint_*.pkl")))
+
+    @property
+    def events_paths(self):
+        return sorted(glob.glob(os.path.join(self.folder, "events_*.pkl")))
+
+    # Snapshots, taken in the main thread:
+
+    def _snapshot_tvb(self):
+        simulator = self.simulator
+        snapshot = {"current_step": int(simulator.current_step),
+                    "current_state": np.array(simulator.current_state),
+                    "history": np.array(simulator.history.buffer)}
+        noise = getattr(simulator.integrator, "noise", None)
+        if noise is not None and getattr(noise, "random_stream", None) is not None:
+            snapshot["random_state"] = noise.random_stream.get_state()
+        snapshot["monitors_stocks"] = [np.array(monitor._stock) if hasattr(monitor, "_stock") else None
+                                       for monitor in simulator.monitors]
+        return snapshot
+
+    def _snapshot_interface(self):
+        interface = self.tvb_spikeNet_interface
+        snapshot = {"synchronization_step": interface._synchronization_step,
+                    "tvb_to_spikeNet_buffers": [np.array(buffer) for buffer in interface._tvb_to_spikeNet_buffers],
+                    "spikeNet_to_tvb_values": [np.array(values) for values in interface._spikeNet_to_tvb_values],
+                    "pipelined_values": [np.array(values) for values in interface._pipelined_values],
+                    "pipelined_ready_values": [np.array(values) for values in interface._pipelined_ready_values]}
+        return snapshot
+
+    def _loop_populations(self):
+        for reg_lbl, region in self.spiking_network.brain_regions.items():
+            for pop_lbl, population in region.items():
+                yield reg_lbl, pop_lbl, population
+
+    def _snapshot_spiking_network(self):
+        neurons = OrderedDict()
+        connections = OrderedDict()
+        for reg_lbl, pop_lbl, population in self._loop_populations():
+            if len(self.neurons_attributes):
+                neurons[(reg_lbl, pop_lbl)] = population.Get(self.neurons_attributes)
+            if len(self.connections_attributes):
+                connections[(reg_lbl, pop_lbl)] = \
+                    population.GetFromConnections(self.connections_attributes, source_or_target="target")
+        # The step within the current synchronization window, for the postponed runs of the spiking network:
+        return {"neurons": neurons, "connections": connections,
+                "synchronization_step": self.spiking_network._synchronization_step}
+
+    def _loop_output_devices(self):
+        for pop_lbl, device_set in self.spiking_network.output_devices.items():
+            for reg_lbl, device in device_set.items():
+                yield pop_lbl, reg_lbl, device
+
+    def _flush_events(self):
+        # Get the events recorded since the previous checkpoint, with times shifted by the time of the restored run:
+        events = OrderedDict()
+        for pop_lbl, reg_lbl, device in self._loop_output_devices():
+            n_events = device.number_of_events
+            n_flushed, number_of_resets = self._flushed_events.get((pop_lbl, reg_lbl), (0, device.number_of_resets))
+            if number_of_resets != device.number_of_resets:
+                # The device has been reset since the previous checkpoint, and its events count from 0 again:
+                n_flushed = 0
+            if n_events > n_flushed:
+                device_events = OrderedDict([(var, np.array(values)[n_flushed:n_events])
+                                             for var, values in device.events.items()])
+                if "times" in device_events:
+                    device_events["times"] = device_events["times"] + self._events_time_offset
+                events[(pop_lbl, reg_lbl)] = device_events
+            self._flushed_events[(pop_lbl, reg_lbl)] = (n_events, device.number_of_resets)
+        return events
+
+    def snapshot(self):
+        """Method to snapshot the current state of the co-simulation.
+           Returns:
+            a dictionary of the TVB, interface and spiking network state, and of the new events to be flushed
+        """
+        snapshot = {"tvb": self._snapshot_tvb(), "interface": None, "spiking_network": None, "events": {}}
+        if self.tvb_spikeNet_interface is not None:
+            # Make sure that any pipelined Spiking Network simulation is completed:
+            self.spiking_network.wait()
+            snapshot["interface"] = self._snapshot_interface()
+            snapshot["spiking_network"] = self._snapshot_spiking_network()
+            snapshot["events"] = self._flush_events()
+        return snapshot
+
+    # Writing, in the worker thread:
+
+    @staticmethod
+    def _dump(obj, path):
+        # Write to a temporary file first, so that a failure never leaves a corrupted checkpoint behind:
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def _write(self, snapshot):
+        step = snapshot["tvb"]["current_step"]
+        events = snapshot.pop("events")
+        if len(events):
+            self._dump(events, self._events_path(step))
+        self._dump(snapshot, self._checkpoint_path(step))
+        paths = self.checkpoints_paths
+        for path in paths[:max(len(paths) - self.keep, 0)]:
+            os.remove(path)
+        return self._checkpoint_path(step)
+
+    def wait(self):
+        """Method to wait for the writing of the last checkpoint, if any, to complete.
+           Returns:
+            the path of the last checkpoint written
+        """
+        if self._future is None:
+            return None
+        future = self._future
+        self._future = None
+        return future.result()
+
+    def checkpoint(self, block=False):
+        """Method to take a checkpoint of the co-simulation, the writing of which runs on a worker thread.
+           Arguments:
+            block: boolean flag to wait for the writing of the checkpoint to complete. Default = False
+           Returns:
+            the path of the checkpoint, if block is True, otherwise None
+        """
+        tic = perf_counter()
+        # Only one checkpoint may be written at a time:
+        self.wait()
+        snapshot = self.snapshot()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = self._executor.submit(self._write, snapshot)
+        self.timings.append(perf_counter() - tic)
+        if block:
+            return self.wait()
+        return None
+
+    def run(self, simulation_length, checkpoint_period, **kwargs):
+        """Method to run the simulator for simulation_length (in ms),
+           taking a checkpoint at the end of every checkpoint_period (in ms).
+           Arguments:
+            simulation_length: the total length of the simulation in ms
+            checkpoint_period: the simulation time between checkpoints in ms
+            kwargs: other keyword arguments to the simulator's run method
+           Returns:
+            the list of (time, data) tuples of the monitors, concatenated for the whole simulation_length
+        """
+        dt = self.simulator.integrator.dt
+        if checkpoint_period < dt:
+            raise ValueError("checkpoint_period=%g is smaller than the TVB time step dt=%g!"
+                             % (checkpoint_period, dt))
+        outputs = None
+        remaining = float(simulation_length)
+        while remaining > dt / 2:
+            length = min(checkpoint_period, remaining)
+            results = self.simulator.run(simulation_length=length, **kwargs)
+            if outputs is None:
+                outputs = [[[time], [data]] for time, data in results]
+            else:
+                for output, (time, data) in zip(outputs, results):
+                    output[0].append(time)
+                    output[1].append(data)
+            self.checkpoint()
+            remaining -= length
+        self.wait()
+        if outputs is None:
+            return []
+        return [(np.concatenate([time for time in times if time.size]) if np.any([time.size for time in times])
+                 else np.array([]),
+                 np.concatenate([data for data in datas if data.size]) if np.any([data.size for data in datas])
+                 else np.array([]))
+                for times, datas in outputs]
+
+    # Restoring:
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+    def load_events(self):
+        """Method to load and concatenate all events flushed to disk.
+           Returns:
+            a dictionary of (population label, region label) keys and of dictionaries of events' arrays
+        """
+        output = OrderedDict()
+        for path in self.events_paths:
+            for key, events in self.load(path).items():
+                device_events = output.setdefault(key, OrderedDict())
+                for var, values in events.items():
+                    device_events.setdefault(var, []).append(values)
+        for device_events in output.values():
+            for var, values in device_events.items():
+                device_events[var] = np.concatenate(values)
+        return output
+
+    def _restore_tvb(self, snapshot):
+        simulator = self.simulator
+        if simulator.history.buffer.shape != snapshot["history"].shape:
+            raise ValueError("Checkpoint history shape %s does not match the simulator's one %s!"
+                             % (str(snapshot["history"].shape), str(simulator.history.buffer.shape)))
+        simulator.current_step = snapshot["current_step"]
+        simulator.current_state = snapshot["current_state"]
+        simulator.history.buffer[:] = snapshot["history"]
+        if "random_state" in snapshot:
+            simulator.integrator.noise.random_stream.set_state(snapshot["random_state"])
+        for monitor, stock in zip(simulator.monitors, snapshot["monitors_stocks"]):
+            if stock is not None:
+                monitor._stock = np.array(stock)
+
+    def _restore_interface(self, snapshot):
+        interface = self.tvb_spikeNet_interface
+        interface._synchronization_step = snapshot["synchronization_step"]
+        for buffer, values in zip(interface._tvb_to_spikeNet_buffers, snapshot["tvb_to_spikeNet_buffers"]):
+            buffer[:] = values
+        interface._spikeNet_to_tvb_values = snapshot["spikeNet_to_tvb_values"]
+        interface._pipelined_values = snapshot["pipelined_values"]
+        interface._pipelined_ready_values = snapshot["pipelined_ready_values"]
+
+    def _restore_spiking_network(self, snapshot):
+        self.spiking_network._synchronization_step = snapshot["synchronization_step"]
+        for reg_lbl, pop_lbl, population in self._loop_populations():
+            values = snapshot["neurons"].get((reg_lbl, pop_lbl), None)
+            if values is not None:
+                population.Set(dict(values))
+            values = snapshot["connections"].get((reg_lbl, pop_lbl), None)
+            if values is not None:
+                if len(values) and \
+                        len(list(values.values())[0]) != len(population.GetConnections(source_or_target="target")):
+                    raise ValueError("The number of connections of population %s of region %s "
+                                     "does not match the checkpointed one!" % (pop_lbl, reg_lbl))
+                population.SetToConnections(dict(values), source_or_target="target")
+
+    def restore(self, path=None):
+        """Method to restore in bulk a checkpoint of the co-simulation,
+           after the simulator, the spiking network and the interface have been rebuilt and configured.
+           The spiking network -> TVB event counters and the output devices' event cursors are not restored,
+           since the rebuilt devices have not recorded any events yet,
+           and the times of the events recorded after the restoring are shifted by the time of the checkpoint.
+           Arguments:
+            path: the path of the checkpoint to restore. Default = None, corresponding to the latest checkpoint
+           Returns:
+            the path of the restored checkpoint
+        """
+        self.wait()
+        if path is None:
+            paths = self.checkpoints_paths
+            if len(paths) == 0:
+                raise ValueError("No checkpoint found in folder %s!" % self.folder)
+            path = paths[-1]
+        snapshot = self.load(path)
+        self._restore_tvb(snapshot["tvb"])
+        if self.tvb_spikeNet_interface is not None:
+            self._restore_interface(snapshot["interface"])
+            self._restore_spiking_network(snapshot["spiking_network"])
+            self._flushed_events = {}
+            self._events_time_offset = snapshot["tvb"]["current_step"] * self.simulator.integrator.dt
+        LOG.info("Restored checkpoint %s at TVB step %d!" % (path, snapshot["tvb"]["current_step"]))
+        return path
+
+    def close(self):
+        """Method to wait for the last checkpoint to be written, and to stop the worker thread,
+           as well as the one of any pipelined Spiking Network simulation."""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.tvb_spikeNet_interface is not None:
+            self.spiking_network.close_pipeline()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import h5py
+import numpy as np
+
+
+# An events archive is an HDF5 file with a group per output device, named after the device's label,
+# holding an append only (resizable) dataset per recorded variable, i.e., "times", "senders", etc.
+
+
+class EventsArchiveWriter(object):
+
+    """EventsArchiveWriter appends the events of output devices to an events archive,
+       e.g., the events drained from a device before they are deleted by its reset,
+       so that the full record of a long run is kept on disk, while the spiking simulator's memory stays bounded.
+    """
+
+    def __init__(self, filepath, chunk_size=65536, compression=None):
+        """Arguments:
+            filepath: the path of the HDF5 file. Events are appended to any existing archive.
+            chunk_size: the number of events of the chunks of the datasets. Default = 65536
+            compression: the compression filter of the datasets, e.g., "gzip". Default = None
+        """
+        self.filepath = filepath
+        self.chunk_size = int(chunk_size)
+        self.compression = compression
+        self._file = h5py.File(filepath, "a")
+
+    @staticmethod
+    def _dtype(values):
+        if values.dtype.kind in "OUS":
+            return h5py.string_dtype()
+        return values.dtype
+
+    def append(self, label, events):
+        """Method to append events of a device to the archive.
+           Arguments:
+            label: the label (string) of the device
+            events: a dictionary of arrays of equal size for all the variables of the device
+        """
+        n_events = len(events["times"])
+        if n_events == 0:
+            return
+        group = self._file.require_group(label)
+        for var, values in events.items():
+            values = np.asarray(values).ravel()
+            if values.dtype.kind in "OU":
+                values = values.astype("O").astype(str).astype("O")
+            if var in group:
+                dataset = group[var]
+                n_archived = dataset.shape[0]
+                dataset.resize((n_archived + n_events, ))
+                dataset[n_archived:] = values
+            else:
+                group.create_dataset(var, data=values, dtype=self._dtype(values), maxshape=(None, ),
+                                     chunks=(self.chunk_size, ), compression=self.compression)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def read_events_archive(filepath, label=None, variables=None):
+    """This function reads the events of an events archive.
+       Arguments:
+        filepath: the path of the HDF5 file
+        label: the label (string) of a device. Default = None, corresponding to all devices
+        variables: a sequence of the variables to be read. Default = None, corresponding to all variables
+       Returns:
+        the events dictionary of the device, if label is given,
+        otherwise an OrderedDict of the events dictionaries of all devices, by label
+    """
+    with h5py.File(filepath, "r") as file:
+        if label is None:
+            labels = list(file.keys())
+        else:
+            labels = [label]
+        events = OrderedDict()
+        for device_label in labels:
+            group = file[device_label]
+            device_variables = list(group.keys()) if variables is None else variables
+            events[device_label] = OrderedDict([(var, group[var][()]) for var in device_variables])
+    if label is None:
+        return events
+    return events[label]
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import numpy as np
+
+
+# An exchange log consists of three files, sharing the same base filepath:
+# - filepath.json: a header with the layout of the exchanged values and the co-simulation settings,
+# - filepath.tvb_to_spikeNet.bin: the raw values passed to the TVB -> Spiking Network interfaces,
+# - filepath.spikeNet_to_tvb.bin: the raw values written to the TVB state from the Spiking Network,
+# where each TVB time step is a row of the concatenated values of all interfaces.
+
+
+def _exchange_log_paths(filepath):
+    return filepath + ".json", filepath + ".tvb_to_spikeNet.bin", filepath + ".spikeNet_to_tvb.bin"
+
+
+class ExchangeLogWriter(object):
+
+    """ExchangeLogWriter appends the values exchanged between TVB and a Spiking Network at every TVB time step
+       to the binary files of an exchange log.
+       The values of each interface have to be written in the order of the header's layout.
+    """
+
+    def __init__(self, filepath, header, dtype="f8"):
+        """Arguments:
+            filepath: the base filepath of the exchange log files
+            header: a dictionary of the layout of the exchanged values and the co-simulation settings,
+                    including the numbers of values of each TVB -> Spiking Network interface
+                    as "tvb_to_spikeNet_sizes", and the target TVB state variable index and nodes' indices
+                    of each Spiking Network -> TVB interface, as "spikeNet_to_tvb_layout"
+            dtype: the numpy data type of the logged values. Default = "f8"
+        """
+        self.filepath = filepath
+        self.dtype = np.dtype(dtype)
+        self.header = dict(header)
+        self.header["dtype"] = self.dtype.str
+        header_path, tvb_to_spikeNet_path, spikeNet_to_tvb_path = _exchange_log_paths(filepath)
+        with open(header_path, "w") as file:
+            json.dump(self.header, file, indent=2)
+        self._tvb_to_spikeNet_file = open(tvb_to_spikeNet_path, "wb")
+        self._spikeNet_to_tvb_file = open(spikeNet_to_tvb_path, "wb")
+
+    def write_tvb_to_spikeNet(self, values):
+        self._tvb_to_spikeNet_file.write(np.asarray(values, dtype=self.dtype).tobytes())
+
+    def write_spikeNet_to_tvb(self, values):
+        self._spikeNet_to_tvb_file.write(np.asarray(values, dtype=self.dtype).tobytes())
+
+    def close(self):
+        for file in [self._tvb_to_spikeNet_file, self._spikeNet_to_tvb_file]:
+            if not file.closed:
+                file.close()
+
+
+class ExchangeLogReader(object):
+
+    """ExchangeLogReader reads the values exchanged between TVB and a Spiking Network,
+       per TVB time step and interface, from the files of an exchange log written by an ExchangeLogWriter.
+    """
+
+    def __init__(self, filepath):
+        """Arguments:
+            filepath: the base filepath of the exchange log files
+        """
+        self.filepath = filepath
+        header_path, tvb_to_spikeNet_path, spikeNet_to_tvb_path = _exchange_log_paths(filepath)
+        with open(header_path, "r") as file:
+            self.header = json.load(file)
+        self.tvb_to_spikeNet_sizes = [int(size) for size in self.header["tvb_to_spikeNet_sizes"]]
+        self.spikeNet_to_tvb_layout = [(int(sv_id), np.array(nodes_ids).astype("i"))
+                                       for sv_id, nodes_ids in self.header["spikeNet_to_tvb_layout"]]
+        dtype = np.dtype(self.header["dtype"])
+        self.tvb_to_spikeNet = self._load(tvb_to_spikeNet_path, dtype, np.sum(self.tvb_to_spikeNet_sizes))
+        self.spikeNet_to_tvb = self._load(spikeNet_to_tvb_path, dtype,
+                                          np.sum([len(nodes_ids) for sv_id, nodes_ids in self.spikeNet_to_tvb_layout]))
+
+    @staticmethod
+    def _load(path, dtype, row_size):
+        values = np.fromfile(path, dtype=dtype).astype("f8")
+        row_size = int(row_size)
+        if row_size == 0:
+            return np.zeros((0, 0))
+        # Drop any incomplete row of an interrupted recording:
+        n_rows = values.size // row_size
+        return values[:n_rows * row_size].reshape((n_rows, row_size))
+
+    @staticmethod
+    def _split(row, sizes):
+        return np.split(row, np.cumsum(sizes)[:-1]) if len(sizes) else []
+
+    @property
+    def number_of_steps(self):
+        return max(self.tvb_to_spikeNet.shape[0], self.spikeNet_to_tvb.shape[0])
+
+    def tvb_to_spikeNet_values(self, step):
+        """Method to return the list of the values passed to each TVB -> Spiking Network interface at a TVB step."""
+        return self._split(self.tvb_to_spikeNet[step], self.tvb_to_spikeNet_sizes)
+
+    def spikeNet_to_tvb_values(self, step):
+        """Method to return the list of the values written to the TVB state from each Spiking Network -> TVB
+           interface at a TVB step."""
+        return self._split(self.spikeNet_to_tvb[step],
+                           [len(nodes_ids) for sv_id, nodes_ids in self.spikeNet_to_tvb_layout])
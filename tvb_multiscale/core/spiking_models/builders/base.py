@@ -3,7 +3,7 @@ from abc import ABCMeta, abstractmethod
 from six import string_types
 from collections import OrderedDict
 import numpy as np
-from pandas import Series
+from pandas import Series, concat
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
 from tvb_multiscale.core.spiking_models.brain import SpikingBrain
@@ -38,6 +38,9 @@ class SpikingModelBuilder(object):
 
     population_order = 100
 
+    # If True, all connections among populations are evaluated first, and then created by connect_populations():
+    bulk_connections = False
+
     # User inputs:
     tvb_simulator = None
     spiking_nodes_ids = []
@@ -523,8 +526,10 @@ class SpikingModelBuilder(object):
                                                       params=population["params"](node_id),
                                                       *args, **kwargs)
 
-    def connect_within_node_spiking_populations(self):
-        """Method to connect all populations withing each Spiking brain region node."""
+    def _within_node_populations_connections(self):
+        """Generator of the connections among the populations within each Spiking brain region node,
+           as (source population, source neurons' function, target population, target neurons' function,
+               conn_spec, syn_spec) tuples, the arguments of connect_two_populations()."""
         # For every different type of connections between distinct Spiking nodes' populations
         for i_conn, conn in enumerate(ensure_list(self._populations_connections)):
             # ...and for every brain region node where this connection will be created:
@@ -542,14 +547,14 @@ class SpikingModelBuilder(object):
                     # ...and target populations of this connection...
                     for pop_trg in ensure_list(conn["target"]):
                         # ...connect the two populations:
-                        self.connect_two_populations(
-                            self._spiking_brain[i_node][pop_src], conn["source_inds"],
-                            self._spiking_brain[i_node][pop_trg], conn["target_inds"],
-                            conn["conn_spec"], syn_spec
-                        )
-
-    def connect_spiking_region_nodes(self):
-        """Method to connect all Spiking brain region nodes among them."""
+                        yield (self._spiking_brain.iloc[i_node][pop_src], conn["source_inds"],
+                               self._spiking_brain.iloc[i_node][pop_trg], conn["target_inds"],
+                               conn["conn_spec"], dict(syn_spec))
+
+    def _among_nodes_populations_connections(self):
+        """Generator of the connections among the populations of distinct Spiking brain region nodes,
+           as (source population, source neurons' function, target population, target neurons' function,
+               conn_spec, syn_spec) tuples, the arguments of connect_two_populations()."""
         # For every different type of connections between distinct Spiking region nodes' populations
         for i_conn, conn in enumerate(ensure_list(self._nodes_connections)):
             # ...form the connection for every distinct pair of Spiking nodes
@@ -557,6 +562,9 @@ class SpikingModelBuilder(object):
                 # ...get the source spiking brain region indice:
                 i_source_node = np.where(self.spiking_nodes_ids == source_index)[0][0]
                 for target_index in conn["target_nodes"]:
+                    if source_index == target_index:
+                        # ...as long as this is not a within node connection...
+                        continue
                     # ...get the target spiking brain region indice:
                     i_target_node = np.where(self.spiking_nodes_ids == target_index)[0][0]
                     # ...create a synapse parameters dictionary, from the configured inputs:
@@ -565,17 +573,43 @@ class SpikingModelBuilder(object):
                                                 conn["delay"](source_index, target_index),
                                                 conn["receptor_type"](source_index, target_index)
                                                 )
-                    if source_index != target_index:
-                        # ...and as long as this is not a within node connection...
-                        for conn_src in ensure_list(conn["source"]):
-                            # ...and for every combination of source...
-                            src_pop = self._spiking_brain[i_source_node][conn_src]
-                            for conn_trg in ensure_list(conn["target"]):
-                                # ...and target population...
-                                trg_pop = self._spiking_brain[i_target_node][conn_trg]
-                                self.connect_two_populations(src_pop, conn["source_inds"],
-                                                             trg_pop, conn["target_inds"],
-                                                             conn['conn_spec'], syn_spec)
+                    for conn_src in ensure_list(conn["source"]):
+                        # ...and for every combination of source...
+                        src_pop = self._spiking_brain.iloc[i_source_node][conn_src]
+                        for conn_trg in ensure_list(conn["target"]):
+                            # ...and target population...
+                            trg_pop = self._spiking_brain.iloc[i_target_node][conn_trg]
+                            yield (src_pop, conn["source_inds"], trg_pop, conn["target_inds"],
+                                   conn['conn_spec'], dict(syn_spec))
+
+    def connect_populations(self, connections):
+        """Method to create a sequence of connections among SpikingPopulation instances,
+           when the builder connects in bulk (bulk_connections = True).
+           By default, it calls connect_two_populations() for every connection,
+           but spiking simulator specific builders may override it to merge the connections
+           into fewer calls to the spiking simulator.
+           Arguments:
+            connections: a sequence of (source, src_inds_fun, target, trg_inds_fun, conn_params, synapse_params)
+                         tuples, with the arguments of connect_two_populations()
+        """
+        for connection in connections:
+            self.connect_two_populations(*connection)
+
+    def _connect_populations(self, connections):
+        if self.bulk_connections:
+            # Evaluate all the connections' properties first, and then create them all together:
+            self.connect_populations(list(connections))
+        else:
+            for connection in connections:
+                self.connect_two_populations(*connection)
+
+    def connect_within_node_spiking_populations(self):
+        """Method to connect all populations withing each Spiking brain region node."""
+        self._connect_populations(self._within_node_populations_connections())
+
+    def connect_spiking_region_nodes(self):
+        """Method to connect all Spiking brain region nodes among them."""
+        self._connect_populations(self._among_nodes_populations_connections())
 
     def build_spiking_brain(self):
         """Method to build and connect all Spiking brain region nodes,
@@ -593,8 +627,7 @@ class SpikingModelBuilder(object):
            - brain region nodes (pandas.Series) they target."""
         _devices = Series()
         for device in devices:
-            _devices = _devices.append(
-                            self.build_and_connect_devices(device))
+            _devices = concat([_devices, self.build_and_connect_devices(device)])
         return _devices
 
     def build_and_connect_output_devices(self):
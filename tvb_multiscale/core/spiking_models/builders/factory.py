@@ -2,7 +2,7 @@
 import os
 
 import numpy as np
-from pandas import Series
+from pandas import Series, concat
 from six import string_types
 
 from tvb_multiscale.core.config import CONFIGURED, initialize_logger
@@ -51,7 +51,8 @@ def _get_connections(device, spiking_nodes):
     if device_target_nodes is None:
         device_target_nodes = spiking_nodes
     else:
-        device_target_nodes = spiking_nodes[device_target_nodes]
+        # The device's nodes are positions of the spiking nodes:
+        device_target_nodes = spiking_nodes.iloc[device_target_nodes]
     return connections, device_target_nodes
 
 
@@ -190,13 +191,11 @@ def build_and_connect_devices(devices_input_dicts, create_device_fun, connect_de
         # For every distinct quantity to be measured from Spiking or stimulated towards Spiking nodes...
         dev_names = device_dict.get("names", None)
         if dev_names is None:  # If no devices' names are given...
-            devices = devices.append(
-                            build_and_connect_devices_one_to_one(device_dict, create_device_fun, connect_device_fun,
-                                                                 spiking_nodes, config=config, **kwargs)
-                                              )
+            devices = concat([devices,
+                              build_and_connect_devices_one_to_one(device_dict, create_device_fun, connect_device_fun,
+                                                                   spiking_nodes, config=config, **kwargs)])
         else:
-            devices = devices.append(
-                            build_and_connect_devices_one_to_many(device_dict, create_device_fun, connect_device_fun,
-                                                                  spiking_nodes, dev_names, config=config, **kwargs)
-                                              )
+            devices = concat([devices,
+                              build_and_connect_devices_one_to_many(device_dict, create_device_fun, connect_device_fun,
+                                                                    spiking_nodes, dev_names, config=config, **kwargs)])
     return devices
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
 from six import string_types
-from copy import deepcopy
 from collections import OrderedDict
 
 import pandas as pd
@@ -9,13 +8,14 @@ import xarray as xr
 import numpy as np
 
 from tvb_multiscale.core.config import initialize_logger, LINE
-from tvb_multiscale.core.utils.data_structures_utils import filter_events, summarize, flatten_neurons_inds_in_DataArray
+from tvb_multiscale.core.utils.data_structures_utils import \
+    filter_events, summarize, flatten_neurons_inds_in_DataArray, group_events, grouped_events_to_dict
 
 from tvb.basic.neotraits.api import HasTraits, Attr, Int, List
 
 from tvb.contrib.scripts.utils.log_error_utils import raise_value_error
 from tvb.contrib.scripts.utils.data_structures_utils import \
-    ensure_list, list_of_dicts_to_dict_of_lists, sort_events_by_x_and_y, data_xarray_from_continuous_events, is_integer
+    ensure_list, list_of_dicts_to_dict_of_lists, data_xarray_from_continuous_events, is_integer
 
 
 LOG = initialize_logger(__name__)
@@ -329,13 +329,171 @@ class InputDevice(Device):
 InputDeviceDict = {}
 
 
+class EventBuffer(object):
+
+    """EventBuffer holds the events recorded by an output device in append only, typed numpy arrays (columns),
+       one per variable: "times", "senders" and any recorded variables.
+       The columns' capacity is doubled whenever an append exceeds it,
+       so that appending costs amortized constant time per event,
+       and events are returned as read only views of the columns, without copying.
+       Readers can follow the appended events independently, by means of named read cursors (see read()).
+    """
+
+    def __init__(self, variables=(), times_dtype="f8", senders_dtype="i4", variables_dtype="f8", capacity=1024):
+        """Arguments:
+            variables: a sequence of the names of the recorded variables other than "times" and "senders".
+                       More variables can be added, as long as the buffer is empty. Default = ()
+            times_dtype: the numpy data type of the times' column. Default = "f8"
+            senders_dtype: the numpy data type of the senders' column. Default = "i4"
+            variables_dtype: the numpy data type of the other variables' columns. Default = "f8"
+            capacity: the initial number of events the columns can hold. Default = 1024
+        """
+        self._variables_dtype = np.dtype(variables_dtype)
+        self._capacity = max(int(capacity), 1)
+        self._size = 0
+        self._columns = OrderedDict()
+        self._add_column("times", np.dtype(times_dtype))
+        self._add_column("senders", np.dtype(senders_dtype))
+        for var in variables:
+            self._add_column(var, self._variables_dtype)
+        self._cursors = {}
+
+    def _add_column(self, var, dtype):
+        self._columns[var] = np.empty((self._capacity, ), dtype=dtype)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def variables(self):
+        return list(self._columns.keys())
+
+    @property
+    def nbytes(self):
+        return int(np.sum([column.nbytes for column in self._columns.values()]))
+
+    def _grow(self, size):
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        for var, column in self._columns.items():
+            new_column = np.empty((capacity, ), dtype=column.dtype)
+            new_column[:self._size] = column[:self._size]
+            self._columns[var] = new_column
+        self._capacity = capacity
+
+    def append(self, events):
+        """Method to append a chunk of events.
+           Arguments:
+            events: a dictionary of sequences of equal size, one for each variable of the buffer.
+                    Variables not in the buffer are added to it, if the buffer is empty.
+        """
+        n_events = len(events["times"])
+        for var in events.keys():
+            if var not in self._columns:
+                if self._size:
+                    raise ValueError("Cannot add variable %s to a non empty EventBuffer!" % var)
+                self._add_column(var, self._variables_dtype)
+        if n_events == 0:
+            return
+        if self._size + n_events > self._capacity:
+            self._grow(self._size + n_events)
+        for var, column in self._columns.items():
+            if var not in events:
+                raise ValueError("Variable %s is missing from the events appended to the EventBuffer!" % var)
+            values = np.asarray(events[var]).ravel()
+            if values.size != n_events:
+                raise ValueError("Variable %s has %d values, instead of %d, as the events' times!"
+                                 % (var, values.size, n_events))
+            if values.dtype.kind in "OUS" and column.dtype.kind not in "OUS":
+                # Non numerical senders' labels (e.g., "population_neuron") are stored as objects:
+                column = column.astype("O")
+                self._columns[var] = column
+            column[self._size:self._size + n_events] = values
+        self._size += n_events
+
+    def column(self, var, start=0, stop=None):
+        """Method to return a read only view of the events of a variable, from start up to stop indices."""
+        if stop is None:
+            stop = self._size
+        view = self._columns[var][start:np.minimum(stop, self._size)]
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, var):
+        return self.column(var)
+
+    def get_events(self, variables=None, start=0, stop=None):
+        """Method to return a dictionary of read only views of the events, from start up to stop indices.
+           Arguments:
+            variables: a sequence of the variables to be included. Default = None, corresponding to all variables.
+            start: the index of the first event. Default = 0
+            stop: the index after the last event. Default = None, corresponding to the number of events
+           Returns:
+            an OrderedDict of the events' arrays
+        """
+        if variables is None:
+            variables = self._columns.keys()
+        return OrderedDict([(var, self.column(var, start, stop)) for var in variables])
+
+    @property
+    def events(self):
+        return self.get_events()
+
+    def cursor(self, name="default"):
+        """Method to return the position of the named read cursor, i.e., the number of events it has read."""
+        return self._cursors.get(name, 0)
+
+    def read(self, name="default", variables=None):
+        """Method to return the events appended since the previous call of the named read cursor,
+           and advance the cursor to the end of the buffer.
+           Arguments:
+            name: the name of the read cursor. Default = "default"
+            variables: a sequence of the variables to be included. Default = None, corresponding to all variables.
+           Returns:
+            an OrderedDict of the new events' arrays
+        """
+        events = self.get_events(variables, start=self.cursor(name))
+        self._cursors[name] = self._size
+        return events
+
+    def clear(self):
+        """Method to delete all events and reset all read cursors.
+           New columns are allocated, so that the views of the events returned before are not overwritten."""
+        for var, column in self._columns.items():
+            self._add_column(var, column.dtype)
+        self._size = 0
+        self._cursors = {}
+
+
 class OutputDevice(Device):
 
     """OutputDevice class to wrap around an output (recording/measuring/monitoring) device"""
 
+    _events_cursor = 0  # The number of events already read by get_new_events()
+
+    # The events grouped by (x, y) variables, cached along with the number of events they were computed for:
+    _grouped_events_cache = None
+
+    # An optional EventsArchiveWriter, to which the events are appended before they are deleted by reset():
+    events_archive = None
+
+    # The number of times reset() restarted the count of events from 0,
+    # so that readers comparing the count to a previous one can tell that it was reset in between:
+    number_of_resets = 0
+
     def __init__(self, device, *args, **kwargs):
         kwargs["model"] = kwargs.pop("model", "output_device")
         super(OutputDevice, self).__init__(device, *args, **kwargs)
+        self._grouped_events_cache = {}
 
     def GetConnections(self):
         """Method to get connections of the device from neurons.
@@ -386,10 +544,12 @@ class OutputDevice(Device):
               the filtered dictionary of events
         """
         if events is None:
-            # The events of the device:
-            events = deepcopy(self.events)
+            # The events of the device, as (read only) arrays, which are only sliced below, never modified in place:
+            events = OrderedDict(self.events)
+        else:
+            events = OrderedDict(events)
         if variables is None:
-            variables = events.keys()
+            variables = list(events.keys())
         else:
             variables = ensure_list(variables)
         n_events = len(events["times"])
@@ -397,18 +557,77 @@ class OutputDevice(Device):
             if events_inds is not None:
                 if hasattr(events_inds, "__len__") or isinstance(events_inds, slice):
                     # events_inds are numerical or boolean indices, or a slice:
-                    select_fun = lambda x, events_inds: np.array(x)[events_inds].tolist()
+                    select_fun = lambda x, events_inds: np.asarray(x)[events_inds]
                 else: # events_inds is a scalar to start indexing from:
-                    select_fun = lambda x, events_inds: np.array(x)[events_inds:].tolist()
+                    select_fun = lambda x, events_inds: np.asarray(x)[events_inds:]
                 for var in variables:
                     events[var] = select_fun(events[var], events_inds)
             if len(filter_kwargs) > 0:
                 return filter_events(events, **filter_kwargs)
         else:
             for var in variables:
-                events[var] = []
+                events[var] = np.array([])
         return events
 
+    def _get_new_events(self, variables, n_events):
+        # Default: slice the events between the read cursor and the current number of events
+        events = self.events
+        return dict([(var, np.array(events[var])[self._events_cursor:n_events]) for var in variables])
+
+    def get_new_events(self, variables=None):
+        """This method returns only the events recorded since its previous call,
+           by keeping and advancing a read cursor for the device.
+            Arguments:
+                variables: sequence (list, tuple, array) of variables to be included in the output.
+                           Default=None, corresponds to "times", "senders" and all recorded variables.
+            Returns:
+              the dictionary of the new events' (numpy) arrays
+        """
+        if variables is None:
+            variables = ["times", "senders"] + list(getattr(self, "record_from", []))
+        else:
+            variables = ensure_list(variables)
+        n_events = self.number_of_events
+        if n_events > self._events_cursor:
+            new_events = self._get_new_events(variables, n_events)
+        else:
+            new_events = dict([(var, np.array([])) for var in variables])
+        self._events_cursor = n_events
+        return new_events
+
+    def get_grouped_events(self, x="senders", y="times"):
+        """This method returns the values of the events' variable y grouped by the values of the variable x,
+           in a compressed sparse row form (see group_events()), which is cached until new events are recorded.
+           Arguments:
+            x: the variable to group by. Default = "senders"
+            y: the variable to be grouped. Default = "times"
+           Returns:
+            the sorted unique values of x, the offsets array, and the array of the values of y sorted by x and y
+        """
+        if self._grouped_events_cache is None:
+            self._grouped_events_cache = {}
+        n_events = self.number_of_events
+        cached = self._grouped_events_cache.get((x, y), None)
+        if cached is None or cached[0] != n_events:
+            cached = (n_events, group_events(self.events, x, y))
+            self._grouped_events_cache[(x, y)] = cached
+        return cached[1]
+
+    def _clear_grouped_events_cache(self):
+        # To be called when the events are deleted:
+        self._grouped_events_cache = {}
+
+    def _restart_events_count(self):
+        # To be called by reset(), after the events have been deleted and their count restarted from 0:
+        self._events_cursor = 0
+        self._clear_grouped_events_cache()
+        self.number_of_resets += 1
+
+    def _archive_events(self):
+        # To be called before the events are deleted, if the device has an events' archive:
+        if self.events_archive is not None and self.number_of_events:
+            self.events_archive.append(self.label, self.events)
+
     @property
     @abstractmethod
     def events(self):
@@ -536,21 +755,32 @@ class SpikeRecorder(OutputDevice):
                              the events of which should be excluded from the output. Default = [].
               full_senders: if True, we include neurons' indices that have sent no spike at all. Default=False
              Returns:
-              dictionary of spike events sorted by sender neuron
+              dictionary of spike events sorted by sender neuron,
+              including the senders with no spikes within the selected times, if any, with empty arrays
          """
-        sorted_events = sort_events_by_x_and_y(self.get_events(events_inds=events_inds),
-                                               x="senders", y="times",
-                                               filter_y=times, exclude_y=exclude_times)
+        sorted_events = grouped_events_to_dict(
+            *self._get_grouped_spikes_events("senders", "times", events_inds, times, exclude_times))
         if full_senders:
             # In this case we also include neurons with 0 spikes in the output
             sender_neurons = self.neurons
-            output = OrderedDict()
-            for neuron in sender_neurons:
-                output[neuron] = np.array([])
-            output.update(sorted_events)
-            return output
+        elif (times is not None and len(times) > 0) or (exclude_times is not None and len(exclude_times) > 0):
+            # In this case we also include the senders with 0 spikes within the selected times:
+            sender_neurons = self._get_grouped_spikes_events("senders", "times", events_inds)[0].tolist()
         else:
             return sorted_events
+        output = OrderedDict()
+        for neuron in sender_neurons:
+            output[neuron] = np.array([])
+        output.update(sorted_events)
+        return output
+
+    def _get_grouped_spikes_events(self, x, y, events_inds=None, times=None, exclude_times=[]):
+        if events_inds is None and (times is None or len(times) == 0) \
+                and (exclude_times is None or len(exclude_times) == 0):
+            # The grouping of all the events is cached:
+            return self.get_grouped_events(x, y)
+        return group_events(self.get_events(events_inds=events_inds, times=times, exclude_times=exclude_times),
+                            x, y)
 
     def get_spikes_neurons_by_times(self, events_inds=None, times=None, exclude_times=[]):
         """This method will return the spikes' senders per spike time,
@@ -565,8 +795,8 @@ class SpikeRecorder(OutputDevice):
              Returns:
               dictionary of spike events sorted by time
          """
-        return sort_events_by_x_and_y(self.get_events(events_inds=events_inds),
-                                      x="times", y="senders", filter_x=times, exclude_x=exclude_times)
+        return grouped_events_to_dict(
+            *self._get_grouped_spikes_events("times", "senders", events_inds, times, exclude_times))
 
     @property
     def spikes_times(self):
@@ -903,7 +1133,7 @@ class SpikeMultimeter(Multimeter, SpikeRecorder):
             Returns:
              the filtered dictionary of spikes' events
         """
-        events = deepcopy(self.events)
+        events = OrderedDict(self.events)
         if events_inds:
             spike_var = self.spikes_vars[0]
             if (hasattr(events_inds, "__len__") and len(events_inds) > 0) or isinstance(events_inds, slice):
@@ -1123,7 +1353,7 @@ class DeviceSet(pd.Series, HasTraits):
         or a single Device if the argument is an integer indice or a string label."""
         if isinstance(items, string_types) or is_integer(items):
             return super(DeviceSet, self).__getitem__(items)
-        return DeviceSet(name=self.name, model=self.model, device_set=super(DeviceSet, self).__getitem__(items))
+        return DeviceSet(label=self.name, model=self.model, device_set=super(DeviceSet, self).__getitem__(items))
 
     def _repr(self):
         return "%s - Name: %s, Model: %s" % \
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 
 import pandas as pd
 import numpy as np
@@ -67,6 +69,23 @@ class SpikingNetwork(HasTraits):
     _OutputSpikeDeviceDict = OutputSpikeDeviceDict
     _OutputContinuousTimeDeviceDict = OutputContinuousTimeDeviceDict
 
+    # The number of TVB time steps of each synchronization window with TVB,
+    # set by the TVB - Spiking Network interface:
+    synchronization_n_steps = 1
+    _synchronization_step = 0
+
+    # In pipelined co-simulation, Run returns immediately and the simulation runs on a worker thread,
+    # followed by the pipeline_callback (e.g., the readout of the TVB - Spiking Network interface),
+    # overlapping with the TVB integration, until wait() is called:
+    pipelined = False
+    pipeline_callback = None
+    _executor = None
+    _run_future = None
+    _pipeline_times = None
+
+    # An optional CosimulationProfiler, shared with the TVB - Spiking Network interface:
+    profiler = None
+
     def __init__(self,
                  brain_regions=None,
                  output_devices=None,
@@ -130,10 +149,87 @@ class SpikingNetwork(HasTraits):
         pass
 
     @abstractmethod
-    def Run(self, simulation_length, *args, **kwargs):
-        """Method to simulate the spiking network for a specific simulation_length (in ms)."""
+    def _Run(self, simulation_length, *args, **kwargs):
+        """Method to simulate the spiking network for a specific simulation_length (in ms),
+           to be implemented by the specific spiking simulator."""
         pass
 
+    def Run(self, simulation_length, *args, **kwargs):
+        """Method to simulate the spiking network for a specific simulation_length (in ms).
+           When co-simulating with TVB in synchronization windows of synchronization_n_steps > 1 TVB time steps,
+           the simulation is postponed until the last TVB time step of each window,
+           and then it runs at once for the whole window.
+        """
+        if self.synchronization_n_steps > 1:
+            self._synchronization_step += 1
+            if self._synchronization_step < self.synchronization_n_steps:
+                if self.profiler is not None:
+                    self.profiler.mark()
+                return
+            simulation_length = self._synchronization_step * simulation_length
+            self._synchronization_step = 0
+        if self.profiler is not None:
+            tic = perf_counter()
+        if self.pipelined:
+            self.wait()
+            if self._pipeline_times is None:
+                self.reset_pipeline()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._run_future = self._executor.submit(self._pipelined_Run, simulation_length, *args, **kwargs)
+        else:
+            self._Run(simulation_length, *args, **kwargs)
+        if self.profiler is not None:
+            self.profiler.add("spikeNet_run", perf_counter() - tic)
+            self.profiler.mark()
+
+    def _pipelined_Run(self, simulation_length, *args, **kwargs):
+        # Simulate and perform the pipeline callback on the worker thread, timing their total duration:
+        tic = perf_counter()
+        self._Run(simulation_length, *args, **kwargs)
+        if self.pipeline_callback is not None:
+            self.pipeline_callback()
+        self._pipeline_times["run"] += perf_counter() - tic
+        self._pipeline_times["runs"] += 1
+
+    def wait(self):
+        """Method to wait for the completion of a pipelined simulation running on the worker thread, if any."""
+        if self._run_future is not None:
+            tic = perf_counter()
+            self._run_future.result()
+            self._pipeline_times["wait"] += perf_counter() - tic
+            self._run_future = None
+
+    def reset_pipeline(self):
+        """Method to (re)set the timings of the pipelined simulation, stopping the worker thread, if any.
+           A new worker thread is started by the next pipelined Run."""
+        self.close_pipeline()
+        self._pipeline_times = {"runs": 0, "run": 0.0, "wait": 0.0}
+
+    def close_pipeline(self):
+        """Method to wait for the last pipelined simulation, if any, and to stop the worker thread,
+           to be called at the end of the simulation."""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @property
+    def pipeline_overlap(self):
+        """The fraction of the total time of the pipelined simulations (and callbacks)
+           that has been overlapped with the TVB integration, i.e., not waited for."""
+        if not self._pipeline_times or self._pipeline_times["run"] == 0.0:
+            return 0.0
+        return max(0.0, 1.0 - self._pipeline_times["wait"] / self._pipeline_times["run"])
+
+    def pipeline_report(self):
+        """Method to return a dictionary of the number of pipelined simulations,
+           their total duration, the total time waited for them, and the overlap achieved."""
+        self.wait()
+        report = dict(self._pipeline_times or {"runs": 0, "run": 0.0, "wait": 0.0})
+        report["overlap"] = self.pipeline_overlap
+        return report
+
     @property
     @abstractmethod
     def min_delay(self):
@@ -183,6 +279,8 @@ class SpikingNetwork(HasTraits):
            Returns:
             - a Series of selected DeviceSet instances
         """
+        # Make sure that any pipelined simulation has been completed:
+        self.wait()
         devices = pd.Series()
         mode = kwargs.get("mode", None)
         if mode and mode.find("activity") > -1:
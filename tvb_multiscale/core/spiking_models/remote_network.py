@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import traceback
+from operator import attrgetter
+
+import numpy as np
+import pandas as pd
+
+from tvb_multiscale.core.config import CONFIGURED, initialize_logger
+from tvb_multiscale.core.spiking_models.brain import SpikingBrain
+from tvb_multiscale.core.spiking_models.network import SpikingNetwork
+from tvb_multiscale.core.utils.shared_memory_utils import SharedMemoryRingBuffer
+
+
+LOG = initialize_logger(__name__)
+
+
+def serve_spiking_network(build_interface, connection, input_buffer_name, state_shape, coupling_shape, n_slots):
+    """This function runs in the child process of a RemoteSpikingNetwork.
+       It builds the TVB - Spiking Network interface and its spiking network (e.g., NEST or ANNarchy),
+       and then serves the control messages of the parent process:
+       - ("configure", ): configures the spiking network for simulation,
+       - ("run", simulation_length): reads the TVB state and coupling from the input ring buffer,
+                                     applies them to the spiking network, simulates it,
+                                     and writes its output for TVB to the output ring buffer,
+       - ("call", attribute, args, kwargs): gets (or calls) an attribute of the spiking network,
+       - ("close", ): stops serving.
+       Each message is answered by ("done", result), or by ("error", traceback).
+       Arguments:
+        build_interface: a picklable callable, which returns the built TVBSpikeNetInterface
+        connection: the child's end of the multiprocessing.Pipe for the control messages
+        input_buffer_name: the name of the SharedMemoryRingBuffer of TVB state and coupling values
+        state_shape: the shape (number of state variables, number of regions) of the TVB state
+        coupling_shape: the shape (number of coupling variables, number of regions) of the TVB coupling
+        n_slots: the number of slots of the ring buffers
+    """
+    input_buffer = None
+    output_buffer = None
+    try:
+        interface = build_interface()
+        interface.configure(interface.tvb_model)
+        output_layout = [(plan[2], plan[3]) for plan in interface._spikeNet_to_tvb_plan]
+        input_buffer = SharedMemoryRingBuffer(np.prod(state_shape) + np.prod(coupling_shape), n_slots,
+                                              name=input_buffer_name)
+        output_buffer = SharedMemoryRingBuffer(np.sum([len(nodes_ids) for sv_id, nodes_ids in output_layout]),
+                                               n_slots)
+        state_size = int(np.prod(state_shape))
+        connection.send(("done", {"output_buffer_name": output_buffer.name,
+                                  "output_layout": output_layout,
+                                  "spikeNet_to_tvb_params": interface.spikeNet_to_tvb_params,
+                                  "tvb_nodes_ids": np.array(interface.tvb_nodes_ids),
+                                  "spiking_nodes_ids": np.array(interface.spiking_nodes_ids),
+                                  "min_delay": interface.spiking_network.min_delay}))
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+        return
+    while True:
+        message = connection.recv()
+        command = message[0]
+        try:
+            if command == "configure":
+                interface.spiking_network.configure()
+                result = None
+            elif command == "run":
+                values = input_buffer.read()
+                state = np.zeros(tuple(state_shape) + (1, ))
+                state[:, :, 0] = values[:state_size].reshape(state_shape)
+                coupling = np.zeros(tuple(coupling_shape) + (1, ))
+                coupling[:, :, 0] = values[state_size:].reshape(coupling_shape)
+                interface.tvb_state_to_spikeNet(state, coupling, None)
+                interface.spiking_network.Run(message[1])
+                state = interface.spikeNet_state_to_tvb_state(state)
+                output_buffer.write(np.concatenate([state[sv_id, nodes_ids, 0]
+                                                    for sv_id, nodes_ids in output_layout] + [[]]))
+                result = None
+            elif command == "call":
+                result = attrgetter(message[1])(interface.spiking_network)
+                if hasattr(result, "__call__"):
+                    result = result(*message[2], **message[3])
+            elif command == "close":
+                connection.send(("done", None))
+                break
+            else:
+                raise ValueError("Unknown command %s!" % str(command))
+            connection.send(("done", result))
+        except Exception:
+            connection.send(("error", traceback.format_exc()))
+    input_buffer.close()
+    output_buffer.close()
+
+
+class RemoteSpikingNetwork(SpikingNetwork):
+    """
+        RemoteSpikingNetwork is a proxy SpikingNetwork, the actual spiking network of which
+        (e.g., a NESTNetwork or an ANNarchyNetwork), together with its TVB - Spiking Network interface,
+        is built and simulated in a child process, by the serve_spiking_network function.
+        TVB state and coupling values are transferred to the child process,
+        and the spiking network output for TVB is transferred back,
+        via SharedMemoryRingBuffer instances, so that only small control messages are pickled.
+        It is used by the RemoteTVBSpikeNetInterface.
+    """
+
+    _process = None
+    _connection = None
+    _pending = False
+    exitcode = None
+
+    input_buffer = None
+    output_buffer = None
+    output_layout = []
+    spikeNet_to_tvb_params = {}
+    tvb_nodes_ids = np.array([])
+    spiking_nodes_ids = np.array([])
+    _min_delay = 0.0
+
+    def __init__(self, build_interface, state_shape, coupling_shape, n_slots=2, config=CONFIGURED):
+        """Start the child process, build the spiking network in it and establish the transfer buffers.
+           Arguments:
+            build_interface: a picklable (e.g., module level) callable, which returns the built TVBSpikeNetInterface
+            state_shape: the shape (number of state variables, number of regions) of the TVB state
+            coupling_shape: the shape (number of coupling variables, number of regions) of the TVB coupling
+            n_slots: the number of slots of the ring buffers. Default = 2
+        """
+        super(RemoteSpikingNetwork, self).__init__(SpikingBrain(), pd.Series(dtype="O"), pd.Series(dtype="O"),
+                                                   config)
+        self.state_shape = tuple(state_shape)
+        self.coupling_shape = tuple(coupling_shape)
+        self.input_buffer = SharedMemoryRingBuffer(np.prod(self.state_shape) + np.prod(self.coupling_shape),
+                                                   n_slots)
+        context = multiprocessing.get_context("spawn")
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(target=serve_spiking_network,
+                                        args=(build_interface, child_connection, self.input_buffer.name,
+                                              self.state_shape, self.coupling_shape, n_slots),
+                                        daemon=True)
+        self._process.start()
+        self._pending = True
+        handshake = self.wait()
+        self.output_buffer = SharedMemoryRingBuffer(np.sum([len(nodes_ids)
+                                                            for sv_id, nodes_ids in handshake["output_layout"]]),
+                                                    n_slots, name=handshake["output_buffer_name"])
+        self.output_layout = handshake["output_layout"]
+        self.spikeNet_to_tvb_params = handshake["spikeNet_to_tvb_params"]
+        self.tvb_nodes_ids = handshake["tvb_nodes_ids"]
+        self.spiking_nodes_ids = handshake["spiking_nodes_ids"]
+        self._min_delay = handshake["min_delay"]
+        LOG.info("%s started spiking network process %d!" % (self.__class__.__name__, self._process.pid))
+
+    def _send(self, *message):
+        self.wait()
+        if self._process is None:
+            raise ValueError("The spiking network process is not running (exit code %s)!" % str(self.exitcode))
+        try:
+            self._connection.send(message)
+        except (ConnectionResetError, BrokenPipeError):
+            self._process_died()
+        self._pending = True
+
+    def _process_died(self):
+        """Method to reap the child process, which died, e.g., by a segmentation fault, or killed for out of memory,
+           record its exit code and raise an error."""
+        self._pending = False
+        pid = self._process.pid
+        self._process.join()
+        self.exitcode = self._process.exitcode
+        self._process = None
+        raise ValueError("The spiking network process %d died with exit code %s!" % (pid, str(self.exitcode)))
+
+    def wait(self):
+        """Method to wait for the reply of the child process to the last control message, if any.
+           Returns:
+            the result of the last control message
+        """
+        if not self._pending:
+            return None
+        try:
+            status, result = self._connection.recv()
+        except (EOFError, ConnectionResetError, BrokenPipeError):
+            self._process_died()
+        self._pending = False
+        if status == "error":
+            raise ValueError("The spiking network process failed with:\n%s" % result)
+        return result
+
+    @property
+    def min_delay(self):
+        return self._min_delay
+
+    def configure(self, *args, **kwargs):
+        """Method to configure the spiking network of the child process for simulation."""
+        self._send("configure")
+        self.wait()
+
+    def write_tvb_values(self, state, coupling):
+        """Method to write the TVB state and coupling (of the first mode) to the input ring buffer."""
+        self.input_buffer.write(np.concatenate([state[:, :, 0].flatten(), coupling[:, :, 0].flatten()]))
+
+    def read_spikeNet_values(self):
+        """Method to read the values for TVB, output by the last simulation of the child process.
+           Returns:
+            a list of the tuples (TVB state variable index, TVB nodes' indices, values)
+        """
+        self.wait()
+        values = self.output_buffer.read()
+        output = []
+        start = 0
+        for sv_id, nodes_ids in self.output_layout:
+            output.append((sv_id, nodes_ids, values[start:start + len(nodes_ids)]))
+            start += len(nodes_ids)
+        return output
+
+    def _Run(self, simulation_length, *args, **kwargs):
+        """Method to request the simulation of the spiking network of the child process
+           for a specific simulation_length (in ms), after the TVB values have been written.
+           It returns without waiting for the simulation to be completed.
+        """
+        self._send("run", simulation_length)
+
+    def call(self, attribute, *args, **kwargs):
+        """Method to get, or call with the given arguments, an attribute of the spiking network of the child process,
+           e.g., for getting its recorded data after the end of the simulation, via call("get_spikes").
+           Mind that the result has to be picklable.
+        """
+        self._send("call", attribute, args, kwargs)
+        return self.wait()
+
+    def close(self):
+        """Method to stop the child process and release the shared memory."""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._send("close")
+                self.wait()
+            self._process.join()
+            self._process = None
+        for ring_buffer in [self.output_buffer, self.input_buffer]:
+            if ring_buffer is not None:
+                ring_buffer.close()
+        self.output_buffer = None
+        self.input_buffer = None
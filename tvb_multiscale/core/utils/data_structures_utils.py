@@ -39,6 +39,44 @@ def flatten_neurons_inds_in_DataArray(data_array, neurons_dim_label="Neuron"):
     return data_array
 
 
+def _flatten_times(times):
+    if isinstance(times, np.ndarray):
+        return times.ravel()
+    return flatten_list(times)
+
+
+def _times_interval_inds(events_times, interval, times_sorted):
+    # Indices of the events within an interval [start, stop] of times, where None means an open end.
+    # For sorted times, the interval is found by binary search, and returned as a slice:
+    start, stop = interval
+    if times_sorted:
+        i_start = 0 if start is None else np.searchsorted(events_times, start, side="left")
+        i_stop = events_times.size if stop is None else np.searchsorted(events_times, stop, side="right")
+        return slice(int(i_start), int(np.maximum(i_start, i_stop)))
+    inds = np.ones(events_times.shape, dtype="bool")
+    if start is not None:
+        inds &= events_times >= start
+    if stop is not None:
+        inds &= events_times <= stop
+    return inds
+
+
+def _times_inds(events_times, times, times_sorted):
+    # Indices of the events within a sequence of times, or within an interval of times, if len(times) == 2:
+    times = _flatten_times(times)
+    if len(times) == 2:
+        return _times_interval_inds(events_times, times, times_sorted)
+    return np.isin(events_times, np.array(times, dtype=events_times.dtype))
+
+
+def _inds_to_mask(inds, n_events):
+    if isinstance(inds, slice):
+        mask = np.zeros((n_events, ), dtype="bool")
+        mask[inds] = True
+        return mask
+    return inds
+
+
 def filter_events(events, variables=None, times=None, exclude_times=[]):
     """This method will select/exclude part of the measured events, depending on user inputs
         Arguments:
@@ -46,30 +84,17 @@ def filter_events(events, variables=None, times=None, exclude_times=[]):
             variables: sequence (list, tuple, array) of variables to be included in the output,
                        assumed to correspond to keys of the events dict.
                        Default=None, corresponds to all keys of events.
-            times: sequence (list, tuple, array) of times the events of which should be included in the output.
-                     Default = None, corresponds to all events' times.
+            times: sequence (list, tuple, array) of times the events of which should be included in the output,
+                   or an interval of times (start, stop), if it is of length 2,
+                   where either start or stop can be None, for an open interval.
+                   Default = None, corresponds to all events' times.
             exclude_times: sequence (list, tuple, array) of times
-                             the events of which should be excluded from the output. Default = [].
+                           the events of which should be excluded from the output,
+                           or an interval of times (start, stop), as for times. Default = [].
         Returns:
               the filtered dictionary (of arrays per attribute) of events
     """
 
-    def in_fun(values):
-        # Function to return a boolean about whether a value is
-        # within a sequence or an interval (len(values) == 2) of values:
-        if len(values) == 2:
-            if values[0] is not None:
-                if values[1] is not None:
-                    return lambda x: x >= values[0] and x <= values[1]
-                else:
-                    return lambda x: x >= values[0]
-            elif values[1] is not None:
-                return lambda x: x <= values[0]
-            else:
-                return lambda x: x
-        else:
-            return lambda x: x in values
-
     # The variables to return:
     if variables is None:
         variables = events.keys()
@@ -77,31 +102,57 @@ def filter_events(events, variables=None, times=None, exclude_times=[]):
     # The events:
     output_events = OrderedDict()
 
-    events_times = np.array(events["times"])
+    events_times = np.asarray(events["times"]).ravel()
 
-    n_events = len(events["times"])
+    n_events = events_times.size
     if n_events > 0:
         # As long as there are events:
+        times_sorted = bool(np.all(events_times[1:] >= events_times[:-1]))
         # If we (un)select times...
         if times is not None and len(times) > 0:
-            in_times = in_fun(flatten_list(times))
+            inds = _times_inds(events_times, times, times_sorted)
         else:
-            in_times = lambda x: True
+            inds = slice(0, n_events)
         if exclude_times is not None and len(exclude_times) > 0:
-            not_in_exclude_times = lambda x: not in_fun(flatten_list(exclude_times))(x)
-        else:
-            not_in_exclude_times = lambda x: True
-        inds = np.logical_and(np.ones((n_events,)),
-                              [in_times(time) and not_in_exclude_times(time)
-                               for time in events_times])
+            inds = _inds_to_mask(inds, n_events) & \
+                   ~_inds_to_mask(_times_inds(events_times, exclude_times, times_sorted), n_events)
         for var in ensure_list(variables):
-            output_events[var] = events[var][inds]
+            output_events[var] = np.asarray(events[var])[inds]
     else:
         for var in ensure_list(variables):
-            output_events[var] = []
+            output_events[var] = np.array([])
     return output_events
 
 
+def group_events(events, x="senders", y="times"):
+    """This function groups the values of the events' variable y by the values of the events' variable x,
+       in a compressed sparse row (CSR) form, by means of a stable argsort.
+        Arguments:
+            events: dictionary of events
+            x: the variable to group by. Default = "senders"
+            y: the variable to be grouped. Default = "times"
+        Returns:
+            the sorted unique values of x (groups),
+            the offsets array, of length equal to the number of groups + 1,
+            and the array of the values of y, sorted by x first and y second,
+            so that the values of y of the i-th group are ys[offsets[i]:offsets[i+1]]
+    """
+    xs = np.asarray(events[x]).ravel()
+    ys = np.asarray(events[y]).ravel()
+    order = np.argsort(ys, kind="stable")
+    order = order[np.argsort(xs[order], kind="stable")]
+    groups, starts = np.unique(xs[order], return_index=True)
+    offsets = np.append(starts, xs.size).astype("i8")
+    return groups, offsets, ys[order]
+
+
+def grouped_events_to_dict(groups, offsets, ys):
+    """This function returns an OrderedDict of the values of y per group, as slices (views) of ys,
+       for the output of group_events()"""
+    return OrderedDict([(group, ys[offsets[i_group]:offsets[i_group+1]])
+                        for i_group, group in enumerate(groups.tolist())])
+
+
 def summarize(results, digits=None):
 
     def unique_floats_fun(vals):
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import json
+from collections import OrderedDict
+from time import perf_counter
+
+import numpy as np
+
+
+class CosimulationProfiler(object):
+
+    """CosimulationProfiler accumulates the time spent at each phase of every co-simulation step,
+       as they are reported by the TVBSpikeNetInterface and the SpikingNetwork that share it:
+        - tvb_to_spikeNet_transform: transformation of TVB state to Spiking Network input values,
+        - tvb_to_spikeNet_set: setting of the values to the Spiking Network input devices/parameters,
+        - spikeNet_run: Spiking Network simulation (submission only, for pipelined simulation),
+        - spikeNet_wait: waiting for a pipelined Spiking Network simulation to complete,
+        - tvb_integration: TVB integration (the time between the Spiking Network Run and the write-back to TVB),
+        - spikeNet_readout: reading and transformation of the Spiking Network output values,
+        - spikeNet_to_tvb_write: writing of the Spiking Network values to the TVB state,
+        - tvb_other: the rest of the TVB simulation loop (coupling, monitors, etc).
+       A co-simulation step starts with the transfer of TVB state to the Spiking Network.
+    """
+
+    phases = ["tvb_to_spikeNet_transform", "tvb_to_spikeNet_set", "spikeNet_run", "spikeNet_wait",
+              "tvb_integration", "spikeNet_readout", "spikeNet_to_tvb_write", "tvb_other"]
+
+    def __init__(self, phases=None):
+        if phases is not None:
+            self.phases = list(phases)
+        self.reset()
+
+    def reset(self):
+        self.timings = OrderedDict([(phase, []) for phase in self.phases])
+        self._step_timings = OrderedDict([(phase, 0.0) for phase in self.phases])
+        self._mark = None
+        self._step_started = False
+
+    def mark(self):
+        """Mark the current time, as the start of the next add_since_mark()"""
+        self._mark = perf_counter()
+
+    def add(self, phase, duration):
+        """Add a duration (in sec) to the phase of the current step."""
+        self._step_timings[phase] += duration
+
+    def add_since_mark(self, phase):
+        """Add the time passed since the last mark to the phase of the current step, if there is a mark."""
+        if self._mark is not None:
+            self._step_timings[phase] += perf_counter() - self._mark
+            self._mark = None
+
+    def start_step(self):
+        """End the current step, if any, storing its timings, and start a new one."""
+        if self._step_started:
+            self.end_step()
+        self._step_started = True
+
+    def end_step(self):
+        """Store the timings of the current step and reset them for the next one."""
+        for phase, duration in self._step_timings.items():
+            self.timings[phase].append(duration)
+            self._step_timings[phase] = 0.0
+        self._step_started = False
+
+    @property
+    def number_of_steps(self):
+        return len(self.timings[self.phases[0]])
+
+    def report(self, bins=20):
+        """Method to return a dictionary of the totals, statistics and histograms of the steps' timings of each phase.
+           Arguments:
+            bins: the number of bins of the histograms. Default = 20
+           Returns:
+            a dictionary of phases' dictionaries, and the number of steps and total time of all phases
+        """
+        if self._step_started:
+            self.end_step()
+        output = OrderedDict()
+        total = 0.0
+        for phase, timings in self.timings.items():
+            timings = np.array(timings)
+            phase_report = OrderedDict([("total", float(np.sum(timings)))])
+            total += phase_report["total"]
+            if timings.size:
+                counts, edges = np.histogram(timings, bins=bins)
+                phase_report.update([("mean", float(np.mean(timings))), ("std", float(np.std(timings))),
+                                     ("min", float(np.min(timings))), ("max", float(np.max(timings))),
+                                     ("histogram", {"counts": counts.tolist(), "edges": edges.tolist()})])
+            output[phase] = phase_report
+        output["number_of_steps"] = self.number_of_steps
+        output["total"] = total
+        return output
+
+    def to_json(self, filepath, bins=20):
+        """Method to write the report of the profiler to a json file."""
+        with open(filepath, "w") as file:
+            json.dump(self.report(bins), file, indent=2)
+        return filepath
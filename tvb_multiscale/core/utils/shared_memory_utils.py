@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+class SharedMemoryRingBuffer(object):
+
+    """SharedMemoryRingBuffer is a ring buffer of fixed size float64 vectors (slots)
+       in a multiprocessing.shared_memory.SharedMemory block, to be shared by a single producer process
+       and a single consumer process. Its header holds the total numbers of slots written and read.
+       The synchronization of the two processes, e.g., via control messages, is left to the user.
+    """
+
+    _header_size = 2  # number of writes and number of reads
+
+    def __init__(self, slot_size, n_slots=2, name=None):
+        """Create a new ring buffer, or attach to an existing one, if its name is given.
+           Arguments:
+            slot_size: the number of float64 values of each slot
+            n_slots: the number of slots of the ring buffer. Default = 2
+            name: the name of an existing ring buffer's shared memory block to attach to. Default = None
+        """
+        self.slot_size = int(slot_size)
+        self.n_slots = int(n_slots)
+        nbytes = 8 * (self._header_size + self.n_slots * max(self.slot_size, 1))
+        self._owner = name is None
+        if self._owner:
+            self.shared_memory = SharedMemory(create=True, size=nbytes)
+        else:
+            self.shared_memory = SharedMemory(name=name)
+        self._header = np.ndarray((self._header_size,), dtype="i8", buffer=self.shared_memory.buf)
+        self._slots = np.ndarray((self.n_slots, max(self.slot_size, 1)), dtype="f8",
+                                 buffer=self.shared_memory.buf, offset=8 * self._header_size)
+        if self._owner:
+            self._header[:] = 0
+
+    @property
+    def name(self):
+        return self.shared_memory.name
+
+    @property
+    def number_of_writes(self):
+        return int(self._header[0])
+
+    @property
+    def number_of_reads(self):
+        return int(self._header[1])
+
+    @property
+    def number_of_pending_slots(self):
+        return self.number_of_writes - self.number_of_reads
+
+    def write(self, values):
+        """Write the values' vector to the next slot of the ring buffer."""
+        if self.number_of_pending_slots >= self.n_slots:
+            raise ValueError("Ring buffer %s is full with %d unread slots!" % (self.name, self.n_slots))
+        self._slots[self.number_of_writes % self.n_slots, :self.slot_size] = values
+        self._header[0] += 1
+
+    def read(self):
+        """Read (a copy of) the values' vector of the next unread slot of the ring buffer."""
+        if self.number_of_pending_slots < 1:
+            raise ValueError("Ring buffer %s has no unread slots!" % self.name)
+        values = self._slots[self.number_of_reads % self.n_slots, :self.slot_size].copy()
+        self._header[1] += 1
+        return values
+
+    def close(self):
+        """Detach from the shared memory block, and unlink it, if this is the process that created it."""
+        self._header = None
+        self._slots = None
+        self.shared_memory.close()
+        if self._owner:
+            self.shared_memory.unlink()
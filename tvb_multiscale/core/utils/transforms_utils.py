@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Fused TVB -> Spiking Network transformation kernels of the general form:
+# values_for_spikeNet = scale * tvb_values[nodes_ids], optionally clipped at zero (e.g., for spike rates),
+# where scale is the vector of the interface scales fused with the builder's transformation weights.
+
+
+def _gather(values, nodes_ids, scale):
+    values = values[nodes_ids]
+    if values.ndim > 1:
+        # One scale per node for all TVB modes:
+        scale = np.reshape(scale, (-1,) + (1,) * (values.ndim - 1))
+    return scale, values
+
+
+def gather_scale(values, nodes_ids, scale):
+    scale, values = _gather(values, nodes_ids, scale)
+    return scale * values
+
+
+def gather_scale_clip(values, nodes_ids, scale):
+    scale, values = _gather(values, nodes_ids, scale)
+    return np.maximum(0.0, scale * values)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(nogil=True)
+    def _gather_scale_numba(values, nodes_ids, scale):
+        output = np.empty(nodes_ids.shape[0])
+        for i in range(nodes_ids.shape[0]):
+            output[i] = scale[i] * values[nodes_ids[i]]
+        return output
+
+    @njit(nogil=True)
+    def _gather_scale_clip_numba(values, nodes_ids, scale):
+        output = np.empty(nodes_ids.shape[0])
+        for i in range(nodes_ids.shape[0]):
+            value = scale[i] * values[nodes_ids[i]]
+            # NaN values are propagated, as by np.maximum:
+            if value < 0.0:
+                output[i] = 0.0
+            else:
+                output[i] = value
+        return output
+
+    def _numba_kernel(numba_kernel, numpy_kernel):
+        def kernel(values, nodes_ids, scale):
+            # The jitted kernels work only for vectors of values, i.e., for a single TVB mode:
+            if values.ndim == 1:
+                return numba_kernel(values, nodes_ids, scale)
+            return numpy_kernel(values, nodes_ids, scale)
+        return kernel
+
+    gather_scale_numba = _numba_kernel(_gather_scale_numba, gather_scale)
+    gather_scale_clip_numba = _numba_kernel(_gather_scale_clip_numba, gather_scale_clip)
+
+
+def transform_kernel(clip=False, use_numba=True):
+    """Function to return a fused transformation kernel of signature kernel(values, nodes_ids, scale),
+       which gathers the values at the nodes' indices, multiplies them with the scale vector,
+       and, optionally, clips the result at zero.
+       The kernel is jitted by numba, if numba is available and use_numba is True,
+       otherwise it is a pure numpy function.
+       Arguments:
+        clip: boolean flag to clip the transformed values at zero (e.g., for spike rates). Default = False
+        use_numba: boolean flag to use numba jitted kernels, if numba is available. Default = True
+       Returns:
+        the kernel function
+    """
+    if use_numba and NUMBA_AVAILABLE:
+        if clip:
+            return gather_scale_clip_numba
+        return gather_scale_numba
+    if clip:
+        return gather_scale_clip
+    return gather_scale
+
+
+def transform_kernel_from_function(transform_fun):
+    """Function to wrap a transformation function of signature transform_fun(values, nodes_ids)
+       into a kernel of signature kernel(values, nodes_ids, scale)."""
+    def kernel(values, nodes_ids, scale):
+        return scale * transform_fun(values, nodes_ids)
+    return kernel
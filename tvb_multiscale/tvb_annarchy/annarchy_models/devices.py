@@ -7,7 +7,7 @@ from xarray import DataArray, combine_by_coords
 import numpy as np
 
 from tvb_multiscale.core.spiking_models.devices import \
-   Device, InputDevice, OutputDevice, SpikeRecorder, Multimeter, SpikeMultimeter
+   Device, InputDevice, OutputDevice, SpikeRecorder, Multimeter, SpikeMultimeter, EventBuffer
 from tvb_multiscale.core.utils.data_structures_utils import flatten_neurons_inds_in_DataArray
 
 from tvb_multiscale.tvb_annarchy.annarchy_models.population import ANNarchyPopulation
@@ -697,9 +697,9 @@ class ANNarchySpikeMonitor(ANNarchyOutputDevice, SpikeRecorder):
     """ANNarchySpikeMonitor class to wrap around ANNarchy.Monitor instances,
        acting as an output device of spike discrete events."""
 
-    _data = List(of=dict, label="SpikeMonitor data buffer", default=(),
-                 doc="""A list of dictionaries (one per Monitor) for holding the spike events
-                       read from the Monitors""")
+    _data = Attr(field_type=EventBuffer, label="SpikeMonitor data buffer", default=lambda: EventBuffer(),
+                 required=True,
+                 doc="""An EventBuffer holding the spike events read from the Monitors""")
 
     def __init__(self, monitors=None, label="", annarchy_instance=None, run_tvb_multiscale_init=True, **kwargs):
         if run_tvb_multiscale_init:
@@ -710,43 +710,34 @@ class ANNarchySpikeMonitor(ANNarchyOutputDevice, SpikeRecorder):
 
     def _record(self):
         """Method to get discrete spike events' data from ANNarchy.Monitor instances,
-           and merge and store them to the _data buffer."""
+           and append them to the _data buffer."""
         dt = self.dt
-        for i_m, (monitor, population) in enumerate(self.monitors.items()):
-            if len(self._data) <= i_m:
-                self._data += (OrderedDict(), )
+        for monitor, population in self.monitors.items():
             spikes = monitor.get("spike")
-            senders = self._get_senders(population, list(spikes.keys()))
-            for sender, spikes_times in zip(senders, list(spikes.values())):
-                self._data[i_m].update({sender:
-                                            self._data[i_m].get(sender, []) + (np.array(spikes_times) * dt).tolist()})
+            if len(spikes) == 0:
+                continue
+            spikes_times = [np.array(spikes_steps) for spikes_steps in spikes.values()]
+            senders = np.repeat(np.array(ensure_list(self._get_senders(population, list(spikes.keys())))),
+                                [len(spikes_steps) for spikes_steps in spikes_times])
+            self._data.append({"times": np.concatenate(spikes_times) * dt, "senders": senders})
 
     @property
     def events(self):
         """Method to record discrete spike events' data from ANNarchy.Monitor instances,
            and to return them in a events dictionary."""
         self._record()
-        events = OrderedDict()
-        events["times"] = []
-        events["senders"] = []
-        for i_m, monitor_data in enumerate(self._data):
-            for sender, spikes_times in monitor_data.items():
-                events["times"] += spikes_times
-                events["senders"] += [sender] * len(spikes_times)
-        return events
+        return self._data.events
 
     @property
     def number_of_events(self):
         self._record()
-        n_events = 0
-        for i_m, monitor_data in enumerate(self._data):
-            for sender, spikes_times in monitor_data.items():
-                n_events += len(spikes_times)
-        return n_events
+        return self._data.size
 
     def reset(self):
         self._record()
-        self._data = ()
+        self._archive_events()
+        self._data.clear()
+        self._restart_events_count()
 
 
 class ANNarchySpikeMultimeter(ANNarchyMonitor, ANNarchySpikeMonitor, SpikeMultimeter):
@@ -83,7 +83,7 @@ class ANNarchyNetwork(SpikingNetwork):
             directory = os.path.join(directory.split(cwd)[-1][1:].split("res")[0], self.__class__.__name__)
         self.annarchy_instance.compile(directory=directory, *args, **kwargs)
 
-    def Run(self, simulation_length, *args, **kwargs):
+    def _Run(self, simulation_length, *args, **kwargs):
         """Method to simulate the ANNarchy network for a specific simulation_length (in ms).
            It will run annarchy_instance.simulate(simulation_length, *args, **kwargs)
         """
@@ -23,8 +23,12 @@ class TVBtoANNarchyDeviceInterface(TVBtoSpikeNetDeviceInterface):
 
 class TVBtoANNarchyPoissonPopulationInterface(TVBtoANNarchyDeviceInterface):
 
-    def set(self, values):
-        self.Set({"rates": np.maximum([0], self._assert_input_size(values))})
+    def set(self, values, mask=None):
+        values = np.maximum([0], self._assert_input_size(values))
+        if mask is None:
+            self.Set({"rates": values})
+        else:
+            self.Set({"rates": values[mask]}, nodes=np.array(self.devices())[mask].tolist())
 
 
 class TVBtoANNarchyPoissonNeuronInterface(TVBtoANNarchyPoissonPopulationInterface):
@@ -44,8 +48,12 @@ class TVBtoANNarchyHomogeneousCorrelatedSpikeTrainsInterface(TVBtoANNarchyPoisso
 
 class TVBtoNESTMIPGeneratorInterface(TVBtoANNarchyDeviceInterface):
 
-    def set(self, values):
-        self.Set({"rate": np.maximum(0, values)})
+    def set(self, values, mask=None):
+        values = np.maximum(0, values)
+        if mask is None:
+            self.Set({"rate": values})
+        else:
+            self.Set({"rate": values[mask]}, nodes=np.array(self.devices())[mask].tolist())
 
 
 INPUT_INTERFACES_DICT = {# "DCCurrentInjector": TVBtoANNarchyDCCurrentInjectorInterface,
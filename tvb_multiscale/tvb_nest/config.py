@@ -12,6 +12,7 @@ MYMODULES_DIR = os.environ.get("MYMODULES_DIR",
                                os.path.join(TVB_NEST_DIR, "tvb_nest/nest/modules"))
 MYMODULES_BLD_DIR = os.environ.get("MYMODULES_BLD_DIR",
                                    os.path.join(TVB_NEST_DIR, "tvb_nest/nest/modules_builds"))
+MYMODULES_CACHE_DIR = os.environ.get("MYMODULES_CACHE_DIR", os.path.join(MYMODULES_BLD_DIR, "cache"))
 
 
 class Config(ConfigBase):
@@ -21,6 +22,11 @@ class Config(ConfigBase):
     RECORDINGS_DIR = os.path.join(WORKING_DIR, "nest_recordings")
     MYMODULES_DIR = MYMODULES_DIR
     MYMODULES_BLD_DIR = MYMODULES_BLD_DIR
+    MYMODULES_CACHE_DIR = MYMODULES_CACHE_DIR
+    # The environment variables of the compiler flags, which, if changed, require NEST modules to be recompiled:
+    MYMODULES_COMPILER_FLAGS = ["CC", "CXX", "CFLAGS", "CXXFLAGS", "LDFLAGS", "CMAKE_ARGS"]
+    # The maximum number of processes compiling NEST modules in parallel (None for as many as the available cores):
+    MYMODULES_COMPILE_WORKERS = None
 
     MASTER_SEED = 0
 
@@ -78,6 +84,7 @@ class Config(ConfigBase):
         self.DEFAULT_NEST_KERNEL_CONFIG["data_path"] = self.RECORDINGS_DIR
         self.MYMODULES_DIR = MYMODULES_DIR
         self.MYMODULES_BLD_DIR = MYMODULES_BLD_DIR
+        self.MYMODULES_CACHE_DIR = MYMODULES_CACHE_DIR
 
 
 CONFIGURED = Config(initialize_logger=False)
@@ -4,6 +4,8 @@ from tvb_multiscale.tvb_nest.config import CONFIGURED
 from tvb_multiscale.tvb_nest.nest_models.devices import \
     NESTInputDeviceDict, NESTSpikeInputDeviceDict, NESTCurrentInputDeviceDict, \
     NESTOutputDeviceDict, NESTOutputSpikeDeviceDict, NESTOutputContinuousTimeDeviceDict
+from tvb_multiscale.tvb_nest.interfaces.tvb_to_nest_devices_interface import TVBtoNESTDeviceInterface
+from tvb_multiscale.tvb_nest.interfaces.nest_to_tvb_interface import NESTtoTVBinterface
 from tvb_multiscale.core.interfaces.base import TVBSpikeNetInterface
 
 
@@ -22,3 +24,14 @@ class TVBNESTInterface(TVBSpikeNetInterface):
     @property
     def nest_instance(self):
         return self.spiking_network.nest_instance
+
+    def configure(self, tvb_model):
+        super(TVBNESTInterface, self).configure(tvb_model)
+        # Concatenate the devices of each TVB -> NEST device interface into a single NodeCollection:
+        for interface in self.tvb_to_spikeNet_interfaces:
+            if isinstance(interface, TVBtoNESTDeviceInterface):
+                interface.configure()
+        # ...and the recorders of each NEST -> TVB interface, for bulk reading of their number of events:
+        for interface in self.spikeNet_to_tvb_interfaces:
+            if isinstance(interface, NESTtoTVBinterface):
+                interface.configure()
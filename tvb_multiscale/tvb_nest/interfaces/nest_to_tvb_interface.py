@@ -7,6 +7,15 @@ from tvb_multiscale.core.interfaces.spikeNet_to_tvb_interface import SpikeNetToT
 
 class NESTtoTVBinterface(SpikeNetToTVBinterface):
 
+    # A single NodeCollection of all the recorders of the interface,
+    # the order of the interface's nodes in it, and the number of neurons recorded by each node's recorder,
+    # for getting the number of events of all recorders with a single get() call:
+    _devices_collection = None
+    _devices_order = None
+    _number_of_neurons = None
+    # The number of resets of each node's recorder, when its number of events was last read:
+    _number_of_resets = None
+
     def __init__(self, spiking_network, tvb_sv_id, name="", model="",
                  nodes_ids=[], scale=np.array([1.0]), device_set=None):
         super(NESTtoTVBinterface, self).__init__(spiking_network, tvb_sv_id, name, model,
@@ -17,48 +26,68 @@ class NESTtoTVBinterface(SpikeNetToTVBinterface):
     def nest_instance(self):
         return self.spiking_network.nest_instance
 
+    def configure(self):
+        """Method to concatenate all the recorders of the interface into a single NodeCollection,
+           (sorted by global id), and to cache the number of neurons each one records from.
+           It has to be called again if the recorders' connections change."""
+        global_ids = np.array([self[node].global_id for node in self.devices()]).flatten()
+        self._devices_order = np.argsort(global_ids)
+        self._devices_collection = self.nest_instance.NodeCollection(global_ids[self._devices_order].tolist())
+        # (at least 1, for recorders without any neurons, which record no events anyway):
+        self._number_of_neurons = \
+            np.maximum(1.0, np.array([self[node].number_of_neurons for node in self.devices()]).astype("f8"))
+        self._number_of_resets = self._get_number_of_resets()
+
+    def _get_number_of_resets(self):
+        return np.array([self[node].number_of_resets for node in self.devices()])
+
     @property
     def population_mean_spikes_number(self):
-        values = []
-        for i_node, (node, n_events) in enumerate(zip(self.devices(), self.number_of_events)):
-            number_of_events = self[node].number_of_events
-            if number_of_events > n_events:
-                values.append((number_of_events - n_events) / self[node].number_of_neurons)
-            else:
-                values.append(0.0)
-            self.number_of_events[i_node] = number_of_events
-        return np.array(values).flatten()
+        # The number of events of all recorders, with a single get() call:
+        if self._devices_collection is None:
+            self.configure()
+        number_of_events = np.empty(self._number_of_neurons.shape)
+        number_of_events[self._devices_order] = \
+            np.array(self._devices_collection.get("n_events")).flatten()
+        # ...plus the events drained from the memory of the recorders, if any:
+        number_of_events += np.array([self[node].number_of_drained_events for node in self.devices()])
+        # The number of events of the recorders reset since the previous exchange counts from 0:
+        number_of_resets = self._get_number_of_resets()
+        previous_number_of_events = np.where(number_of_resets == self._number_of_resets, self.number_of_events, 0.0)
+        self._number_of_resets = number_of_resets
+        # Only the events recorded since the previous exchange, if any:
+        values = np.where(number_of_events > previous_number_of_events,
+                          (number_of_events - previous_number_of_events) / self._number_of_neurons, 0.0)
+        self.number_of_events = number_of_events
+        return values
+
+    # The following readouts are incremental:
+    # each device keeps a read cursor and only the events recorded since the previous exchange are fetched.
 
     @property
     def population_mean_spikes_activity(self):
         values = []
-        for i_node, (node, n_events) in enumerate(zip(self.devices(), self.number_of_events)):
-            number_of_events = self[node].number_of_events
-            if number_of_events > n_events:
-                # if there are new events, sum up only the spikes' weights not yet considered:
-                values.append(np.sum(self.events[self.spike_var][n_events:]) / self[node].number_of_neurons)
-            else:
-                values.append(0.0)
-            self.number_of_events[i_node] = number_of_events
+        for node in self.devices():
+            # sum up only the spikes' weights not yet considered:
+            spikes_vars = self[node].spikes_vars
+            new_events = self[node].get_new_events(spikes_vars)
+            values.append(np.sum([np.sum(new_events[var]) for var in spikes_vars]) / self[node].number_of_neurons)
         return np.array(values).flatten()
 
     @property
     def current_population_mean_values(self):
         values = []
-        for i_node, (node, n_events) in enumerate(zip(self.devices(), self.number_of_events)):
-            number_of_events = self[node].number_of_events
-            if number_of_events > n_events:
-                # if there are new events, take the mean of all the values not yet considered:
-                # (unlike discrete spike events, for continuous multimeter events
-                # we assume that the new events are of size n_time_steps * n_neurons,
-                # and, unlike spike weights' time series,
-                # we compute mean absolute activity and not a rate
-                # (i.e., with division by number of time points instead of time)
-                this_node_values = []
-                for var in self[node].record_from:
-                    this_node_values.append(np.mean(self.events[var][n_events:]))
-                values.append(np.array(this_node_values))
+        for node in self.devices():
+            # take the mean of all the values not yet considered:
+            # (unlike discrete spike events, for continuous multimeter events
+            # we assume that the new events are of size n_time_steps * n_neurons,
+            # and, unlike spike weights' time series,
+            # we compute mean absolute activity and not a rate
+            # (i.e., with division by number of time points instead of time)
+            record_from = self[node].record_from
+            new_events = self[node].get_new_events(record_from)
+            if len(record_from) and new_events[record_from[0]].size:
+                values.append(np.array([np.mean(new_events[var]) for var in record_from]))
             else:
-                values.append(np.zeros((len(self.record_from),)))
-            self.number_of_events[i_node] = number_of_events
-        return np.array(values).flatten()
\ No newline at end of file
+                values.append(np.zeros((len(record_from),)))
+        return np.array(values).flatten()
@@ -5,64 +5,159 @@ import numpy as np
 from tvb_multiscale.core.interfaces.tvb_to_spikeNet_device_interface import TVBtoSpikeNetDeviceInterface
 
 
-# Each interface has its own set(values) method, depending on the underlying device:
+# Each interface has its own set(values) method, depending on the underlying device.
+# Interfaces of devices, the values of which hold until they are set again,
+# can also set values to a subset of their devices, via set(values, mask).
 
 
 class TVBtoNESTDeviceInterface(TVBtoSpikeNetDeviceInterface):
 
+    # A single NEST NodeCollection of all the devices of the interface,
+    # and the order of the interface's nodes in it, for batched set() calls:
+    _devices_collection = None
+    _devices_order = None
+    _devices_global_ids = None
+
     @property
     def nest_instance(self):
         return self.spiking_network.nest_instance
 
+    @property
+    def kernel_status(self):
+        # The NEST kernel status snapshot of the NESTNetwork, to avoid querying NEST at every time step
+        return self.spiking_network.kernel_status
+
+    def configure(self):
+        """Method to concatenate all the devices of the interface into a single NEST NodeCollection,
+           (sorted by global id, as required by NEST), so that they can be set with a single set() call."""
+        global_ids = np.array([self[node].global_id for node in self.devices()]).flatten()
+        self._devices_order = np.argsort(global_ids)
+        self._devices_global_ids = global_ids[self._devices_order]
+        self._devices_collection = self.nest_instance.NodeCollection(self._devices_global_ids.tolist())
+
+    def _schedule_times(self, n_steps):
+        # The times of a schedule of n_steps TVB time steps, starting from the current NEST time,
+        # rounded to the grid of the NEST resolution, which NEST requires of the devices' times:
+        resolution = self.kernel_status.resolution
+        times = self.kernel_status.time + resolution + self.dt * np.arange(n_steps)
+        return (np.round(times / resolution) * resolution).tolist()
+
+    def _set_batched(self, values_per_node, common_values={}, arrays=False, mask=None):
+        """Method to set values to all the devices of the interface with a single NEST set() call.
+           Arguments:
+            values_per_node: dictionary of attributes names' and sequences of values, one for each node
+            common_values: dictionary of attributes names' and values common for all nodes. Default = {}
+            arrays: if True, the values per node are arrays (e.g., spike times).
+                    Then, a list of dictionaries is set, one for each device. Otherwise, list-valued parameters.
+                    Default = False
+            mask: an optional boolean array of the nodes to set values to. Default = None, for all nodes
+        """
+        if self._devices_collection is None:
+            self.configure()
+        if mask is None:
+            order = self._devices_order
+            devices_collection = self._devices_collection
+        else:
+            # The masked devices, still sorted by global id:
+            sorted_mask = np.array(mask)[self._devices_order]
+            order = self._devices_order[sorted_mask]
+            devices_collection = self.nest_instance.NodeCollection(self._devices_global_ids[sorted_mask].tolist())
+        if arrays:
+            values = []
+            for i_node in order:
+                node_values = dict(common_values)
+                for key, val in values_per_node.items():
+                    node_values[key] = np.array(val[i_node]).flatten().tolist()
+                values.append(node_values)
+        else:
+            values = dict(common_values)
+            for key, val in values_per_node.items():
+                values[key] = np.array(val)[order].tolist()
+        devices_collection.set(values)
+
 
 class TVBtoNESTDCGeneratorInterface(TVBtoNESTDeviceInterface):
 
+    # Values are set for the next TVB time step only:
+    _persistent_values = False
+
     def set(self, values):
-        self.Set({"amplitude": self._assert_input_size(values),
-                  "origin": self.nest_instance.GetKernelStatus("time"),
-                  "start": self.nest_instance.GetKernelStatus("min_delay"),
-                  "stop": self.dt})
+        self._set_batched({"amplitude": self._assert_input_size(values)},
+                          {"origin": self.kernel_status.time,
+                           "start": self.kernel_status.min_delay,
+                           "stop": self.dt})
 
 
 class TVBtoNESTPoissonGeneratorInterface(TVBtoNESTDeviceInterface):
 
+    # Values are set for the next TVB time step only:
+    _persistent_values = False
+
     def set(self, values):
-        self.Set({"rate": np.maximum([0], self._assert_input_size(values)),
-                  "origin": self.nest_instance.GetKernelStatus("time"),
-                  "start": self.nest_instance.GetKernelStatus("min_delay"),
-                  "stop": self.dt})
+        self._set_batched({"rate": np.maximum([0], self._assert_input_size(values))},
+                          {"origin": self.kernel_status.time,
+                           "start": self.kernel_status.min_delay,
+                           "stop": self.dt})
 
 
 class TVBtoNESTInhomogeneousPoissonGeneratorInterface(TVBtoNESTDeviceInterface):
 
-    def set(self, values):
-        values = np.maximum([0], self._assert_input_size(values)).tolist()
-        for i_val, val in enumerate(values):
-            values[i_val] = [val]
-        self.Set({"rate_times": [[self.nest_instance.GetKernelStatus("time") +
-                                  self.nest_instance.GetKernelStatus("resolution")]] * self.number_of_nodes,
-                  "rate_values": values})
+    def set(self, values, mask=None):
+        self._set_batched({"rate_values": np.maximum([0], self._assert_input_size(values))},
+                          {"rate_times": self._schedule_times(1)},
+                          arrays=True, mask=mask)
+
+    def set_schedule(self, values):
+        """Method to set a schedule of rates, for each TVB time step of a synchronization window.
+           Arguments:
+            values: array of shape (number of TVB time steps, number of nodes)
+        """
+        self._set_batched({"rate_values": np.maximum(0, values).T},
+                          {"rate_times": self._schedule_times(values.shape[0])},
+                          arrays=True)
+
+
+class TVBtoNESTStepCurrentGeneratorInterface(TVBtoNESTDeviceInterface):
+
+    def set(self, values, mask=None):
+        self._set_batched({"amplitude_values": self._assert_input_size(values)},
+                          {"amplitude_times": self._schedule_times(1)},
+                          arrays=True, mask=mask)
+
+    def set_schedule(self, values):
+        """Method to set a schedule of currents, for each TVB time step of a synchronization window.
+           Arguments:
+            values: array of shape (number of TVB time steps, number of nodes)
+        """
+        self._set_batched({"amplitude_values": np.array(values).T},
+                          {"amplitude_times": self._schedule_times(values.shape[0])},
+                          arrays=True)
 
 
 class TVBtoNESTSpikeGeneratorInterface(TVBtoNESTDeviceInterface):
 
+    # Values are set for the next TVB time step only:
+    _persistent_values = False
+
     def set(self, values):
         values = self._assert_input_size(values)
         # TODO: change this so that rate corresponds to number of spikes instead of spikes' weights
-        self.Set({"spikes_times": np.ones((self.number_of_nodes,)) *
-                                  self.nest_instance.GetKernelStatus("min_delay"),
-                  "origin": self.nest_instance.GetKernelStatus("time"),
-                  "spike_weights": values})
+        self._set_batched({"spikes_times": np.ones((self.number_of_nodes,)) *
+                                           self.kernel_status.min_delay,
+                           "spike_weights": values},
+                          {"origin": self.kernel_status.time},
+                          arrays=True)
 
 
 class TVBtoNESTMIPGeneratorInterface(TVBtoNESTDeviceInterface):
 
-    def set(self, values):
-        self.Set({"rate": np.maximum(0, self._assert_input_size(values))})
+    def set(self, values, mask=None):
+        self._set_batched({"rate": np.maximum(0, self._assert_input_size(values))}, mask=mask)
 
 
 INPUT_INTERFACES_DICT = {"dc_generator": TVBtoNESTDCGeneratorInterface,
                          "poisson_generator": TVBtoNESTPoissonGeneratorInterface,
                          "inhomogeneous_poisson_generator": TVBtoNESTInhomogeneousPoissonGeneratorInterface,
+                         "step_current_generator": TVBtoNESTStepCurrentGeneratorInterface,
                          "spike_generator": TVBtoNESTSpikeGeneratorInterface,
                          "mip_generator": TVBtoNESTMIPGeneratorInterface}
\ No newline at end of file
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from copy import deepcopy
+from collections import OrderedDict
+from numbers import Number
 
 import numpy as np
 
@@ -10,7 +12,7 @@ from tvb_multiscale.tvb_nest.nest_models.region_node import NESTRegionNode
 from tvb_multiscale.tvb_nest.nest_models.brain import NESTBrain
 from tvb_multiscale.tvb_nest.nest_models.network import NESTNetwork
 from tvb_multiscale.tvb_nest.nest_models.builders.nest_factory import \
-    load_nest, compile_modules, get_populations_neurons, create_conn_spec, create_device, connect_device
+    NEST_BOOTSTRAP, load_nest, compile_modules, get_populations_neurons, create_conn_spec, create_device, connect_device
 from tvb_multiscale.core.spiking_models.builders.factory import build_and_connect_devices
 from tvb_multiscale.core.spiking_models.builders.base import SpikingModelBuilder
 
@@ -32,6 +34,9 @@ class NESTModelBuilder(SpikingModelBuilder):
     config = CONFIGURED
     nest_instance = None
     modules_to_install = []
+    # The maximum number of synapses of an "all_to_all" connection to be expanded and merged by connect_populations().
+    # Larger connections are created by a native nest.Connect call each, to avoid the memory of the expanded arrays:
+    max_bulk_all_to_all_synapses = 1000000
     _spiking_brain = NESTBrain()
 
     def __init__(self, tvb_simulator, nest_nodes_ids, nest_instance=None, config=CONFIGURED, logger=LOG):
@@ -44,9 +49,13 @@ class NESTModelBuilder(SpikingModelBuilder):
     def _configure_nest_kernel(self):
         # Setting or loading a nest instance:
         if self.nest_instance is None:
-            self.nest_instance = load_nest(self.config, self.logger)
-        self.nest_instance.ResetKernel()  # This will restart NEST!
-        self.nest_instance.set_verbosity(self.config.NEST_VERBOCITY)  # don't print all messages from NEST
+            self.nest_instance = load_nest(self.config, self.logger, reset=False)
+        if NEST_BOOTSTRAP.manages(self.nest_instance):
+            # This will restart NEST, re-installing the modules installed so far,
+            # but not the kernel configuration of a previous builder, which is replaced right after:
+            NEST_BOOTSTRAP.reset(self.logger, restore_kernel_config=False)
+        else:
+            self.nest_instance.ResetKernel()  # This will restart NEST!
         kernel_config = deepcopy(self.default_kernel_config)
         # Printing the time progress should only be used when the simulation is run on a local machine:
         #  kernel_config["print_time"] = self.nest_instance.Rank() == 0
@@ -55,43 +64,68 @@ class NESTModelBuilder(SpikingModelBuilder):
         kernel_config["resolution"] = self.spiking_dt
         if "data_path" in kernel_config.keys():
             safe_makedirs(kernel_config["data_path"])  # Make sure this folder exists
-        self.nest_instance.SetKernelStatus(kernel_config)
+        if NEST_BOOTSTRAP.manages(self.nest_instance):
+            # Cache the kernel configuration, to be re-applied by every reset of NEST:
+            NEST_BOOTSTRAP.configure_kernel(kernel_config, self.config.NEST_VERBOCITY)
+        else:
+            self.nest_instance.set_verbosity(self.config.NEST_VERBOCITY)  # don't print all messages from NEST
+            self.nest_instance.SetKernelStatus(kernel_config)
+
+    @staticmethod
+    def _module_names(module):
+        # Return the name of the module to be compiled and the one of the module to be installed:
+        if module[-6:] == "module":
+            return module.split("module")[0], module
+        return module, module + "module"
+
+    def _install(self, module):
+        if NEST_BOOTSTRAP.manages(self.nest_instance):
+            # Cache the module, to be re-installed by every reset of NEST:
+            NEST_BOOTSTRAP.install(module)
+        else:
+            self.nest_instance.Install(module)
 
-    def _compile_install_nest_module(self, module):
+    def _install_nest_module(self, module):
         """This method will try to install the input NEST module.
-           If it fails, it will try to compile it first and retry installing it.
            Arguments:
-            module: the name (string) of the module to be installed and, possibly, compiled
+            module: the name (string) of the module to be installed
+           Returns:
+            True if the installation succeeded, False otherwise
         """
-        if module[-6:] == "module":
-            module_name = module.split("module")[0]
-        else:
-            module_name = module
-            module = module + "module"
         try:
             # Try to install it...
             self.logger.info("Trying to install module %s..." % module)
-            self.nest_instance.Install(module)
+            self._install(module)
             self.logger.info("DONE installing module %s!" % module)
+            return True
         except:
             self.logger.info("FAILED! We need to first compile it!")
-            # ...unless we need to first compile it:
-            compile_modules(module_name, recompile=False, config=self.config)
-            # and now install it...
-            self.logger.info("Installing now module %s..." % module)
-            self.nest_instance.Install(module)
-            self.logger.info("DONE installing module %s!" % module)
+            return False
 
     def compile_install_nest_modules(self, modules_to_install):
         """This method will try to install the input NEST modules, also compiling them, if necessary.
+           All the modules that fail to install are compiled together, in parallel processes,
+           or installed from the compilation cache, if they are unchanged (see compile_modules()).
             Arguments:
              modules_to_install: a sequence (list, tuple) of the names (strings)
                                  of the modules to be installed and, possibly, compiled
         """
         if len(modules_to_install) > 0:
             self.logger.info("Starting to compile modules %s!" % str(modules_to_install))
+            to_compile = []
             while len(modules_to_install) > 0:
-                self._compile_install_nest_module(modules_to_install.pop())
+                module_name, module = self._module_names(modules_to_install.pop())
+                if not self._install_nest_module(module):
+                    to_compile.append((module_name, module))
+            if len(to_compile) > 0:
+                # ...unless we need to first compile them:
+                compile_modules([module_name for module_name, module in to_compile], recompile=False,
+                                config=self.config, logger=self.logger)
+                for module_name, module in to_compile:
+                    # and now install them...
+                    self.logger.info("Installing now module %s..." % module)
+                    self._install(module)
+                    self.logger.info("DONE installing module %s!" % module)
 
     def confirm_compile_install_nest_models(self, models):
         """This method will try to confirm the existence of the input NEST models,
@@ -103,9 +137,7 @@ class NESTModelBuilder(SpikingModelBuilder):
         """
         nest_models = self.nest_instance.Models()
         models = ensure_list(models)
-        for model in models:  # , module # zip(models, cycle(modules_to_install)):
-            if model not in nest_models:
-                self._compile_install_nest_module(model)
+        self.compile_install_nest_modules([model for model in models if model not in nest_models])
 
     def configure(self):
         self._configure_nest_kernel()
@@ -253,6 +285,84 @@ class NESTModelBuilder(SpikingModelBuilder):
                                        get_populations_neurons(pop_trg, trg_inds_fun),
                                        conn_spec, syn_spec)
 
+    def _bulk_connections_pairs(self, src_neurons, trg_neurons, conn_spec, src_is_trg):
+        """A method to expand the connections of a deterministic connectivity rule
+           to arrays of the source and target neurons' ids of every synapse.
+           Returns:
+            the pre and post arrays, or None for rules that cannot be expanded,
+            and for "all_to_all" connections of more than max_bulk_all_to_all_synapses synapses.
+        """
+        if conn_spec["rule"] == "one_to_one":
+            if src_neurons.size != trg_neurons.size:
+                # Let NEST raise the error:
+                return None
+            pre = src_neurons
+            post = trg_neurons
+        elif conn_spec["rule"] == "all_to_all":
+            if src_neurons.size * trg_neurons.size > self.max_bulk_all_to_all_synapses:
+                return None
+            pre = np.repeat(src_neurons, trg_neurons.size)
+            post = np.tile(trg_neurons, src_neurons.size)
+        else:
+            return None
+        if src_is_trg and not conn_spec.get("allow_autapses", True):
+            # The merged connections have a bare "one_to_one" rule, which allows autapses:
+            autapses = pre == post
+            pre = pre[~autapses]
+            post = post[~autapses]
+        return pre, post
+
+    def connect_populations(self, connections):
+        """Method to create a sequence of connections among NESTPopulation instances in bulk.
+           The connections of the deterministic "all_to_all" and "one_to_one" rules,
+           with single numerical synapse parameters, are expanded to arrays of the source and target neurons' ids,
+           merged by synapse model and synapse parameters' names, and created by a single nest.Connect call each,
+           with a "one_to_one" rule and array valued synapse parameters.
+           All other connections (e.g., of probabilistic rules, of distributions of weights or delays,
+           or "all_to_all" ones of more than max_bulk_all_to_all_synapses synapses)
+           are created by a separate nest.Connect call each, as in connect_two_populations().
+           Arguments:
+            connections: a sequence of (source, src_inds_fun, target, trg_inds_fun, conn_params, synapse_params)
+                         tuples, with the arguments of connect_two_populations()
+        """
+        bulk = OrderedDict()
+        n_calls = 0
+        for pop_src, src_inds_fun, pop_trg, trg_inds_fun, conn_spec, syn_spec in connections:
+            # Prepare the parameters of connectivity:
+            conn_spec = self._prepare_conn_spec(pop_src, pop_trg, conn_spec)
+            # Prepare the parameters of the synapse:
+            syn_spec = self._prepare_syn_spec(dict(syn_spec))
+            src_neurons = get_populations_neurons(pop_src, src_inds_fun)
+            trg_neurons = get_populations_neurons(pop_trg, trg_inds_fun)
+            pairs = None
+            # Only numbers can be merged, not, e.g., distributions, or nest.Parameter instances:
+            if np.all([isinstance(value, Number)
+                       for key, value in syn_spec.items() if key not in ["synapse_model", "receptor_type"]]):
+                pairs = self._bulk_connections_pairs(np.array(src_neurons.tolist()), np.array(trg_neurons.tolist()),
+                                                     conn_spec, pop_src.population == pop_trg.population)
+            # We might create the same connection multiple times for different synaptic receptors...
+            for receptor in ensure_list(syn_spec["receptor_type"]):
+                syn_spec["receptor_type"] = receptor
+                if pairs is None:
+                    self.nest_instance.Connect(src_neurons, trg_neurons, conn_spec, syn_spec)
+                    n_calls += 1
+                    continue
+                params = sorted([key for key in syn_spec.keys() if key != "synapse_model"])
+                merged = bulk.setdefault((syn_spec["synapse_model"], tuple(params)),
+                                         OrderedDict([(key, []) for key in ["pre", "post"] + params]))
+                merged["pre"].append(pairs[0])
+                merged["post"].append(pairs[1])
+                for key in params:
+                    merged[key].append(np.full(pairs[0].shape, syn_spec[key]))
+        for (synapse_model, params), merged in bulk.items():
+            bulk_syn_spec = {"synapse_model": synapse_model}
+            for key in params:
+                bulk_syn_spec[key] = np.concatenate(merged[key])
+            self.nest_instance.Connect(np.concatenate(merged["pre"]), np.concatenate(merged["post"]),
+                                       {"rule": "one_to_one"}, bulk_syn_spec)
+            n_calls += 1
+        self.logger.info("Created connections with %d nest.Connect calls, %d of them in bulk." % (n_calls, len(bulk)))
+
     def build_spiking_region_node(self, label="", input_node=None, *args, **kwargs):
         """This methods builds a NESTRegionNode instance,
            which consists of a pandas.Series of all SpikingPopulation instances,
@@ -3,6 +3,11 @@
 import os
 import sys
 import shutil
+import hashlib
+import subprocess
+import multiprocessing
+from collections import OrderedDict
+from time import perf_counter
 from copy import deepcopy
 
 import numpy as np
@@ -25,15 +30,12 @@ LOG = initialize_logger(__name__)
 # Helper functions with NEST
 
 
-def load_nest(config=CONFIGURED, logger=LOG):
-    """This method will load a NEST instance and return it, after reading the NEST environment constants.
+def _set_nest_environment(config=CONFIGURED, logger=LOG):
+    """This method sets the NEST environment constants, and the system path, to import NEST from.
         Arguments:
          config: configuration class instance. Default: imported default CONFIGURED object.
          logger: logger object. Default: local LOG object.
-        Returns:
-         the imported NEST instance
     """
-    logger.info("Loading a NEST instance...")
     nest_path = config.NEST_PATH
     os.environ['NEST_INSTALL_DIR'] = nest_path
     log_path('NEST_INSTALL_DIR', logger)
@@ -57,68 +59,281 @@ def load_nest(config=CONFIGURED, logger=LOG):
     sys.path.insert(0, os.environ['NEST_PYTHON_PREFIX'])
     logger.info("%s: %s" % ("system path", sys.path))
 
-    import nest
-    nest.ResetKernel()
+
+class NESTBootstrap(object):
+
+    """NESTBootstrap loads NEST at most once per process, and resets it to a clean state on demand.
+       It keeps the NEST instance once imported, as well as the NEST modules installed
+       and the kernel configuration set through it, so that reset() restarts the NEST kernel
+       and then re-installs those modules and, unless asked not to, re-applies that kernel configuration.
+       The wall times (sec) of every bootstrap step ("environment", "import", "reset", "install", "kernel")
+       are recorded in the timings dictionary, as lists, one entry per call.
+       Use the NEST_BOOTSTRAP instance of this module, instead of creating new ones.
+    """
+
+    def __init__(self):
+        self.nest_instance = None
+        self.installed_modules = []
+        self.kernel_config = None
+        self.verbosity = None
+        self.timings = OrderedDict()
+
+    def _timed(self, step, tic):
+        self.timings.setdefault(step, []).append(perf_counter() - tic)
+
+    @property
+    def loaded(self):
+        return self.nest_instance is not None
+
+    def manages(self, nest_instance):
+        """Returns True if the input NEST instance is the one loaded by this bootstrap."""
+        return nest_instance is not None and nest_instance is self.nest_instance
+
+    def load(self, config=CONFIGURED, logger=LOG):
+        """This method will load a NEST instance and return it, after reading the NEST environment constants,
+           unless it has already been loaded, in which case it returns the loaded one.
+            Arguments:
+             config: configuration class instance. Default: imported default CONFIGURED object.
+             logger: logger object. Default: local LOG object.
+            Returns:
+             the imported NEST instance
+        """
+        if self.nest_instance is None:
+            logger.info("Loading a NEST instance...")
+            tic = perf_counter()
+            _set_nest_environment(config, logger)
+            self._timed("environment", tic)
+            tic = perf_counter()
+            import nest
+            self._timed("import", tic)
+            self.nest_instance = nest
+        return self.nest_instance
+
+    def install(self, module):
+        """This method installs a NEST module, unless it is already installed through this bootstrap,
+           and caches it, so that it is re-installed by every reset().
+           Arguments:
+            module: the name (string) of the module, e.g., "mymodule"
+        """
+        if module not in self.installed_modules:
+            tic = perf_counter()
+            self.nest_instance.Install(module)
+            self._timed("install", tic)
+            self.installed_modules.append(module)
+
+    def configure_kernel(self, kernel_config, verbosity=None):
+        """This method sets, and caches, the verbosity and the kernel configuration of NEST,
+           so that they are re-applied by every reset().
+           Arguments:
+            kernel_config: a dictionary of the kernel configuration
+            verbosity: the verbosity level of NEST. Default = None, in which case it is not set
+        """
+        tic = perf_counter()
+        if verbosity is not None:
+            self.verbosity = verbosity
+            self.nest_instance.set_verbosity(verbosity)
+        self.kernel_config = deepcopy(kernel_config)
+        self.nest_instance.SetKernelStatus(kernel_config)
+        self._timed("kernel", tic)
+
+    def reset(self, logger=LOG, restore_kernel_config=True):
+        """This method resets the NEST kernel to a clean state and re-installs the cached modules.
+           Arguments:
+            logger: logger object. Default: local LOG object.
+            restore_kernel_config: (bool) flag to also re-apply the cached verbosity and kernel configuration.
+                                   Default = True. Builders, which set a new configuration right after, reset with
+                                   False, so that no setting of a previous configuration stays in effect.
+           Returns:
+            the NEST instance
+        """
+        tic = perf_counter()
+        self.nest_instance.ResetKernel()  # This will restart NEST!
+        self._timed("reset", tic)
+        for module in self.installed_modules:
+            tic = perf_counter()
+            try:
+                self.nest_instance.Install(module)
+            except Exception as e:
+                # Some NEST versions keep the modules loaded after ResetKernel:
+                if "loaded already" not in str(e) and "already loaded" not in str(e):
+                    raise
+                logger.debug("Module %s is still loaded after reset." % module)
+            self._timed("install", tic)
+        if restore_kernel_config:
+            if self.verbosity is not None:
+                self.nest_instance.set_verbosity(self.verbosity)
+            if self.kernel_config is not None:
+                tic = perf_counter()
+                self.nest_instance.SetKernelStatus(deepcopy(self.kernel_config))
+                self._timed("kernel", tic)
+        else:
+            self.verbosity = None
+            self.kernel_config = None
+        return self.nest_instance
+
+
+NEST_BOOTSTRAP = NESTBootstrap()
+
+
+def load_nest(config=CONFIGURED, logger=LOG, reset=True):
+    """This method will load a NEST instance and return it, after reading the NEST environment constants.
+       NEST is imported only once per process, by the NEST_BOOTSTRAP, and reused afterwards.
+        Arguments:
+         config: configuration class instance. Default: imported default CONFIGURED object.
+         logger: logger object. Default: local LOG object.
+         reset: (bool) flag to reset NEST to a clean state (see NESTBootstrap.reset()). Default = True.
+        Returns:
+         the imported NEST instance
+    """
+    nest = NEST_BOOTSTRAP.load(config, logger)
+    if reset:
+        NEST_BOOTSTRAP.reset(logger)
     return nest
 
 
-def compile_modules(modules, recompile=False, config=CONFIGURED, logger=LOG):
+def nest_version(nest_path):
+    """This function returns the version (string) of the NEST installed in nest_path,
+       as reported by its nest-config, or "unknown", if that fails."""
+    try:
+        return subprocess.check_output([os.path.join(nest_path, "bin", "nest-config"), "--version"],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def nest_module_hash(source_path, nest_path, compiler_flags=()):
+    """This function computes the key of a NEST module in the compilation cache,
+       i.e., the SHA-256 hash of its sources, of the NEST version it is compiled for,
+       and of the values of the environment variables of the compiler flags.
+       Arguments:
+        source_path: the path to the folder of the module's sources
+        nest_path: the path to the NEST installation
+        compiler_flags: a sequence of names (strings) of environment variables of compiler flags. Default = ()
+       Returns:
+        the hash (hexadecimal string)
+    """
+    sha = hashlib.sha256()
+    for root, dirs, files in os.walk(source_path):
+        dirs.sort()
+        for filename in sorted(files):
+            filepath = os.path.join(root, filename)
+            sha.update(os.path.relpath(filepath, source_path).encode() + b"\0")
+            with open(filepath, "rb") as file:
+                sha.update(file.read() + b"\0")
+    sha.update(nest_version(nest_path).encode() + b"\0")
+    for flag in compiler_flags:
+        sha.update(("%s=%s" % (flag, os.environ.get(flag, ""))).encode() + b"\0")
+    return sha.hexdigest()
+
+
+def _nest_module_installed_files(module, nest_path):
+    modulemodule = module + "module"
+    lib_path = os.path.join(nest_path, "lib", "nest")
+    return {"so": os.path.join(lib_path, modulemodule + ".so"),
+            "dylib": os.path.join(lib_path, "lib" + modulemodule + ".dylib"),
+            "h": os.path.join(nest_path, "include", modulemodule, modulemodule + ".h")}
+
+
+def _build_nest_module(module, source_path, module_bld_dir, nest_path):
+    # Compile and install a module, in a worker process of compile_modules():
+    if os.path.exists(module_bld_dir):
+        # Delete any pre-compiled built files:
+        shutil.rmtree(module_bld_dir)
+    # Create a  module build directory and copy there the source files:
+    shutil.copytree(source_path, module_bld_dir)
+    from pynestml.frontend.pynestml_frontend import install_nest
+    install_nest(module_bld_dir, nest_path)
+    return module
+
+
+def _cache_nest_module(installed_files, module_cache_dir):
+    # Copy the installed .so and .h files of a module to its entry in the compilation cache,
+    # via a temporary folder, so that concurrent jobs sharing the cache never see a partial entry.
+    # An existing entry of the same key holds the same module, e.g., cached by a concurrent job, and it is kept,
+    # because deleting it could break a job installing the module from it:
+    if not os.path.isfile(installed_files["so"]) or not os.path.isfile(installed_files["h"]):
+        return False
+    if os.path.isdir(module_cache_dir):
+        return True
+    temp_dir = "%s.tmp%d" % (module_cache_dir, os.getpid())
+    safe_makedirs(temp_dir)
+    for key in ["so", "h"]:
+        shutil.copyfile(installed_files[key], os.path.join(temp_dir, os.path.basename(installed_files[key])))
+    try:
+        os.rename(temp_dir, module_cache_dir)
+    except OSError:
+        # The entry has been created by a concurrent job in the meantime:
+        shutil.rmtree(temp_dir)
+    return True
+
+
+def _install_nest_module_from_cache(installed_files, module_cache_dir):
+    # Just copy the .h, .so, and .dylib files to the appropriate NEST build paths:
+    solib_file = os.path.join(module_cache_dir, os.path.basename(installed_files["so"]))
+    safe_makedirs(os.path.dirname(installed_files["so"]))
+    shutil.copyfile(solib_file, installed_files["so"])
+    shutil.copyfile(solib_file, installed_files["dylib"])
+    safe_makedirs(os.path.dirname(installed_files["h"]))
+    shutil.copyfile(os.path.join(module_cache_dir, os.path.basename(installed_files["h"])), installed_files["h"])
+
+
+def compile_modules(modules, recompile=False, config=CONFIGURED, logger=LOG, n_workers=None):
     """Function to compile NEST modules.
+       Modules are cached after compilation, in config.MYMODULES_CACHE_DIR,
+       by a hash of their sources, the NEST version and the compiler flags (see nest_module_hash),
+       so that a module is recompiled only if any of those changes, otherwise it is installed from the cache.
+       The modules that need compilation are compiled in parallel, in separate processes.
        Arguments:
         modules: a sequence (list, tuple) of NEST modules' names (strings).
         recompile: (bool) flag to recompile a module that is already compiled. Default = False.
         config: configuration class instance. Default: imported default CONFIGURED object.
         logger: logger object. Default: local LOG object.
+        n_workers: the maximum number of processes compiling modules in parallel.
+                   Default = None, in which case config.MYMODULES_COMPILE_WORKERS,
+                   or, if that is None, the number of available cores.
     """
     # ...unless we need to first compile it:
     logger.info("Preparing MYMODULES_BLD_DIR: %s" % config.MYMODULES_BLD_DIR)
     safe_makedirs(config.MYMODULES_BLD_DIR)
-    lib_path = os.path.join(os.environ["NEST_INSTALL_DIR"], "lib", "nest")
-    include_path = os.path.join(os.environ["NEST_INSTALL_DIR"], "include")
+    safe_makedirs(config.MYMODULES_CACHE_DIR)
+    nest_path = os.environ.get("NEST_INSTALL_DIR", config.NEST_PATH)
+    modules_files = OrderedDict()
+    to_compile = OrderedDict()
     for module in ensure_list(modules):
-        modulemodule = module + "module"
-        module_bld_dir = os.path.join(config.MYMODULES_BLD_DIR, module)
-        solib_file = os.path.join(module_bld_dir, modulemodule + ".so")
-        dylib_file = os.path.join(module_bld_dir, "lib" + modulemodule + ".dylib")
-        include_file = os.path.join(module_bld_dir, modulemodule + ".h")
-        installed_solib_file = os.path.join(lib_path, os.path.basename(solib_file))
-        installed_dylib_file = os.path.join(lib_path, os.path.basename(dylib_file))
-        module_include_path = os.path.join(include_path, modulemodule)
-        installed_h_file = os.path.join(module_include_path, modulemodule + ".h")
-        if not os.path.isfile(solib_file) \
-                or not os.path.isfile(dylib_file) \
-                    or not os.path.isfile(include_file) \
-                        or recompile:
-            # If any of the .so, .dylib or .h files don't exist,
+        installed_files = _nest_module_installed_files(module, nest_path)
+        source_path = os.path.join(config.MYMODULES_DIR, module)
+        module_hash = nest_module_hash(source_path, nest_path, config.MYMODULES_COMPILER_FLAGS)
+        module_cache_dir = os.path.join(config.MYMODULES_CACHE_DIR, "%s_%s" % (module, module_hash))
+        modules_files[module] = installed_files
+        if os.path.isdir(module_cache_dir) and not recompile:
+            logger.info("Installing module %s from the compilation cache %s..." % (module, module_cache_dir))
+            _install_nest_module_from_cache(installed_files, module_cache_dir)
+        else:
+            # If the module's sources, NEST or the compiler flags changed,
             # or if the user requires recompilation,
             # proceed with recompilation:
-            if os.path.exists(module_bld_dir):
-                # Delete any pre-compiled built files:
-                shutil.rmtree(module_bld_dir)
-            # Create a  module build directory and copy there the source files:
-            source_path = os.path.join(config.MYMODULES_DIR, module)
-            logger.info("Copying module sources from %s\ninto %s..." % (source_path, module_bld_dir))
-            shutil.copytree(source_path, module_bld_dir)
-            # Now compile:
-            logger.info("Compiling %s..." % module)
-            logger.info("in build directory %s..." % module_bld_dir)
-            success_message = "DONE compiling and installing %s!" % module
-            from pynestml.frontend.pynestml_frontend import install_nest
-            install_nest(module_bld_dir, config.NEST_PATH)
-            logger.info("Compiling finished without errors...")
+            to_compile[module] = (source_path, os.path.join(config.MYMODULES_BLD_DIR, module), module_cache_dir)
+    if len(to_compile) > 0:
+        if n_workers is None:
+            n_workers = config.MYMODULES_COMPILE_WORKERS or multiprocessing.cpu_count()
+        n_workers = int(np.maximum(1, np.minimum(n_workers, len(to_compile))))
+        logger.info("Compiling modules %s with %d processes..." % (str(list(to_compile.keys())), n_workers))
+        args = [(module, source_path, module_bld_dir, nest_path)
+                for module, (source_path, module_bld_dir, module_cache_dir) in to_compile.items()]
+        if n_workers > 1:
+            with multiprocessing.get_context("spawn").Pool(n_workers) as pool:
+                pool.starmap(_build_nest_module, args)
         else:
-            logger.info("Installing precompiled module %s..." % module)
-            success_message = "DONE installing precompiled module %s!" % module
-            # Just copy the .h, .so, and .dylib files to the appropriate NEST build paths:
-            shutil.copyfile(solib_file, installed_solib_file)
-            shutil.copyfile(solib_file, installed_dylib_file)
-            safe_makedirs(include_path)
-            shutil.copyfile(os.path.join(module_bld_dir, modulemodule + ".h"), installed_h_file)
-        installed_files = {}
-        for file in [installed_solib_file, installed_dylib_file, installed_h_file]:
-            installed_files[file] = os.path.isfile(file)
+            for arg in args:
+                _build_nest_module(*arg)
+        logger.info("Compiling finished without errors...")
+        for module, (source_path, module_bld_dir, module_cache_dir) in to_compile.items():
+            if _cache_nest_module(modules_files[module], module_cache_dir):
+                logger.info("Cached compiled module %s in %s" % (module, module_cache_dir))
+    for module, installed_files in modules_files.items():
+        installed_files = dict([(file, os.path.isfile(file)) for file in installed_files.values()])
         if all(installed_files.values()):
-            logger.info(success_message)
+            logger.info("DONE compiling and/or installing %s!" % module)
         else:
             logger.warn("Something seems to have gone wrong with compiling and/or installing %s!"
                         "\n Installed files (not) found (True (False) respectively)!:\n%s"
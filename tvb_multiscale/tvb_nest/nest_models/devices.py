@@ -5,11 +5,10 @@ from abc import ABCMeta
 import glob
 
 import numpy as np
-from numpy.lib.recfunctions import rename_fields
 import xarray as xr
 
 from tvb_multiscale.core.spiking_models.devices import \
-    Device, InputDevice, OutputDevice, SpikeRecorder, Multimeter, Voltmeter, SpikeMultimeter
+    Device, InputDevice, OutputDevice, SpikeRecorder, Multimeter, Voltmeter, SpikeMultimeter, EventBuffer
 from tvb_multiscale.core.utils.data_structures_utils import flatten_neurons_inds_in_DataArray
 
 from tvb.basic.neotraits.api import List
@@ -326,24 +325,103 @@ def read_nest_output_device_data_from_ascii_to_dict(filepath):
        Returns:
         the events dictionary of the recorded data
     """
-    recarray = rename_fields(np.genfromtxt(filepath, names=True, skip_header=2),
-                             {"sender": "senders", "time_ms": "times"})
-    return {name: ensure_list(recarray[name]) for name in recarray.dtype.names}
+    return NESTASCIIFileReader(filepath).read()
+
+
+# The names of NEST ascii recordings' columns, renamed to the events' variables:
+NEST_ASCII_COLUMNS_NAMES = {"sender": "senders", "time_ms": "times"}
+
+
+class NESTASCIIFileReader(object):
+
+    """NESTASCIIFileReader follows the tail of a NEST recording device ascii file,
+       i.e., it parses only the lines appended to the file since its previous read,
+       starting from the byte offset it keeps, instead of the whole file.
+       Any incomplete last line is left to be read when completed.
+       If the file is truncated (e.g., when the device is reset), reading starts again after the file's header.
+    """
+
+    def __init__(self, filepath, header_lines=2):
+        """Arguments:
+            filepath: absolute or relative path to the file (string)
+            header_lines: the number of comment lines preceding the line of the columns' names. Default = 2
+        """
+        self.filepath = filepath
+        self.header_lines = header_lines
+        self.columns = []
+        self._data_offset = None
+        self.offset = 0
+
+    def _read_header(self, file):
+        # Returns True if the whole header, up to the line of the columns' names, has been written:
+        file.seek(0)
+        for _ in range(self.header_lines + 1):
+            line = file.readline()
+            if not line.endswith(b"\n"):
+                return False
+        self.columns = [NEST_ASCII_COLUMNS_NAMES.get(name, name) for name in line.decode().split()]
+        self._data_offset = file.tell()
+        self.offset = self._data_offset
+        return True
+
+    def _empty(self):
+        return dict([(name, np.array([])) for name in self.columns])
+
+    def read(self):
+        """Method to parse the lines appended to the file since the previous read.
+           Returns:
+            the events dictionary of the newly recorded data
+        """
+        with open(self.filepath, "rb") as file:
+            if self._data_offset is None or os.fstat(file.fileno()).st_size < self.offset:
+                # The file is read for the first time, or it has been truncated:
+                if not self._read_header(file):
+                    self._data_offset = None
+                    return self._empty()
+            file.seek(self.offset)
+            text = file.read()
+        # Parse only complete lines:
+        n_bytes = text.rfind(b"\n") + 1
+        if n_bytes == 0 or len(self.columns) == 0:
+            return self._empty()
+        text = text[:n_bytes].decode()
+        n_values = text.count("\n") * len(self.columns)
+        try:
+            values = np.fromstring(text, dtype="f8", sep=" ")
+        except ValueError:
+            # Recent numpy versions raise for tokens that are not numbers...
+            values = np.array([])
+        if values.size != n_values:
+            # ...whereas older ones stop silently at the first such token:
+            raise ValueError("Failed to parse %d values of columns %s from file %s, after byte %d!"
+                             % (n_values, str(self.columns), self.filepath, self.offset))
+        self.offset += n_bytes
+        values = values.reshape((-1, len(self.columns)))
+        return dict([(name, values[:, i_col]) for i_col, name in enumerate(self.columns)])
 
 
 class NESTOutputDevice(NESTDevice, OutputDevice):
 
     """NESTOutputDevice class to wrap around a NEST output (recording) device"""
 
+    # The number of events drained from the memory of the recorder to its events' buffer since its last reset:
+    number_of_drained_events = 0
+
     def __init__(self, device, nest_instance, *args, **kwargs):
         kwargs["model"] = kwargs.pop("model", "nest_output_device")
         super(NESTOutputDevice, self).__init__(device, nest_instance, *args, **kwargs)
         if kwargs.get("record_to", "ascii") == "ascii":
             self._get_events = self._get_events_from_ascii
+            self._get_new_events = self._get_new_events_from_ascii
             self._reset = self._delete_events_in_ascii_files
         else:
             self._get_events = self._get_events_from_memory
+            self._get_new_events = self._get_new_events_from_memory
             self._reset = self._delete_events_in_memory
+        # The events read from the ascii files, or drained from the memory of the recorder:
+        self._events_buffer = EventBuffer()
+        # The readers following the tail of each ascii file:
+        self._files_readers = {}
 
     @property
     def record_from(self):
@@ -355,19 +433,50 @@ class NESTOutputDevice(NESTDevice, OutputDevice):
     @property
     def _empty_events(self):
         keys = ["times", "senders"] + self.record_from
-        return dict(zip(keys, [[]]*len(keys)))
+        return dict(zip(keys, [np.array([])]*len(keys)))
+
+    def _read_new_events_from_ascii(self):
+        # Append to the events' buffer only the lines appended to each file since its previous read:
+        for filepath in self._get_filenames():
+            if filepath not in self._files_readers:
+                self._files_readers[filepath] = NESTASCIIFileReader(filepath)
+            new_events = self._files_readers[filepath].read()
+            if len(new_events.get("times", [])):
+                self._events_buffer.append(new_events)
 
     def _get_events_from_ascii(self):
-        events = self._empty_events
-        filenames = self._get_filenames()
-        for filepath in filenames:
-            this_file_events = read_nest_output_device_data_from_ascii_to_dict(filepath)
-            for key in events.keys():
-                events[key] = events[key] + this_file_events[key]
-        return events
+        self._read_new_events_from_ascii()
+        if self._events_buffer.size == 0:
+            return self._empty_events
+        return self._events_buffer.events
+
+    def _get_new_events_from_ascii(self, variables, n_events):
+        self._read_new_events_from_ascii()
+        if self._events_buffer.size == 0:
+            return dict([(var, np.array([])) for var in variables])
+        return self._events_buffer.read("new_events", variables)
+
+    def _drain_events_from_memory(self):
+        # Move the events recorded since the previous drain to the events' buffer,
+        # and delete them from the memory of the recorder, by setting its n_events to 0,
+        # so that the cost of each readout does not grow with the simulated time:
+        n_events = self.device.get("n_events")
+        if n_events:
+            self._events_buffer.append(self.device.get("events"))
+            self.device.set({"n_events": 0})
+            self.number_of_drained_events += n_events
 
     def _get_events_from_memory(self):
-        return self.device.get("events")
+        self._drain_events_from_memory()
+        if self._events_buffer.size == 0:
+            return self._empty_events
+        return self._events_buffer.events
+
+    def _get_new_events_from_memory(self, variables, n_events):
+        self._drain_events_from_memory()
+        if self._events_buffer.size == 0:
+            return dict([(var, np.array([])) for var in variables])
+        return self._events_buffer.read("new_events", variables)
 
     @property
     def events(self):
@@ -375,23 +484,34 @@ class NESTOutputDevice(NESTDevice, OutputDevice):
 
     @property
     def number_of_events(self):
-        return self.device.get("n_events")
+        # The events drained from the memory of the recorder are not counted by its n_events anymore:
+        return self.device.get("n_events") + self.number_of_drained_events
 
     @property
     def n_events(self):
         return self.number_of_events
 
     def _delete_events_in_ascii_files(self):
+        self._archive_events()
         for filepath in self._get_filenames():
             truncate_ascii_file_after_header(filepath, header_chars="#")
+        self._files_readers = {}
+        self._events_buffer.clear()
+        # Restart the count of events from 0, as for the events in memory, so that it matches the files' events:
+        self.device.set({"n_events": 0})
+        self._restart_events_count()
 
     def _delete_events_in_memory(self):
-        # TODO: find how to reset recorders!
-        pass
-        # self.device.n_events = 0
+        # Setting n_events to 0 deletes the events kept in memory by the recorder:
+        self._archive_events()
+        self.device.set({"n_events": 0})
+        self._events_buffer.clear()
+        self.number_of_drained_events = 0
+        self._restart_events_count()
 
     def reset(self):
         self._reset()
+        self._clear_grouped_events_cache()
 
 
 class NESTSpikeRecorder(NESTOutputDevice, SpikeRecorder):
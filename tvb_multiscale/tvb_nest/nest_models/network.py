@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 from tvb_multiscale.tvb_nest.config import CONFIGURED, initialize_logger
 from tvb_multiscale.tvb_nest.nest_models.builders.nest_factory import load_nest
 from tvb_multiscale.tvb_nest.nest_models.devices import NESTOutputSpikeDeviceDict, NESTOutputContinuousTimeDeviceDict
@@ -9,6 +11,57 @@ from tvb_multiscale.core.spiking_models.network import SpikingNetwork
 LOG = initialize_logger(__name__)
 
 
+class NESTKernelStatus(object):
+    """NESTKernelStatus is a snapshot of the NEST kernel status values
+       read by the TVB - NEST interfaces at every time step:
+       the resolution and min_delay are read once from NEST, after Prepare (see update()),
+       and the time is advanced locally after each Run, in integer steps of resolution, as in NEST.
+       Before update() is called, the values are read from NEST, since min_delay can still change by new connections.
+    """
+
+    def __init__(self, nest_instance):
+        self.nest_instance = nest_instance
+        self._resolution = None
+        self._min_delay = None
+        self._steps = 0
+
+    def update(self):
+        """Method to read the resolution, min_delay and time from NEST.
+           It has to be called again if the NEST kernel is changed or simulated outside the NESTNetwork."""
+        self._resolution, self._min_delay, time = \
+            self.nest_instance.GetKernelStatus(["resolution", "min_delay", "time"])
+        self._steps = int(np.round(time / self._resolution))
+
+    def clear(self):
+        """Method to clear the snapshot, so that values are read from NEST again, until the next update()."""
+        self._resolution = None
+        self._min_delay = None
+        self._steps = 0
+
+    @property
+    def resolution(self):
+        if self._resolution is None:
+            return self.nest_instance.GetKernelStatus("resolution")
+        return self._resolution
+
+    @property
+    def min_delay(self):
+        if self._min_delay is None:
+            return self.nest_instance.GetKernelStatus("min_delay")
+        return self._min_delay
+
+    @property
+    def time(self):
+        if self._resolution is None:
+            return self.nest_instance.GetKernelStatus("time")
+        return self._steps * self._resolution
+
+    def advance(self, simulation_length):
+        """Method to advance the time of the snapshot after simulating NEST for simulation_length (in ms)."""
+        if self._resolution is not None:
+            self._steps += int(np.round(simulation_length / self._resolution))
+
+
 class NESTNetwork(SpikingNetwork):
     """
         NESTNetwork is a class representing a NEST spiking network comprising of:
@@ -28,6 +81,9 @@ class NESTNetwork(SpikingNetwork):
 
     nest_instance = None
 
+    # A snapshot of the NEST kernel status (resolution, min_delay and time), updated upon configure():
+    kernel_status = None
+
     _OutputSpikeDeviceDict = NESTOutputSpikeDeviceDict
     _OutputContinuousTimeDeviceDict = NESTOutputContinuousTimeDeviceDict
 
@@ -39,6 +95,7 @@ class NESTNetwork(SpikingNetwork):
         if nest_instance is None:
             nest_instance = load_nest(self.config, LOG)
         self.nest_instance = nest_instance
+        self.kernel_status = NESTKernelStatus(self.nest_instance)
         super(NESTNetwork, self).__init__(brain_regions, output_devices, input_devices, config)
 
     @property
@@ -47,16 +104,18 @@ class NESTNetwork(SpikingNetwork):
 
     @property
     def min_delay(self):
-        return self.nest_instance.GetKernelStatus("min_delay")
+        return self.kernel_status.min_delay
 
     def configure(self, *args, **kwargs):
         """Method to configure NEST network simulation.
-           It will run nest.Prepare(*args, **kwargs)
+           It will run nest.Prepare(*args, **kwargs), and then take a snapshot of the NEST kernel status.
         """
         self.nest_instance.Prepare(*args, **kwargs)
+        self.kernel_status.update()
 
-    def Run(self, simulation_length, *args, **kwargs):
+    def _Run(self, simulation_length, *args, **kwargs):
         """Method to simulate the NEST network for a specific simulation_length (in ms).
-           It will run nest.Run(simulation_length, *args, **kwarg)
+           It will run nest.Run(simulation_length, *args, **kwarg), and advance the time of the kernel status snapshot.
         """
         self.nest_instance.Run(simulation_length, *args, **kwargs)
+        self.kernel_status.advance(simulation_length)
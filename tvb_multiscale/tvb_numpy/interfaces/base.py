@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from tvb_multiscale.tvb_numpy.config import CONFIGURED
+from tvb_multiscale.tvb_numpy.numpy_models.devices import \
+    NumpyInputDeviceDict, NumpySpikeInputDeviceDict, NumpyCurrentInputDeviceDict, \
+    NumpyOutputDeviceDict, NumpyOutputSpikeDeviceDict, NumpyOutputContinuousTimeDeviceDict
+from tvb_multiscale.tvb_numpy.interfaces.tvb_to_numpy_devices_interface import TVBtoNumpyDeviceInterface
+from tvb_multiscale.tvb_numpy.interfaces.numpy_to_tvb_interface import NumpytoTVBinterface
+from tvb_multiscale.core.interfaces.base import TVBSpikeNetInterface
+
+
+class TVBNumpyInterface(TVBSpikeNetInterface):
+    _available_input_devices = NumpyInputDeviceDict.keys()
+    _current_input_devices = NumpyCurrentInputDeviceDict.keys()
+    _spike_rate_input_devices = NumpySpikeInputDeviceDict.keys()
+    _available_output_devices = NumpyOutputDeviceDict.keys()
+    _spike_rate_output_devices = NumpyOutputSpikeDeviceDict.keys()
+    _multimeter_output_devices = NumpyOutputContinuousTimeDeviceDict.keys()
+    _voltmeter_output_devices = ["voltmeter"]
+
+    def __init__(self, config=CONFIGURED):
+        super(TVBNumpyInterface, self).__init__(config)
+
+    @property
+    def numpy_instance(self):
+        return self.spiking_network.numpy_instance
+
+    def configure(self, tvb_model):
+        super(TVBNumpyInterface, self).configure(tvb_model)
+        # Concatenate the devices of each TVB -> Spiking Network device interface into a single NodeCollection:
+        for interface in self.tvb_to_spikeNet_interfaces:
+            if isinstance(interface, TVBtoNumpyDeviceInterface):
+                interface.configure()
+        # ...and the recorders of each Spiking Network -> TVB interface, for bulk reading of their number of events:
+        for interface in self.spikeNet_to_tvb_interfaces:
+            if isinstance(interface, NumpytoTVBinterface):
+                interface.configure()
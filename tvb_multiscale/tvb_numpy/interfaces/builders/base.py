@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from tvb_multiscale.tvb_numpy.numpy_models.devices import NumpyInputDeviceDict
+from tvb_multiscale.tvb_numpy.interfaces.builders.tvb_to_numpy_devices_interface_builder import \
+    TVBtoNumpyDeviceInterfaceBuilder
+from tvb_multiscale.tvb_numpy.interfaces.builders.tvb_to_numpy_parameter_interface_builder import \
+    TVBtoNumpyParameterInterfaceBuilder
+from tvb_multiscale.tvb_numpy.interfaces.builders.numpy_to_tvb_interface_builder import NumpytoTVBInterfaceBuilder
+from tvb_multiscale.core.interfaces.builders.base import TVBSpikeNetInterfaceBuilder
+
+
+class TVBNumpyInterfaceBuilder(TVBSpikeNetInterfaceBuilder):
+    _tvb_to_spikNet_device_interface_builder = TVBtoNumpyDeviceInterfaceBuilder
+    _tvb_to_spikeNet_parameter_interface_builder = TVBtoNumpyParameterInterfaceBuilder
+    _spikeNet_to_tvb_interface_builder = NumpytoTVBInterfaceBuilder
+    _input_device_dict = NumpyInputDeviceDict
+
+    # TVB <-> Spiking Network transformations' weights/funs
+    # If set as weights, they will become a transformation function of
+    # lambda state, regions_indices: w[regions_indices] * state[regions_indices]
+    # If set as a function of lambda state: fun(state), it will become a vector function of:
+    # lambda state, regions_indices: np.array([fun(state[index]) for index in regions_indices)])
+    # TVB -> Spiking Network
+    w_tvb_to_spike_rate = 1000.0  # (spike rate in the numpy simulator is in spikes/sec, assuming TVB rate is spikes/ms)
+    w_tvb_to_current = 1000.0  # (1000.0 (nA -> pA), because I_e, and dc_generator amplitude are in pA)
+    w_tvb_to_potential = 1.0  # assuming mV in both Spiking Network and TVB
+    # TVB <- Spiking Network
+    # We return from a spike_recorder the ratio number_of_population_spikes / number_of_population_neurons
+    # for every TVB time step (see TVBNESTInterfaceBuilder).
+    w_spikes_to_tvb = 1.0
+    w_spikes_var_to_tvb = 1.0
+    # We return from a multimeter or voltmeter the membrane potential in mV
+    w_potential_to_tvb = 1.0
+
+    @property
+    def numpy_instance(self):
+        return self.spiking_network.numpy_instance
+
+    @property
+    def config(self):
+        return self.spiking_network.config
+
+    @property
+    def spikeNet_min_delay(self):
+        return self.numpy_instance.GetKernelStatus("min_delay")
+
+    def assert_delay(self, delay):
+        return np.maximum(self.spikeNet_min_delay, delay)
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+from tvb_multiscale.tvb_numpy.interfaces.tvb_to_numpy_parameters_interface import TVBtoNumpyParameterInterface
+from tvb_multiscale.core.interfaces.builders.tvb_to_spikeNet_parameter_interface_builder import \
+    TVBtoSpikeNetParameterInterfaceBuilder
+
+
+class TVBtoNumpyParameterInterfaceBuilder(TVBtoSpikeNetParameterInterfaceBuilder):
+    _build_target_class = TVBtoNumpyParameterInterface
+
+    @property
+    def numpy_instance(self):
+        return self.spiking_network.numpy_instance
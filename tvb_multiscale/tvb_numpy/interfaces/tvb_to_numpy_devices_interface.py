@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from tvb_multiscale.core.interfaces.tvb_to_spikeNet_device_interface import TVBtoSpikeNetDeviceInterface
+
+
+# Each interface has its own set(values) method, depending on the underlying device.
+# Interfaces of devices, the values of which hold until they are set again,
+# can also set values to a subset of their devices, via set(values, mask).
+# Input devices of the NumpySimulator are active for times t, such that origin + start < t <= origin + stop,
+# therefore, the values set at the current time are applied to the next TVB time step dt.
+
+
+class TVBtoNumpyDeviceInterface(TVBtoSpikeNetDeviceInterface):
+
+    # A single NodeCollection of all the devices of the interface, for batched set() calls:
+    _devices_collection = None
+    _devices_global_ids = None
+
+    @property
+    def numpy_instance(self):
+        return self.spiking_network.numpy_instance
+
+    def configure(self):
+        """Method to concatenate all the devices of the interface into a single NodeCollection,
+           so that they can be set with a single set() call."""
+        self._devices_global_ids = np.array([self[node].global_id for node in self.devices()]).flatten()
+        self._devices_collection = self.numpy_instance.NodeCollection(self._devices_global_ids)
+
+    def _schedule_times(self, n_steps):
+        # The times of a schedule of n_steps TVB time steps, starting from the current time,
+        # rounded to the grid of the resolution:
+        resolution = self.numpy_instance.GetKernelStatus("resolution")
+        times = self.numpy_instance.GetKernelStatus("time") + resolution + self.dt * np.arange(n_steps)
+        return (np.round(times / resolution) * resolution).tolist()
+
+    def _set_batched(self, values_per_node, common_values={}, arrays=False, mask=None):
+        """Method to set values to all the devices of the interface with a single set() call.
+           Arguments:
+            values_per_node: dictionary of attributes names' and sequences of values, one for each node
+            common_values: dictionary of attributes names' and values common for all nodes. Default = {}
+            arrays: if True, the values per node are arrays (e.g., scheduled rates).
+                    Then, a list of dictionaries is set, one for each device. Otherwise, list-valued parameters.
+                    Default = False
+            mask: an optional boolean array of the nodes to set values to. Default = None, for all nodes
+        """
+        if self._devices_collection is None:
+            self.configure()
+        if mask is None:
+            inds = np.arange(len(self._devices_collection))
+            devices_collection = self._devices_collection
+        else:
+            inds = np.where(mask)[0]
+            devices_collection = self.numpy_instance.NodeCollection(self._devices_global_ids[inds])
+        if arrays:
+            values = []
+            for i_node in inds:
+                node_values = dict(common_values)
+                for key, val in values_per_node.items():
+                    node_values[key] = np.array(val[i_node]).flatten().tolist()
+                values.append(node_values)
+        else:
+            values = dict(common_values)
+            for key, val in values_per_node.items():
+                values[key] = np.array(val)[inds]
+        devices_collection.set(values)
+
+
+class TVBtoNumpyDCGeneratorInterface(TVBtoNumpyDeviceInterface):
+
+    # Values are set for the next TVB time step only:
+    _persistent_values = False
+
+    def set(self, values):
+        self._set_batched({"amplitude": self._assert_input_size(values)},
+                          {"origin": self.numpy_instance.GetKernelStatus("time"), "start": 0.0, "stop": self.dt})
+
+
+class TVBtoNumpyPoissonGeneratorInterface(TVBtoNumpyDeviceInterface):
+
+    # Values are set for the next TVB time step only:
+    _persistent_values = False
+
+    def set(self, values):
+        self._set_batched({"rate": np.maximum([0], self._assert_input_size(values))},
+                          {"origin": self.numpy_instance.GetKernelStatus("time"), "start": 0.0, "stop": self.dt})
+
+
+class TVBtoNumpyInhomogeneousPoissonGeneratorInterface(TVBtoNumpyDeviceInterface):
+
+    def set(self, values, mask=None):
+        self._set_batched({"rate_values": np.maximum([0], self._assert_input_size(values))},
+                          {"rate_times": self._schedule_times(1)},
+                          arrays=True, mask=mask)
+
+    def set_schedule(self, values):
+        """Method to set a schedule of rates, for each TVB time step of a synchronization window.
+           Arguments:
+            values: array of shape (number of TVB time steps, number of nodes)
+        """
+        self._set_batched({"rate_values": np.maximum(0, values).T},
+                          {"rate_times": self._schedule_times(values.shape[0])},
+                          arrays=True)
+
+
+class TVBtoNumpyStepCurrentGeneratorInterface(TVBtoNumpyDeviceInterface):
+
+    def set(self, values, mask=None):
+        self._set_batched({"amplitude_values": self._assert_input_size(values)},
+                          {"amplitude_times": self._schedule_times(1)},
+                          arrays=True, mask=mask)
+
+    def set_schedule(self, values):
+        """Method to set a schedule of currents, for each TVB time step of a synchronization window.
+           Arguments:
+            values: array of shape (number of TVB time steps, number of nodes)
+        """
+        self._set_batched({"amplitude_values": np.array(values).T},
+                          {"amplitude_times": self._schedule_times(values.shape[0])},
+                          arrays=True)
+
+
+INPUT_INTERFACES_DICT = {"dc_generator": TVBtoNumpyDCGeneratorInterface,
+                         "poisson_generator": TVBtoNumpyPoissonGeneratorInterface,
+                         "inhomogeneous_poisson_generator": TVBtoNumpyInhomogeneousPoissonGeneratorInterface,
+                         "step_current_generator": TVBtoNumpyStepCurrentGeneratorInterface}
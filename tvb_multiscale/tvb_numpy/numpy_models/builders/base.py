@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+from copy import deepcopy
+
+import numpy as np
+
+from tvb_multiscale.tvb_numpy.config import CONFIGURED, initialize_logger
+from tvb_multiscale.tvb_numpy.numpy_models.population import NumpyPopulation
+from tvb_multiscale.tvb_numpy.numpy_models.region_node import NumpyRegionNode
+from tvb_multiscale.tvb_numpy.numpy_models.brain import NumpyBrain
+from tvb_multiscale.tvb_numpy.numpy_models.network import NumpyNetwork
+from tvb_multiscale.tvb_numpy.numpy_models.builders.numpy_factory import \
+    load_numpy, get_populations_neurons, create_conn_spec, create_device, connect_device
+from tvb_multiscale.core.spiking_models.builders.factory import build_and_connect_devices
+from tvb_multiscale.core.spiking_models.builders.base import SpikingModelBuilder
+
+from tvb.contrib.scripts.utils.log_error_utils import raise_value_error
+from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
+
+
+LOG = initialize_logger(__name__)
+
+
+class NumpyModelBuilder(SpikingModelBuilder):
+
+    """This is the base class of a NumpyModelBuilder,
+       which builds a NumpyNetwork from user configuration inputs.
+       The builder is half way opionionated.
+    """
+
+    config = CONFIGURED
+    numpy_instance = None
+    _spiking_brain = NumpyBrain()
+
+    def __init__(self, tvb_simulator, numpy_nodes_ids, numpy_instance=None, config=CONFIGURED, logger=LOG):
+        super(NumpyModelBuilder, self).__init__(tvb_simulator, numpy_nodes_ids, config, logger)
+        self.numpy_instance = numpy_instance
+        self._spiking_brain = NumpyBrain()
+        # Setting the numpy simulator's defaults from config
+        self.default_kernel_config = self.config.DEFAULT_NUMPY_KERNEL_CONFIG
+
+    def _configure_numpy_kernel(self):
+        # Setting or creating a numpy simulator instance:
+        if self.numpy_instance is None:
+            self.numpy_instance = load_numpy(self.config, self.logger)
+        kernel_config = deepcopy(self.default_kernel_config)
+        self._update_spiking_dt()
+        self._update_default_min_delay()
+        kernel_config["resolution"] = self.spiking_dt
+        self.numpy_instance.ResetKernel(**kernel_config)
+
+    def confirm_numpy_models(self, models):
+        """This method will confirm the existence of the input neuron and synapse models.
+           Arguments:
+            models: a sequence (list, tuple) of the names (strings) of the models to be confirmed
+        """
+        numpy_models = self.numpy_instance.Models() + ["static_synapse"]
+        for model in ensure_list(models):
+            if model not in numpy_models:
+                raise_value_error("Model %s is not one of the available models of the numpy simulator: %s!"
+                                  % (model, str(numpy_models)))
+
+    def configure(self):
+        self._configure_numpy_kernel()
+        super(NumpyModelBuilder, self).configure()
+        self.confirm_numpy_models(self._models)
+
+    def build_spiking_population(self, label, model, size, params):
+        """This methods builds a NumpyPopulation instance,
+           which represents a population of spiking neurons of the same neural model,
+           and residing at a particular brain region node.
+           Arguments:
+            label: name (string) of the population
+            model: name (string) of the neural model
+            size: number (integer) of the neurons of this population
+            params: dictionary of parameters of the neural model to be set upon creation
+           Returns:
+            a NumpyPopulation class instance
+        """
+        return NumpyPopulation(self.numpy_instance.Create(model, int(np.round(size)), params=params),
+                               label, model, self.numpy_instance)
+
+    @property
+    def min_delay(self):
+        try:
+            return self.numpy_instance.GetKernelStatus("min_delay")
+        except:
+            return self.default_min_delay
+
+    def _assert_delay(self, delay):
+        """A method to assert the delay value, respecting the resolution of the numpy simulator."""
+        if isinstance(delay, dict):
+            min_delay = delay.get("low", delay.get("mu", self.spiking_dt))
+        else:
+            min_delay = delay
+        if min_delay < self.spiking_dt:
+            raise_value_error("Coupling spiking neurons with delay = %s < numpy simulator resolution = %f "
+                              "is not possible!:\n" % (str(delay), self.spiking_dt))
+        return delay
+
+    def _prepare_conn_spec(self, pop_src, pop_trg, conn_spec):
+        return create_conn_spec(n_src=pop_src.number_of_neurons, n_trg=pop_trg.number_of_neurons,
+                                src_is_trg=(pop_src.population == pop_trg.population),
+                                config=self.config, **conn_spec)[0]
+
+    def set_synapse(self, syn_model, weight, delay, receptor_type, params={}):
+        """Method to set the synaptic model, the weight, the delay,
+           the synaptic receptor type, and other possible synapse parameters
+           to a synapse_params dictionary.
+           Arguments:
+            - syn_model: the name (string) of the synapse model
+            - weight: the weight of the synapse
+            - delay: the delay of the connection,
+            - receptor_type: the receptor type
+            - params: a dict of possible synapse parameters
+           Returns:
+            a dictionary of the whole synapse configuration
+        """
+        syn_spec = {'synapse_model': syn_model, 'weight': weight, 'delay': delay, 'receptor_type': receptor_type}
+        syn_spec.update(params)
+        return syn_spec
+
+    def connect_two_populations(self, pop_src, src_inds_fun, pop_trg, trg_inds_fun, conn_spec, syn_spec):
+        """Method to connect two NumpyPopulation instances in the SpikingNetwork.
+           Arguments:
+            source: the source NumpyPopulation of the connection
+            src_inds_fun: a function that selects a subset of the souce population neurons
+            target: the target NumpyPopulation of the connection
+            trg_inds_fun: a function that selects a subset of the target population neurons
+            conn_params: a dict of parameters of the connectivity pattern among the neurons of the two populations,
+                         excluding weight and delay ones
+            synapse_params: a dict of parameters of the synapses among the neurons of the two populations,
+                            including weight, delay and synaptic receptor type ones
+        """
+        # Prepare the parameters of connectivity:
+        conn_spec = self._prepare_conn_spec(pop_src, pop_trg, conn_spec)
+        # Prepare the parameters of the synapse:
+        syn_spec = dict(syn_spec)
+        syn_spec["delay"] = self._assert_delay(syn_spec["delay"])
+        # We might create the same connection multiple times for different synaptic receptors...
+        receptors = ensure_list(syn_spec["receptor_type"])
+        for receptor in receptors:
+            syn_spec["receptor_type"] = receptor
+            self.numpy_instance.Connect(get_populations_neurons(pop_src, src_inds_fun),
+                                        get_populations_neurons(pop_trg, trg_inds_fun),
+                                        conn_spec, syn_spec)
+
+    def build_spiking_region_node(self, label="", input_node=None, *args, **kwargs):
+        """This methods builds a NumpyRegionNode instance,
+           which consists of a pandas.Series of all SpikingPopulation instances,
+           residing at a particular brain region node.
+           Arguments:
+            label: name (string) of the region node. Default = ""
+            input_node: an already created SpikingRegionNode() class. Default = None.
+            *args, **kwargs: other optional positional or keyword arguments
+           Returns:
+            a SpikingRegionNode class instance
+        """
+        return NumpyRegionNode(label, input_node, self.numpy_instance)
+
+    def build_and_connect_devices(self, devices):
+        """Method to build and connect input or output devices, organized by
+           - the variable they measure or stimulate (pandas.Series), and the
+           - population(s) (pandas.Series), and
+           - brain region nodes (pandas.Series) they target.
+           See tvb_multiscale.core.spiking_models.builders.factory
+           and tvb_multiscale.tvb_numpy.numpy_models.builders.numpy_factory"""
+        return build_and_connect_devices(devices, create_device, connect_device,
+                                         self._spiking_brain, self.config, numpy_instance=self.numpy_instance)
+
+    def build(self):
+        """A method to build the final NumpyNetwork class based on the already created constituents."""
+        return NumpyNetwork(self.numpy_instance, self._spiking_brain,
+                            self._output_devices, self._input_devices, config=self.config)
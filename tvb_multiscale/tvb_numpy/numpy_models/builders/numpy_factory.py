@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+from copy import deepcopy
+
+from tvb_multiscale.tvb_numpy.config import CONFIGURED, initialize_logger
+from tvb_multiscale.tvb_numpy.numpy_models.simulator import NumpySimulator
+from tvb_multiscale.tvb_numpy.numpy_models.devices import NumpyInputDeviceDict, NumpyOutputDeviceDict
+
+from tvb.contrib.scripts.utils.log_error_utils import raise_value_error, warning
+
+
+LOG = initialize_logger(__name__)
+
+
+# Helper functions with the NumpySimulator
+
+
+def load_numpy(config=CONFIGURED, logger=LOG):
+    """This method will create a NumpySimulator instance and return it.
+        Arguments:
+         config: configuration class instance. Default: imported default CONFIGURED object.
+         logger: logger object. Default: local LOG object.
+        Returns:
+         the NumpySimulator instance
+    """
+    logger.info("Creating a NumpySimulator instance...")
+    return NumpySimulator(**config.DEFAULT_NUMPY_KERNEL_CONFIG)
+
+
+def get_populations_neurons(population, inds_fun=None):
+    """This method will return a subset NodeCollection instance
+       of the NumpyPopulation._population, if inds_fun argument is a function
+       Arguments:
+        population: a NumpyPopulation class instance
+        inds_fun: a function that takes a NodeCollection as argument and returns another NodeCollection
+       Returns:
+        NodeCollection NumpyPopulation._population instance
+    """
+    if inds_fun is None:
+        return population._population
+    return inds_fun(population._population)
+
+
+def create_conn_spec(n_src=1, n_trg=1, src_is_trg=False, config=CONFIGURED, **kwargs):
+    """This function returns a conn_spec dictionary and the expected/accurate number of total connections.
+       Arguments:
+        n_src: number (int) of source neurons. Default = 1.
+        n_trg: number (int) of target neurons. Default = 1.
+        src_is_trg: a (bool) flag to determine if the source and target populations are the same one. Default = False.
+        config: configuration class instance. Default: imported default CONFIGURED object.
+    """
+    conn_spec = dict(config.DEFAULT_CONNECTION["conn_spec"])
+    P_DEF = conn_spec["p"]
+    conn_spec.update(kwargs)
+    rule = conn_spec["rule"]
+    p = conn_spec["p"]
+    if p is None:
+        p = P_DEF
+    output_conn_spec = {'rule': rule,
+                        'allow_autapses': conn_spec["allow_autapses"],
+                        'allow_multapses': conn_spec["allow_multapses"]}
+    if rule == 'one_to_one':
+        return output_conn_spec, min(n_src, n_trg)
+    elif rule == 'fixed_total_number':
+        N = conn_spec["N"]
+        if N is None:
+            # Prune all to all connections to end up to connection probability p:
+            N = int(round(p * n_src * n_trg))
+        output_conn_spec['N'] = N
+        return output_conn_spec, N
+    elif rule == 'fixed_indegree':
+        indegree = conn_spec["indegree"]
+        if indegree is None:
+            indegree = int(round(p * n_src))
+        output_conn_spec['indegree'] = indegree
+        return output_conn_spec, indegree * n_trg
+    elif rule == 'fixed_outdegree':
+        outdegree = conn_spec["outdegree"]
+        if outdegree is None:
+            outdegree = int(round(p * n_trg))
+        output_conn_spec['outdegree'] = outdegree
+        return output_conn_spec, outdegree * n_src
+    else:
+        Nall = n_src * n_trg
+        if src_is_trg and conn_spec["allow_autapses"] is False:
+            Nall -= n_src
+        if rule == 'pairwise_bernoulli':
+            output_conn_spec['p'] = p
+            return output_conn_spec, int(round(p * Nall))
+        else:  # assuming rule == 'all_to_all':
+            return output_conn_spec, Nall
+
+
+def create_device(device_model, params=None, config=CONFIGURED, numpy_instance=None, **kwargs):
+    """Method to create a NumpyDevice.
+       Arguments:
+        device_model: name (string) of the device model
+        params: dictionary of parameters of device and/or its synapse. Default = None
+        config: configuration class instance. Default: imported default CONFIGURED object.
+        numpy_instance: the NumpySimulator instance.
+                        Default = None, in which case we are going to create one, and also return it in the output
+       Returns:
+        the NumpyDevice class, and optionally, the NumpySimulator instance if it is created here.
+    """
+    if numpy_instance is None:
+        numpy_instance = load_numpy(config=config)
+        return_numpy = True
+    else:
+        return_numpy = False
+    label = kwargs.pop("label", "")
+    if device_model in NumpyInputDeviceDict.keys():
+        devices_dict = NumpyInputDeviceDict
+        default_params = deepcopy(config.NUMPY_INPUT_DEVICES_PARAMS_DEF.get(device_model, {}))
+    elif device_model in NumpyOutputDeviceDict.keys():
+        devices_dict = NumpyOutputDeviceDict
+        default_params = deepcopy(config.NUMPY_OUTPUT_DEVICES_PARAMS_DEF.get(device_model, {}))
+    else:
+        raise_value_error("%s is neither one of the available input devices: %s\n "
+                          "nor of the output ones: %s!" %
+                          (device_model, str(config.NUMPY_INPUT_DEVICES_PARAMS_DEF),
+                           str(config.NUMPY_OUTPUT_DEVICES_PARAMS_DEF)))
+    default_params["label"] = label
+    if isinstance(params, dict) and len(params) > 0:
+        default_params.update(params)
+    numpy_device_id = numpy_instance.Create(device_model, params=default_params)
+    numpy_device = devices_dict[device_model](numpy_device_id, numpy_instance, label=default_params["label"])
+    if return_numpy:
+        return numpy_device, numpy_instance
+    else:
+        return numpy_device
+
+
+def connect_device(numpy_device, population, neurons_inds_fun, weight=1.0, delay=0.0, receptor_type=0,
+                   numpy_instance=None, config=CONFIGURED, **kwargs):
+    """This method connects a NumpyDevice to a NumpyPopulation instance.
+       Arguments:
+        numpy_device: the NumpyDevice instance
+        population: the NumpyPopulation instance
+        neurons_inds_fun: a function to return a NumpyPopulation or a subset thereof of the target population.
+                          Default = None.
+        weight: the weights of the connection. Default = 1.0.
+        delay: the delays of the connection. Default = 0.0.
+        receptor_type: type of the synaptic receptor. Default = 0.
+        config: configuration class instance. Default: imported default CONFIGURED object.
+        numpy_instance: the NumpySimulator instance.
+       Returns:
+        the connected NumpyDevice
+    """
+    if receptor_type is None:
+        receptor_type = 0
+    if numpy_instance is None:
+        raise_value_error("There is no NumpySimulator instance!")
+    resolution = numpy_instance.GetKernelStatus("resolution")
+    if isinstance(delay, dict):
+        if delay["low"] < resolution:
+            warning("Minimum delay %f is smaller than the numpy simulator resolution %f!\n"
+                    "Setting minimum delay equal to resolution!" % (delay["low"], resolution))
+            delay["low"] = resolution
+        if delay["high"] <= delay["low"]:
+            raise_value_error("Maximum delay %f is not smaller than minimum one %f!" % (delay["high"], delay["low"]))
+    elif delay < resolution:
+        warning("Delay %f is smaller than the numpy simulator resolution %f!\n"
+                "Setting minimum delay equal to resolution!" % (delay, resolution))
+        delay = resolution
+    syn_spec = {"weight": weight, "delay": delay, "receptor_type": receptor_type}
+    neurons = get_populations_neurons(population, neurons_inds_fun)
+    if numpy_device.model == "spike_recorder":
+        #                      source  ->  target
+        numpy_instance.Connect(neurons, numpy_device.device, syn_spec=syn_spec)
+    else:
+        numpy_instance.Connect(numpy_device.device, neurons, syn_spec=syn_spec)
+    return numpy_device
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABCMeta
+
+import numpy as np
+import xarray as xr
+
+from tvb_multiscale.core.spiking_models.devices import \
+    Device, InputDevice, OutputDevice, SpikeRecorder, Multimeter, Voltmeter
+from tvb_multiscale.core.utils.data_structures_utils import flatten_neurons_inds_in_DataArray
+
+from tvb.contrib.scripts.utils.data_structures_utils \
+    import ensure_list, extract_integer_intervals, data_xarray_from_continuous_events
+
+
+# These classes wrap around the devices of the NumpySimulator.
+
+
+class NumpyDevice(Device):
+    __metaclass__ = ABCMeta
+
+    """NumpyDevice class to wrap around an output (recording) or input (stimulating) device of the NumpySimulator"""
+
+    numpy_instance = None
+    _weight_attr = "weight"
+    _delay_attr = "delay"
+    _receptor_attr = "receptor"
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "numpy_device")
+        super(NumpyDevice, self).__init__(device, *args, **kwargs)
+        self.numpy_instance = numpy_instance
+
+    def _assert_numpy(self):
+        if self.numpy_instance is None:
+            raise ValueError("No numpy simulator instance associated to this %s of model %s!" %
+                             (self.__class__.__name__, self.model))
+
+    def _assert_device(self):
+        """Method to assert that the node of the network is a device"""
+        try:
+            self.device.get("element_type")
+        except:
+            raise ValueError("Failed to Get device %s!" % str(self.device))
+
+    @property
+    def global_id(self):
+        return self.device.get("global_id")
+
+    @property
+    def spiking_simulator_module(self):
+        return self.numpy_instance
+
+    @property
+    def numpy_model(self):
+        return str(self.device.get("model"))
+
+    def Set(self, values_dict):
+        """Method to set attributes of the device
+           Arguments:
+            values_dict: dictionary of attributes names' and values.
+        """
+        self.device.set(values_dict)
+
+    def Get(self, attrs=None):
+        """Method to get attributes of the device.
+           Arguments:
+            attrs: names of attributes to be returned. Default = None, corresponds to all neurons' attributes.
+           Returns:
+            Dictionary of attributes.
+        """
+        if attrs is None:
+            return self.device.get()
+        else:
+            return self.device.get(attrs)
+
+    def _GetConnections(self, **kwargs):
+        """Method to get attributes of the connections from/to the device
+           Return:
+            connections' objects
+        """
+        self._assert_numpy()
+        return self.numpy_instance.GetConnections(**kwargs)
+
+    def _SetToConnections(self, values_dict, connections=None):
+        """Method to set attributes of the connections from/to the device
+            Arguments:
+             values_dict: dictionary of attributes names' and values.
+             connections: A SynapseCollection. Default = None, corresponding to all device's connections
+        """
+        if connections is None:
+            connections = self.connections
+        connections.set(values_dict)
+
+    def _GetFromConnections(self, attrs=None, connections=None):
+        """Method to get attributes of the connections from/to the device
+           Arguments:
+            attrs: collection (list, tuple, array) of the attributes to be included in the output.
+                   Default = None, correspondingn to all devices' attributes
+            connections: A SynapseCollection. Default = None, corresponding to all device's connections
+           Returns:
+            Dictionary of lists of connections' attributes.
+        """
+        if connections is None:
+            connections = self.connections
+        if attrs is None:
+            return connections.get()
+        else:
+            return connections.get(ensure_list(attrs))
+
+    def GetConnections(self):
+        """Method to get all connections of the device to neurons.
+           Returns:
+            SynapseCollection.
+        """
+        return self._GetConnections(source=self.device)
+
+    @property
+    def connections(self):
+        """Method to get all connections of the device to neurons.
+           Returns:
+            SynapseCollection.
+        """
+        return self.GetConnections()
+
+    def get_neurons(self, source_or_target="target"):
+        """Method to get the indices of all the neurons the device is connected from/to.
+           Mind that for all input and all out output devices, except for spike recorder,
+           the devices connects to the neurons, and not vice-versa,
+           i.e., neurons are the target of the device connection.
+        """
+        return tuple(np.unique(ensure_list(self.connections.get(source_or_target))).tolist())
+
+    @property
+    def neurons(self):
+        """Method to get the indices of all the neurons the device is connected to."""
+        return self.get_neurons("target")
+
+    def _print_neurons(self, neurons):
+        return "%d neurons: %s" % (self.number_of_neurons, extract_integer_intervals(neurons, print=True))
+
+
+class NumpyInputDevice(NumpyDevice, InputDevice):
+
+    """NumpyInputDevice class to wrap around an input (stimulating) device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "numpy_input_device")
+        super(NumpyInputDevice, self).__init__(device, numpy_instance, *args, **kwargs)
+
+
+class NumpyPoissonGenerator(NumpyInputDevice):
+
+    """NumpyPoissonGenerator class to wrap around a poisson_generator device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "poisson_generator")
+        super(NumpyPoissonGenerator, self).__init__(device, numpy_instance, *args, **kwargs)
+
+
+class NumpyInhomogeneousPoissonGenerator(NumpyInputDevice):
+
+    """NumpyInhomogeneousPoissonGenerator class to wrap around
+       an inhomogeneous_poisson_generator device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "inhomogeneous_poisson_generator")
+        super(NumpyInhomogeneousPoissonGenerator, self).__init__(device, numpy_instance, *args, **kwargs)
+
+
+class NumpyDCGenerator(NumpyInputDevice):
+
+    """NumpyDCGenerator class to wrap around a dc_generator device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "dc_generator")
+        super(NumpyDCGenerator, self).__init__(device, numpy_instance, *args, **kwargs)
+
+
+class NumpyStepCurrentGenerator(NumpyInputDevice):
+
+    """NumpyStepCurrentGenerator class to wrap around a step_current_generator device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "step_current_generator")
+        super(NumpyStepCurrentGenerator, self).__init__(device, numpy_instance, *args, **kwargs)
+
+
+NumpySpikeInputDeviceDict = {"poisson_generator": NumpyPoissonGenerator,
+                             "inhomogeneous_poisson_generator": NumpyInhomogeneousPoissonGenerator}
+
+
+NumpyCurrentInputDeviceDict = {"dc_generator": NumpyDCGenerator,
+                               "step_current_generator": NumpyStepCurrentGenerator}
+
+
+NumpyInputDeviceDict = {}
+NumpyInputDeviceDict.update(NumpySpikeInputDeviceDict)
+NumpyInputDeviceDict.update(NumpyCurrentInputDeviceDict)
+
+
+class NumpyOutputDevice(NumpyDevice, OutputDevice):
+
+    """NumpyOutputDevice class to wrap around an output (recording) device of the NumpySimulator.
+       Events are always recorded in memory."""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "numpy_output_device")
+        super(NumpyOutputDevice, self).__init__(device, numpy_instance, *args, **kwargs)
+
+    @property
+    def record_from(self):
+        return []
+
+    @property
+    def events(self):
+        return self.device.get("events")
+
+    @property
+    def number_of_events(self):
+        return self.device.get("n_events")
+
+    @property
+    def n_events(self):
+        return self.number_of_events
+
+    def reset(self):
+        self._archive_events()
+        self.device.set({"n_events": 0})
+        self._restart_events_count()
+
+
+class NumpySpikeRecorder(NumpyOutputDevice, SpikeRecorder):
+
+    """NumpySpikeRecorder class to wrap around a spike_recorder device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "spike_recorder")
+        super(NumpySpikeRecorder, self).__init__(device, numpy_instance, *args, **kwargs)
+
+    # Only SpikeRecorder is the target of connections with neurons:
+
+    def GetConnections(self):
+        """Method to get connections of the device from neurons.
+           Returns:
+            connections' objects.
+        """
+        return self._GetConnections(target=self.device)
+
+    @property
+    def neurons(self):
+        """Method to get the indices of all the neurons the device is connected to."""
+        return self.get_neurons("source")
+
+
+class NumpyMultimeter(NumpyOutputDevice, Multimeter):
+
+    """NumpyMultimeter class to wrap around a multimeter device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "multimeter")
+        super(NumpyMultimeter, self).__init__(device, numpy_instance, *args, **kwargs)
+
+    @property
+    def record_from(self):
+        return [str(name) for name in self.device.get('record_from')]
+
+    def get_data(self, variables=None, name=None, dims_names=["Time", "Variable", "Neuron"], flatten_neurons_inds=True):
+        """This method returns time series' data recorded by the multimeter.
+           Arguments:
+            variables: a sequence of variables' names (strings) to be selected.
+                       Default = None, corresponds to all variables the multimeter records from.
+            name: label of output. Default = None, which defaults to the label of the Device
+            dims_names: sequence of dimensions' labels (strings) for the output array.
+                        Default = ["Time", "Variable", "Neuron"]
+           Returns:
+            a xarray DataArray with the output data
+        """
+        if name is None:
+            name = self.label
+        events = self.events
+        times = events.pop("times")
+        senders = events.pop("senders")
+        if len(times) + len(senders):
+            data = data_xarray_from_continuous_events(events, times, senders,
+                                                      variables=self._determine_variables(variables),
+                                                      name=name, dims_names=dims_names)
+            if flatten_neurons_inds:
+                data = flatten_neurons_inds_in_DataArray(data, data.dims[2])
+        else:
+            vars = self._determine_variables(variables)
+            data = xr.DataArray(np.empty((len(times), len(vars), len(senders))), name=name, dims=dims_names,
+                                coords={dims_names[0]: times, dims_names[1]: vars, dims_names[2]: senders})
+        return data
+
+
+class NumpyVoltmeter(NumpyMultimeter, Voltmeter):
+
+    """NumpyVoltmeter class to wrap around a voltmeter device of the NumpySimulator"""
+
+    def __init__(self, device, numpy_instance, *args, **kwargs):
+        kwargs["model"] = kwargs.pop("model", "voltmeter")
+        super(NumpyVoltmeter, self).__init__(device, numpy_instance, *args, **kwargs)
+        assert self.var in self.record_from
+
+    @property
+    def var(self):
+        return "V_m"
+
+    @property
+    def get_V_m(self):
+        return self.var
+
+    @property
+    def V_m(self):
+        return self.var
+
+
+NumpyOutputSpikeDeviceDict = {"spike_recorder": NumpySpikeRecorder}
+
+
+NumpyOutputContinuousTimeDeviceDict = {"multimeter": NumpyMultimeter,
+                                       "voltmeter": NumpyVoltmeter}
+
+
+NumpyOutputDeviceDict = {}
+NumpyOutputDeviceDict.update(NumpyOutputSpikeDeviceDict)
+NumpyOutputDeviceDict.update(NumpyOutputContinuousTimeDeviceDict)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import numpy as np
+
+from tvb_multiscale.core.spiking_models.devices import EventBuffer
+
+
+# Input (stimulating) and output (recording) device models of the NumpySimulator.
+# As for NEST devices, input devices are active for times t, such that origin + start < t <= origin + stop.
+
+
+class NumpyKernelDevice(object):
+
+    """NumpyKernelDevice is the base class of the device models of the NumpySimulator.
+       It holds the device's parameters in a dictionary."""
+
+    model = ""
+    element_type = ""
+    parameters = OrderedDict()
+
+    def __init__(self, params=None):
+        self._params = OrderedDict([("label", ""), ("start", 0.0), ("stop", np.inf), ("origin", 0.0)])
+        self._params.update(self.parameters)
+        if params:
+            self.set(params)
+
+    @property
+    def attributes(self):
+        return ["model", "element_type"] + list(self._params.keys())
+
+    def get(self, name):
+        if name == "model":
+            return self.model
+        elif name == "element_type":
+            return self.element_type
+        elif name not in self._params:
+            raise ValueError("%s is not a parameter of device model %s!\n"
+                             "Available attributes: %s" % (name, self.model, str(self.attributes)))
+        return self._params[name]
+
+    def set(self, values_dict):
+        for name, value in values_dict.items():
+            if name not in self._params:
+                raise ValueError("%s is not a parameter of device model %s!\n"
+                                 "Available parameters: %s" % (name, self.model, str(list(self._params.keys()))))
+            self._params[name] = value
+
+    def is_active(self, time):
+        origin = self._params["origin"]
+        return origin + self._params["start"] < time <= origin + self._params["stop"]
+
+
+class PoissonGenerator(NumpyKernelDevice):
+
+    """Poisson spike trains' generator of rate in Hz, independent for each target neuron."""
+
+    model = "poisson_generator"
+    element_type = "stimulator"
+    parameters = OrderedDict([("rate", 0.0)])
+
+    def value(self, time):
+        return self._params["rate"]
+
+
+def _scheduled_value(times, values, time):
+    # The value of a schedule at time, or 0.0 before the first scheduled time:
+    ind = np.searchsorted(times, time, side="right") - 1
+    if ind < 0:
+        return 0.0
+    return values[ind]
+
+
+class InhomogeneousPoissonGenerator(PoissonGenerator):
+
+    """Poisson spike trains' generator of rates in Hz changing at the scheduled times,
+       independent for each target neuron."""
+
+    model = "inhomogeneous_poisson_generator"
+    parameters = OrderedDict([("rate_times", []), ("rate_values", [])])
+
+    def value(self, time):
+        return _scheduled_value(self._params["rate_times"], self._params["rate_values"], time)
+
+
+class DCGenerator(NumpyKernelDevice):
+
+    """Direct current generator of amplitude in pA."""
+
+    model = "dc_generator"
+    element_type = "stimulator"
+    parameters = OrderedDict([("amplitude", 0.0)])
+
+    def value(self, time):
+        return self._params["amplitude"]
+
+
+class StepCurrentGenerator(DCGenerator):
+
+    """Current generator of amplitudes in pA changing at the scheduled times."""
+
+    model = "step_current_generator"
+    parameters = OrderedDict([("amplitude_times", []), ("amplitude_values", [])])
+
+    def value(self, time):
+        return _scheduled_value(self._params["amplitude_times"], self._params["amplitude_values"], time)
+
+
+class NumpyKernelRecorder(NumpyKernelDevice):
+
+    """NumpyKernelRecorder is the base class of the recording devices of the NumpySimulator.
+       Events are recorded in memory, in an EventBuffer, and returned as views of its columns."""
+
+    element_type = "recorder"
+
+    def __init__(self, params=None):
+        super(NumpyKernelRecorder, self).__init__(params)
+        self._clear_events()
+
+    @property
+    def record_from(self):
+        return []
+
+    @property
+    def variables(self):
+        return ["times", "senders"] + list(self.record_from)
+
+    @property
+    def attributes(self):
+        return super(NumpyKernelRecorder, self).attributes + ["events", "n_events"]
+
+    def _clear_events(self):
+        self._events_buffer = EventBuffer(self.record_from)
+
+    @property
+    def events(self):
+        return self._events_buffer.events
+
+    def get(self, name):
+        if name == "events":
+            return self.events
+        elif name == "n_events":
+            return self._events_buffer.size
+        return super(NumpyKernelRecorder, self).get(name)
+
+    def set(self, values_dict):
+        values_dict = dict(values_dict)
+        if "n_events" in values_dict:
+            # As in NEST, setting n_events to 0 deletes all events recorded in memory:
+            if values_dict.pop("n_events") != 0:
+                raise ValueError("n_events can only be set to 0!")
+            self._clear_events()
+        super(NumpyKernelRecorder, self).set(values_dict)
+        if "record_from" in values_dict:
+            self._clear_events()
+
+    def record(self, events):
+        """Method to record a chunk of events.
+           Arguments:
+            events: dictionary of arrays of equal size for all the variables of the device
+        """
+        self._events_buffer.append(events)
+
+
+class SpikeRecorder(NumpyKernelRecorder):
+
+    """Spikes' recorder."""
+
+    model = "spike_recorder"
+
+
+class Multimeter(NumpyKernelRecorder):
+
+    """Recorder of neurons' state variables or parameters, every interval ms."""
+
+    model = "multimeter"
+    parameters = OrderedDict([("record_from", ["V_m"]), ("interval", 1.0)])
+
+    @property
+    def record_from(self):
+        return list(self._params["record_from"])
+
+
+class Voltmeter(Multimeter):
+
+    """Recorder of neurons' membrane potential V_m, every interval ms."""
+
+    model = "voltmeter"
+
+
+KERNEL_INPUT_DEVICES = {PoissonGenerator.model: PoissonGenerator,
+                        InhomogeneousPoissonGenerator.model: InhomogeneousPoissonGenerator,
+                        DCGenerator.model: DCGenerator,
+                        StepCurrentGenerator.model: StepCurrentGenerator}
+
+KERNEL_OUTPUT_DEVICES = {SpikeRecorder.model: SpikeRecorder,
+                         Multimeter.model: Multimeter,
+                         Voltmeter.model: Voltmeter}
+
+KERNEL_DEVICES = {}
+KERNEL_DEVICES.update(KERNEL_INPUT_DEVICES)
+KERNEL_DEVICES.update(KERNEL_OUTPUT_DEVICES)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+from tvb_multiscale.tvb_numpy.config import CONFIGURED, initialize_logger
+from tvb_multiscale.tvb_numpy.numpy_models.builders.numpy_factory import load_numpy
+from tvb_multiscale.tvb_numpy.numpy_models.devices import \
+    NumpyOutputSpikeDeviceDict, NumpyOutputContinuousTimeDeviceDict
+from tvb_multiscale.core.spiking_models.network import SpikingNetwork
+
+
+LOG = initialize_logger(__name__)
+
+
+class NumpyNetwork(SpikingNetwork):
+    """
+        NumpyNetwork is a class representing a spiking network of the pure numpy NumpySimulator, comprising of:
+        - a NumpyBrain class, i.e., neural populations organized per brain region they reside and neural model,
+        - a pandas.Series of DeviceSet classes of output (measuring/recording/monitor) devices,
+        - a pandas.Series of DeviceSet classes of input (stimulating) devices,
+        all of which are implemented as indexed mappings by inheriting from pandas.Series class.
+        The class also includes methods to return measurements (mean, sum/total data, spikes, spikes rates etc)
+        from output devices, as xarray.DataArrays.
+        It serves as a fast in-process reference backend for small networks, tests and benchmarks,
+        that requires neither NEST nor ANNarchy.
+    """
+
+    numpy_instance = None
+
+    _OutputSpikeDeviceDict = NumpyOutputSpikeDeviceDict
+    _OutputContinuousTimeDeviceDict = NumpyOutputContinuousTimeDeviceDict
+
+    def __init__(self, numpy_instance=None,
+                 brain_regions=None,
+                 output_devices=None,
+                 input_devices=None,
+                 config=CONFIGURED):
+        if numpy_instance is None:
+            numpy_instance = load_numpy(config, LOG)
+        self.numpy_instance = numpy_instance
+        super(NumpyNetwork, self).__init__(brain_regions, output_devices, input_devices, config)
+
+    @property
+    def spiking_simulator_module(self):
+        return self.numpy_instance
+
+    @property
+    def min_delay(self):
+        return self.numpy_instance.GetKernelStatus("min_delay")
+
+    def configure(self, *args, **kwargs):
+        """Method to configure the numpy network simulation.
+           It will compile the network's connections via numpy_instance.Prepare()
+        """
+        self.numpy_instance.Prepare()
+
+    def _Run(self, simulation_length, *args, **kwargs):
+        """Method to simulate the numpy network for a specific simulation_length (in ms)."""
+        self.numpy_instance.Run(simulation_length)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Vectorized spiking neuron models of the NumpySimulator.
+# Each model holds its parameters and state variables in preallocated arrays of size equal to the number of neurons,
+# and advances all neurons by one time step with a few array operations.
+
+
+class NumpyNeuronModel(object):
+
+    """NumpyNeuronModel is the base class of the vectorized neuron models of the NumpySimulator.
+       Parameters and state variables are numpy arrays of size equal to the number of neurons.
+       Spike inputs are the summed weights of all spikes arriving at each neuron at the current time step,
+       and current inputs the summed currents (in pA) of all current generators targeting each neuron.
+    """
+
+    __metaclass__ = ABCMeta
+
+    model = ""
+    parameters = OrderedDict()  # default parameters
+    state_variables = OrderedDict()  # default initial conditions of state variables
+
+    def __init__(self, size, params=None):
+        self.size = int(size)
+        self._values = OrderedDict()
+        for name, default in list(self.parameters.items()) + list(self.state_variables.items()):
+            self._values[name] = np.full((self.size,), default, dtype="f8")
+        if params:
+            self.set(params)
+
+    @property
+    def attributes(self):
+        return list(self._values.keys())
+
+    def _assert_attribute(self, name):
+        if name not in self._values:
+            raise ValueError("%s is not a parameter or state variable of neuron model %s!\n"
+                             "Available attributes: %s" % (name, self.model, str(self.attributes)))
+
+    def get(self, name, inds=slice(None)):
+        self._assert_attribute(name)
+        return self._values[name][inds]
+
+    def set(self, values_dict, inds=slice(None)):
+        for name, values in values_dict.items():
+            self._assert_attribute(name)
+            self._values[name][inds] = values
+
+    @abstractmethod
+    def update(self, dt, spikes_input, currents_input):
+        """Method to advance all neurons by one time step.
+           Arguments:
+            dt: the time step in ms
+            spikes_input: array of the summed weights of the spikes arriving at each neuron
+            currents_input: array of the summed input currents of each neuron
+           Returns:
+            a boolean array of the neurons that spiked
+        """
+        pass
+
+
+class LIF(NumpyNeuronModel):
+
+    """Current based leaky integrate and fire neuron model with exponentially decaying synaptic currents,
+       (similar to NEST iaf_psc_exp, with a single synaptic time constant),
+       integrated with the exponential Euler method.
+       Spike weights are in pA, times in ms, potentials in mV, capacitance in pF.
+    """
+
+    model = "lif"
+    parameters = OrderedDict([("C_m", 250.0), ("tau_m", 10.0), ("t_ref", 2.0), ("E_L", -70.0),
+                              ("V_th", -55.0), ("V_reset", -70.0), ("tau_syn", 2.0), ("I_e", 0.0)])
+    state_variables = OrderedDict([("V_m", -70.0), ("I_syn", 0.0), ("refractory_time", 0.0)])
+
+    def update(self, dt, spikes_input, currents_input):
+        v = self._values
+        v["I_syn"] = v["I_syn"] * np.exp(-dt / v["tau_syn"]) + spikes_input
+        decay = np.exp(-dt / v["tau_m"])
+        V_m = v["E_L"] + (v["V_m"] - v["E_L"]) * decay + \
+              (v["I_syn"] + v["I_e"] + currents_input) * v["tau_m"] / v["C_m"] * (1.0 - decay)
+        refractory = v["refractory_time"] > 0.0
+        v["V_m"] = np.where(refractory, v["V_reset"], V_m)
+        v["refractory_time"] = np.where(refractory, v["refractory_time"] - dt, 0.0)
+        spikes = v["V_m"] >= v["V_th"]
+        v["V_m"][spikes] = v["V_reset"][spikes]
+        v["refractory_time"][spikes] = v["t_ref"][spikes]
+        return spikes
+
+
+class Izhikevich(NumpyNeuronModel):
+
+    """Izhikevich neuron model (similar to NEST izhikevich),
+       integrated with the forward Euler method.
+       Spike weights are added directly to the membrane potential V_m (in mV).
+    """
+
+    model = "izhikevich"
+    parameters = OrderedDict([("a", 0.02), ("b", 0.2), ("c", -65.0), ("d", 8.0),
+                              ("V_th", 30.0), ("I_e", 0.0)])
+    state_variables = OrderedDict([("V_m", -65.0), ("U_m", -13.0)])
+
+    def update(self, dt, spikes_input, currents_input):
+        v = self._values
+        V_m = v["V_m"]
+        U_m = v["U_m"]
+        v["V_m"] = V_m + dt * (0.04 * V_m * V_m + 5.0 * V_m + 140.0 - U_m + v["I_e"] + currents_input) \
+                   + spikes_input
+        v["U_m"] = U_m + dt * v["a"] * (v["b"] * V_m - U_m)
+        spikes = v["V_m"] >= v["V_th"]
+        v["V_m"][spikes] = v["c"][spikes]
+        v["U_m"][spikes] += v["d"][spikes]
+        return spikes
+
+
+NEURON_MODELS = {LIF.model: LIF,
+                 Izhikevich.model: Izhikevich}
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from tvb_multiscale.core.spiking_models.region_node import SpikingRegionNode
+
+
+class NumpyRegionNode(SpikingRegionNode):
+
+    """NumpyRegionNode class is an indexed mapping
+       (based on inheriting from pandas.Series class)
+       between populations labels and NumpyPopulation instances,
+       residing at a specific brain region node.
+    """
+
+    numpy_instance = None
+    _weight_attr = "weight"
+    _delay_attr = "delay"
+    _receptor_attr = "receptor"
+
+    def __init__(self, label="", input_nodes=None, numpy_instance=None, **kwargs):
+        self.numpy_instance = numpy_instance
+        super(NumpyRegionNode, self).__init__(label, input_nodes, **kwargs)
+
+    @property
+    def spiking_simulator_module(self):
+        if self.numpy_instance is None:
+            for i_pop, pop_lbl, pop in self._loop_generator():
+                self.numpy_instance = pop.numpy_instance
+                if self.numpy_instance is not None:
+                    break
+        return self.numpy_instance
@@ -0,0 +1,620 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import numpy as np
+
+from tvb_multiscale.tvb_numpy.numpy_models.neurons import NumpyNeuronModel, NEURON_MODELS
+from tvb_multiscale.tvb_numpy.numpy_models.kernel_devices import \
+    PoissonGenerator, DCGenerator, SpikeRecorder, Multimeter, KERNEL_DEVICES
+
+from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
+
+
+# A minimal, pure numpy, clock driven spiking network simulator,
+# with an interface that follows a small subset of the one of PyNEST:
+# Create(), Connect(), GetConnections(), Prepare(), Run(), Cleanup(), Simulate(),
+# GetKernelStatus(), SetKernelStatus(), ResetKernel() and Models(),
+# as well as NodeCollection and SynapseCollection classes with get() and set() methods.
+# Nodes (neurons and devices) are indexed by global ids starting from 1.
+# All neurons of a Create() call form a group of the same neuron model,
+# the state of which is updated by a few vectorized operations per time step.
+# Spikes and currents are delivered to their target neurons via ring buffers of size
+# equal to the maximum delay (in time steps) + 1.
+
+
+def _values_per_node(values, n):
+    # Return the values as a tuple, or as a single value if there is only one node, as NEST does:
+    if n == 1:
+        return values[0]
+    return tuple(values)
+
+
+def _draw_values(spec, n, rng):
+    # Generate n connections' values from a scalar, a sequence, or a distribution dictionary:
+    if isinstance(spec, dict):
+        distribution = spec.get("distribution", None)
+        if distribution == "uniform":
+            return rng.uniform(spec.get("low", 0.0), spec.get("high", 1.0), size=n)
+        elif distribution == "normal":
+            return rng.normal(spec.get("mu", 0.0), spec.get("sigma", 1.0), size=n)
+        elif distribution == "lognormal":
+            return rng.lognormal(spec.get("mu", 0.0), spec.get("sigma", 1.0), size=n)
+        raise ValueError("Distribution %s is not supported! Use one of 'uniform', 'normal', 'lognormal'!"
+                         % str(distribution))
+    values = np.array(spec, dtype="f8").flatten()
+    if values.size == 1:
+        return np.full((n,), values[0])
+    if values.size != n:
+        raise ValueError("The %d values given are neither 1 nor equal to the %d connections!" % (values.size, n))
+    return values
+
+
+class NodeCollection(object):
+
+    """NodeCollection is a collection of nodes (neurons or devices) of a NumpySimulator, given by their global ids."""
+
+    def __init__(self, simulator, global_ids=()):
+        self.simulator = simulator
+        self.global_ids = np.array(global_ids, dtype="i8").flatten()
+
+    def __repr__(self):
+        return "NodeCollection(%s)" % str(self.global_ids.tolist())
+
+    def __len__(self):
+        return self.global_ids.size
+
+    def __iter__(self):
+        for global_id in self.global_ids:
+            yield NodeCollection(self.simulator, [global_id])
+
+    def __getitem__(self, key):
+        return NodeCollection(self.simulator, self.global_ids[key])
+
+    def __add__(self, other):
+        return NodeCollection(self.simulator, np.union1d(self.global_ids, other.global_ids))
+
+    def __eq__(self, other):
+        return isinstance(other, NodeCollection) and np.array_equal(self.global_ids, other.global_ids)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = object.__hash__
+
+    @property
+    def global_id(self):
+        return _values_per_node(self.global_ids.tolist(), len(self))
+
+    def tolist(self):
+        return self.global_ids.tolist()
+
+    def get(self, *attrs):
+        """Method to get attributes of the nodes.
+           Arguments:
+            attrs: None, the name of an attribute, a sequence of names, or several names as positional arguments.
+                   Default = None, corresponding to all attributes.
+           Returns:
+            for a single attribute name, a tuple of its values (or a single value for a single node),
+            otherwise, a dictionary of such values per attribute name.
+        """
+        if len(attrs) == 0 or (len(attrs) == 1 and attrs[0] is None):
+            attrs = self.simulator._nodes_attributes(self.global_ids)
+        elif len(attrs) == 1 and isinstance(attrs[0], str):
+            return _values_per_node(self.simulator._get_nodes_values(self.global_ids, attrs[0]), len(self))
+        else:
+            attrs = [attr for attr_seq in attrs for attr in ensure_list(attr_seq)]
+        return OrderedDict([(attr, _values_per_node(self.simulator._get_nodes_values(self.global_ids, attr),
+                                                    len(self)))
+                            for attr in attrs])
+
+    def set(self, params=None, **kwargs):
+        """Method to set attributes of the nodes.
+           Arguments:
+            params: a dictionary of attributes' names and values, or a list of such dictionaries, one per node.
+                    Values can be single ones, common for all nodes, or sequences of one value per node.
+            **kwargs: attributes' names and values, alternatively to params
+        """
+        if params is None:
+            params = kwargs
+        if isinstance(params, (list, tuple)):
+            if len(params) != len(self):
+                raise ValueError("The %d dictionaries of parameters are not equal to the %d nodes!"
+                                 % (len(params), len(self)))
+            for global_id, node_params in zip(self.global_ids, params):
+                self.simulator._set_nodes_values(np.array([global_id]), node_params)
+        else:
+            self.simulator._set_nodes_values(self.global_ids, params)
+
+
+class SynapseCollection(object):
+
+    """SynapseCollection is a collection of connections of a NumpySimulator, given by their indices."""
+
+    _attributes = ["source", "target", "weight", "delay", "receptor", "synapse_model"]
+
+    def __init__(self, simulator, indices=()):
+        self.simulator = simulator
+        self.indices = np.array(indices, dtype="i8").flatten()
+
+    def __repr__(self):
+        return "SynapseCollection of %d connections" % len(self)
+
+    def __len__(self):
+        return self.indices.size
+
+    def get(self, *attrs):
+        """Method to get attributes of the connections.
+           Arguments:
+            attrs: None, the name of an attribute, a sequence of names, or several names as positional arguments.
+                   Default = None, corresponding to all attributes.
+           Returns:
+            for a single attribute name, a list of its values (or a single value for a single connection),
+            otherwise, a dictionary of such values per attribute name.
+        """
+        if len(attrs) == 0 or (len(attrs) == 1 and attrs[0] is None):
+            attrs = self._attributes
+        elif len(attrs) == 1 and isinstance(attrs[0], str):
+            return self._get(attrs[0])
+        else:
+            attrs = [attr for attr_seq in attrs for attr in ensure_list(attr_seq)]
+        return OrderedDict([(attr, self._get(attr)) for attr in attrs])
+
+    def _get(self, attr):
+        if attr not in self._attributes:
+            raise ValueError("%s is not an attribute of connections!\n"
+                             "Available attributes: %s" % (attr, str(self._attributes)))
+        values = self.simulator._connections[attr][self.indices].tolist()
+        if len(values) == 1:
+            return values[0]
+        return values
+
+    def set(self, params=None, **kwargs):
+        """Method to set attributes of the connections.
+           Arguments:
+            params: a dictionary of attributes' names and values.
+                    Values can be single ones, common for all connections,
+                    or sequences of one value per connection.
+            **kwargs: attributes' names and values, alternatively to params
+        """
+        if params is None:
+            params = kwargs
+        for attr, values in params.items():
+            if attr not in ["weight", "delay", "receptor"]:
+                raise ValueError("Only weight, delay and receptor attributes of connections can be set, not %s!"
+                                 % attr)
+            if attr == "delay":
+                values = self.simulator._assert_delays(_draw_values(values, len(self), self.simulator.rng))
+            self.simulator._connections[attr][self.indices] = values
+        # The connections have to be compiled again before the next Run():
+        self.simulator._prepared = False
+
+
+class NumpySimulator(object):
+
+    """NumpySimulator is a minimal, pure numpy, clock driven spiking network simulator,
+       with an interface following a small subset of the one of PyNEST.
+       It is meant for small networks, tests, and benchmarks of the TVB - Spiking Network interfaces,
+       without a NEST or ANNarchy installation.
+    """
+
+    def __init__(self, resolution=0.1, rng_seed=0):
+        self.ResetKernel(resolution, rng_seed)
+
+    def ResetKernel(self, resolution=0.1, rng_seed=0):
+        """Method to delete all nodes and connections, and reset the time to 0.0"""
+        self._resolution = float(resolution)
+        self._rng_seed = rng_seed
+        self.rng = np.random.RandomState(rng_seed)
+        self._step = 0
+        # Global id -> group index and index of the node within the group. Global id 0 is not used.
+        self._node_group = np.array([-1], dtype="i8")
+        self._node_local = np.array([-1], dtype="i8")
+        self._groups = []
+        self._groups_global_ids = []
+        self._connections = OrderedDict([("source", np.array([], dtype="i8")),
+                                         ("target", np.array([], dtype="i8")),
+                                         ("weight", np.array([], dtype="f8")),
+                                         ("delay", np.array([], dtype="f8")),
+                                         ("receptor", np.array([], dtype="i8")),
+                                         ("synapse_model", np.array([], dtype="O"))])
+        self._spikes_buffer = np.zeros((1, 1))
+        self._currents_buffer = np.zeros((1, 1))
+        self._prepared = False
+
+    # Kernel status:
+
+    @property
+    def number_of_nodes(self):
+        return self._node_group.size - 1
+
+    @property
+    def time(self):
+        return self._step * self._resolution
+
+    @property
+    def min_delay(self):
+        if self._connections["delay"].size:
+            return float(np.min(self._connections["delay"]))
+        return self._resolution
+
+    @property
+    def max_delay(self):
+        if self._connections["delay"].size:
+            return float(np.max(self._connections["delay"]))
+        return self._resolution
+
+    def GetKernelStatus(self, keys=None):
+        status = OrderedDict([("resolution", self._resolution), ("time", self.time),
+                              ("min_delay", self.min_delay), ("max_delay", self.max_delay),
+                              ("rng_seed", self._rng_seed), ("network_size", self.number_of_nodes)])
+        if keys is None:
+            return status
+        elif isinstance(keys, str):
+            return status[keys]
+        return tuple(status[key] for key in keys)
+
+    def SetKernelStatus(self, params):
+        for key, value in params.items():
+            if key == "resolution":
+                if self._step > 0 or self._connections["delay"].size:
+                    raise ValueError("The resolution cannot be changed after connecting nodes or simulating!")
+                self._resolution = float(value)
+            elif key == "rng_seed":
+                self._rng_seed = value
+                self.rng = np.random.RandomState(value)
+            elif key not in ["time", "min_delay", "max_delay", "network_size"]:
+                # Silently ignore NEST specific kernel parameters (e.g., "data_path", "print_time"):
+                continue
+            else:
+                raise ValueError("Kernel status %s cannot be set!" % key)
+
+    def Models(self):
+        return list(NEURON_MODELS.keys()) + list(KERNEL_DEVICES.keys())
+
+    # Nodes:
+
+    def NodeCollection(self, global_ids=()):
+        return NodeCollection(self, global_ids)
+
+    def _add_group(self, group, size):
+        global_ids = np.arange(self.number_of_nodes + 1, self.number_of_nodes + 1 + size)
+        self._node_group = np.concatenate([self._node_group, np.full((size,), len(self._groups), dtype="i8")])
+        self._node_local = np.concatenate([self._node_local, np.arange(size)])
+        self._groups.append(group)
+        self._groups_global_ids.append(global_ids)
+        self._prepared = False
+        return global_ids
+
+    def Create(self, model, n=1, params=None):
+        """Method to create n neurons of the same neural model, or n devices of the same device model.
+           Arguments:
+            model: the name (string) of the neuron or device model
+            n: the number of nodes to create. Default = 1
+            params: a dictionary of parameters. Default = None
+           Returns:
+            the NodeCollection of the created nodes
+        """
+        n = int(n)
+        if model in NEURON_MODELS:
+            global_ids = self._add_group(NEURON_MODELS[model](n, params), n)
+        elif model in KERNEL_DEVICES:
+            global_ids = np.concatenate([self._add_group(KERNEL_DEVICES[model](params), 1) for _ in range(n)])
+        else:
+            raise ValueError("Model %s is neither one of the available neuron models %s,\n"
+                             "nor one of the available device models %s!"
+                             % (model, str(list(NEURON_MODELS.keys())), str(list(KERNEL_DEVICES.keys()))))
+        return NodeCollection(self, global_ids)
+
+    def _nodes_by_group(self, global_ids):
+        groups = self._node_group[global_ids]
+        if np.any(groups < 0):
+            raise ValueError("Nodes' global ids %s do not exist!" % str(global_ids[groups < 0].tolist()))
+        for group in np.unique(groups):
+            inds = np.where(groups == group)[0]
+            yield self._groups[group], inds, self._node_local[global_ids[inds]]
+
+    def _nodes_attributes(self, global_ids):
+        attrs = ["global_id", "model"]
+        for group, inds, local_inds in self._nodes_by_group(global_ids):
+            return attrs + [attr for attr in group.attributes if attr not in ["model"]]
+        return attrs
+
+    def _get_nodes_values(self, global_ids, attr):
+        values = [None] * global_ids.size
+        for group, inds, local_inds in self._nodes_by_group(global_ids):
+            if attr == "global_id":
+                group_values = global_ids[inds].tolist()
+            elif attr == "model":
+                group_values = [group.model] * inds.size
+            elif isinstance(group, NumpyNeuronModel):
+                group_values = group.get(attr, local_inds).tolist()
+            else:
+                group_values = [group.get(attr)]
+            for ind, value in zip(inds, group_values):
+                values[ind] = value
+        return values
+
+    def _set_nodes_values(self, global_ids, params):
+        n_nodes = global_ids.size
+        for group, inds, local_inds in self._nodes_by_group(global_ids):
+            is_neuron = isinstance(group, NumpyNeuronModel)
+            group_params = {}
+            for attr, values in params.items():
+                if attr in ["global_id", "model", "element_type"]:
+                    raise ValueError("Attribute %s cannot be set!" % attr)
+                per_node = isinstance(values, (list, tuple, np.ndarray)) and len(values) == n_nodes
+                if per_node and not is_neuron and isinstance(group.get(attr), list):
+                    # For sequence valued device parameters (e.g., schedules), only a sequence of sequences
+                    # corresponds to one value per node:
+                    per_node = isinstance(values[0], (list, tuple, np.ndarray))
+                if not per_node:
+                    group_params[attr] = values
+                elif is_neuron:
+                    group_params[attr] = np.array(values)[inds]
+                else:
+                    # Each device is a group of a single node:
+                    group_params[attr] = values[inds[0]]
+            if is_neuron:
+                group.set(group_params, local_inds)
+            else:
+                group.set(group_params)
+
+    def _is_neuron(self):
+        return np.array([False] + [isinstance(self._groups[group], NumpyNeuronModel)
+                                   for group in self._node_group[1:]], dtype="bool")
+
+    def _as_global_ids(self, nodes):
+        if isinstance(nodes, NodeCollection):
+            return nodes.global_ids
+        return np.array(ensure_list(nodes), dtype="i8").flatten()
+
+    # Connections:
+
+    def _assert_delays(self, delays):
+        # Delays are multiples of the resolution, and at least equal to it:
+        return np.maximum(np.round(delays / self._resolution), 1.0) * self._resolution
+
+    def _connect_pairs(self, sources, targets, rule, allow_autapses, allow_multapses, conn_spec):
+        n_src = sources.size
+        n_trg = targets.size
+        if rule == "all_to_all":
+            pairs = (np.tile(sources, n_trg), np.repeat(targets, n_src))
+        elif rule == "one_to_one":
+            if n_src != n_trg:
+                raise ValueError("one_to_one connections require equal numbers of sources (%d) and targets (%d)!"
+                                 % (n_src, n_trg))
+            pairs = (sources, targets)
+        elif rule in ["fixed_indegree", "fixed_outdegree"]:
+            if rule == "fixed_indegree":
+                n_from, n_to, degree, pool = n_trg, n_src, conn_spec["indegree"], sources
+            else:
+                n_from, n_to, degree, pool = n_src, n_trg, conn_spec["outdegree"], targets
+            degree = int(degree)
+            if allow_multapses:
+                choices = pool[self.rng.randint(n_to, size=(n_from, degree))]
+            else:
+                if degree > n_to:
+                    raise ValueError("%s = %d > %d possible partners, without multapses!" % (rule, degree, n_to))
+                keys = self.rng.rand(n_from, n_to)
+                if not allow_autapses:
+                    # Sort autapses last:
+                    others = targets if rule == "fixed_indegree" else sources
+                    keys[others[:, None] == pool[None, :]] = 2.0
+                choices = pool[np.argsort(keys, axis=1)[:, :degree]]
+            if rule == "fixed_indegree":
+                pairs = (choices.flatten(), np.repeat(targets, degree))
+            else:
+                pairs = (np.repeat(sources, degree), choices.flatten())
+        elif rule == "fixed_total_number":
+            N = int(conn_spec["N"])
+            if allow_multapses:
+                pairs = (sources[self.rng.randint(n_src, size=N)], targets[self.rng.randint(n_trg, size=N)])
+            else:
+                inds = self.rng.choice(n_src * n_trg, N, replace=False)
+                pairs = (sources[inds % n_src], targets[inds // n_src])
+        elif rule == "pairwise_bernoulli":
+            i_trg, i_src = np.where(self.rng.rand(n_trg, n_src) < conn_spec["p"])
+            pairs = (sources[i_src], targets[i_trg])
+        else:
+            raise ValueError("Connection rule %s is not supported!" % rule)
+        if not allow_autapses:
+            mask = pairs[0] != pairs[1]
+            pairs = (pairs[0][mask], pairs[1][mask])
+        return pairs
+
+    def Connect(self, pre, post, conn_spec=None, syn_spec=None):
+        """Method to connect source to target nodes.
+           Arguments:
+            pre: the source NodeCollection, or sequence of global ids
+            post: the target NodeCollection, or sequence of global ids
+            conn_spec: the name of the connection rule, or a dictionary of the connection rule and its parameters:
+                       "all_to_all" (default), "one_to_one", "fixed_indegree" (with "indegree"),
+                       "fixed_outdegree" (with "outdegree"), "fixed_total_number" (with "N"),
+                       "pairwise_bernoulli" (with "p"), as well as the "allow_autapses" and "allow_multapses" flags.
+            syn_spec: a dictionary of "weight", "delay" (in ms), "receptor_type", and "synapse_model".
+                      Weights and delays can be single values, sequences of one value per connection,
+                      or dictionaries of "uniform", "normal", or "lognormal" distributions.
+        """
+        if conn_spec is None:
+            conn_spec = {"rule": "all_to_all"}
+        elif isinstance(conn_spec, str):
+            conn_spec = {"rule": conn_spec}
+        syn_spec = dict(syn_spec or {})
+        sources, targets = self._connect_pairs(self._as_global_ids(pre), self._as_global_ids(post),
+                                               conn_spec.get("rule", "all_to_all"),
+                                               conn_spec.get("allow_autapses", True),
+                                               conn_spec.get("allow_multapses", True),
+                                               conn_spec)
+        n = sources.size
+        receptor = syn_spec.get("receptor_type", 0)
+        if receptor is None:
+            receptor = 0
+        new_connections = OrderedDict([
+            ("source", sources), ("target", targets),
+            ("weight", _draw_values(syn_spec.get("weight", 1.0), n, self.rng)),
+            ("delay", self._assert_delays(_draw_values(syn_spec.get("delay", self._resolution), n, self.rng))),
+            ("receptor", np.full((n,), receptor, dtype="i8")),
+            ("synapse_model", np.full((n,), syn_spec.get("synapse_model", syn_spec.get("model", "static_synapse")),
+                                      dtype="O"))])
+        for attr, values in new_connections.items():
+            self._connections[attr] = np.concatenate([self._connections[attr], values])
+        self._prepared = False
+
+    def GetConnections(self, source=None, target=None, synapse_model=None):
+        """Method to get the connections from source and/or to target nodes.
+           Arguments:
+            source: the source NodeCollection, or sequence of global ids. Default = None, corresponding to all nodes
+            target: the target NodeCollection, or sequence of global ids. Default = None, corresponding to all nodes
+            synapse_model: the name of the synapse model. Default = None, corresponding to all synapse models
+           Returns:
+            the SynapseCollection of the connections
+        """
+        mask = np.ones(self._connections["source"].shape, dtype="bool")
+        if source is not None:
+            mask &= np.isin(self._connections["source"], self._as_global_ids(source))
+        if target is not None:
+            mask &= np.isin(self._connections["target"], self._as_global_ids(target))
+        if synapse_model is not None:
+            mask &= self._connections["synapse_model"] == synapse_model
+        return SynapseCollection(self, np.where(mask)[0])
+
+    # Simulation:
+
+    def _compile_csr(self, mask, sources, values):
+        # Sort the masked connections by source, and return the indices' pointer per source global id,
+        # and the sorted values:
+        order = np.argsort(sources[mask], kind="stable")
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(sources[mask], minlength=self.number_of_nodes + 1))])
+        return indptr, [value[mask][order] for value in values]
+
+    def _resize_buffers(self, n_slots):
+        # Resize the ring buffers, keeping any spikes and currents pending for delivery:
+        n_columns = self.number_of_nodes + 1
+        for name in ["_spikes_buffer", "_currents_buffer"]:
+            old = getattr(self, name)
+            new = np.zeros((n_slots, n_columns))
+            for delay in range(min(old.shape[0], n_slots)):
+                new[(self._step + delay) % n_slots, :old.shape[1]] = old[(self._step + delay) % old.shape[0]]
+            setattr(self, name, new)
+
+    def Prepare(self):
+        """Method to compile the connections into arrays sorted by source, for fast spikes' delivery."""
+        conns = self._connections
+        is_neuron = self._is_neuron()
+        delays_steps = np.maximum(np.round(conns["delay"] / self._resolution), 1).astype("i8")
+        src_is_neuron = is_neuron[conns["source"]]
+        trg_is_neuron = is_neuron[conns["target"]]
+        # Neuron -> neuron connections:
+        self._synapses_indptr, (self._synapses_targets, self._synapses_weights, self._synapses_delays) = \
+            self._compile_csr(src_is_neuron & trg_is_neuron, conns["source"],
+                              [conns["target"], conns["weight"], delays_steps])
+        # Neuron -> spike recorder connections:
+        is_spike_recorder = np.array([False] + [isinstance(self._groups[group], SpikeRecorder)
+                                                for group in self._node_group[1:]], dtype="bool")
+        self._recorders_indptr, (self._recorders_ids, ) = \
+            self._compile_csr(src_is_neuron & is_spike_recorder[conns["target"]], conns["source"],
+                              [self._node_group[conns["target"]]])
+        # Device -> neuron connections, per device:
+        self._neurons_groups = [i_group for i_group, group in enumerate(self._groups)
+                                if isinstance(group, NumpyNeuronModel)]
+        self._generators = []
+        self._multimeters = []
+        for i_group, group in enumerate(self._groups):
+            if isinstance(group, (PoissonGenerator, DCGenerator, Multimeter)):
+                mask = (conns["source"] == self._groups_global_ids[i_group][0]) & trg_is_neuron
+                targets = conns["target"][mask]
+                if isinstance(group, Multimeter):
+                    targets = np.unique(targets)
+                    self._multimeters.append((group, targets, list(self._nodes_by_group(targets))))
+                elif targets.size:
+                    self._generators.append((group, targets, conns["weight"][mask], delays_steps[mask]))
+        self._resize_buffers(int(np.max(delays_steps, initial=1)) + 1)
+        self._prepared = True
+
+    def _expand_connections(self, indptr, sources):
+        # Return the indices of the compiled connections of the given sources:
+        starts = indptr[sources]
+        counts = indptr[sources + 1] - starts
+        total = np.sum(counts)
+        if total == 0:
+            return np.array([], dtype="i8")
+        return np.arange(total) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+
+    def _deliver(self, buffer, targets, values, delays_steps):
+        np.add.at(buffer, ((self._step - 1 + delays_steps) % buffer.shape[0], targets), values)
+
+    def _run_step(self):
+        dt = self._resolution
+        slot = self._step % self._spikes_buffer.shape[0]
+        spikes_input = self._spikes_buffer[slot]
+        currents_input = self._currents_buffer[slot]
+        spiking_neurons = []
+        for i_group in self._neurons_groups:
+            global_ids = self._groups_global_ids[i_group]
+            spikes = self._groups[i_group].update(dt, spikes_input[global_ids], currents_input[global_ids])
+            if spikes.any():
+                spiking_neurons.append(global_ids[spikes])
+        spikes_input[:] = 0.0
+        currents_input[:] = 0.0
+        self._step += 1
+        time = self.time
+        # Deliver and record the spikes of this time step:
+        if len(spiking_neurons):
+            spiking_neurons = np.concatenate(spiking_neurons)
+            inds = self._expand_connections(self._synapses_indptr, spiking_neurons)
+            if inds.size:
+                self._deliver(self._spikes_buffer, self._synapses_targets[inds],
+                              self._synapses_weights[inds], self._synapses_delays[inds])
+            inds = self._expand_connections(self._recorders_indptr, spiking_neurons)
+            if inds.size:
+                senders = np.repeat(spiking_neurons,
+                                    np.diff(self._recorders_indptr)[spiking_neurons])
+                recorders = self._recorders_ids[inds]
+                for i_group in np.unique(recorders):
+                    recorder = self._groups[i_group]
+                    if recorder.is_active(time):
+                        recorder_senders = senders[recorders == i_group]
+                        recorder.record({"times": np.full(recorder_senders.shape, time),
+                                         "senders": recorder_senders})
+        # Generate the input of the active generators:
+        for generator, targets, weights, delays_steps in self._generators:
+            if generator.is_active(time):
+                if isinstance(generator, PoissonGenerator):
+                    rate = generator.value(time)
+                    if rate > 0.0:
+                        counts = self.rng.poisson(rate * dt / 1000.0, size=targets.size)
+                        spiking = counts > 0
+                        if spiking.any():
+                            self._deliver(self._spikes_buffer, targets[spiking],
+                                          weights[spiking] * counts[spiking], delays_steps[spiking])
+                else:
+                    self._deliver(self._currents_buffer, targets,
+                                  weights * generator.value(time), delays_steps)
+        # Record the multimeters' variables:
+        for multimeter, targets, targets_by_group in self._multimeters:
+            interval_steps = max(int(np.round(multimeter.get("interval") / dt)), 1)
+            if targets.size and self._step % interval_steps == 0 and multimeter.is_active(time):
+                events = OrderedDict([("times", np.full(targets.shape, time)), ("senders", targets)])
+                for var in multimeter.record_from:
+                    events[var] = np.empty(targets.shape)
+                    for group, inds, local_inds in targets_by_group:
+                        events[var][inds] = group.get(var, local_inds)
+                multimeter.record(events)
+
+    def Run(self, t):
+        """Method to simulate for t ms, which has to be a multiple of the resolution."""
+        if not self._prepared:
+            self.Prepare()
+        n_steps = int(np.round(t / self._resolution))
+        for _ in range(n_steps):
+            self._run_step()
+
+    def Cleanup(self):
+        pass
+
+    def Simulate(self, t):
+        """Method to simulate for t ms, which has to be a multiple of the resolution."""
+        self.Prepare()
+        self.Run(t)
+        self.Cleanup()